@@ -10,6 +10,7 @@ from .core.models import (
     CaseModel,
     ConditionModel,
     ExecutionResult,
+    GenerateModel,
     GroupModel,
     NegatedConditionModel,
     SuiteModel,
@@ -28,6 +29,7 @@ __all__ = [
     "ConditionModel",
     "Executable",
     "ExecutionResult",
+    "GenerateModel",
     "GroupModel",
     "NegatedConditionModel",
     "RunReport",
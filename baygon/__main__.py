@@ -8,40 +8,68 @@ from pathlib import Path
 
 from rich.console import Console
 import typer
+from typer.core import TyperGroup
 
 from . import __copyright__, __version__
-from .error import ConfigError, InvalidExecutableError
+from .error import BaygonError, ConfigError, InvalidExecutableError, WorkerError
+from .presentation.payload import merge_payloads, report_payload
 from .presentation.rich import (
     render_command_panels,
     render_pretty_failures,
     render_summary_table,
 )
 from .presentation.text import render_case_results, render_summary
+from .runtime.cache import RunCache
+from .runtime.concurrency import AdaptiveConcurrency
+from .runtime.distributed import WorkerServer
+from .runtime.recording import load_recordings, save_recordings, stale_cases
 from .runtime.runner import RunReport
-from .suite import SuiteExecutor, SuiteLoader
+from .runtime.scheduling import (
+    load_durations,
+    longest_first,
+    parse_shard,
+    plan_makespan,
+    shard_selector,
+    suite_hash,
+)
+from .service import (
+    FairScheduler,
+    GradingService,
+    JobStore,
+    create_server,
+    server_address,
+)
+from .suite import SuiteContext, SuiteExecutor, SuiteLoader
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("baygon")
 
 console = Console()
+
+
+class _DefaultCommandGroup(TyperGroup):
+    """Dispatch to `run` unless the first argument names a sub-command."""
+
+    default_command = "run"
+
+    def parse_args(self, ctx, args):
+        group_options = {
+            option for param in self.get_params(ctx) for option in param.opts
+        }
+        if not args or (args[0] not in self.commands and args[0] not in group_options):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
 app = typer.Typer(
+    cls=_DefaultCommandGroup,
     help="Baygon functional test runner.",
-    context_settings={"allow_interspersed_args": True},
 )
 
 
-def _report_payload(report: RunReport) -> dict:
-    return {
-        "failures": report.failures,
-        "successes": report.successes,
-        "skipped": report.skipped,
-        "total": report.total,
-        "time": report.duration,
-        "points": {
-            "total": report.points_total,
-            "earned": report.points_earned,
-        },
-    }
+def report_format_of(filename) -> str:
+    """Return the report format implied by a file name, YAML for .yml/.yaml."""
+    return "yaml" if Path(filename).suffix.lower() in {".yml", ".yaml"} else "json"
 
 
 def save_report(data, filename, output_format):
@@ -56,6 +84,17 @@ def save_report(data, filename, output_format):
             yaml.dump(data, fp)
 
 
+def load_report(filename):
+    """Load a report written by `save_report`."""
+    path = Path(filename)
+    text = path.read_text(encoding="utf-8")
+    if report_format_of(path) == "yaml":
+        import yaml
+
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
 def version():
     """Display the version."""
     typer.echo(f"Baygon version {__version__} {__copyright__}")
@@ -76,7 +115,67 @@ def _format_callback(value: str | None) -> str | None:
     return normalized
 
 
-@app.callback(invoke_without_command=True)
+def _jobs_callback(value: str) -> str:
+    if value == "auto" or (value.isdigit() and int(value) >= 1):
+        return value
+    raise typer.BadParameter("Jobs must be a positive number or 'auto'.")
+
+
+def _load_context(config: Path | None) -> SuiteContext:
+    try:
+        context = SuiteLoader().load(path=str(config) if config else None)
+    except (ConfigError, ValueError) as error:
+        typer.secho(f"\nError: {error}", fg="red", bold=True, err=True)
+        raise typer.Exit(code=1) from error
+
+    config_path = context.source_path or config
+    typer.secho(f"Using configuration file: {config_path}")
+    return context
+
+
+def _render_report(
+    report_result: RunReport,
+    *,
+    verbose: int,
+    pretty: bool,
+    table: bool,
+    report: Path | None,
+    report_format: str | None,
+    shard: str | None = None,
+) -> None:
+    include_issues = not pretty
+    render_case_results(
+        report_result,
+        write=typer.echo,
+        verbose=verbose,
+        include_issues=include_issues,
+    )
+
+    if verbose >= 3 and not pretty:
+        for case_result in report_result.cases:
+            render_command_panels(
+                case_result,
+                console=console,
+                hide_empty_streams=False,
+            )
+
+    if pretty:
+        render_pretty_failures(report_result, console=console)
+
+    if table:
+        render_summary_table(report_result, console=console)
+
+    render_summary(report_result, write=typer.echo)
+
+    if report:
+        save_report(
+            report_payload(report_result, shard=shard),
+            report,
+            report_format or report_format_of(report),
+        )
+
+
+@app.command("run", context_settings={"allow_interspersed_args": True})
 def cli(
     executable: Path | None = typer.Argument(
         None,
@@ -101,6 +200,14 @@ def cli(
         help="Increase verbosity. Use -vvv for detailed command frames.",
     ),
     limit: int = typer.Option(-1, "-l", "--limit", help="Limit errors to N."),
+    jobs: str = typer.Option(
+        "1",
+        "-j",
+        "--jobs",
+        metavar="N|auto",
+        callback=_jobs_callback,
+        help="Run N test cases concurrently, or adapt to the load with 'auto'.",
+    ),
     debug: bool = typer.Option(False, "-d", "--debug", help="Enable debug mode."),
     report: Path | None = typer.Option(
         None,
@@ -138,24 +245,64 @@ def cli(
         resolve_path=True,
         help="Choose config file (.yml or .json).",
     ),
+    record: Path | None = typer.Option(
+        None,
+        "--record",
+        file_okay=False,
+        resolve_path=True,
+        help="Record every executed command into the given directory.",
+    ),
+    last_failed: bool = typer.Option(
+        False,
+        "--lf",
+        "--last-failed",
+        help="Only run the cases that failed last time.",
+    ),
+    failed_first: bool = typer.Option(
+        False,
+        "--ff",
+        "--failed-first",
+        help="Run the cases that failed last time first.",
+    ),
+    use_cache: bool = typer.Option(
+        True,
+        "--cache/--no-cache",
+        help="Read and update the run state stored next to the config.",
+    ),
+    shard: str | None = typer.Option(
+        None,
+        "--shard",
+        metavar="K/N",
+        help="Only run the K-th of N deterministic partitions of the suite.",
+    ),
+    timings: Path | None = typer.Option(
+        None,
+        "--timings",
+        exists=True,
+        dir_okay=False,
+        resolve_path=True,
+        help="Report or cache file whose durations balance the shards.",
+    ),
+    workers: str | None = typer.Option(
+        None,
+        "--workers",
+        metavar="ADDR,...",
+        help="Run the cases on workers (host:port or unix:PATH, comma separated).",
+    ),
+    keep_failed: bool = typer.Option(
+        False,
+        "--keep-failed",
+        help="Keep the working directories of failed cases.",
+    ),
 ) -> None:
-    """Baygon functional test runner."""
+    """Run the test suite against an executable."""
 
     del _version  # Trigger callback evaluation & silence linters.
 
     resolved_executable = str(executable) if executable else None
 
-    loader = SuiteLoader()
     executor = SuiteExecutor()
-
-    try:
-        context = loader.load(path=str(config) if config else None)
-    except (ConfigError, ValueError) as error:
-        typer.secho(f"\nError: {error}", fg="red", bold=True, err=True)
-        raise typer.Exit(code=1) from error
-
-    config_path = context.source_path or config
-    typer.secho(f"Using configuration file: {config_path}")
+    context = _load_context(config)
 
     if verbose > 0:
         typer.echo(f"Verbose level set to {verbose}")
@@ -165,50 +312,298 @@ def cli(
         logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("Debug mode enabled.")
 
+    cache = RunCache.for_base_dir(context.base_dir) if use_cache else None
+    select = order = in_shard = None
+    if cache is not None and last_failed:
+        select = cache.last_failed()
+        if select is None:
+            typer.echo("No previously failed cases, running everything.")
+    if cache is not None and failed_first:
+        order = cache.failed_first()
+
+    if shard is not None:
+        try:
+            shard_index, shard_count = parse_shard(shard)
+        except ConfigError as error:
+            typer.secho(f"\nError: {error}", fg="red", bold=True, err=True)
+            raise typer.Exit(code=1) from error
+        durations = load_durations(timings) if timings is not None else None
+        in_shard = shard_selector(
+            context.model.iter_cases(), shard_index, shard_count, durations
+        )
+        previous = select
+        select = (
+            in_shard
+            if previous is None
+            else lambda case: in_shard(case) and previous(case)
+        )
+
+    suite_key = suite_hash(context.model)
+    history = cache.durations(suite_key) if cache is not None else {}
+    concurrency: int | AdaptiveConcurrency
+    if jobs == "auto":
+        concurrency = AdaptiveConcurrency(expected=history)
+        slots = concurrency.initial
+    else:
+        concurrency = slots = int(jobs)
+
+    if slots > 1 and history:
+        longest = longest_first(context.model.iter_cases(), history)
+        first = order
+        order = longest if first is None else lambda case: (first(case), longest(case))
+
     try:
         report_result = executor.run(
             context,
             executable=resolved_executable,
             limit=limit,
+            select=select,
+            order=order,
+            jobs=concurrency,
+            workers=workers.split(",") if workers else None,
+            keep_failed=keep_failed,
         )
-    except InvalidExecutableError as error:
+    except (InvalidExecutableError, ConfigError, WorkerError) as error:
         typer.secho(f"\nError: {error}", fg="red", bold=True, err=True)
         raise typer.Exit(code=1) from error
 
-    include_issues = not pretty
-    render_case_results(
+    actual_makespan = report_result.duration
+    if cache is not None:
+        cache.update(report_result, suite_key=suite_key)
+        if last_failed:
+            report_result = cache.merge(report_result, within=in_shard)
+
+    if record:
+        save_recordings(report_result, record, base_dir=context.base_dir)
+
+    _render_report(
         report_result,
-        write=typer.echo,
         verbose=verbose,
-        include_issues=include_issues,
+        pretty=pretty,
+        table=table,
+        report=report,
+        report_format=report_format,
+        shard=shard,
     )
+    if cache is not None:
+        cache.save()
+
+    if verbose > 0 and slots > 1:
+        planned = [
+            case
+            for case in context.model.iter_cases()
+            if select is None or select(case)
+        ]
+        predicted = plan_makespan(planned, history, slots, order)
+        estimate = f"predicted {predicted:.2f} s" if history else "no history yet"
+        label = f"{slots} jobs" if jobs != "auto" else f"auto jobs from {slots}"
+        typer.echo(f"Makespan on {label}: {actual_makespan:.2f} s ({estimate}).")
 
-    if verbose >= 3 and not pretty:
-        for case_result in report_result.cases:
-            render_command_panels(
-                case_result,
-                console=console,
-                hide_empty_streams=False,
-            )
+    typer.echo("")
 
-    if pretty:
-        render_pretty_failures(report_result, console=console)
 
-    if table:
-        render_summary_table(report_result, console=console)
+@app.command("regrade")
+def regrade(
+    recordings: Path = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=False,
+        resolve_path=True,
+        help="Directory written by 'baygon run --record'.",
+    ),
+    verbose: int = typer.Option(
+        0,
+        "-v",
+        "--verbose",
+        count=True,
+        help="Increase verbosity. Use -vvv for detailed command frames.",
+    ),
+    report: Path | None = typer.Option(
+        None,
+        "-r",
+        "--report",
+        writable=True,
+        resolve_path=True,
+        help="Write report to the given file.",
+    ),
+    table: bool = typer.Option(
+        False, "-T", "--table", help="Display a rich summary table."
+    ),
+    pretty: bool = typer.Option(
+        False,
+        "-p",
+        "--pretty",
+        help="Display nested frames for failing tests.",
+    ),
+    report_format: str | None = typer.Option(
+        None,
+        "-f",
+        "--format",
+        case_sensitive=False,
+        help="Report format (json or yaml).",
+        callback=_format_callback,
+    ),
+    config: Path | None = typer.Option(
+        None,
+        "-c",
+        "-t",
+        "--config",
+        exists=True,
+        dir_okay=False,
+        readable=True,
+        resolve_path=True,
+        help="Choose config file (.yml or .json).",
+    ),
+) -> None:
+    """Grade recorded executions with the current configuration."""
 
-    render_summary(report_result, write=typer.echo)
+    context = _load_context(config)
+    report_result = SuiteExecutor().regrade(
+        context, recordings=load_recordings(recordings)
+    )
 
-    if report:
-        destination = str(report)
-        output_format = report_format or (
-            "yaml" if destination.endswith(".yaml") else "json"
+    _render_report(
+        report_result,
+        verbose=verbose,
+        pretty=pretty,
+        table=table,
+        report=report,
+        report_format=report_format,
+    )
+
+    stale = stale_cases(report_result)
+    if stale:
+        identifiers = ", ".join(result.case.id_str for result in stale)
+        typer.secho(
+            f"{len(stale)} case(s) need re-execution: {identifiers}", fg="yellow"
         )
-        save_report(_report_payload(report_result), destination, output_format)
 
     typer.echo("")
 
 
+@app.command("worker")
+def worker(
+    listen: str = typer.Option(
+        "127.0.0.1:4000",
+        "--listen",
+        metavar="ADDR",
+        help="Address to listen on (host:port or unix:PATH).",
+    ),
+    allow_remote: bool = typer.Option(
+        False,
+        "--allow-remote",
+        help="Listen on an address other machines can reach. Anyone able to "
+        "connect can run commands as this user.",
+    ),
+) -> None:
+    """Execute test cases on behalf of a coordinator."""
+
+    try:
+        server = WorkerServer(listen, allow_remote=allow_remote)
+    except (OSError, WorkerError) as error:
+        typer.secho(f"\nError: {error}", fg="red", bold=True, err=True)
+        raise typer.Exit(code=1) from error
+
+    typer.echo(f"Worker listening on {server.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+@app.command("serve")
+def serve(
+    listen: str = typer.Option(
+        "127.0.0.1:8300",
+        "--listen",
+        metavar="ADDR",
+        help="Address of the HTTP API (host:port or unix:PATH).",
+    ),
+    jobs: int = typer.Option(
+        1, "-j", "--jobs", min=1, help="Grade N jobs concurrently."
+    ),
+    database: Path = typer.Option(
+        Path("baygon-jobs.sqlite"),
+        "--db",
+        dir_okay=False,
+        resolve_path=True,
+        help="SQLite file holding the job queue.",
+    ),
+    owner_cap: int | None = typer.Option(
+        None,
+        "--owner-cap",
+        min=1,
+        help="Maximum number of jobs of a single owner graded at once.",
+    ),
+    allow_remote: bool = typer.Option(
+        False,
+        "--allow-remote",
+        help="Listen on an address other machines can reach. Anyone able to "
+        "connect can run commands as this user.",
+    ),
+) -> None:
+    """Grade submissions sent to a local HTTP API."""
+
+    store = JobStore(database, scheduler=FairScheduler(owner_cap=owner_cap))
+    service = GradingService(store, jobs=jobs)
+    try:
+        server = create_server(listen, service, allow_remote=allow_remote)
+    except (OSError, ValueError, BaygonError) as error:
+        store.close()
+        typer.secho(f"\nError: {error}", fg="red", bold=True, err=True)
+        raise typer.Exit(code=1) from error
+
+    service.start()
+    typer.echo(f"Serving on {server_address(server)} with {jobs} grader(s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        store.close()
+
+
+@app.command("merge")
+def merge(
+    parts: list[Path] = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        readable=True,
+        resolve_path=True,
+        help="Partial reports written by sharded runs.",
+    ),
+    report: Path = typer.Option(
+        ...,
+        "-r",
+        "--report",
+        writable=True,
+        resolve_path=True,
+        help="Write the merged report to the given file.",
+    ),
+    report_format: str | None = typer.Option(
+        None,
+        "-f",
+        "--format",
+        case_sensitive=False,
+        help="Report format (json or yaml).",
+        callback=_format_callback,
+    ),
+) -> None:
+    """Merge partial reports from sharded runs into one report."""
+
+    merged = merge_payloads(load_report(part) for part in parts)
+    save_report(merged, report, report_format or report_format_of(report))
+
+    typer.echo(f"Merged {len(parts)} report(s): {merged['total']} tests.")
+    typer.echo(f"Points: {merged['points']['earned']}/{merged['points']['total']}")
+    typer.echo(f"{merged['failures']} failed, {merged['successes']} passed.")
+
+
 def run() -> None:
     """Entrypoint used by packaging tools."""
     app()
@@ -0,0 +1,66 @@
+"""Socket addresses of services, workers and the grading service."""
+
+from __future__ import annotations
+
+import ipaddress
+import socket
+from typing import Any
+
+LOOPBACK = "127.0.0.1"
+"""Host reached when an address only gives a port."""
+
+
+def parse_address(address: str) -> tuple[socket.AddressFamily, Any]:
+    """Return the socket family and address of "unix:path" or "[host:]port".
+
+    A bare port is reached on the loopback interface.
+
+        >>> parse_address("8080")
+        (<AddressFamily.AF_INET: 2>, ('127.0.0.1', 8080))
+        >>> parse_address("localhost:4000")
+        (<AddressFamily.AF_INET: 2>, ('localhost', 4000))
+        >>> parse_address("unix:server.sock")[1]
+        'server.sock'
+
+    Raises:
+        ValueError: if the address is malformed, or names a Unix socket on a
+            platform without them.
+    """
+    if address.startswith("unix:"):
+        path = address[len("unix:") :]
+        if not path:
+            raise ValueError(
+                f"Invalid address '{address}', the socket path is missing."
+            )
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Unix sockets are not supported on this platform.")
+        return socket.AF_UNIX, path
+    host, _, port = address.rpartition(":")
+    if not port.isdigit() or int(port) > 65535:
+        raise ValueError(
+            f"Invalid address '{address}', expected a port, host:port or unix:path."
+        )
+    return socket.AF_INET, (host or LOOPBACK, int(port))
+
+
+def is_local(address: str) -> bool:
+    """Tell whether only this machine can connect to an address it listens on.
+
+        >>> is_local("127.0.0.1:4000"), is_local("unix:/tmp/worker.sock")
+        (True, True)
+        >>> is_local("0.0.0.0:4000")
+        False
+
+    Raises:
+        ValueError: if the address is malformed.
+    """
+    family, target = parse_address(address)
+    if family != socket.AF_INET:
+        return True
+    host = target[0]
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
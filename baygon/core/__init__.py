@@ -4,6 +4,7 @@ from .models import (
     CaseModel,
     ConditionModel,
     ExecutionResult,
+    GenerateModel,
     GroupModel,
     NegatedConditionModel,
     SuiteModel,
@@ -14,6 +15,7 @@ __all__ = [
     "CaseModel",
     "ConditionModel",
     "ExecutionResult",
+    "GenerateModel",
     "GroupModel",
     "NegatedConditionModel",
     "SuiteModel",
@@ -47,11 +47,105 @@ class ConditionModel:
     contains: str | None = None
     expected: str | None = None
     negated: tuple[NegatedConditionModel, ...] = field(default_factory=tuple)
+    file: str | None = None
+    equals_bytes: str | None = None
+    sha256: str | None = None
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "filters", _deep_freeze(self.filters))
 
 
+@dataclass(frozen=True)
+class FileCheckModel:
+    """Expectations on a file written by the program."""
+
+    path: str
+    same_as: str | None = None
+    conditions: tuple[ConditionModel, ...] = ()
+
+
+@dataclass(frozen=True)
+class DialogueStepModel:
+    """Text sent to a running program, then output expected from it."""
+
+    send: str | None = None
+    expect: tuple[ConditionModel, ...] = ()
+    timeout: float | None = None
+
+
+@dataclass(frozen=True)
+class PipelineStageModel:
+    """Command of a pipeline; without executable, the program under test."""
+
+    executable: str | None = None
+    args: tuple[str, ...] = ()
+    exit: int | None = None
+
+
+@dataclass(frozen=True)
+class ServiceModel:
+    """Program started once for a group and reached over a socket."""
+
+    address: str
+    args: tuple[str, ...] = ()
+    env: Mapping[str, str] = field(default_factory=dict)
+    ready: str | None = None
+    start_timeout: float | None = None
+    timeout: float | None = None
+    connections: int = 4
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "env", _deep_freeze(self.env))
+
+
+@dataclass(frozen=True)
+class LoadTemplateModel:
+    """Request sent during a load test and the conditions on its response."""
+
+    request: str
+    response: tuple[ConditionModel, ...] = ()
+
+
+@dataclass(frozen=True)
+class LoadModel:
+    """Concurrent requests sent to the service of a group, and thresholds."""
+
+    templates: tuple[LoadTemplateModel, ...]
+    concurrency: int = 1
+    duration: float | None = None
+    requests: int | None = None
+    min_rps: float | None = None
+    max_p99: float | None = None
+    max_error_rate: float = 0
+
+
+@dataclass(frozen=True)
+class LibraryModel:
+    """Shared library and the signatures of the functions called."""
+
+    path: str
+    functions: Mapping[str, str]
+    timeout: float | None = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "functions", _deep_freeze(self.functions))
+
+
+@dataclass(frozen=True)
+class GenerateModel:
+    """Property-based input generation settings for a case."""
+
+    values: Mapping[str, Mapping[str, Any]]
+    count: int = 100
+    seed: int | None = None
+    jobs: int | None = None
+    shrink: int = 200
+    reference: str | None = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "values", _deep_freeze(self.values))
+
+
 @dataclass(frozen=True)
 class CaseModel:
     """Leaf test case definition."""
@@ -70,6 +164,20 @@ class CaseModel:
     exit: int | str | None
     filters: Mapping[str, Any]
     eval: Mapping[str, Any] | None = None
+    generate: GenerateModel | None = None
+    needs: tuple[str, ...] = ()
+    workdir: str | None = None
+    files: tuple[FileCheckModel, ...] = ()
+    stdin_file: str | None = None
+    early_exit: bool | None = None
+    dialogue: tuple[DialogueStepModel, ...] = ()
+    pipeline: tuple[PipelineStageModel, ...] = ()
+    request: str | None = None
+    response: tuple[ConditionModel, ...] = ()
+    load: LoadModel | None = None
+    call: str | None = None
+    returns: Any = None
+    tolerance: float | None = None
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "env", _deep_freeze(self.env))
@@ -96,10 +204,23 @@ class GroupModel:
     filters: Mapping[str, Any]
     tests: tuple[TestNode, ...]
     eval: Mapping[str, Any] | None = None
+    needs: tuple[str, ...] = ()
+    fail_fast: bool = False
+    setup: tuple[tuple[str, ...], ...] = ()
+    teardown: tuple[tuple[str, ...], ...] = ()
+    workdir: str | None = None
+    early_exit: bool | None = None
+    service: ServiceModel | None = None
+    library: LibraryModel | None = None
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "filters", _deep_freeze(self.filters))
 
+    @property
+    def id_str(self) -> str:
+        """Return the dotted identifier (e.g. '1.2')."""
+        return ".".join(str(part) for part in self.id)
+
     def iter_cases(self) -> Iterator[CaseModel]:
         """Iterate over every leaf case contained in this group."""
         for test in self.tests:
@@ -126,6 +247,14 @@ class SuiteModel:
     report_format: str | None = None
     table: bool = False
     compute_score: bool = False
+    time_budget: float | None = None
+    setup: tuple[tuple[str, ...], ...] = ()
+    teardown: tuple[tuple[str, ...], ...] = ()
+    workdir: str | None = None
+    early_exit: bool | None = None
+    capture: str = "pipe"
+    launcher: str = "spawn"
+    decode_errors: str = "strict"
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "filters", _deep_freeze(self.filters))
@@ -180,6 +309,14 @@ def _build_suite(config: Mapping[str, Any]) -> SuiteModel:
         report_format=config.get("format"),
         table=config.get("table", False),
         compute_score=config.get("compute-score", False),
+        time_budget=config.get("time-budget"),
+        setup=_build_commands(config.get("setup")),
+        teardown=_build_commands(config.get("teardown")),
+        workdir=config.get("workdir"),
+        early_exit=config.get("early-exit"),
+        capture=config.get("capture") or "pipe",
+        launcher=config.get("launcher") or "spawn",
+        decode_errors=config.get("decode-errors") or "strict",
     )
 
 
@@ -195,7 +332,16 @@ def _build_node(config: Mapping[str, Any]) -> TestNode:
             filters=config.get("filters") or {},
             tests=tests,
             eval=config.get("eval"),
+            needs=tuple(str(item) for item in config.get("needs") or ()),
+            fail_fast=bool(config.get("fail-fast", False)),
+            setup=_build_commands(config.get("setup")),
+            teardown=_build_commands(config.get("teardown")),
+            workdir=config.get("workdir"),
+            early_exit=config.get("early-exit"),
+            service=_build_service(config.get("service")),
+            library=_build_library(config.get("library")),
         )
+    stdin = config.get("stdin")
     return CaseModel(
         id=_as_id_tuple(config.get("test_id")),
         name=config.get("name", ""),
@@ -204,13 +350,117 @@ def _build_node(config: Mapping[str, Any]) -> TestNode:
         executable=config.get("executable"),
         args=tuple(config.get("args") or ()),
         env=config.get("env") or {},
-        stdin=config.get("stdin"),
+        stdin=None if isinstance(stdin, Mapping) else stdin,
+        stdin_file=stdin.get("file") if isinstance(stdin, Mapping) else None,
         stdout=tuple(_build_condition(item) for item in config.get("stdout") or ()),
         stderr=tuple(_build_condition(item) for item in config.get("stderr") or ()),
         repeat=int(config.get("repeat", 1)),
         exit=config.get("exit"),
         filters=config.get("filters") or {},
         eval=config.get("eval"),
+        generate=_build_generate(config.get("generate")),
+        needs=tuple(str(item) for item in config.get("needs") or ()),
+        workdir=config.get("workdir"),
+        early_exit=config.get("early-exit"),
+        dialogue=tuple(
+            DialogueStepModel(
+                send=step.get("send"),
+                expect=tuple(
+                    _build_condition(item) for item in step.get("expect") or ()
+                ),
+                timeout=step.get("timeout"),
+            )
+            for step in config.get("dialogue") or ()
+        ),
+        pipeline=tuple(
+            PipelineStageModel(
+                executable=stage.get("executable"),
+                args=tuple(stage.get("args") or ()),
+                exit=stage.get("exit"),
+            )
+            for stage in config.get("pipeline") or ()
+        ),
+        request=config.get("request"),
+        response=tuple(_build_condition(item) for item in config.get("response") or ()),
+        load=_build_load(config.get("load")),
+        call=config.get("call"),
+        returns=config.get("returns"),
+        tolerance=config.get("tolerance"),
+        files=tuple(
+            FileCheckModel(
+                path=str(path),
+                same_as=spec.get("same-as"),
+                conditions=tuple(
+                    _build_condition(item) for item in spec.get("conditions") or ()
+                ),
+            )
+            for path, spec in (config.get("files") or {}).items()
+        ),
+    )
+
+
+def _build_commands(
+    config: Sequence[Sequence[str]] | None,
+) -> tuple[tuple[str, ...], ...]:
+    return tuple(tuple(str(arg) for arg in argv) for argv in config or ())
+
+
+def _build_service(config: Mapping[str, Any] | None) -> ServiceModel | None:
+    if not config:
+        return None
+    return ServiceModel(
+        address=config["address"],
+        args=tuple(config.get("args") or ()),
+        env=config.get("env") or {},
+        ready=config.get("ready"),
+        start_timeout=config.get("start-timeout"),
+        timeout=config.get("timeout"),
+        connections=int(config.get("connections", 4)),
+    )
+
+
+def _build_library(config: Mapping[str, Any] | None) -> LibraryModel | None:
+    if not config:
+        return None
+    return LibraryModel(
+        path=config["path"],
+        functions=config.get("functions") or {},
+        timeout=config.get("timeout"),
+    )
+
+
+def _build_load(config: Mapping[str, Any] | None) -> LoadModel | None:
+    if not config:
+        return None
+    return LoadModel(
+        templates=tuple(
+            LoadTemplateModel(
+                request=template["request"],
+                response=tuple(
+                    _build_condition(item) for item in template.get("response") or ()
+                ),
+            )
+            for template in config["templates"]
+        ),
+        concurrency=int(config.get("concurrency", 1)),
+        duration=config.get("duration"),
+        requests=config.get("requests"),
+        min_rps=config.get("min-rps"),
+        max_p99=config.get("max-p99"),
+        max_error_rate=config.get("max-error-rate", 0),
+    )
+
+
+def _build_generate(config: Mapping[str, Any] | None) -> GenerateModel | None:
+    if not config:
+        return None
+    return GenerateModel(
+        values=config.get("values") or {},
+        count=int(config.get("count", 100)),
+        seed=config.get("seed"),
+        jobs=config.get("jobs"),
+        shrink=int(config.get("shrink", 200)),
+        reference=config.get("reference"),
     )
 
 
@@ -230,4 +480,7 @@ def _build_condition(config: Mapping[str, Any]) -> ConditionModel:
         contains=config.get("contains"),
         expected=config.get("expected"),
         negated=negated,
+        file=config.get("file"),
+        equals_bytes=config.get("equals-bytes"),
+        sha256=config.get("sha256"),
     )
@@ -30,3 +30,7 @@ class ConfigSyntaxError(ConfigError):
         super().__init__(message)
         self.line = line
         self.column = column
+
+
+class WorkerError(BaygonError):
+    """Raised when remote workers cannot run a suite"""
@@ -1,22 +1,113 @@
 """Executable class. To be used with the Test class."""
 
-from collections import namedtuple
+import contextlib
 import logging
 import os
 from pathlib import Path
+import select
+import selectors
 import shutil
 import subprocess
+import tempfile
+import time
 import typing
 
 from .error import InvalidExecutableError
 
 logger = logging.getLogger("baygon")
 
-Outputs = namedtuple("Outputs", ["exit_status", "stdout", "stderr"])
-
 forbidden_binaries = ["rm", "mv", "dd", "wget", "mkfs"]
 
 
+CAPTURES = ("pipe", "file")
+CHANNELS = ("stdout", "stderr")
+
+
+class Outputs:
+    """Exit status and outputs of a program.
+
+    The outputs are kept as the bytes the program wrote. They are decoded on
+    first access to `stdout` or `stderr`, or through `text` with another error
+    policy, and the text is cached. Text given instead of bytes is kept as is.
+
+        >>> out = Outputs(0, b"caf\\xc3\\xa9", b"\\xff")
+        >>> out.stdout
+        'café'
+        >>> out.text("stderr", errors="replace")
+        '\\ufffd'
+        >>> out.stderr_bytes
+        b'\\xff'
+    """
+
+    def __init__(
+        self, exit_status, stdout=b"", stderr=b"", *, encoding="utf-8", errors="strict"
+    ):
+        self.exit_status = exit_status
+        self.encoding = encoding
+        self.errors = errors
+        self._raw = {}
+        self._texts = {}
+        for name, value in zip(CHANNELS, (stdout, stderr)):
+            if isinstance(value, str):
+                self._texts[name] = value
+            self._raw[name] = value or b""
+
+    @property
+    def stdout(self) -> str:
+        return self.text("stdout")
+
+    @property
+    def stderr(self) -> str:
+        return self.text("stderr")
+
+    @property
+    def stdout_bytes(self) -> bytes:
+        return self.data("stdout")
+
+    @property
+    def stderr_bytes(self) -> bytes:
+        return self.data("stderr")
+
+    def data(self, stream: str) -> bytes:
+        """Return the raw bytes of "stdout" or "stderr"."""
+        value = self._raw[stream]
+        if isinstance(value, str):
+            value = self._raw[stream] = value.encode(self.encoding, "surrogateescape")
+        return value
+
+    def text(self, stream: str, errors: typing.Optional[str] = None) -> str:
+        """Return "stdout" or "stderr" decoded with the given error policy.
+
+        :raises UnicodeDecodeError: with the "strict" policy, if the output
+            is not valid in the encoding of the program.
+        """
+        if stream in self._texts:
+            return self._texts[stream]
+        key = (stream, errors or self.errors)
+        if key not in self._texts:
+            self._texts[key] = str(self._raw[stream], self.encoding, key[1])
+        return self._texts[key]
+
+    def __iter__(self):
+        return iter((self.exit_status, self.stdout, self.stderr))
+
+    def __eq__(self, other):
+        if not isinstance(other, Outputs):
+            return NotImplemented
+        return self.exit_status == other.exit_status and all(
+            self.data(name) == other.data(name) for name in CHANNELS
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        stdout, stderr = (self.text(name, "backslashreplace") for name in CHANNELS)
+        return (
+            f"{self.__class__.__name__}(exit_status={self.exit_status}, "
+            f"stdout={stdout!r}, stderr={stderr!r})"
+        )
+
+
 def get_env(env: typing.Optional[str] = None) -> dict:
     """Get the environment variables to be used for the subprocess."""
     return {**os.environ, **(env or {})}
@@ -71,27 +162,69 @@ class Executable:
                     f"Program '{filename}' is not an executable!"
                 )
 
-    def run(self, *args, stdin=None, env=None, hook=None):
-        """Run the program and grab all the outputs."""
+    def run(
+        self,
+        *args,
+        stdin=None,
+        env=None,
+        hook=None,
+        cwd=None,
+        capture="pipe",
+        monitor=None,
+    ):
+        """Run the program and grab all the outputs.
+
+        :param stdin: Text written to the standard input, or a path whose file
+            becomes the standard input of the program without being read.
+        :param cwd: Directory the program runs in, the current one by default.
+        :param capture: How outputs are collected. With "pipe" they are read
+            while the program runs. With "file" the program writes into
+            anonymous temporary files, read once it has exited.
+        :param monitor: Callable receiving the standard output chunk by chunk
+            while the program runs. The program is killed as soon as it
+            returns True, and the output read so far is returned. It needs
+            the "pipe" capture.
+        :return: The exit status and the outputs, kept in bytes until decoded.
+            The hook also receives the outputs in bytes.
+        """
+        if capture not in CAPTURES:
+            raise ValueError(f"Unknown capture backend '{capture}'")
+        if monitor is not None and capture != "pipe":
+            raise ValueError("A monitor needs the pipe capture")
 
         cmd = [self.filename, *[str(a) for a in args]]
 
-        with subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stdin=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            env=env,
-        ) as proc:
-            if stdin is not None:
+        with contextlib.ExitStack() as stack:
+            source = subprocess.PIPE
+            if isinstance(stdin, os.PathLike):
+                source = stack.enter_context(Path(stdin).open("rb"))
+                stdin = None
+            elif stdin is not None:
                 stdin = stdin.encode(self.encoding)
 
-            stdout, stderr = proc.communicate(input=stdin)
+            sinks = [subprocess.PIPE, subprocess.PIPE]
+            if capture == "file":
+                sinks = [stack.enter_context(spill_file(name)) for name in CHANNELS]
+
+            start = time.perf_counter()
+            proc = stack.enter_context(
+                self._popen(
+                    cmd,
+                    stdout=sinks[0],
+                    stdin=source,
+                    stderr=sinks[1],
+                    env=env,
+                    cwd=cwd,
+                )
+            )
+            if monitor is None:
+                stdout, stderr = proc.communicate(input=stdin)
+            else:
+                stdout, stderr = communicate(proc, stdin, monitor)
+            duration = time.perf_counter() - start
 
-            if stdout is not None:
-                stdout = stdout.decode(self.encoding)
-            if stderr is not None:
-                stderr = stderr.decode(self.encoding)
+            if capture == "file":
+                stdout, stderr = (read_spill(f) for f in sinks)
 
             if hook and callable(hook):
                 hook(
@@ -100,13 +233,18 @@ class Executable:
                     stdout=stdout,
                     stderr=stderr,
                     exit_status=proc.returncode,
+                    duration=round(duration, 6),
                 )
 
-            return Outputs(proc.returncode, stdout, stderr)
+            return Outputs(proc.returncode, stdout, stderr, encoding=self.encoding)
 
     def __call__(self, *args, **kwargs):
         return self.run(*args, **kwargs)
 
+    def _popen(self, cmd, **kwargs) -> subprocess.Popen:
+        """Start the program; subclasses may start it another way."""
+        return subprocess.Popen(cmd, **kwargs)
+
     def __repr__(self):
         return f"{self.__class__.__name__}<{self.filename}>"
 
@@ -114,3 +252,75 @@ class Executable:
     def _is_executable(filename):
         path = Path(filename)
         return path.is_file() and os.access(path, os.X_OK)
+
+
+def communicate(proc, stdin, monitor=None) -> tuple[bytes, bytes]:
+    """Exchange data with the program like `Popen.communicate`.
+
+    Outputs written into files instead of pipes are returned as None. With a
+    `monitor`, the program is killed once it returns True on a chunk of its
+    standard output; what was read until then is returned.
+    """
+    streams = (proc.stdout, proc.stderr)
+    chunks = {stream.fileno(): [] for stream in streams if stream is not None}
+    pending = memoryview(stdin or b"")
+    with selectors.DefaultSelector() as selector:
+        for fd in chunks:
+            selector.register(fd, selectors.EVENT_READ)
+        if proc.stdin is not None:
+            if pending:
+                selector.register(proc.stdin.fileno(), selectors.EVENT_WRITE)
+            else:
+                proc.stdin.close()
+        while selector.get_map():
+            for key, _ in selector.select():
+                if key.events & selectors.EVENT_WRITE:
+                    try:
+                        written = os.write(key.fd, pending[: select.PIPE_BUF])
+                    except BrokenPipeError:
+                        written = len(pending)
+                    pending = pending[written:]
+                    if not pending:
+                        selector.unregister(key.fd)
+                        proc.stdin.close()
+                    continue
+                data = os.read(key.fd, 1 << 16)
+                if not data:
+                    selector.unregister(key.fd)
+                    continue
+                chunks[key.fd].append(data)
+                if (
+                    monitor is not None
+                    and key.fd == proc.stdout.fileno()
+                    and monitor(data)
+                ):
+                    proc.kill()
+                    proc.wait()
+                    return _joined(streams, chunks)
+    proc.wait()
+    return _joined(streams, chunks)
+
+
+def _joined(streams, chunks) -> tuple[bytes, bytes]:
+    return tuple(
+        b"".join(chunks[stream.fileno()]) if stream is not None else None
+        for stream in streams
+    )
+
+
+def spill_file(name: str) -> typing.BinaryIO:
+    """Return an anonymous file receiving one output stream of a program.
+
+    A memfd lives in memory and never touches the disk. Platforms without
+    it fall back on an unlinked temporary file.
+    """
+    if hasattr(os, "memfd_create"):
+        with contextlib.suppress(OSError):
+            return os.fdopen(os.memfd_create(f"baygon-{name}"), "w+b")
+    return tempfile.TemporaryFile()
+
+
+def read_spill(stream: typing.BinaryIO) -> bytes:
+    """Return what the program wrote in a spill file, read in one call."""
+    stream.seek(0)
+    return stream.read()
@@ -188,6 +188,7 @@ class FilterEval(Filter):
         self, start: str = "{{", end: str = "}}", init: list[str] | None = None
     ):
         super().__init__()
+        self._settings = {"start": start, "end": end, "init": init}
         self._mustache = re.compile(f"{start}(.*?){end}")
         self._kernel = TinyKernel()
 
@@ -213,6 +214,28 @@ class FilterEval(Filter):
         ret += value[pos:]
         return ret
 
+    def has_mustaches(self, value: str) -> bool:
+        """Return True if evaluating `value` may change it.
+
+        >>> FilterEval().has_mustaches("{{ 1 + 1 }}")
+        True
+        """
+        return self._mustache.search(value) is not None
+
+    def clone(self) -> FilterEval:
+        """Return a new evaluator with the same settings and a fresh kernel."""
+        return FilterEval(**self._settings)
+
+    def bind(self, **values) -> FilterEval:
+        """Expose variables to the mustaches.
+
+        >>> f = FilterEval().bind(a=2)
+        >>> f("{{ a * 21 }}")
+        '42'
+        """
+        self._kernel.glb.update(values)
+        return self
+
     def exec(self, code: str):
         """Execute code in the kernel."""
 
@@ -0,0 +1,214 @@
+"""Random value generators used by property-based test cases.
+
+Each generator draws values from a seeded `random.Random` instance and knows
+how to propose simpler candidates for a given value, which is used to shrink
+failing inputs down to a minimal counterexample.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+import random
+import string
+from typing import Any, Callable, TypeVar
+
+GeneratorType = TypeVar("GeneratorType", bound="ValueGenerator")
+
+
+class ValueGenerator(ABC):
+    """Base class for value generators."""
+
+    @abstractmethod
+    def draw(self, rng: random.Random) -> Any:
+        """Draw a random value."""
+        raise NotImplementedError
+
+    def shrink(self, value: Any) -> Iterator[Any]:
+        """Yield simpler candidates for `value`, simplest first."""
+        yield from ()
+
+    @classmethod
+    def name(cls):
+        """Return the registration name of the generator."""
+        return cls.__name__.split("Generate", maxsplit=1)[1].lower()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}"
+
+
+_GENERATOR_REGISTRY: dict[str, type[ValueGenerator]] = {}
+
+
+def register_generator(
+    name: str | None = None,
+) -> Callable[[type[GeneratorType]], type[GeneratorType]] | type[GeneratorType]:
+    """Register a generator so it can be referenced from configuration."""
+
+    def decorator(cls: type[GeneratorType]) -> type[GeneratorType]:
+        key = (name or cls.name()).lower()
+        existing = _GENERATOR_REGISTRY.get(key)
+        if existing is not None and existing is not cls:
+            raise ValueError(f"Generator '{key}' is already registered.")
+        _GENERATOR_REGISTRY[key] = cls
+        return cls
+
+    if isinstance(name, type):
+        cls = name
+        name = None
+        return decorator(cls)
+    return decorator
+
+
+def get_registered_generators() -> dict[str, type[ValueGenerator]]:
+    """Return a copy of the registered generators mapping."""
+    return dict(_GENERATOR_REGISTRY)
+
+
+@register_generator
+class GenerateInteger(ValueGenerator):
+    """Integers drawn uniformly between two bounds (inclusive).
+
+    >>> g = GenerateInteger(-10, 10)
+    >>> g.draw(random.Random(1))
+    -6
+    >>> list(g.shrink(7))
+    [0, 4, 6]
+    """
+
+    def __init__(self, min: int = 0, max: int = 100):  # noqa: A002
+        self.min = int(min)
+        self.max = int(max)
+        if self.min > self.max:
+            raise ValueError("integer generator requires min <= max")
+
+    def draw(self, rng: random.Random) -> int:
+        return rng.randint(self.min, self.max)
+
+    def _target(self) -> int:
+        return min(max(0, self.min), self.max)
+
+    def shrink(self, value: int) -> Iterator[int]:
+        target = self._target()
+        seen = set()
+        delta = value - target
+        while delta:
+            candidate = value - delta
+            if candidate not in seen:
+                seen.add(candidate)
+                yield candidate
+            delta = int(delta / 2)
+
+
+@register_generator
+class GenerateFloat(ValueGenerator):
+    """Floats drawn uniformly between two bounds.
+
+    >>> list(GenerateFloat(0, 10).shrink(7.25))
+    [0.0, 7.0]
+    """
+
+    def __init__(self, min: float = 0.0, max: float = 1.0):  # noqa: A002
+        self.min = float(min)
+        self.max = float(max)
+        if self.min > self.max:
+            raise ValueError("float generator requires min <= max")
+
+    def draw(self, rng: random.Random) -> float:
+        return rng.uniform(self.min, self.max)
+
+    def shrink(self, value: float) -> Iterator[float]:
+        target = min(max(0.0, self.min), self.max)
+        if value != target:
+            yield target
+        truncated = float(int(value))
+        if truncated not in (value, target) and self.min <= truncated <= self.max:
+            yield truncated
+
+
+@register_generator
+class GenerateChoice(ValueGenerator):
+    """Values picked among a fixed list, earlier items being simpler.
+
+    >>> list(GenerateChoice("a", "b", "c").shrink("c"))
+    ['a', 'b']
+    """
+
+    def __init__(self, *items: Any):
+        if not items:
+            raise ValueError("choice generator requires at least one item")
+        self.items = list(items)
+
+    def draw(self, rng: random.Random) -> Any:
+        return rng.choice(self.items)
+
+    def shrink(self, value: Any) -> Iterator[Any]:
+        if value not in self.items:
+            return
+        yield from self.items[: self.items.index(value)]
+
+
+@register_generator
+class GenerateText(ValueGenerator):
+    """Strings of bounded length built from an alphabet.
+
+    >>> list(GenerateText(alphabet="ab").shrink("bab"))
+    ['', 'ab', 'bb', 'ba', 'aab', 'baa']
+    """
+
+    def __init__(
+        self,
+        min_length: int = 0,
+        max_length: int = 16,
+        alphabet: str = string.ascii_letters + string.digits,
+    ):
+        self.min_length = int(min_length)
+        self.max_length = int(max_length)
+        self.alphabet = str(alphabet)
+        if not self.alphabet:
+            raise ValueError("text generator requires a non-empty alphabet")
+        if self.min_length > self.max_length:
+            raise ValueError("text generator requires min-length <= max-length")
+
+    def draw(self, rng: random.Random) -> str:
+        length = rng.randint(self.min_length, self.max_length)
+        return "".join(rng.choice(self.alphabet) for _ in range(length))
+
+    def shrink(self, value: str) -> Iterator[str]:
+        seen = {value}
+
+        def _fresh(candidate: str) -> bool:
+            if candidate in seen or len(candidate) < self.min_length:
+                return False
+            seen.add(candidate)
+            return True
+
+        for candidate in (value[: self.min_length], value[len(value) // 2 :]):
+            if _fresh(candidate):
+                yield candidate
+        for index in range(len(value)):
+            candidate = value[:index] + value[index + 1 :]
+            if _fresh(candidate):
+                yield candidate
+        simplest = self.alphabet[0]
+        for index, char in enumerate(value):
+            candidate = value[:index] + simplest + value[index + 1 :]
+            if char != simplest and _fresh(candidate):
+                yield candidate
+
+
+class GeneratorFactory:
+    """Factory for generators."""
+
+    @staticmethod
+    def _get_generator_class(name: str) -> type[ValueGenerator]:
+        key = name.lower()
+        try:
+            return _GENERATOR_REGISTRY[key]
+        except KeyError as exc:
+            raise ValueError(f"Unknown generator: {name}") from exc
+
+    def __new__(cls, name, *args, **kwargs) -> ValueGenerator:
+        generator_cls = cls._get_generator_class(name)
+        kwargs = {key.replace("-", "_"): value for key, value in kwargs.items()}
+        return generator_cls(*args, **kwargs)
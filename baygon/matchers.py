@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import hashlib
 import re
 from typing import Callable, TypeVar
 
@@ -62,8 +63,56 @@ class InvalidEquals(InvalidCondition):
         return f"Output {value} does not equal '{self.expected}' on {self.on}."
 
 
+class InvalidBytes(InvalidCondition):
+    """Raw output differing from the expected bytes."""
+
+    def __str__(self):
+        offset = next(
+            (i for i, (a, b) in enumerate(zip(self.value, self.expected)) if a != b),
+            min(len(self.value), len(self.expected)),
+        )
+        actual = self.value[offset : offset + 8].hex(" ") or "end of output"
+        expected = self.expected[offset : offset + 8].hex(" ") or "end of output"
+        return (
+            f"Output {self.on} differs from the expected bytes at byte {offset}: "
+            f"expected {expected}, got {actual}."
+        )
+
+
+class InvalidDigest(InvalidCondition):
+    """Raw output with an unexpected SHA-256 digest."""
+
+    def __str__(self):
+        return f"Output {self.on} has SHA-256 {self.value}, expected {self.expected}."
+
+
+class InvalidEncoding:
+    """Output that cannot be decoded for the text matchers."""
+
+    def __init__(self, error: UnicodeDecodeError, on=None, test=None, **kwargs):
+        self.error = error
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        error = self.error
+        return (
+            f"Output {self.on} is not valid {error.encoding} at byte "
+            f"{error.start}: {error.reason}."
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
+
 class MatchBase(ABC):
-    """Base class for all matchers."""
+    """Base class for all matchers.
+
+    Binary matchers receive the raw bytes of an output, neither decoded nor
+    filtered.
+    """
+
+    binary = False
 
     def __init__(self, inverse=False, **kwargs):
         """Initialize the matcher."""
@@ -153,6 +202,45 @@ class MatchEquals(MatchBase):
         return None
 
 
+@register_matcher("equals-bytes")
+class MatchEqualsBytes(MatchBase):
+    """Match if the raw output equals bytes given in hexadecimal."""
+
+    binary = True
+
+    def __init__(self, expected, **kwargs):
+        """Initialize the matcher."""
+        self.expected = bytes.fromhex(expected)
+        super().__init__(**kwargs)
+
+    def __call__(self, value, **kwargs):
+        if (bytes(value) != self.expected) ^ self.inverse:
+            return InvalidBytes(bytes(value), self.expected, **kwargs)
+        return None
+
+
+@register_matcher
+class MatchSha256(MatchBase):
+    """Match the SHA-256 digest of the raw output.
+
+    >>> MatchSha256(hashlib.sha256(b"abc").hexdigest())(b"abc") is None
+    True
+    """
+
+    binary = True
+
+    def __init__(self, digest, **kwargs):
+        """Initialize the matcher."""
+        self.digest = digest.lower()
+        super().__init__(**kwargs)
+
+    def __call__(self, value, **kwargs):
+        digest = hashlib.sha256(value).hexdigest()
+        if (digest != self.digest) ^ self.inverse:
+            return InvalidDigest(digest, self.digest, **kwargs)
+        return None
+
+
 class MatcherFactory:
     """Factory for matchers."""
 
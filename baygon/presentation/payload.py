@@ -0,0 +1,108 @@
+"""Serializable report payloads written with `--report` and merged across shards."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from baygon.runtime.fixtures import FixtureResult
+from baygon.runtime.recording import command_to_dict
+from baygon.runtime.runner import CaseResult, RunReport
+
+
+def case_payload(result: CaseResult) -> dict[str, Any]:
+    """Return the plain-data form of a single case result."""
+    payload = {
+        "id": result.case.id_str,
+        "name": result.case.name,
+        "status": result.status,
+        "points": result.case.points or 0,
+        "earned": result.points_earned or 0,
+        "duration": result.duration,
+        "issues": [str(issue) for issue in result.issues],
+    }
+    if result.case.generate is not None:
+        # The seed of a passing run is kept too, so that it can be replayed.
+        payload["seed"] = result.seed
+        payload["trials"] = result.trials
+        payload["counterexample"] = (
+            dict(result.counterexample) if result.counterexample is not None else None
+        )
+    if result.workdir is not None:
+        payload["workdir"] = result.workdir
+    if result.load is not None:
+        payload["load"] = result.load.summary()
+    return payload
+
+
+def fixture_payload(result: FixtureResult) -> dict[str, Any]:
+    """Return the plain-data form of setup or teardown commands."""
+    return {
+        "scope": result.scope,
+        "stage": result.stage,
+        "status": result.status,
+        "duration": result.duration,
+        "commands": [command_to_dict(command) for command in result.commands],
+    }
+
+
+def report_payload(report: RunReport, *, shard: str | None = None) -> dict:
+    """Return the plain-data form of a run report."""
+    payload = {
+        "failures": report.failures,
+        "successes": report.successes,
+        "skipped": report.skipped,
+        "total": report.total,
+        "time": report.duration,
+        "points": {
+            "total": report.points_total,
+            "earned": report.points_earned,
+        },
+        "cases": [case_payload(result) for result in report.cases],
+    }
+    if report.fixtures:
+        payload["fixtures"] = [fixture_payload(result) for result in report.fixtures]
+    if shard is not None:
+        payload["shard"] = shard
+    return payload
+
+
+def _id_key(identifier: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in identifier.split(".") if part.isdigit())
+
+
+def merge_payloads(payloads: Iterable[Mapping[str, Any]]) -> dict:
+    """Combine partial report payloads into a single report payload.
+
+    Totals and points are recomputed from the cases. When a case appears in
+    several payloads, the last one wins. The time is the longest partial
+    time, since shards run concurrently.
+    """
+    cases: dict[str, Mapping[str, Any]] = {}
+    time = 0.0
+    for payload in payloads:
+        time = max(time, float(payload.get("time") or 0))
+        for case in payload.get("cases", ()):
+            cases[str(case["id"])] = case
+
+    ordered = [cases[key] for key in sorted(cases, key=_id_key)]
+    statuses = [case.get("status") for case in ordered]
+    successes = statuses.count("passed")
+    failures = statuses.count("failed")
+    skipped = statuses.count("skipped")
+    return {
+        "failures": failures,
+        "successes": successes,
+        "skipped": skipped,
+        "total": successes + failures + skipped,
+        "time": time,
+        "points": {
+            "total": sum(case.get("points") or 0 for case in ordered),
+            "earned": sum(
+                case.get("earned") or 0
+                for case in ordered
+                if case.get("status") == "passed"
+            ),
+        },
+        "cases": [dict(case) for case in ordered],
+    }
@@ -87,6 +87,11 @@ def _build_pretty_failure_panel(result: CaseResult) -> Panel:
     summary.add_row("path", result.case.name)
     summary.add_row("status", Text("FAILED", style="bold red"))
     summary.add_row("points", f"0/{result.case.points or 0}")
+    if result.counterexample is not None:
+        values = ", ".join(
+            f"{name}={value!r}" for name, value in result.counterexample.items()
+        )
+        summary.add_row("counterexample", f"{values} (seed {result.seed})")
 
     issues_table = Table.grid(padding=(0, 1))
     issues_table.add_column(style="red bold", justify="right")
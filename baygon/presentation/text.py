@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Callable
 
-from baygon.runtime.runner import RunReport
+from baygon.runtime.runner import CaseResult, RunReport
 
 Writer = Callable[[str], None]
 
@@ -24,17 +24,57 @@ def render_case_results(
         header = f"Test {result.case.id_str}: {result.case.name}"
         status = result.status.lower()
         if status == "passed":
-            write(f"{header} PASSED")
+            write(f"{header} PASSED{' (cached)' if result.cached else ''}")
+            if result.load is not None:
+                write(_format_load(result))
         elif status == "failed":
             write(f"{header} FAILED")
+            if result.load is not None:
+                write(_format_load(result))
             if include_issues and result.issues:
                 for issue in result.issues:
                     write(str(issue))
+            if result.counterexample is not None:
+                write(_format_counterexample(result))
+            if result.workdir is not None:
+                write(f"Working directory kept in {result.workdir}")
         elif status == "skipped":
             write(f"{header} SKIPPED")
+            if include_issues:
+                for issue in result.issues:
+                    write(str(issue))
         else:
             write(f"{header} {result.status}")
 
+    for fixture in report.fixtures:
+        if fixture.status != "failed":
+            continue
+        write(f"{fixture.label} FAILED")
+        if include_issues and fixture.commands:
+            command = fixture.commands[-1]
+            write(f"{' '.join(command.argv)} exited with {command.exit_status}")
+            if command.stderr:
+                write(command.text("stderr").rstrip())
+
+
+def _format_counterexample(result: CaseResult) -> str:
+    values = ", ".join(
+        f"{name}={value!r}" for name, value in result.counterexample.items()
+    )
+    return f"Counterexample (seed {result.seed}): {values}"
+
+
+def _format_load(result: CaseResult) -> str:
+    stats = result.load
+    latency = ", ".join(
+        f"{name} {stats.percentile(fraction) or 0:.4f} s"
+        for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+    )
+    return (
+        f"Load: {stats.requests} requests, {stats.rps:.1f} requests/s, "
+        f"{latency}, {stats.errors} errors"
+    )
+
 
 def render_summary(report: RunReport, *, write: Writer) -> None:
     """Render the global summary for a run."""
@@ -54,4 +94,4 @@ def render_summary(report: RunReport, *, write: Writer) -> None:
         write("ok.")
 
     if report.skipped > 0:
-        write(f"{report.skipped} test(s) skipped, some executables may be missing.")
+        write(f"{report.skipped} test(s) skipped.")
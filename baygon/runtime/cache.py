@@ -0,0 +1,210 @@
+"""Persistent run state used to re-run failing cases first or only.
+
+The cache lives in a `.baygon_cache` directory next to the configuration file
+and records, for every case id, the status and duration of its last run. It
+also keeps a short duration history per suite fingerprint, used to schedule
+the longest cases first when running in parallel.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+import json
+import logging
+from pathlib import Path
+import statistics
+from typing import Any, Callable
+
+from baygon.core.models import CaseModel
+from baygon.runtime.runner import CaseResult, RunReport
+
+logger = logging.getLogger("baygon")
+
+CACHE_DIRNAME = ".baygon_cache"
+_STATE_FILENAME = "state.json"
+_HISTORY_LENGTH = 5
+_HISTORY_SUITES = 8
+
+
+@dataclass(frozen=True)
+class CaseState:
+    """Last known outcome of a case."""
+
+    status: str
+    duration: float | None = None
+
+
+class RunCache:
+    """Case states persisted between runs."""
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self._cases: dict[str, CaseState] = {}
+        self._history: dict[str, dict[str, list[float]]] = {}
+        self.load()
+
+    @classmethod
+    def for_base_dir(cls, base_dir: str | Path) -> RunCache:
+        """Return the cache stored next to a configuration file."""
+        return cls(Path(base_dir) / CACHE_DIRNAME)
+
+    @property
+    def path(self) -> Path:
+        return self.directory / _STATE_FILENAME
+
+    def load(self) -> None:
+        """Read the state file, starting afresh if it is missing or corrupt."""
+        self._cases = {}
+        self._history = {}
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            cases = data.get("cases", {})
+            self._cases = {
+                str(key): CaseState(
+                    status=str(value["status"]), duration=value.get("duration")
+                )
+                for key, value in cases.items()
+            }
+            self._history = {
+                str(suite): {
+                    str(key): [float(value) for value in values]
+                    for key, values in entries.items()
+                }
+                for suite, entries in data.get("history", {}).items()
+            }
+        except (ValueError, KeyError, TypeError, AttributeError):
+            logger.debug("Ignoring unreadable cache file %s", self.path)
+            self._cases = {}
+            self._history = {}
+
+    def save(self) -> bool:
+        """Write the state file, creating the cache directory if needed.
+
+        Returns:
+            False if the cache could not be written, which is only logged:
+            losing the cache must not lose the outcome of a run.
+        """
+        data = {
+            "cases": {
+                key: {"status": state.status, "duration": state.duration}
+                for key, state in sorted(self._cases.items())
+            },
+            "history": self._history,
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            gitignore = self.directory / ".gitignore"
+            if not gitignore.exists():
+                gitignore.write_text("# Created by baygon\n*\n", encoding="utf-8")
+            self.path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        except OSError as error:
+            logger.warning("Could not write the cache %s: %s", self.path, error)
+            return False
+        return True
+
+    def get(self, case_id: str) -> CaseState | None:
+        return self._cases.get(case_id)
+
+    @property
+    def states(self) -> Mapping[str, CaseState]:
+        return dict(self._cases)
+
+    @property
+    def failed(self) -> set[str]:
+        """Identifiers of the cases that failed on their last run."""
+        return {key for key, state in self._cases.items() if state.status == "failed"}
+
+    def update(self, report: RunReport, *, suite_key: str | None = None) -> None:
+        """Store the outcome of every case actually executed in `report`.
+
+        When `suite_key` is given, the durations are also appended to the
+        history of that suite.
+        """
+        history = None
+        if suite_key is not None:
+            history = self._history.pop(suite_key, {})
+            self._history[suite_key] = history
+            while len(self._history) > _HISTORY_SUITES:
+                del self._history[next(iter(self._history))]
+
+        for result in report.cases:
+            if result.cached:
+                continue
+            self._cases[result.case.id_str] = CaseState(
+                status=result.status, duration=result.duration
+            )
+            if history is not None and result.duration is not None:
+                samples = history.setdefault(result.case.id_str, [])
+                samples.append(result.duration)
+                del samples[:-_HISTORY_LENGTH]
+
+    def durations(self, suite_key: str) -> dict[str, float]:
+        """Return the median recorded duration of each case of a suite."""
+        return {
+            key: statistics.median(samples)
+            for key, samples in self._history.get(suite_key, {}).items()
+            if samples
+        }
+
+    def last_failed(self) -> Callable[[CaseModel], bool] | None:
+        """Return a selector for failed or unknown cases.
+
+        Returns None when nothing failed last time, meaning everything runs.
+        """
+        failed = self.failed
+        if not failed:
+            return None
+
+        def _select(case: CaseModel) -> bool:
+            state = self._cases.get(case.id_str)
+            return state is None or state.status != "passed"
+
+        return _select
+
+    def failed_first(self) -> Callable[[CaseModel], Any]:
+        """Return a sort key scheduling previously failed cases first."""
+        failed = self.failed
+        return lambda case: case.id_str not in failed
+
+    def merge(
+        self,
+        report: RunReport,
+        *,
+        within: Callable[[CaseModel], bool] | None = None,
+    ) -> RunReport:
+        """Complete `report` with cached results of cases that did not run.
+
+        Only cases that passed on their last run are merged, so the score
+        reflects the whole suite while failures always come from a real run.
+        With `within`, only the cases it selects are merged, such as those of
+        a shard.
+        """
+        ran = {result.case.id_str for result in report.cases}
+        results = {result.case.id_str: result for result in report.cases}
+        for case in report.suite.iter_cases():
+            if case.id_str in ran or (within is not None and not within(case)):
+                continue
+            state = self._cases.get(case.id_str)
+            if state is None or state.status != "passed":
+                continue
+            results[case.id_str] = CaseResult(
+                case=case,
+                status="passed",
+                issues=(),
+                commands=(),
+                duration=state.duration,
+                points_earned=case.points or 0,
+                cached=True,
+            )
+
+        ordered = [
+            results[case.id_str]
+            for case in report.suite.iter_cases()
+            if case.id_str in results
+        ]
+        return RunReport.from_results(
+            report.suite, ordered, report.duration, fixtures=report.fixtures
+        )
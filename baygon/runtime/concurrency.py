@@ -0,0 +1,141 @@
+"""Adapt the number of concurrently running cases to the machine load.
+
+The controller starts at the CPU count and is consulted by the runner before
+starting each case. It backs off when available memory runs low, when the
+load average exceeds the CPU count, or when cases run noticeably slower than
+their recorded durations, and grows again when the machine is idle.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger("baygon")
+
+
+class SystemProbe:
+    """Read the load average and available memory of the machine."""
+
+    def __init__(self, meminfo: str | Path = "/proc/meminfo") -> None:
+        self._meminfo = Path(meminfo)
+
+    def cpus(self) -> int:
+        return os.cpu_count() or 1
+
+    def load(self) -> float | None:
+        """Return the one-minute load average, if the platform reports it."""
+        try:
+            return os.getloadavg()[0]
+        except (AttributeError, OSError):  # pragma: no cover - non-Unix
+            return None
+
+    def memory(self) -> float | None:
+        """Return the available fraction of memory, None if unknown."""
+        try:
+            text = self._meminfo.read_text(encoding="ascii")
+        except OSError:
+            return None
+        values = {}
+        for line in text.splitlines():
+            name, _, rest = line.partition(":")
+            fields = rest.split()
+            if fields and fields[0].isdigit():
+                values[name] = int(fields[0])
+        total, available = values.get("MemTotal"), values.get("MemAvailable")
+        if not total or available is None:
+            return None
+        return available / total
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit adjusted from load, memory and case slowdowns.
+
+    Args:
+        expected: Recorded duration of each case id, used to detect cases
+            running slower than usual.
+        minimum: Lowest limit.
+        maximum: Highest limit, twice the CPU count by default.
+        interval: Minimum number of seconds between two adjustments.
+        memory_low: Available memory fraction under which the limit halves.
+        memory_ok: Available memory fraction required to raise the limit.
+    """
+
+    def __init__(
+        self,
+        *,
+        expected: Mapping[str, float] | None = None,
+        minimum: int = 1,
+        maximum: int | None = None,
+        interval: float = 0.5,
+        memory_low: float = 0.1,
+        memory_ok: float = 0.25,
+        probe: SystemProbe | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._probe = probe or SystemProbe()
+        self._cpus = self._probe.cpus()
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum or 2 * self._cpus, self.minimum)
+        self.initial = min(max(self._cpus, self.minimum), self.maximum)
+        self._limit = self.initial
+        self._expected = dict(expected or {})
+        self._interval = interval
+        self._memory_low = memory_low
+        self._memory_ok = memory_ok
+        self._clock = clock
+        self._checked = clock()
+        self._slowdown = 1.0
+        self._lock = threading.Lock()
+
+    def limit(self) -> int:
+        """Return the number of cases that may run at once right now."""
+        with self._lock:
+            now = self._clock()
+            if now - self._checked >= self._interval:
+                self._checked = now
+                self._adjust()
+            return self._limit
+
+    def observe(self, case_id: str, duration: float | None) -> None:
+        """Record the duration of a completed case."""
+        expected = self._expected.get(case_id)
+        if not expected or duration is None:
+            return
+        with self._lock:
+            self._slowdown = 0.7 * self._slowdown + 0.3 * (duration / expected)
+
+    def _adjust(self) -> None:
+        load = self._probe.load()
+        memory = self._probe.memory()
+        previous = self._limit
+        if memory is not None and memory < self._memory_low:
+            self._limit = max(self.minimum, self._limit // 2)
+            reason = "memory low"
+        elif (load is not None and load > 1.25 * self._cpus) or self._slowdown > 1.5:
+            self._limit = max(self.minimum, self._limit - 1)
+            reason = "overloaded"
+        elif (
+            (load is None or load < 0.75 * self._cpus)
+            and (memory is None or memory >= self._memory_ok)
+            and self._slowdown < 1.2
+        ):
+            self._limit = min(self.maximum, self._limit + 1)
+            reason = "idle"
+        else:
+            reason = "steady"
+        if self._limit != previous:
+            logger.debug(
+                "jobs auto: %d -> %d (%s; load %s, memory %s, slowdown %.2f)",
+                previous,
+                self._limit,
+                reason,
+                "n/a" if load is None else f"{load:.2f}",
+                "n/a" if memory is None else f"{memory:.0%}",
+                self._slowdown,
+            )
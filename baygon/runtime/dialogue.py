@@ -0,0 +1,223 @@
+"""Send/expect exchanges with one long-lived program."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+import contextlib
+import os
+import selectors
+import subprocess
+import time
+from typing import Callable
+
+DEFAULT_TIMEOUT = 5.0
+"""Seconds a dialogue step waits for matching output when none is given."""
+
+KILL_GRACE = 0.5
+"""Seconds given to collect the outputs of a killed program."""
+
+
+class Session:
+    """A running program driven through non-blocking pipes.
+
+    Everything the program writes is kept. `expect` looks at the standard
+    output written since the previous successful `expect`.
+
+        >>> with Session(["cat"]) as session:
+        ...     sent = session.send(b"ping\\n")
+        ...     session.expect(lambda data: data == b"ping\\n", timeout=5)
+        True
+    """
+
+    def __init__(
+        self,
+        argv: Sequence[str],
+        *,
+        env: dict[str, str] | None = None,
+        cwd: str | None = None,
+    ):
+        self.argv = list(argv)
+        self.stdout = bytearray()
+        self.stderr = bytearray()
+        self.sent = bytearray()
+        self.mark = 0
+        self._start = time.perf_counter()
+        self.process = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            cwd=cwd,
+        )
+        self._buffers = {
+            self.process.stdout.fileno(): self.stdout,
+            self.process.stderr.fileno(): self.stderr,
+        }
+        self._selector = selectors.DefaultSelector()
+        for fd in (*self._buffers, self.process.stdin.fileno()):
+            os.set_blocking(fd, False)
+        for fd in self._buffers:
+            self._selector.register(fd, selectors.EVENT_READ)
+
+    @property
+    def eof(self) -> bool:
+        """Return True once the program closed its standard output."""
+        return self.process.stdout.fileno() not in self._open
+
+    @property
+    def duration(self) -> float:
+        return round(time.perf_counter() - self._start, 6)
+
+    @property
+    def _open(self) -> set[int]:
+        """Return the outputs the program has not closed yet."""
+        return set(self._buffers) & set(self._selector.get_map())
+
+    def pending(self) -> bytes:
+        """Return the standard output not consumed by `expect` yet."""
+        return bytes(self.stdout[self.mark :])
+
+    def send(self, data: bytes, timeout: float = DEFAULT_TIMEOUT) -> bool:
+        """Write to the standard input, reading outputs meanwhile.
+
+        Returns:
+            False if the program stopped reading before everything was sent.
+        """
+        self.sent += data
+        if self.process.stdin.closed:
+            return False
+        view = memoryview(data)
+        deadline = time.monotonic() + timeout
+        fd = self.process.stdin.fileno()
+        self._selector.register(fd, selectors.EVENT_WRITE)
+        try:
+            while view:
+                try:
+                    view = view[os.write(fd, view) :]
+                except BlockingIOError:
+                    if not self._pump(deadline):
+                        return False
+                except BrokenPipeError:
+                    return False
+        finally:
+            self._selector.unregister(fd)
+        return True
+
+    def expect(self, accept: Callable[[bytes], bool], timeout: float) -> bool:
+        """Wait until `accept` holds on the pending output.
+
+        The pending output is consumed on success.
+
+        Returns:
+            False if the output did not match before the timeout or the end
+            of the output.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if accept(self.pending()):
+                self.mark = len(self.stdout)
+                return True
+            if self.eof or not self._pump(deadline):
+                return False
+
+    def close(self, timeout: float) -> int | None:
+        """Close the standard input and wait for the program to exit.
+
+        Returns:
+            The exit status, or None if the program had to be killed.
+        """
+        self._close_stdin()
+        deadline = time.monotonic() + timeout
+        while self._open and self._pump(deadline):
+            pass
+        try:
+            return self.process.wait(max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            self.kill()
+            return None
+
+    def kill(self) -> None:
+        """Stop the program and collect what it wrote until then."""
+        self._close_stdin()
+        self.process.kill()
+        self.process.wait()
+        deadline = time.monotonic() + KILL_GRACE
+        while self._open and self._pump(deadline):
+            pass
+
+    def _close_stdin(self) -> None:
+        with contextlib.suppress(BrokenPipeError):
+            self.process.stdin.close()
+
+    def _pump(self, deadline: float) -> bool:
+        """Read what is available on the outputs, waiting until `deadline`.
+
+        Returns:
+            False once the deadline is passed without anything to read.
+        """
+        remaining = deadline - time.monotonic()
+        if remaining < 0 or not self._selector.get_map():
+            return False
+        events = self._selector.select(remaining)
+        for key, mask in events:
+            if mask & selectors.EVENT_WRITE:
+                continue
+            data = os.read(key.fd, 1 << 16)
+            if data:
+                self._buffers[key.fd] += data
+            else:
+                self._selector.unregister(key.fd)
+        return bool(events)
+
+    def __enter__(self) -> Session:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.process.poll() is None:
+            self.kill()
+        self._selector.close()
+        for stream in (self.process.stdout, self.process.stderr):
+            stream.close()
+
+
+class DialogueTimeout:
+    """Issue reported when a dialogue step got no matching output."""
+
+    def __init__(
+        self, step: int, timeout: float, eof: bool, on=None, test=None, **kwargs
+    ):
+        self.step = step
+        self.timeout = timeout
+        self.eof = eof
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        if self.eof:
+            return f"Dialogue step {self.step}: the program closed its output first."
+        return (
+            f"Dialogue step {self.step}: no matching output within "
+            f"{self.timeout:g} s."
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
+
+class NoExit:
+    """Issue reported when a program does not exit at the end of a dialogue."""
+
+    def __init__(self, timeout: float, on=None, test=None, **kwargs):
+        self.timeout = timeout
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return (
+            f"The program did not exit within {self.timeout:g} s after the "
+            "dialogue and was killed."
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
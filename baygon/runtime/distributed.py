@@ -0,0 +1,418 @@
+"""Run suites on remote workers over TCP or Unix sockets.
+
+Messages are JSON objects, one per line. A coordinator connects to each
+worker and sends a `plan` holding the suite source, the base directory and
+optionally the executable under test. It then sends one `case` message at a
+time and waits for the matching `result`. When a worker disconnects, the case
+it was running is handed to another worker.
+"""
+
+from __future__ import annotations
+
+import base64
+from collections.abc import Mapping, Sequence
+import hashlib
+import json
+import logging
+from pathlib import Path
+import queue
+import shutil
+import socket
+import socketserver
+import tempfile
+import threading
+from typing import Any
+
+from baygon.addresses import is_local, parse_address
+from baygon.core.models import CaseModel, SuiteModel, TestNode
+from baygon.error import BaygonError, ConfigError, WorkerError
+from baygon.runtime.recording import command_from_dict, command_to_dict
+from baygon.runtime.runner import (
+    BaygonRunner,
+    CaseResult,
+    ExecutionContext,
+    RunReport,
+)
+
+logger = logging.getLogger("baygon")
+
+PROTOCOL_VERSION = 1
+
+
+class RemoteIssue:
+    """Issue reported by a worker, kept as its rendered message."""
+
+    def __init__(self, message: str, on=None, test=None, **kwargs):
+        self.message = message
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
+
+def _parse_address(address: str) -> tuple[int, Any]:
+    try:
+        return parse_address(address)
+    except ValueError as error:
+        raise WorkerError(str(error)) from None
+
+
+def result_to_dict(result: CaseResult) -> dict[str, Any]:
+    """Serialize a case result, rendering issues as messages."""
+    return {
+        "id": result.case.id_str,
+        "status": result.status,
+        "issues": [str(issue) for issue in result.issues],
+        "commands": [command_to_dict(command) for command in result.commands],
+        "duration": result.duration,
+        "points_earned": result.points_earned,
+        "seed": result.seed,
+        "counterexample": result.counterexample,
+        "trials": result.trials,
+    }
+
+
+def result_from_dict(case: CaseModel, data: Mapping[str, Any]) -> CaseResult:
+    """Rebuild the result of `case` sent by a worker."""
+    return CaseResult(
+        case=case,
+        status=data["status"],
+        issues=tuple(RemoteIssue(message, test=case) for message in data["issues"]),
+        commands=tuple(command_from_dict(command) for command in data["commands"]),
+        duration=data.get("duration"),
+        points_earned=data.get("points_earned"),
+        seed=data.get("seed"),
+        counterexample=data.get("counterexample"),
+        trials=data.get("trials"),
+    )
+
+
+class _Channel:
+    """Line-delimited JSON messages over a connected socket."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+
+    def send(self, message: Mapping[str, Any]) -> None:
+        data = json.dumps(message, separators=(",", ":")) + "\n"
+        self._sock.sendall(data.encode("utf-8"))
+
+    def receive(self) -> dict[str, Any]:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("connection closed")
+        return json.loads(line)
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+
+class RemoteWorker:
+    """Coordinator side of the connection to a worker."""
+
+    def __init__(self, address: str, *, timeout: float | None = None) -> None:
+        self.address = address
+        self._timeout = timeout
+        self._channel: _Channel | None = None
+
+    def connect(self, plan: Mapping[str, Any]) -> None:
+        """Open the connection and send the suite plan."""
+        family, target = _parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self._timeout)
+        try:
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+        self._channel = _Channel(sock)
+        self._channel.send(plan)
+        reply = self._channel.receive()
+        if reply.get("type") != "ready":
+            self.close()
+            raise WorkerError(
+                f"Worker {self.address} rejected the plan: {reply.get('message')}"
+            )
+
+    def run_case(self, case: CaseModel) -> CaseResult:
+        """Run `case` on the worker and return its result."""
+        if self._channel is None:
+            raise ConnectionError(f"worker {self.address} is not connected")
+        self._channel.send({"type": "case", "id": case.id_str})
+        reply = self._channel.receive()
+        if reply.get("type") != "result":
+            raise WorkerError(f"Worker {self.address}: {reply.get('message')}")
+        return result_from_dict(case, reply["result"])
+
+    def close(self) -> None:
+        if self._channel is not None:
+            self._channel.close()
+            self._channel = None
+
+
+_FIXTURES_ON_WORKERS = (
+    "Setup and teardown commands, services and libraries cannot run on workers."
+)
+
+
+def _has_fixtures(node: SuiteModel | TestNode) -> bool:
+    if isinstance(node, CaseModel):
+        return False
+    if node.setup or node.teardown:
+        return True
+    if getattr(node, "service", None) or getattr(node, "library", None):
+        return True
+    return any(_has_fixtures(child) for child in node.tests)
+
+
+class DistributedRunner(BaygonRunner):
+    """Runner dispatching cases to remote workers.
+
+    Cases evaluated with `eval` share a kernel that lives in this process, so
+    they are executed locally. Every other case runs on the first idle worker.
+    Setup and teardown commands, services and libraries are rejected, since
+    their fixtures would not exist on the workers. A case a worker cannot run
+    fails with the error of the worker, and the run goes on.
+    """
+
+    def __init__(
+        self,
+        suite: SuiteModel,
+        *,
+        workers: Sequence[str],
+        source: str,
+        base_dir: Path,
+        executable: str | Path | None = None,
+        timeout: float | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(suite, base_dir=base_dir, executable=executable, **kwargs)
+        self._addresses = list(workers)
+        self._source = source
+        self._shipped = self._resolve_path(executable)
+        self._timeout = timeout
+        self._idle: queue.Queue[RemoteWorker] = queue.Queue()
+        self._alive = 0
+        self._alive_lock = threading.Lock()
+
+    def run(self, limit: int = -1, *, jobs: int | None = None, **kwargs) -> RunReport:
+        """Connect to the workers and run the suite on them."""
+        if _has_fixtures(self.suite):
+            raise ConfigError(_FIXTURES_ON_WORKERS)
+        plan = self._plan()
+        for address in self._addresses:
+            worker = RemoteWorker(address, timeout=self._timeout)
+            try:
+                worker.connect(plan)
+            except (OSError, ConnectionError, WorkerError) as error:
+                logger.warning("Skipping worker %s: %s", address, error)
+                continue
+            self._alive += 1
+            self._idle.put(worker)
+        if not self._alive:
+            raise WorkerError("No worker available.")
+
+        try:
+            return super().run(limit, jobs=jobs or self._alive, **kwargs)
+        finally:
+            while not self._idle.empty():
+                self._idle.get_nowait().close()
+
+    def _plan(self) -> dict[str, Any]:
+        shipped = None
+        if self._shipped is not None:
+            content = Path(self._shipped).read_bytes()
+            shipped = {
+                "name": Path(self._shipped).name,
+                "sha256": hashlib.sha256(content).hexdigest(),
+                "content": base64.b64encode(content).decode("ascii"),
+            }
+        return {
+            "type": "plan",
+            "version": PROTOCOL_VERSION,
+            "source": self._source,
+            "base_dir": str(self._base_dir),
+            "executable": shipped,
+        }
+
+    def _run_case(self, case: CaseModel, context: ExecutionContext) -> CaseResult:
+        if context.serial:
+            return super()._run_case(case, context)
+
+        while True:
+            worker = self._acquire()
+            try:
+                result = worker.run_case(case)
+            except WorkerError as error:
+                # The worker is fine but could not run this case.
+                self._idle.put(worker)
+                return CaseResult(
+                    case=case,
+                    status="failed",
+                    issues=(RemoteIssue(str(error), test=case),),
+                    commands=(),
+                    points_earned=0,
+                )
+            except (OSError, ConnectionError, ValueError) as error:
+                logger.warning(
+                    "Lost worker %s (%s), reassigning case %s",
+                    worker.address,
+                    error,
+                    case.id_str,
+                )
+                worker.close()
+                with self._alive_lock:
+                    self._alive -= 1
+                continue
+            self._idle.put(worker)
+            return result
+
+    def _acquire(self) -> RemoteWorker:
+        while True:
+            with self._alive_lock:
+                if self._alive <= 0:
+                    raise WorkerError("All workers disconnected.")
+            try:
+                return self._idle.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+
+class _WorkerHandler(socketserver.BaseRequestHandler):
+    """Serve the plan and case messages of one coordinator connection."""
+
+    server: _TCPServer | _UnixServer
+
+    def handle(self) -> None:
+        channel = _Channel(self.request)
+        self._runner: BaygonRunner | None = None
+        try:
+            while True:
+                try:
+                    message = channel.receive()
+                except (ConnectionError, OSError, ValueError):
+                    return
+                try:
+                    reply = self._reply(message)
+                except (BaygonError, ValueError, KeyError) as error:
+                    reply = {"type": "error", "message": str(error)}
+                except Exception as error:
+                    # A case must not take the worker down with it.
+                    logger.exception("Case failed on the worker")
+                    reply = {
+                        "type": "error",
+                        "message": f"{type(error).__name__}: {error}",
+                    }
+                channel.send(reply)
+        finally:
+            if self._runner is not None:
+                self._runner.close()
+
+    def _reply(self, message: Mapping[str, Any]) -> dict[str, Any]:
+        if message.get("type") == "plan":
+            if self._runner is not None:
+                self._runner.close()
+            self._runner = self.server.worker.prepare(message)
+            return {"type": "ready"}
+        if message.get("type") != "case" or self._runner is None:
+            raise WorkerError(f"Unexpected message {message.get('type')!r}.")
+        case_id = message["id"]
+        try:
+            result = self._runner.run_case(case_id)
+        except KeyError:
+            raise WorkerError(f"Unknown case {case_id}.") from None
+        return {"type": "result", "result": result_to_dict(result)}
+
+
+class WorkerServer:
+    """Worker process executing cases on behalf of a coordinator.
+
+    Coordinators are not authenticated and make the worker run any command,
+    so the worker only listens on the loopback interface or a Unix socket
+    unless `allow_remote` is set.
+    """
+
+    def __init__(self, address: str, *, allow_remote: bool = False) -> None:
+        family, target = _parse_address(address)
+        if not allow_remote and not is_local(address):
+            raise WorkerError(
+                f"Refusing to listen on '{address}', reachable from other "
+                "machines, without allowing remote coordinators."
+            )
+        if family == socket.AF_UNIX:
+            if Path(target).is_socket():
+                Path(target).unlink()
+            server_class: type[_TCPServer | _UnixServer] = _UnixServer
+        else:
+            server_class = _TCPServer
+        self._server = server_class(target, _WorkerHandler)
+        self._server.worker = self
+        self._executables = Path(tempfile.mkdtemp(prefix="baygon-worker-"))
+
+    @property
+    def address(self) -> str:
+        """Return the address actually bound, useful with port 0."""
+        bound = self._server.server_address
+        if isinstance(bound, str):
+            return f"unix:{bound}"
+        return f"{bound[0]}:{bound[1]}"
+
+    def prepare(self, plan: Mapping[str, Any]) -> BaygonRunner:
+        """Build the runner described by a coordinator plan."""
+        from baygon.suite import SuiteLoader
+
+        if plan.get("version") != PROTOCOL_VERSION:
+            raise WorkerError(f"Unsupported protocol version {plan.get('version')}.")
+        context = SuiteLoader().from_mapping(plan["source"], cwd=plan["base_dir"])
+        if _has_fixtures(context.model):
+            raise WorkerError(_FIXTURES_ON_WORKERS)
+        executable = None
+        shipped = plan.get("executable")
+        if shipped:
+            executable = self._store(shipped)
+        return context.create_runner(executable=executable)
+
+    def _store(self, shipped: Mapping[str, Any]) -> str:
+        directory = self._executables / shipped["sha256"]
+        path = directory / shipped["name"]
+        if not path.exists():
+            directory.mkdir(parents=True, exist_ok=True)
+            content = base64.b64decode(shipped["content"])
+            if hashlib.sha256(content).hexdigest() != shipped["sha256"]:
+                raise WorkerError("Corrupted executable.")
+            path.write_bytes(content)
+            path.chmod(0o755)
+        return str(path)
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serving and remove the shipped executables."""
+        self._server.shutdown()
+        self.close()
+
+    def close(self) -> None:
+        self._server.server_close()
+        if isinstance(self._server.server_address, str):
+            Path(self._server.server_address).unlink(missing_ok=True)
+        shutil.rmtree(self._executables, ignore_errors=True)
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    worker: WorkerServer
+
+
+if hasattr(socket, "AF_UNIX"):
+
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+        worker: WorkerServer
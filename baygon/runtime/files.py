@@ -0,0 +1,156 @@
+"""Checks on the files written by the program under test."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import mmap
+from pathlib import Path
+
+CHUNK_SIZE = 1 << 20
+SNIPPET = 60
+
+
+def file_digest(path: str | Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """Return the SHA-256 of a file, read in chunks to bound memory use."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as stream:
+        while chunk := stream.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def same_content(actual: str | Path, expected: str | Path) -> bool:
+    """Return True if both files hold the same bytes.
+
+    Sizes are compared first, so files of different lengths are never read.
+    """
+    if Path(actual).stat().st_size != Path(expected).stat().st_size:
+        return False
+    return file_digest(actual) == file_digest(expected)
+
+
+@dataclass(frozen=True)
+class Difference:
+    """Location of the first difference between captured data and a file."""
+
+    offset: int
+    line: int
+    actual: bytes
+    expected: bytes
+
+
+def first_difference(
+    data: bytes, path: str | Path, chunk_size: int = CHUNK_SIZE
+) -> Difference | None:
+    """Compare `data` with the content of a file without reading it whole.
+
+    The file is memory-mapped and compared chunk by chunk, so only the pages
+    actually compared are loaded.
+
+    Returns:
+        None if both are identical, else where they first differ.
+    """
+    with Path(path).open("rb") as stream:
+        if not Path(path).stat().st_size:
+            return _difference(data, b"", 0) if data else None
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(data)
+            common = min(len(data), len(mapped))
+            for start in range(0, common, chunk_size):
+                end = min(start + chunk_size, common)
+                if view[start:end] != mapped[start:end]:
+                    offset = start + _mismatch(view[start:end], mapped[start:end])
+                    return _difference(data, mapped, offset)
+            if len(data) == len(mapped):
+                return None
+            return _difference(data, mapped, common)
+
+
+def _mismatch(actual: memoryview, expected: bytes) -> int:
+    """Return the index of the first differing byte of two distinct chunks."""
+    low, high = 0, min(len(actual), len(expected))
+    while high - low > 64:
+        middle = (low + high) // 2
+        if actual[low:middle] != expected[low:middle]:
+            high = middle
+        else:
+            low = middle
+    for index in range(low, high):
+        if actual[index] != expected[index]:
+            return index
+    return high
+
+
+def _difference(data: bytes, expected: bytes | mmap.mmap, offset: int) -> Difference:
+    return Difference(
+        offset=offset,
+        line=data.count(b"\n", 0, offset) + 1,
+        actual=_line_at(data, offset),
+        expected=_line_at(expected, offset),
+    )
+
+
+def _line_at(data: bytes | mmap.mmap, offset: int) -> bytes:
+    """Return the line holding `offset`, truncated around it."""
+    start = data.rfind(b"\n", 0, offset) + 1
+    end = data.find(b"\n", offset)
+    end = len(data) if end < 0 else end
+    start = max(start, offset - SNIPPET // 2)
+    return bytes(data[start : min(end, start + SNIPPET)])
+
+
+class MissingFile:
+    """Issue reported when an expected file was not written."""
+
+    def __init__(self, path: str, on=None, test=None, **kwargs):
+        self.path = path
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return f"Expected file {self.path} was not created."
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
+
+class InvalidGoldenFile:
+    """Issue reported when a stream differs from its expected file."""
+
+    def __init__(
+        self, difference: Difference, expected: str, on=None, test=None, **kwargs
+    ):
+        self.difference = difference
+        self.expected = expected
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        difference = self.difference
+        actual = difference.actual.decode("utf-8", errors="replace")
+        expected = difference.expected.decode("utf-8", errors="replace")
+        return (
+            f"Output {self.on} differs from {self.expected} at line "
+            f"{difference.line}, byte {difference.offset}: "
+            f"expected {expected!r}, got {actual!r}."
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
+
+class InvalidFileContent:
+    """Issue reported when a file differs from its expected file."""
+
+    def __init__(self, path: str, expected: str, on=None, test=None, **kwargs):
+        self.path = path
+        self.expected = expected
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return f"File {self.path} differs from {self.expected}."
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
@@ -0,0 +1,96 @@
+"""Setup and teardown commands run once around a group of cases."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+import os
+from pathlib import Path
+import subprocess
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from baygon.runtime.runner import CommandLog
+
+
+@dataclass(frozen=True)
+class FixtureResult:
+    """Outcome of the setup or teardown commands of a group or the suite."""
+
+    scope: str
+    stage: str
+    status: str
+    commands: tuple[CommandLog, ...]
+    duration: float | None = None
+
+    @property
+    def label(self) -> str:
+        """Return a readable description such as 'Setup of group 2'."""
+        target = "suite" if self.scope == "suite" else f"group {self.scope}"
+        return f"{self.stage.capitalize()} of {target}"
+
+
+class SetupFailed:
+    """Issue reported on a case skipped because a setup command failed."""
+
+    def __init__(self, scope: str, on=None, test=None, **kwargs):
+        self.scope = scope
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        target = "the suite" if self.scope == "suite" else f"group {self.scope}"
+        return f"Skipped: the setup of {target} failed."
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
+
+def run_commands(
+    commands: Sequence[Sequence[str]],
+    *,
+    hook: Callable[..., None],
+    env: dict[str, Any] | None = None,
+    cwd: str | Path | None = None,
+) -> bool:
+    """Run commands in order, stopping at the first one that fails.
+
+    Commands run in `cwd`, the directory of the configuration file for the
+    runner, so they see the same paths as executables and libraries.
+
+    Each command is reported to `hook` with the same keywords as
+    `Executable.run`. A command that cannot be started is reported with
+    exit status 127 and the error on stderr.
+
+    Returns:
+        True if every command exited with status 0.
+    """
+    for argv in commands:
+        start = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                list(argv),
+                capture_output=True,
+                stdin=subprocess.DEVNULL,
+                env={**os.environ, **(env or {})},
+                cwd=cwd,
+                check=False,
+            )
+        except OSError as error:
+            exit_status, stdout, stderr = 127, "", str(error)
+        else:
+            exit_status = completed.returncode
+            stdout = completed.stdout.decode("utf-8", errors="replace")
+            stderr = completed.stderr.decode("utf-8", errors="replace")
+        hook(
+            cmd=list(argv),
+            stdin=None,
+            stdout=stdout,
+            stderr=stderr,
+            exit_status=exit_status,
+            duration=round(time.perf_counter() - start, 6),
+        )
+        if exit_status != 0:
+            return False
+    return True
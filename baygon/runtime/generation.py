@@ -0,0 +1,156 @@
+"""Property-based execution of generated inputs with shrinking."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+import os
+import random
+from typing import TYPE_CHECKING, Any, Callable
+
+from baygon.core.models import GenerateModel
+from baygon.generators import GeneratorFactory, ValueGenerator
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from baygon.runtime.runner import CommandLog
+
+TrialOutcome = tuple[Sequence[Any], Sequence["CommandLog"]]
+Trial = Callable[[Mapping[str, Any]], TrialOutcome]
+
+
+@dataclass(frozen=True)
+class PropertyOutcome:
+    """Result of checking a property over generated inputs."""
+
+    seed: int
+    trials: int
+    issues: tuple[Any, ...] = ()
+    commands: tuple[CommandLog, ...] = ()
+    counterexample: Mapping[str, Any] | None = None
+    shrinks: int = 0
+
+    @property
+    def passed(self) -> bool:
+        return not self.issues
+
+
+def build_generators(spec: GenerateModel) -> dict[str, ValueGenerator]:
+    """Instantiate the generators declared in a `generate` block."""
+    generators: dict[str, ValueGenerator] = {}
+    for name, definition in spec.values.items():
+        ((kind, args),) = definition.items()
+        if isinstance(args, Mapping):
+            generators[name] = GeneratorFactory(kind, **dict(args))
+        else:
+            generators[name] = GeneratorFactory(kind, *args)
+    return generators
+
+
+def draw_inputs(
+    generators: Mapping[str, ValueGenerator], count: int, seed: int
+) -> list[dict[str, Any]]:
+    """Draw `count` input sets reproducibly from `seed`."""
+    rng = random.Random(seed)
+    return [
+        {name: generator.draw(rng) for name, generator in generators.items()}
+        for _ in range(count)
+    ]
+
+
+def check_property(
+    spec: GenerateModel,
+    trial: Trial,
+    *,
+    seed: int | None = None,
+    jobs: int | None = None,
+) -> PropertyOutcome:
+    """Run `trial` over generated inputs and shrink the first failure.
+
+    Inputs are executed in batches on a thread pool of `jobs` threads, or of
+    `spec.jobs` when not given. The first batch holding a failure stops the
+    run, and the lowest failing index is kept so a given seed always yields
+    the same counterexample.
+    """
+    if seed is None:
+        seed = spec.seed
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
+
+    generators = build_generators(spec)
+    inputs = draw_inputs(generators, spec.count, seed)
+    jobs = jobs or spec.jobs or os.cpu_count() or 1
+    batch_size = max(jobs * 4, 1)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        executed = 0
+        for start in range(0, len(inputs), batch_size):
+            batch = inputs[start : start + batch_size]
+            outcomes = list(pool.map(trial, batch))
+            for values, (issues, commands) in zip(batch, outcomes):
+                executed += 1
+                if issues:
+                    return _shrink(
+                        generators,
+                        values,
+                        (issues, commands),
+                        trial,
+                        pool,
+                        budget=spec.shrink,
+                        seed=seed,
+                        trials=executed,
+                    )
+    return PropertyOutcome(seed=seed, trials=executed)
+
+
+def _shrink(
+    generators: Mapping[str, ValueGenerator],
+    values: Mapping[str, Any],
+    failure: TrialOutcome,
+    trial: Trial,
+    pool: Executor,
+    *,
+    budget: int,
+    seed: int,
+    trials: int,
+) -> PropertyOutcome:
+    current = dict(values)
+    issues, commands = failure
+    shrinks = 0
+    improved = True
+    while improved and budget > 0:
+        improved = False
+        for name, generator in generators.items():
+            candidates = _take(generator.shrink(current[name]), budget)
+            if not candidates:
+                continue
+            budget -= len(candidates)
+            attempts = [{**current, name: candidate} for candidate in candidates]
+            trials += len(attempts)
+            for attempt, outcome in zip(attempts, pool.map(trial, attempts)):
+                if outcome[0]:
+                    current = attempt
+                    issues, commands = outcome
+                    shrinks += 1
+                    improved = True
+                    break
+            if budget <= 0:
+                break
+
+    return PropertyOutcome(
+        seed=seed,
+        trials=trials,
+        issues=tuple(issues),
+        commands=tuple(commands),
+        counterexample=current,
+        shrinks=shrinks,
+    )
+
+
+def _take(candidates: Iterable[Any], limit: int) -> list[Any]:
+    taken: list[Any] = []
+    for candidate in candidates:
+        if len(taken) >= limit:
+            break
+        taken.append(candidate)
+    return taken
@@ -0,0 +1,292 @@
+"""Calls of C functions from a shared library, in a helper process.
+
+The helper only depends on the standard library: it is started as a script
+in isolated mode, loads the library once and answers every call on a line
+of JSON, so a crashing function only takes the helper down.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+import ctypes
+from dataclasses import dataclass
+import json
+import math
+import os
+from pathlib import Path
+import selectors
+import signal
+import subprocess
+import sys
+import time
+from typing import Any
+
+TYPES = {
+    "void": None,
+    "bool": ctypes.c_bool,
+    "char": ctypes.c_char,
+    "int": ctypes.c_int,
+    "unsigned": ctypes.c_uint,
+    "unsigned int": ctypes.c_uint,
+    "long": ctypes.c_long,
+    "unsigned long": ctypes.c_ulong,
+    "long long": ctypes.c_longlong,
+    "size_t": ctypes.c_size_t,
+    "float": ctypes.c_float,
+    "double": ctypes.c_double,
+    "char*": ctypes.c_char_p,
+}
+"""ctypes counterpart of the C types accepted in signatures."""
+
+DEFAULT_TIMEOUT = 5.0
+"""Seconds a single call may take when none is given."""
+
+
+@dataclass(frozen=True)
+class Call:
+    """Call of a library function with arguments written as text."""
+
+    function: str
+    args: tuple[str, ...] = ()
+
+    def __str__(self):
+        return f"{self.function}({', '.join(self.args)})"
+
+
+@dataclass(frozen=True)
+class CallResult:
+    """Value returned by a call, or why it did not return."""
+
+    value: Any = None
+    error: str | None = None
+    duration: float | None = None
+
+
+class LibraryError(Exception):
+    """Raised when the helper cannot load the library."""
+
+
+def run_calls(
+    path: str,
+    functions: Mapping[str, str],
+    calls: Sequence[Call],
+    *,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> list[CallResult]:
+    """Run calls in a helper process, restarted after a call that crashed.
+
+    A call that crashes the helper or does not return within `timeout` is
+    reported with an error, and the next calls run in a new helper.
+
+    Raises:
+        LibraryError: if the library or one of its functions cannot be
+            loaded.
+    """
+    results: list[CallResult] = []
+    while len(results) < len(calls):
+        results.extend(_run_batch(path, functions, calls[len(results) :], timeout))
+    return results
+
+
+def _run_batch(
+    path: str, functions: Mapping[str, str], calls: Sequence[Call], timeout: float
+) -> list[CallResult]:
+    """Run calls in one helper until they are done or one of them fails."""
+    # Imported here since this module is also run as a standalone helper.
+    from baygon.signatures import parse_signature
+
+    signatures = {name: parse_signature(text) for name, text in functions.items()}
+    spec = {
+        "path": path,
+        "functions": {
+            name: [signature.returns, list(signature.args)]
+            for name, signature in signatures.items()
+        },
+        "calls": [[call.function, *call.args] for call in calls],
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-I", str(Path(__file__).resolve())],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    results: list[CallResult] = []
+    pending = bytearray()
+    with process, selectors.DefaultSelector() as selector:
+        process.stdin.write(json.dumps(spec).encode())
+        process.stdin.close()
+        selector.register(process.stdout, selectors.EVENT_READ)
+        start = time.perf_counter()
+        while len(results) < len(calls):
+            line = _next_line(process.stdout, selector, pending, timeout)
+            if line is None:
+                process.kill()
+                results.append(CallResult(error=f"did not return within {timeout:g} s"))
+                break
+            if not line:
+                results.append(CallResult(error=_crash(process)))
+                break
+            reply = json.loads(line)
+            if "loaded" in reply:
+                if reply["loaded"] is not True:
+                    process.wait()
+                    raise LibraryError(reply["loaded"])
+                start = time.perf_counter()
+                continue
+            end = time.perf_counter()
+            results.append(
+                CallResult(
+                    reply.get("value"), reply.get("error"), round(end - start, 6)
+                )
+            )
+            start = end
+        process.stdout.close()
+    return results
+
+
+def _next_line(
+    stream, selector: selectors.BaseSelector, pending: bytearray, timeout: float
+) -> bytes | None:
+    """Return the next line written by the helper.
+
+    Lines are split from `pending`, filled with unbuffered reads, so a line
+    already received is never left waiting behind `select`.
+
+    Returns:
+        The line, b"" if the helper exited, None after `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while b"\n" not in pending:
+        if not selector.select(max(deadline - time.monotonic(), 0)):
+            return None
+        chunk = os.read(stream.fileno(), 1 << 16)
+        if not chunk:
+            return b""
+        pending += chunk
+    end = pending.index(b"\n") + 1
+    line = bytes(pending[:end])
+    del pending[:end]
+    return line
+
+
+def _crash(process: subprocess.Popen) -> str:
+    status = process.wait()
+    if status < 0:
+        return f"crashed with {signal.Signals(-status).name}"
+    stderr = process.stderr.read().decode(errors="replace").strip()
+    return f"stopped the helper with status {status}" + (
+        f": {stderr.splitlines()[-1]}" if stderr else ""
+    )
+
+
+def same_value(value: Any, expected: Any, tolerance: float | None = None) -> bool:
+    """Compare a returned value, with a tolerance for floating-point numbers.
+
+    Numbers are close enough within a relative tolerance of 1e-6, or within
+    `tolerance` when given.
+
+        >>> same_value(0.1 + 0.2, 0.3), same_value(3, 3.5, tolerance=0.5)
+        (True, True)
+    """
+    numbers = (int, float)
+    if (
+        isinstance(value, numbers)
+        and isinstance(expected, numbers)
+        and not isinstance(value, bool)
+        and not isinstance(expected, bool)
+        and (isinstance(value, float) or isinstance(expected, float) or tolerance)
+    ):
+        return math.isclose(value, expected, rel_tol=1e-6, abs_tol=tolerance or 0)
+    return value == expected
+
+
+def _convert(kind: str, text: str) -> Any:
+    """Convert an argument written as text to a value of a C type."""
+    if kind == "bool":
+        return text.lower() in ("1", "true")
+    if kind in ("float", "double"):
+        return float(text)
+    if kind == "char":
+        value = text.encode()
+        if len(value) != 1:
+            raise ValueError(f"'{text}' is not a single character")
+        return value
+    if kind == "char*":
+        return text.encode()
+    return int(text, 0)
+
+
+def _plain(value: Any) -> Any:
+    """Convert a returned C value to JSON."""
+    if isinstance(value, bytes):
+        return value.decode(errors="surrogateescape")
+    return value
+
+
+def _serve() -> None:
+    """Answer the calls read on stdin, one JSON line each."""
+    spec = json.load(sys.stdin)
+    try:
+        library = ctypes.CDLL(spec["path"])
+        prototypes = {}
+        for name, (returns, kinds) in spec["functions"].items():
+            function = getattr(library, name)
+            function.restype = TYPES[returns]
+            function.argtypes = [TYPES[kind] for kind in kinds]
+            prototypes[name] = (function, kinds)
+    except (OSError, AttributeError) as error:
+        _reply({"loaded": str(error)})
+        return
+    _reply({"loaded": True})
+    for name, *args in spec["calls"]:
+        function, kinds = prototypes[name]
+        try:
+            values = [_convert(k, v) for k, v in zip(kinds, args)]
+            reply = {"value": _plain(function(*values))}
+        except (ValueError, ctypes.ArgumentError) as error:
+            reply = {"error": f"has an invalid argument: {error}"}
+        _reply(reply)
+
+
+def _reply(message: dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+class InvalidReturn:
+    """Issue reported when a function returns another value."""
+
+    def __init__(
+        self, call: Call, expected: Any, value: Any, on=None, test=None, **kwargs
+    ):
+        self.call = call
+        self.expected = expected
+        self.value = value
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return f"{self.call} returned {self.value!r} instead of {self.expected!r}."
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
+
+class CallFailed:
+    """Issue reported when a function call crashed or did not return."""
+
+    def __init__(self, call: Call, error: str, on=None, test=None, **kwargs):
+        self.call = call
+        self.error = error
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return f"{self.call} {self.error}."
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
+
+if __name__ == "__main__":
+    _serve()
@@ -0,0 +1,237 @@
+"""Load tests driving a service with concurrent connections."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+import contextlib
+from dataclasses import dataclass
+import math
+import socket
+import time
+from typing import Any, Callable
+
+from baygon.addresses import parse_address
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+"""Upper bounds in seconds of the latency histogram, the last one unbounded."""
+
+
+@dataclass(frozen=True)
+class LoadRequest:
+    """Request sent during a load test and the test of its response."""
+
+    data: bytes
+    accept: Callable[[bytes], bool]
+
+
+@dataclass(frozen=True)
+class LoadStats:
+    """Outcome of a load test.
+
+    Latencies are those of the successful requests, sorted.
+
+        >>> stats = LoadStats(4, 1, 2.0, (0.01, 0.02, 0.03))
+        >>> stats.rps, stats.error_rate, stats.percentile(0.5)
+        (1.5, 0.25, 0.02)
+    """
+
+    requests: int
+    errors: int
+    duration: float
+    latencies: tuple[float, ...] = ()
+
+    @property
+    def rps(self) -> float:
+        """Return the successful requests per second."""
+        return len(self.latencies) / self.duration if self.duration else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the nearest-rank percentile of the latencies."""
+        if not self.latencies:
+            return None
+        rank = max(math.ceil(fraction * len(self.latencies)), 1)
+        return self.latencies[rank - 1]
+
+    def histogram(self) -> list[tuple[float, int]]:
+        """Return the number of latencies up to each bound of `BUCKETS`."""
+        counts = [0] * (len(BUCKETS) + 1)
+        bucket = 0
+        for latency in self.latencies:
+            while bucket < len(BUCKETS) and latency > BUCKETS[bucket]:
+                bucket += 1
+            counts[bucket] += 1
+        return list(zip((*BUCKETS, math.inf), counts))
+
+    def summary(self) -> dict[str, Any]:
+        """Return the plain-data form written to reports."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "duration": round(self.duration, 6),
+            "rps": round(self.rps, 3),
+            "error_rate": round(self.error_rate, 6),
+            "latency": {
+                name: _rounded(self.percentile(fraction))
+                for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+            },
+            "histogram": [
+                {"le": "inf" if math.isinf(bound) else bound, "count": count}
+                for bound, count in self.histogram()
+            ],
+        }
+
+
+def run_load(
+    address: str,
+    requests: Sequence[LoadRequest],
+    *,
+    concurrency: int = 1,
+    count: int | None = None,
+    duration: float | None = None,
+    timeout: float = 5.0,
+) -> LoadStats:
+    """Send `requests` in turn from concurrent connections.
+
+    Each connection sends its next request once the previous response was
+    accepted. The load stops after `count` requests or `duration` seconds,
+    whichever comes first. A request fails if its response is not accepted
+    within `timeout` or the connection breaks; the connection is then
+    opened again.
+    """
+    return asyncio.run(_drive(address, requests, concurrency, count, duration, timeout))
+
+
+class _Budget:
+    """Hand out request numbers until the count or the duration is spent."""
+
+    def __init__(self, count: int | None, duration: float | None):
+        self.count = count
+        self.deadline = None if duration is None else time.monotonic() + duration
+        self.sent = 0
+
+    def claim(self) -> int | None:
+        if self.count is not None and self.sent >= self.count:
+            return None
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return None
+        self.sent += 1
+        return self.sent - 1
+
+
+async def _drive(
+    address: str,
+    requests: Sequence[LoadRequest],
+    concurrency: int,
+    count: int | None,
+    duration: float | None,
+    timeout: float,
+) -> LoadStats:
+    budget = _Budget(count, duration)
+    latencies: list[float] = []
+    errors: list[int] = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _client(address, requests, budget, timeout, latencies, errors)
+            for _ in range(concurrency)
+        )
+    )
+    return LoadStats(
+        requests=budget.sent,
+        errors=len(errors),
+        duration=time.perf_counter() - start,
+        latencies=tuple(sorted(latencies)),
+    )
+
+
+async def _client(
+    address: str,
+    requests: Sequence[LoadRequest],
+    budget: _Budget,
+    timeout: float,
+    latencies: list[float],
+    errors: list[int],
+) -> None:
+    writer = None
+    while (number := budget.claim()) is not None:
+        request = requests[number % len(requests)]
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(_open(address), timeout)
+            writer.write(request.data)
+            await writer.drain()
+            accepted = await asyncio.wait_for(
+                _read_until(reader, request.accept), timeout
+            )
+        except (OSError, asyncio.TimeoutError):
+            accepted = False
+        if accepted:
+            latencies.append(time.perf_counter() - start)
+            continue
+        errors.append(number)
+        await _close(writer)
+        writer = None
+    await _close(writer)
+
+
+async def _open(address: str):
+    family, target = parse_address(address)
+    if family == socket.AF_UNIX:
+        return await asyncio.open_unix_connection(target)
+    return await asyncio.open_connection(*target)
+
+
+async def _close(writer: asyncio.StreamWriter | None) -> None:
+    if writer is not None:
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+
+
+async def _read_until(
+    reader: asyncio.StreamReader, accept: Callable[[bytes], bool]
+) -> bool:
+    """Read a response until `accept` holds, False if the connection closes."""
+    response = bytearray()
+    while not accept(bytes(response)):
+        chunk = await reader.read(1 << 16)
+        if not chunk:
+            return False
+        response += chunk
+    return True
+
+
+def _rounded(value: float | None) -> float | None:
+    return None if value is None else round(value, 6)
+
+
+_THRESHOLDS = {
+    "min-rps": "Throughput of {value:.1f} requests/s is below {limit:g}.",
+    "max-p99": "99th percentile latency of {value:.4f} s is above {limit:g} s.",
+    "max-error-rate": "Error rate of {value:.2%} is above {limit:.2%}.",
+}
+
+
+class LoadThreshold:
+    """Issue reported when a load test misses one of its thresholds."""
+
+    def __init__(
+        self, name: str, limit: float, value: float, on=None, test=None, **kwargs
+    ):
+        self.name = name
+        self.limit = limit
+        self.value = value
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return _THRESHOLDS[self.name].format(value=self.value, limit=self.limit)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
@@ -0,0 +1,153 @@
+"""Commands connected through pipes, like a shell pipeline."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+import contextlib
+import os
+from pathlib import Path
+import subprocess
+import time
+from typing import Any, Callable
+
+from baygon.executable import Outputs, read_spill, spill_file
+
+START_FAILURE = 127
+"""Exit status reported for a stage that could not be started."""
+
+
+def run_pipeline(
+    commands: Sequence[Sequence[str]],
+    *,
+    stdin: str | bytes | os.PathLike | None = None,
+    env: dict[str, str] | None = None,
+    cwd: str | None = None,
+    hook: Callable[..., None] | None = None,
+    encoding: str = "utf-8",
+) -> list[Outputs]:
+    """Run commands with the standard output of each one feeding the next.
+
+    The stages are connected by kernel pipes, so the data flowing between
+    them never goes through Python. The standard error of every stage and
+    the standard output of the last one are written into anonymous files,
+    read once the stages have exited.
+
+    A stage that cannot be started is reported with exit status 127 and the
+    error on stderr, and the next stage reads an empty input.
+
+        >>> [out.exit_status for out in run_pipeline([["echo", "b\\na"], ["sort"]])]
+        [0, 0]
+        >>> run_pipeline([["echo", "b\\na"], ["sort"]])[-1].stdout
+        'a\\nb\\n'
+
+    Returns:
+        The outputs of each stage. Only the last one has a standard output.
+    """
+    commands = [[str(part) for part in argv] for argv in commands]
+    with contextlib.ExitStack() as stack:
+        source: Any = subprocess.PIPE
+        if isinstance(stdin, os.PathLike):
+            source = stack.enter_context(Path(stdin).open("rb"))
+            stdin = None
+        elif isinstance(stdin, str):
+            stdin = stdin.encode(encoding)
+
+        stdout = stack.enter_context(spill_file("stdout"))
+        stderrs = [stack.enter_context(spill_file("stderr")) for _ in commands]
+
+        start = time.perf_counter()
+        stages: list[subprocess.Popen | OSError] = []
+        try:
+            for index, argv in enumerate(commands):
+                last = index == len(commands) - 1
+                try:
+                    stage = subprocess.Popen(
+                        argv,
+                        stdin=source,
+                        stdout=stdout if last else subprocess.PIPE,
+                        stderr=stderrs[index],
+                        env=env,
+                        cwd=cwd,
+                    )
+                except OSError as error:
+                    stage = error
+                if index and source is not subprocess.DEVNULL:
+                    # Only the next stage may hold the read end, so that the
+                    # previous one gets SIGPIPE if it stops reading.
+                    source.close()
+                stages.append(stage)
+                source = (
+                    stage.stdout
+                    if isinstance(stage, subprocess.Popen)
+                    else subprocess.DEVNULL
+                )
+
+            _feed(stages[0], stdin)
+            durations = []
+            for stage in stages:
+                if isinstance(stage, subprocess.Popen):
+                    stage.wait()
+                durations.append(round(time.perf_counter() - start, 6))
+        except BaseException:
+            for stage in stages:
+                if isinstance(stage, subprocess.Popen) and stage.poll() is None:
+                    stage.kill()
+                    stage.wait()
+            raise
+
+        outputs = []
+        for index, (argv, stage) in enumerate(zip(commands, stages)):
+            last = index == len(commands) - 1
+            if isinstance(stage, OSError):
+                exit_status, stderr = START_FAILURE, str(stage).encode(encoding)
+            else:
+                exit_status, stderr = stage.returncode, read_spill(stderrs[index])
+            output = Outputs(
+                exit_status,
+                read_spill(stdout) if last else b"",
+                stderr,
+                encoding=encoding,
+            )
+            outputs.append(output)
+            if hook and callable(hook):
+                hook(
+                    cmd=argv,
+                    stdin=stdin if index == 0 else None,
+                    stdout=output.stdout_bytes,
+                    stderr=output.stderr_bytes,
+                    exit_status=exit_status,
+                    duration=durations[index],
+                )
+        return outputs
+
+
+def _feed(stage: subprocess.Popen | OSError, data: bytes | None) -> None:
+    """Write the input of the first stage, then close its standard input."""
+    if not isinstance(stage, subprocess.Popen) or stage.stdin is None:
+        return
+    with contextlib.suppress(BrokenPipeError):
+        stage.stdin.write(data or b"")
+    with contextlib.suppress(BrokenPipeError):
+        stage.stdin.close()
+
+
+class InvalidStageExit:
+    """Issue reported when a pipeline stage exits with another status."""
+
+    def __init__(
+        self, stage: int, expected: int, value: int, on=None, test=None, **kwargs
+    ):
+        self.stage = stage
+        self.expected = expected
+        self.value = value
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return (
+            f"Pipeline stage {self.stage} exited with status {self.value} "
+            f"instead of {self.expected}."
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
@@ -0,0 +1,341 @@
+"""Runs of Python scripts forked from warm interpreters.
+
+Starting an interpreter and importing modules costs tens of milliseconds,
+more than many tests take to run. A Python script is instead run by a child
+forked from a zygote: an interpreter started once per script with its
+shebang, which already imported the standard modules the script imports.
+The zygote receives the standard streams of each run over a Unix socket, so
+the script reads and writes them as if it had been started directly.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+import contextlib
+import json
+import os
+from pathlib import Path
+import re
+import signal
+import socket
+import subprocess
+import threading
+from typing import Any
+
+from baygon.executable import Executable, communicate, get_env
+
+START_TIMEOUT = 10.0
+"""Seconds a zygote has to import its modules and become ready."""
+
+STOP_GRACE = 2.0
+"""Seconds a zygote has to exit once its control socket is closed."""
+
+STARTUP_VARIABLES = ("PYTHON", "LC_", "LANG")
+"""Prefixes of the variables read when an interpreter starts.
+
+A run whose environment gives them other values than the zygote had is
+started directly, as the zygote can no longer behave like a new interpreter.
+"""
+
+_PYTHON = re.compile(r"^python(\d+(\.\d+)?)?$")
+_ZYGOTE = Path(__file__).resolve().with_name("zygote.py")
+
+
+def python_shebang(path: str | Path) -> list[str] | None:
+    """Return the interpreter command of a Python script.
+
+    The command is split like the kernel does: the interpreter, then the
+    rest of the line as a single argument.
+
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile("w", suffix=".py") as script:
+        ...     _ = script.write("#!/usr/bin/env python3\\nprint('hello')\\n")
+        ...     script.flush()
+        ...     python_shebang(script.name)
+        ['/usr/bin/env', 'python3']
+
+    Returns:
+        None for programs that are not Python scripts.
+    """
+    try:
+        with Path(path).open("rb") as stream:
+            line = stream.readline(256)
+    except OSError:
+        return None
+    if not line.startswith(b"#!"):
+        return None
+    command = line[2:].decode(errors="replace").strip().split(None, 1)
+    if not command:
+        return None
+    program = Path(command[0]).name
+    if program == "env" and len(command) == 2:
+        program = command[1]
+    return command if _PYTHON.match(program) else None
+
+
+class Zygote:
+    """Warm interpreter forking a child for each run of one script.
+
+    It is started on first use. A zygote that cannot start, for instance
+    because the interpreter is too old, is not retried and its runs are
+    started directly.
+    """
+
+    def __init__(self, interpreter: Sequence[str], script: str):
+        self.interpreter = list(interpreter)
+        self.script = script
+        self.process: subprocess.Popen | None = None
+        self.broken = False
+        self._control: socket.socket | None = None
+        self._environment = _startup_variables(os.environ)
+        self._lock = threading.Lock()
+
+    def accepts(self, env: Mapping[str, str] | None) -> bool:
+        """Tell whether a run with this environment can be forked."""
+        if env is not None and _startup_variables(env) != self._environment:
+            return False
+        with self._lock:
+            if self._control is None and not self.broken:
+                self.broken = not self._start()
+            return not self.broken
+
+    def spawn(
+        self,
+        argv: Sequence[str],
+        *,
+        stdin: Any = None,
+        stdout: Any = None,
+        stderr: Any = None,
+        env: Mapping[str, str] | None = None,
+        cwd: str | None = None,
+    ) -> ForkedProcess:
+        """Fork a child running `argv`, with streams given as to `Popen`.
+
+        Raises:
+            OSError: if the zygote is not running anymore.
+        """
+        return ForkedProcess(
+            self,
+            [str(arg) for arg in argv],
+            (stdin, stdout, stderr),
+            dict(get_env() if env is None else env),
+            cwd,
+        )
+
+    def send(self, request: dict[str, Any], fds: Sequence[int]) -> None:
+        """Send a request with the descriptors of a run."""
+        with self._lock:
+            if self._control is None:
+                raise OSError("The warm interpreter is not running")
+            socket.send_fds(self._control, [json.dumps(request).encode()], fds)
+
+    def close(self) -> None:
+        """Stop the zygote; running children are left to finish."""
+        with self._lock:
+            if self._control is not None:
+                self._control.close()
+                self._control = None
+            if self.process is not None:
+                try:
+                    self.process.wait(STOP_GRACE)
+                except subprocess.TimeoutExpired:
+                    self.process.kill()
+                    self.process.wait()
+                self.process = None
+
+    def _start(self) -> bool:
+        control, remote = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            self.process = subprocess.Popen(
+                [*self.interpreter, str(_ZYGOTE), str(remote.fileno()), self.script],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                pass_fds=(remote.fileno(),),
+            )
+        except OSError:
+            control.close()
+            return False
+        finally:
+            remote.close()
+        control.settimeout(START_TIMEOUT)
+        try:
+            ready = control.recv(64) == b'{"ready": true}'
+        except OSError:
+            ready = False
+        if not ready:
+            control.close()
+            self.process.kill()
+            self.process.wait()
+            return False
+        control.settimeout(None)
+        self._control = control
+        return True
+
+
+class ForkedProcess:
+    """Child forked by a zygote, used like a `subprocess.Popen`.
+
+    Streams given as `subprocess.PIPE` are available as `stdin`, `stdout`
+    and `stderr`. The exit status is reported by the zygote, which is the
+    parent of the child.
+    """
+
+    def __init__(
+        self,
+        zygote: Zygote,
+        argv: list[str],
+        streams: tuple[Any, Any, Any],
+        env: dict[str, str],
+        cwd: str | None,
+    ):
+        self.args = argv
+        self.returncode: int | None = None
+        self.stdin = self.stdout = self.stderr = None
+        self._buffer = b""
+        fds, owned, pipes = [], [], []
+        try:
+            for index, spec in enumerate(streams):
+                fd = _child_end(index, spec, owned, pipes)
+                fds.append(fd)
+            self._reply, remote = socket.socketpair()
+            owned.append(remote.detach())
+            zygote.send({"argv": argv, "env": env, "cwd": cwd}, [*fds, owned[-1]])
+            self._reply.settimeout(START_TIMEOUT)
+            self.pid = self._read()["pid"]
+        except (OSError, KeyError, ValueError):
+            for stream in pipes:
+                if stream is not None:
+                    stream.close()
+            if hasattr(self, "_reply"):
+                self._reply.close()
+            raise OSError("The warm interpreter did not fork the script") from None
+        finally:
+            for fd in owned:
+                os.close(fd)
+        for name, stream in zip(("stdin", "stdout", "stderr"), pipes):
+            setattr(self, name, stream)
+
+    def communicate(self, input: bytes | None = None) -> tuple[Any, Any]:  # noqa: A002
+        return communicate(self, input)
+
+    def poll(self) -> int | None:
+        if self.returncode is None:
+            with contextlib.suppress(BlockingIOError):
+                self._status(0.0)
+        return self.returncode
+
+    def wait(self, timeout: float | None = None) -> int:
+        if self.returncode is None:
+            try:
+                self._status(timeout)
+            except socket.timeout:
+                raise subprocess.TimeoutExpired(self.args, timeout) from None
+        return self.returncode
+
+    def send_signal(self, sig: int) -> None:
+        if self.poll() is None:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(self.pid, sig)
+
+    def terminate(self) -> None:
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self.send_signal(signal.SIGKILL)
+
+    def __enter__(self) -> ForkedProcess:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for stream in (self.stdin, self.stdout, self.stderr):
+            if stream is not None:
+                stream.close()
+        self.wait()
+
+    def _status(self, timeout: float | None) -> None:
+        self._reply.settimeout(timeout)
+        message = self._read()
+        self._reply.close()
+        self.returncode = message["status"]
+
+    def _read(self) -> dict[str, Any]:
+        """Read the next message of the zygote about this run."""
+        while b"\n" not in self._buffer:
+            chunk = self._reply.recv(4096)
+            if not chunk:
+                raise OSError("The warm interpreter stopped")
+            self._buffer += chunk
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        return json.loads(line)
+
+
+def _child_end(index: int, spec: Any, owned: list[int], pipes: list[Any]) -> int:
+    """Return the descriptor given to the child for a stream spec of `Popen`.
+
+    Descriptors to close once sent are added to `owned` and the parent ends
+    of pipes to `pipes`.
+    """
+    if spec == subprocess.PIPE:
+        read, write = os.pipe()
+        child, parent = (read, write) if index == 0 else (write, read)
+        owned.append(child)
+        pipes.append(os.fdopen(parent, "wb" if index == 0 else "rb", buffering=0))
+        return child
+    pipes.append(None)
+    if spec == subprocess.DEVNULL:
+        owned.append(os.open(os.devnull, os.O_RDWR))
+        return owned[-1]
+    if spec is None:
+        return index
+    return spec if isinstance(spec, int) else spec.fileno()
+
+
+def _startup_variables(env: Mapping[str, str]) -> dict[str, str]:
+    return {
+        key: value for key, value in env.items() if key.startswith(STARTUP_VARIABLES)
+    }
+
+
+class PreforkExecutable(Executable):
+    """Executable whose runs are forked by the zygote of its script."""
+
+    def __new__(cls, filename, *_args, **_kwargs):
+        return super().__new__(cls, filename)
+
+    def __init__(self, filename, zygote: Zygote, encoding="utf-8"):
+        super().__init__(filename, encoding)
+        self.zygote = zygote
+
+    def _popen(self, cmd, **kwargs):
+        if self.zygote.accepts(kwargs.get("env")):
+            with contextlib.suppress(OSError):
+                return self.zygote.spawn(cmd, **kwargs)
+        return super()._popen(cmd, **kwargs)
+
+
+class PreforkPool:
+    """Zygotes of the Python scripts run by a suite, one per script."""
+
+    def __init__(self):
+        self._zygotes: dict[str, Zygote] = {}
+        self._lock = threading.Lock()
+
+    def executable(self, path: str) -> Executable:
+        """Return the executable of `path`, forked when it is a Python script."""
+        interpreter = python_shebang(path)
+        if interpreter is None:
+            return Executable(path)
+        script = str(Path(path).resolve())
+        with self._lock:
+            zygote = self._zygotes.get(script)
+            if zygote is None:
+                zygote = self._zygotes[script] = Zygote(interpreter, script)
+        return PreforkExecutable(path, zygote)
+
+    def close(self) -> None:
+        """Stop every zygote."""
+        with self._lock:
+            zygotes = list(self._zygotes.values())
+        for zygote in zygotes:
+            zygote.close()
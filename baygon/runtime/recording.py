@@ -0,0 +1,339 @@
+"""Record executed commands and re-grade suites from recordings.
+
+Recordings store every `CommandLog` of a case in a compact gzip-compressed
+JSON file named after the case id. Each recording carries a hash of the case
+inputs so a later re-grade can tell which cases must be executed again.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, replace
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Any
+
+from baygon.core.models import CaseModel, SuiteModel, TestNode
+from baygon.executable import Outputs
+from baygon.runtime.runner import BaygonRunner, CaseResult, CommandLog, RunReport
+
+RECORDING_FORMAT = 1
+_SUFFIX = ".json.gz"
+
+
+@dataclass(frozen=True)
+class Recording:
+    """Commands recorded for a single case."""
+
+    case_id: str
+    input_hash: str
+    commands: tuple[CommandLog, ...]
+    status: str | None = None
+
+
+class StaleRecording:
+    """Issue reported when a case must be executed again."""
+
+    def __init__(self, reason: str, on=None, test=None, **kwargs):
+        self.reason = reason
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return f"Recording unusable: {self.reason}; re-run required."
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
+
+def input_hash(
+    case: CaseModel,
+    base_dir: str | Path = ".",
+    workdir: str | Path | None = None,
+    *,
+    digests: dict[Path, str] | None = None,
+) -> str:
+    """Return a stable hash of everything fed to the program by a case.
+
+    A file given as standard input, relative to `base_dir`, and the working
+    directory template `workdir` are hashed by content, so that editing them
+    invalidates the recording. `digests` keeps the digests of templates
+    shared by several cases.
+    """
+    payload = {
+        "executable": case.executable,
+        "args": list(case.args),
+        "env": dict(case.env),
+        "stdin": case.stdin,
+        "repeat": case.repeat,
+    }
+    if case.stdin_file is not None:
+        content = _file_digest(Path(base_dir) / case.stdin_file)
+        payload["stdin_file"] = [case.stdin_file, content]
+    if workdir is not None:
+        template = Path(base_dir) / workdir
+        if digests is None:
+            digests = {}
+        if template not in digests:
+            digests[template] = _tree_digest(template)
+        payload["workdir"] = digests[template]
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _tree_digest(root: Path) -> str:
+    """Return the SHA-256 of the names, links and file contents of a tree."""
+    digest = hashlib.sha256()
+    for current, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(dirs + files):
+            path = Path(current) / name
+            relative = path.relative_to(root).as_posix()
+            if path.is_symlink():
+                entry = f"link:{path.readlink()}"
+            elif path.is_dir():
+                entry = "dir"
+            else:
+                entry = f"file:{_file_digest(path)}"
+            digest.update(f"{relative}\0{entry}\n".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
+
+def _file_digest(path: Path) -> str | None:
+    """Return the SHA-256 of a file read by chunks, or None when unreadable."""
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as stream:
+            for chunk in iter(lambda: stream.read(1 << 16), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def command_to_dict(command: CommandLog) -> dict[str, Any]:
+    """Serialize a command log into plain data.
+
+    Undecodable bytes of the outputs survive as lone surrogates, which JSON
+    escapes, so that replayed outputs hold the original bytes.
+    """
+    return {
+        "argv": list(command.argv),
+        "stdin": command.stdin,
+        "stdout": command.text("stdout", "surrogateescape"),
+        "stderr": command.text("stderr", "surrogateescape"),
+        "exit_status": command.exit_status,
+        "duration": command.duration,
+    }
+
+
+def command_from_dict(data: Mapping[str, Any]) -> CommandLog:
+    """Rebuild a command log from plain data."""
+    return CommandLog(
+        argv=tuple(data.get("argv", ())),
+        stdin=data.get("stdin"),
+        stdout=data.get("stdout", ""),
+        stderr=data.get("stderr", ""),
+        exit_status=int(data.get("exit_status", 0)),
+        duration=data.get("duration"),
+    )
+
+
+def save_recordings(
+    report: RunReport, directory: str | Path, *, base_dir: str | Path = "."
+) -> list[Path]:
+    """Persist the commands of every executed case of `report`.
+
+    `base_dir` is the directory of the suite, from which input files are read.
+    """
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+    templates = dict(_templates(report.suite))
+    digests: dict[Path, str] = {}
+    written: list[Path] = []
+    for result in report.cases:
+        if not result.commands:
+            continue
+        path = target / f"{result.case.id_str}{_SUFFIX}"
+        payload = {
+            "format": RECORDING_FORMAT,
+            "id": result.case.id_str,
+            "name": result.case.name,
+            "input": input_hash(
+                result.case,
+                base_dir,
+                templates.get(result.case.id_str),
+                digests=digests,
+            ),
+            "status": result.status,
+            "commands": [command_to_dict(command) for command in result.commands],
+        }
+        data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        path.write_bytes(gzip.compress(data, mtime=0))
+        written.append(path)
+    return written
+
+
+def _templates(
+    node: SuiteModel | TestNode, workdir: str | None = None
+) -> Iterator[tuple[str, str | None]]:
+    """Yield the id of every case with the template of its working directory."""
+    if node.workdir is not None:
+        workdir = node.workdir
+    if isinstance(node, CaseModel):
+        yield node.id_str, workdir
+        return
+    for child in node.tests:
+        yield from _templates(child, workdir)
+
+
+def load_recordings(directory: str | Path) -> dict[str, Recording]:
+    """Load every recording found in `directory`, keyed by case id."""
+    recordings: dict[str, Recording] = {}
+    for path in sorted(Path(directory).glob(f"*{_SUFFIX}")):
+        payload = json.loads(gzip.decompress(path.read_bytes()).decode("utf-8"))
+        if payload.get("format") != RECORDING_FORMAT:
+            continue
+        recordings[payload["id"]] = Recording(
+            case_id=payload["id"],
+            input_hash=payload["input"],
+            commands=tuple(command_from_dict(c) for c in payload["commands"]),
+            status=payload.get("status"),
+        )
+    return recordings
+
+
+def _raw(value: str | bytes) -> bytes:
+    """Return recorded output as bytes, undecodable bytes included."""
+    if isinstance(value, str):
+        return value.encode("utf-8", "surrogateescape")
+    return value
+
+
+class ReplayExecutable:
+    """Executable stand-in returning recorded outputs in order."""
+
+    def __init__(self, path: str, commands: Sequence[CommandLog]):
+        self.filename = path
+        self._commands: Iterator[CommandLog] = iter(commands)
+
+    def run(
+        self,
+        *args,
+        stdin=None,
+        env=None,
+        hook=None,
+        cwd=None,
+        capture=None,
+        monitor=None,
+    ):
+        """Return the next recorded output without spawning any process.
+
+        Outputs are handed back as the bytes the program wrote, so they are
+        decoded with the same policy as during a live run.
+        """
+        command = next(self._commands)
+        stdout, stderr = _raw(command.stdout), _raw(command.stderr)
+        if monitor is not None:
+            monitor(stdout)
+        if hook and callable(hook):
+            hook(
+                cmd=command.argv,
+                stdin=command.stdin,
+                stdout=stdout,
+                stderr=stderr,
+                exit_status=command.exit_status,
+                duration=command.duration,
+            )
+        return Outputs(command.exit_status, stdout, stderr)
+
+    def __call__(self, *args, **kwargs):
+        return self.run(*args, **kwargs)
+
+
+class ReplayRunner(BaygonRunner):
+    """Runner grading recorded executions instead of spawning processes.
+
+    Filters, matchers and points come from the current suite. Cases without a
+    recording, or whose inputs changed since they were recorded, are reported
+    as skipped with a `StaleRecording` issue.
+    """
+
+    def __init__(self, suite, *, recordings: Mapping[str, Recording], **kwargs):
+        self._recordings = recordings
+        self._replaying = threading.local()
+        self._digests: dict[Path, str] = {}
+        if suite.executable is None:
+            kwargs.setdefault("executable", "recorded")
+        super().__init__(suite, **kwargs)
+        # Nothing is executed, so no interpreter is kept warm.
+        self._prefork = None
+
+    def _run_case(self, case, context) -> CaseResult:
+        recording = self._recordings.get(case.id_str)
+        reason = None
+        if case.generate is not None:
+            reason = "generated inputs are not recorded"
+        elif case.files:
+            reason = "written files are not recorded"
+        elif case.dialogue:
+            reason = "dialogues are not replayed"
+        elif case.pipeline:
+            reason = "pipelines are not replayed"
+        elif case.request is not None or case.load is not None:
+            reason = "service requests are not replayed"
+        elif case.call is not None:
+            reason = "library calls are not replayed"
+        elif recording is None:
+            reason = "no recording for this case"
+        elif recording.input_hash != input_hash(
+            case, self._base_dir, context.workdir, digests=self._digests
+        ):
+            reason = "case inputs changed since recording"
+        elif len(recording.commands) < case.repeat:
+            reason = "recording is incomplete"
+
+        if reason is not None:
+            return CaseResult(
+                case=case,
+                status="skipped",
+                issues=(StaleRecording(reason, test=case),),
+                commands=(),
+                duration=0.0,
+                points_earned=0,
+            )
+
+        self._replaying.recording = recording
+        try:
+            # Recorded programs do not run, so need no working directory.
+            return super()._run_case(case, replace(context, workdir=None))
+        finally:
+            self._replaying.recording = None
+
+    def _get_executable(self, path: str) -> ReplayExecutable:
+        return ReplayExecutable(path, self._replaying.recording.commands)
+
+    def _run_fixture(self, scope, stage, commands) -> None:
+        """Setup and teardown commands are not replayed."""
+        return None
+
+    def _call_library(self, scope, group, planned) -> None:
+        """Library calls are not made: they are not replayed."""
+        return None
+
+    def _start_service(self, scope, spec, path) -> None:
+        """Services are not started: their requests are not replayed."""
+        return None
+
+
+def stale_cases(report: RunReport) -> list[CaseResult]:
+    """Return the cases a re-grade could not evaluate from recordings."""
+    return [
+        result
+        for result in report.cases
+        if any(isinstance(issue, StaleRecording) for issue in result.issues)
+    ]
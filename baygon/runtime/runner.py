@@ -2,29 +2,98 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
-from collections.abc import Iterable, Iterator, Mapping, MutableMapping, Sequence
-from dataclasses import dataclass, field
+from collections import Counter, defaultdict
+from collections.abc import (
+    Container,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Sequence,
+)
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from functools import partial
 from pathlib import Path
+import threading
 import time
 from typing import Any, Callable, Union
 
-from baygon.core.models import CaseModel, ConditionModel, GroupModel, SuiteModel
-from baygon.error import InvalidExecutableError
+from baygon.core.models import (
+    CaseModel,
+    ConditionModel,
+    GroupModel,
+    NegatedConditionModel,
+    ServiceModel,
+    SuiteModel,
+)
+from baygon.error import ConfigError, InvalidExecutableError
 from baygon.executable import Executable, Outputs, get_env
 from baygon.filters import FilterEval, FilterNone, Filters
-from baygon.matchers import InvalidExitStatus, MatcherFactory
+from baygon.matchers import (
+    InvalidEncoding,
+    InvalidEquals,
+    InvalidExitStatus,
+    MatchBase,
+    MatcherFactory,
+)
+from baygon.runtime.concurrency import AdaptiveConcurrency
+from baygon.runtime.dialogue import DEFAULT_TIMEOUT, DialogueTimeout, NoExit, Session
+from baygon.runtime.files import (
+    InvalidFileContent,
+    InvalidGoldenFile,
+    MissingFile,
+    first_difference,
+    same_content,
+)
+from baygon.runtime.fixtures import FixtureResult, SetupFailed, run_commands
+from baygon.runtime.generation import PropertyOutcome, check_property
+from baygon.runtime.library import DEFAULT_TIMEOUT as LIBRARY_TIMEOUT
+from baygon.runtime.library import (
+    Call,
+    CallFailed,
+    CallResult,
+    InvalidReturn,
+    LibraryError,
+    run_calls,
+    same_value,
+)
+from baygon.runtime.load import LoadRequest, LoadStats, LoadThreshold, run_load
+from baygon.runtime.pipeline import InvalidStageExit, run_pipeline
+from baygon.runtime.prefork import PreforkPool
+from baygon.runtime.scheduling import dependency_graph
+from baygon.runtime.service import (
+    START_TIMEOUT,
+    NoResponse,
+    Service,
+    ServiceUnavailable,
+)
+from baygon.runtime.streaming import EarlyExit, OutputMonitor, StreamCheck
+from baygon.runtime.workdir import create_workdir, remove_workdir
+from baygon.signatures import parse_signature
 
 
 @dataclass(frozen=True)
 class CommandLog:
-    """Captured information about a single executed command."""
+    """Captured information about a single executed command.
+
+    Outputs are kept as the executable reported them, in bytes for real
+    programs, and only decoded when displayed or serialized.
+    """
 
     argv: tuple[str, ...]
     stdin: str | None
-    stdout: str
-    stderr: str
+    stdout: str | bytes
+    stderr: str | bytes
     exit_status: int
+    duration: float | None = None
+
+    def text(self, stream: str, errors: str = "replace") -> str:
+        """Return "stdout" or "stderr" as text."""
+        value = getattr(self, stream)
+        if isinstance(value, str):
+            return value
+        return value.decode("utf-8", errors=errors)
 
 
 @dataclass(frozen=True)
@@ -37,6 +106,12 @@ class CaseResult:
     commands: tuple[CommandLog, ...]
     duration: float | None = None
     points_earned: float | int | None = None
+    seed: int | None = None
+    counterexample: Mapping[str, Any] | None = None
+    trials: int | None = None
+    cached: bool = False
+    workdir: str | None = None
+    load: LoadStats | None = None
 
 
 @dataclass(frozen=True)
@@ -51,21 +126,169 @@ class RunReport:
     points_earned: float | int
     duration: float
     cases: tuple[CaseResult, ...]
+    fixtures: tuple[FixtureResult, ...] = ()
 
     @property
     def total(self) -> int:
         return self.successes + self.failures + self.skipped
 
+    @classmethod
+    def from_results(
+        cls,
+        suite: SuiteModel,
+        results: Iterable[CaseResult],
+        duration: float,
+        fixtures: Iterable[FixtureResult] = (),
+    ) -> RunReport:
+        """Aggregate counters and points from individual case results."""
+        cases = tuple(results)
+        counters: defaultdict[str, int] = defaultdict(int)
+        points_total: float | int = 0
+        points_earned: float | int = 0
+        for result in cases:
+            counters[result.status] += 1
+            points_total += result.case.points or 0
+            if result.status == "passed":
+                points_earned += result.points_earned or 0
+        return cls(
+            suite=suite,
+            successes=counters["passed"],
+            failures=counters["failed"],
+            skipped=counters["skipped"],
+            points_total=points_total,
+            points_earned=points_earned,
+            duration=duration,
+            cases=cases,
+            fixtures=tuple(fixtures),
+        )
+
+
+class UnmetDependency:
+    """Issue reported on a case skipped because a prerequisite did not pass."""
+
+    def __init__(self, requires: Sequence[str], on=None, test=None, **kwargs):
+        self.requires = tuple(requires)
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        tests = ", ".join(self.requires)
+        return f"Skipped: requires test {tests}, which did not pass."
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
+
+class GroupFailed:
+    """Issue reported on a case skipped after a failure in a fail-fast group."""
+
+    def __init__(self, group: str, on=None, test=None, **kwargs):
+        self.group = group
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return f"Skipped: a previous test of fail-fast group {self.group} failed."
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
+
+class BudgetExhausted:
+    """Issue reported on a case skipped once the suite time budget is spent."""
+
+    def __init__(self, budget: float, on=None, test=None, **kwargs):
+        self.budget = budget
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return f"Skipped: the time budget of {self.budget:g} s is spent."
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
 
 FilterType = Filters
 EvalType = Union[FilterNone, FilterEval]
 
 
 @dataclass
-class _ExecutionContext:
+class ExecutionContext:
+    """Settings a case inherits from the suite and its enclosing groups."""
+
     filters: FilterType
     eval_filter: EvalType
     executable: str | None
+    fail_fast: tuple[str, ...] = ()
+    fixtures: tuple[GroupModel, ...] = ()
+    workdir: str | None = None
+    early_exit: bool = False
+    services: tuple[tuple[GroupModel, str | None], ...] = ()
+    library: GroupModel | None = None
+
+    @property
+    def serial(self) -> bool:
+        """Tell whether the case shares evaluation state, so runs alone."""
+        return isinstance(self.eval_filter, FilterEval)
+
+
+_PlanItem = tuple[int, CaseModel, ExecutionContext]
+
+
+@dataclass
+class _RunState:
+    """Outcomes deciding which of the remaining cases must be skipped."""
+
+    requires: Mapping[str, Sequence[str]]
+    planned: set[str] = field(default_factory=set)
+    deadline: float | None = None
+    outcomes: dict[str, str] = field(default_factory=dict)
+    failed_groups: set[str] = field(default_factory=set)
+    remaining: Counter[str] = field(default_factory=Counter)
+    setups: dict[str, bool] = field(default_factory=dict)
+    teardowns: dict[str, tuple[tuple[str, ...], ...]] = field(default_factory=dict)
+    fixtures: list[FixtureResult] = field(default_factory=list)
+
+    def is_ready(self, item: _PlanItem) -> bool:
+        """Return True once every prerequisite of the case is done."""
+        needed = self.requires.get(item[1].id_str, ())
+        return all(case_id in self.outcomes for case_id in needed)
+
+    def record(self, item: _PlanItem, result: CaseResult) -> list[str]:
+        """Store a result and return the groups whose teardown is now due."""
+        self.outcomes[item[1].id_str] = result.status
+        if result.status == "failed":
+            self.failed_groups.update(item[2].fail_fast)
+        done = []
+        for group in reversed(item[2].fixtures):
+            self.remaining[group.id_str] -= 1
+            if not self.remaining[group.id_str] and group.id_str in self.teardowns:
+                done.append(group.id_str)
+        return done
+
+
+def _next_ready(
+    pending: Sequence[_PlanItem],
+    serial_busy: bool,
+    ready: Callable[[_PlanItem], bool],
+) -> _PlanItem | None:
+    """Return the first pending case that can start now.
+
+    Serial cases start one at a time, in declaration order among those whose
+    prerequisites are done.
+    """
+    serial_head = None
+    if not serial_busy:
+        serial_head = min(
+            (item for item in pending if item[2].serial and ready(item)),
+            key=lambda item: item[0],
+            default=None,
+        )
+    for item in pending:
+        if ready(item) and (not item[2].serial or item is serial_head):
+            return item
+    return None
 
 
 class BaygonRunner:
@@ -79,12 +302,23 @@ class BaygonRunner:
         executable: str | Path | None = None,
         executable_factory: Callable[[str], Executable] = Executable,
         clock: Callable[[], float] = time.perf_counter,
+        keep_failed: bool = False,
     ) -> None:
         self._suite = suite
         self._base_dir = base_dir
         self._clock = clock
+        self._keep_failed = keep_failed
         self._executable_factory = executable_factory
         self._executables: MutableMapping[str, Executable] = {}
+        self._executables_lock = threading.Lock()
+        self._prefork = (
+            PreforkPool()
+            if suite.launcher == "prefork" and executable_factory is Executable
+            else None
+        )
+        self._services: dict[str, Service] = {}
+        self._calls: dict[str, tuple[Call, CallResult]] = {}
+        self._case_contexts: dict[str, tuple[CaseModel, ExecutionContext]] | None = None
 
         cli_executable = self._resolve_path(executable)
         suite_executable = self._resolve_path(suite.executable)
@@ -97,86 +331,516 @@ class BaygonRunner:
         """Return the suite model handled by the runner."""
         return self._suite
 
-    def run(self, limit: int = -1) -> RunReport:
-        """Run the test suite."""
-        results: list[CaseResult] = []
-        counters = defaultdict(int)
-        points_total: float | int = 0
-        points_earned: float | int = 0
+    def run(
+        self,
+        limit: int = -1,
+        *,
+        select: Callable[[CaseModel], bool] | None = None,
+        order: Callable[[CaseModel], Any] | None = None,
+        jobs: int | AdaptiveConcurrency = 1,
+    ) -> RunReport:
+        """Run the test suite.
+
+        Args:
+            limit: Stop after more than `limit` failures (disabled if <= 0).
+            select: Only run the cases for which it returns True.
+            order: Sort key deciding the execution order. Results are always
+                reported in declaration order.
+            jobs: Number of cases executed concurrently, or a controller
+                adapting it to the machine load.
+
+        A case declaring `needs` starts once its prerequisites are done and is
+        skipped without being executed if any of them did not pass.
+        Prerequisites left out by `select` are considered satisfied. Cases
+        not started yet are also skipped after a failure in an enclosing
+        `fail-fast` group, or once the suite `time-budget` is spent.
 
+        The `setup` commands of a group run before the first of its cases
+        starts and its `teardown` commands after the last one is done. Cases
+        of a group whose setup failed are skipped. The `service` of a group
+        is started after its setup and stopped before its teardown.
+        """
         start = self._clock()
-        root_context = _ExecutionContext(
-            filters=_merge_filters(None, self._suite.filters),
-            eval_filter=_resolve_eval(None, self._suite.eval),
-            executable=self._root_executable,
+        plan = [
+            (index, case, context)
+            for index, (case, context) in enumerate(self._contexts().values())
+            if select is None or select(case)
+        ]
+        if order is not None:
+            plan.sort(key=lambda item: order(item[1]))
+
+        planned = {case.id_str for _, case, _ in plan}
+        budget = self._suite.time_budget
+        state = _RunState(
+            requires={
+                case_id: tuple(item for item in needed if item in planned)
+                for case_id, needed in dependency_graph(self._suite).items()
+            },
+            planned=planned,
+            deadline=start + budget if budget is not None else None,
+            remaining=Counter(
+                group.id_str for _, _, context in plan for group in context.fixtures
+            ),
         )
 
-        stop_requested = False
+        try:
+            if plan:
+                self._set_up("suite", self._suite.setup, self._suite.teardown, state)
+            if isinstance(jobs, AdaptiveConcurrency) or jobs > 1:
+                results = self._run_parallel(plan, limit, jobs, state)
+            else:
+                results = self._run_sequential(plan, limit, state)
+        finally:
+            for scope in reversed(list(state.teardowns)):
+                self._tear_down(scope, state)
+            if self._prefork is not None:
+                self._prefork.close()
 
-        for case, context in self._iter_cases(root_context):
-            if stop_requested:
-                break
+        results.sort(key=lambda item: item[0])
+        duration = round(self._clock() - start, 6)
+        return RunReport.from_results(
+            self._suite,
+            (result for _, result in results),
+            duration,
+            fixtures=state.fixtures,
+        )
 
-            case_points = case.points or 0
-            points_total += case_points
-            case_result = self._run_case(case, context)
+    def run_case(self, case_id: str) -> CaseResult:
+        """Run a single case on its own, as workers do for their coordinator.
 
-            results.append(case_result)
-            status = case_result.status
-            counters[status] += 1
-            if status == "passed":
-                points_earned += case_result.points_earned or 0
-            elif status == "failed" and limit > 0 and counters["failed"] > limit:
-                stop_requested = True
+        Unlike `run`, it neither runs setup and teardown commands nor checks
+        prerequisites and budgets, and warm interpreters stay up for the next
+        case until `close` is called.
 
-        duration = round(self._clock() - start, 6)
-        return RunReport(
-            suite=self._suite,
-            successes=counters["passed"],
-            failures=counters["failed"],
-            skipped=counters["skipped"],
-            points_total=points_total,
-            points_earned=points_earned,
-            duration=duration,
-            cases=tuple(results),
+        Raises:
+            KeyError: if the suite has no case with this id.
+        """
+        case, context = self._contexts()[case_id]
+        return self._run_case(case, context)
+
+    def close(self) -> None:
+        """Stop the warm interpreters started by `run_case`."""
+        if self._prefork is not None:
+            self._prefork.close()
+
+    def _contexts(self) -> dict[str, tuple[CaseModel, ExecutionContext]]:
+        """Return every case with its context, keyed by id in declaration order."""
+        if self._case_contexts is None:
+            root_context = ExecutionContext(
+                filters=_merge_filters(None, self._suite.filters),
+                eval_filter=_resolve_eval(None, self._suite.eval),
+                executable=self._root_executable,
+                workdir=_inherit_workdir(None, self._suite.workdir, self._base_dir),
+                early_exit=bool(self._suite.early_exit),
+            )
+            self._case_contexts = {
+                case.id_str: (case, context)
+                for case, context in self._iter_cases(root_context)
+            }
+        return self._case_contexts
+
+    def _run_sequential(
+        self, plan: Sequence[_PlanItem], limit: int, state: _RunState
+    ) -> list[tuple[int, CaseResult]]:
+        pending = list(plan)
+        results: list[tuple[int, CaseResult]] = []
+        failures = 0
+        while pending:
+            item = next(item for item in pending if state.is_ready(item))
+            pending.remove(item)
+            index, case, context = item
+            case_result = (
+                self._skip(item, state)
+                or self._prepare(item, state)
+                or self._run_case(case, context)
+            )
+            self._record(item, case_result, state)
+            results.append((index, case_result))
+            if case_result.status == "failed":
+                failures += 1
+                if limit > 0 and failures > limit:
+                    break
+        return results
+
+    def _run_parallel(
+        self,
+        plan: Sequence[_PlanItem],
+        limit: int,
+        jobs: int | AdaptiveConcurrency,
+        state: _RunState,
+    ) -> list[tuple[int, CaseResult]]:
+        """Run the plan on a thread pool, starting cases in plan order.
+
+        Cases evaluating mustaches share a stateful kernel, so they run one
+        at a time in declaration order while the other cases fill the pool.
+        Cases wait for their prerequisites; those that must be skipped are
+        reported without taking a slot.
+        """
+        pending = list(plan)
+        results: list[tuple[int, CaseResult]] = []
+        in_flight: dict[Future[CaseResult], _PlanItem] = {}
+        failures = 0
+        stopped = False
+        adaptive = jobs if isinstance(jobs, AdaptiveConcurrency) else None
+        workers = adaptive.maximum if adaptive is not None else jobs
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending or in_flight:
+                serial_busy = any(item[2].serial for item in in_flight.values())
+                capacity = adaptive.limit() if adaptive is not None else workers
+                while not stopped and pending:
+                    item = _next_ready(pending, serial_busy, state.is_ready)
+                    if item is None:
+                        break
+                    skipped = self._skip(item, state)
+                    if skipped is None and len(in_flight) >= capacity:
+                        break
+                    skipped = skipped or self._prepare(item, state)
+                    if skipped is not None:
+                        pending.remove(item)
+                        self._record(item, skipped, state)
+                        results.append((item[0], skipped))
+                        continue
+                    pending.remove(item)
+                    serial_busy = serial_busy or item[2].serial
+                    in_flight[pool.submit(self._run_case, item[1], item[2])] = item
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = in_flight.pop(future)
+                    case_result = future.result()
+                    self._record(item, case_result, state)
+                    results.append((item[0], case_result))
+                    if adaptive is not None:
+                        adaptive.observe(case_result.case.id_str, case_result.duration)
+                    if case_result.status == "failed":
+                        failures += 1
+                        if limit > 0 and failures > limit:
+                            stopped = True
+        return results
+
+    def _skip(self, item: _PlanItem, state: _RunState) -> CaseResult | None:
+        """Return a skipped result if the case must not be executed."""
+        _, case, context = item
+        unmet = [
+            case_id
+            for case_id in state.requires.get(case.id_str, ())
+            if state.outcomes[case_id] != "passed"
+        ]
+        failed_groups = [
+            group for group in context.fail_fast if group in state.failed_groups
+        ]
+        failed_setups = [
+            scope
+            for scope in ("suite", *(group.id_str for group in context.fixtures))
+            if state.setups.get(scope) is False
+        ]
+        if state.deadline is not None and self._clock() >= state.deadline:
+            issue: Any = BudgetExhausted(self._suite.time_budget, test=case)
+        elif failed_setups:
+            issue = SetupFailed(failed_setups[0], test=case)
+        elif failed_groups:
+            issue = GroupFailed(failed_groups[0], test=case)
+        elif unmet:
+            issue = UnmetDependency(unmet, test=case)
+        else:
+            return None
+        return CaseResult(
+            case=case,
+            status="skipped",
+            issues=(issue,),
+            commands=(),
+            duration=0.0,
+            points_earned=0,
+        )
+
+    def _prepare(self, item: _PlanItem, state: _RunState) -> CaseResult | None:
+        """Set up the groups of a case, returning a skipped result on failure."""
+        executables = {group.id_str: path for group, path in item[2].services}
+        for group in item[2].fixtures:
+            if group.id_str in state.setups:
+                continue
+            service = None
+            if group.service is not None:
+                service = (group.service, executables[group.id_str])
+            library = group if group.library is not None else None
+            if not self._set_up(
+                group.id_str, group.setup, group.teardown, state, service, library
+            ):
+                return self._skip(item, state)
+        return None
+
+    def _set_up(
+        self,
+        scope: str,
+        setup: Sequence[Sequence[str]],
+        teardown: Sequence[Sequence[str]],
+        state: _RunState,
+        service: tuple[ServiceModel, str | None] | None = None,
+        library: GroupModel | None = None,
+    ) -> bool:
+        result = self._run_fixture(scope, "setup", setup) if setup else None
+        if library is not None and (result is None or result.status == "passed"):
+            result = self._call_library(scope, library, state.planned) or result
+        if service is not None and (result is None or result.status == "passed"):
+            result = self._start_service(scope, *service) or result
+        if result is not None:
+            state.fixtures.append(result)
+        state.setups[scope] = result is None or result.status == "passed"
+        state.teardowns[scope] = tuple(tuple(argv) for argv in teardown)
+        return state.setups[scope]
+
+    def _tear_down(self, scope: str, state: _RunState) -> None:
+        teardown = state.teardowns.pop(scope)
+        if scope in self._services:
+            state.fixtures.append(self._stop_service(scope))
+        result = self._run_fixture(scope, "teardown", teardown) if teardown else None
+        if result is not None:
+            state.fixtures.append(result)
+
+    def _record(self, item: _PlanItem, result: CaseResult, state: _RunState) -> None:
+        for scope in state.record(item, result):
+            self._tear_down(scope, state)
+
+    def _run_fixture(
+        self, scope: str, stage: str, commands: Sequence[Sequence[str]]
+    ) -> FixtureResult | None:
+        """Run the setup or teardown commands of a group or of the suite."""
+        start = self._clock()
+        command_logs: list[CommandLog] = []
+        passed = run_commands(
+            commands, hook=_capture_hook(command_logs), cwd=self._base_dir
+        )
+        return FixtureResult(
+            scope=scope,
+            stage=stage,
+            status="passed" if passed else "failed",
+            commands=tuple(command_logs),
+            duration=round(self._clock() - start, 6),
         )
 
+    def _start_service(
+        self, scope: str, spec: ServiceModel, path: str | None
+    ) -> FixtureResult | None:
+        """Start the service of a group and wait until it is ready.
+
+        Returns:
+            None once the service is ready, else a failed result holding
+            what the service wrote.
+        """
+        start = self._clock()
+        command_logs: list[CommandLog] = []
+        argv = [str(self._get_executable(path).filename), *spec.args]
+        try:
+            service = Service(
+                argv,
+                address=spec.address,
+                ready=spec.ready,
+                env=get_env(dict(spec.env)),
+                connections=spec.connections,
+                timeout=spec.timeout or DEFAULT_TIMEOUT,
+            )
+        except OSError as error:
+            _capture_hook(command_logs)(
+                cmd=argv,
+                stdin=None,
+                stdout="",
+                stderr=str(error),
+                exit_status=127,
+                duration=0.0,
+            )
+        else:
+            if service.wait_ready(spec.start_timeout or START_TIMEOUT):
+                self._services[scope] = service
+                return None
+            self._log_service(service, _capture_hook(command_logs))
+        return FixtureResult(
+            scope=scope,
+            stage="service",
+            status="failed",
+            commands=tuple(command_logs),
+            duration=round(self._clock() - start, 6),
+        )
+
+    def _call_library(
+        self, scope: str, group: GroupModel, planned: Container[str]
+    ) -> FixtureResult | None:
+        """Call the functions of the planned tests of a group, in one process.
+
+        Returns:
+            None once every call is done, else a failed result if the library
+            could not be loaded.
+        """
+        start = self._clock()
+        spec = group.library
+        path = self._resolve_path(spec.path) if "/" in spec.path else spec.path
+        cases = [case for case in _library_cases(group) if case.id_str in planned]
+        calls = [Call(case.call, case.args) for case in cases]
+        try:
+            results = run_calls(
+                path,
+                spec.functions,
+                calls,
+                timeout=spec.timeout or LIBRARY_TIMEOUT,
+            )
+        except LibraryError as error:
+            command_logs: list[CommandLog] = []
+            _capture_hook(command_logs)(
+                cmd=[path],
+                stdin=None,
+                stdout="",
+                stderr=str(error),
+                exit_status=1,
+                duration=round(self._clock() - start, 6),
+            )
+            return FixtureResult(
+                scope=scope,
+                stage="library",
+                status="failed",
+                commands=tuple(command_logs),
+                duration=round(self._clock() - start, 6),
+            )
+        for case, call, result in zip(cases, calls, results):
+            self._calls[case.id_str] = (call, result)
+        return None
+
+    def _run_call(self, case: CaseModel) -> CaseResult:
+        """Report the call of a case, made when its group was set up."""
+        call, result = self._calls.pop(case.id_str)
+        issues: list[Any] = []
+        if result.error is not None:
+            issues.append(CallFailed(call, result.error, on="return", test=case))
+        elif case.returns is not None and not same_value(
+            result.value, case.returns, case.tolerance
+        ):
+            issues.append(
+                InvalidReturn(call, case.returns, result.value, on="return", test=case)
+            )
+        command = CommandLog(
+            argv=(call.function, *call.args),
+            stdin=None,
+            stdout="" if result.value is None else str(result.value),
+            stderr=result.error or "",
+            exit_status=0 if result.error is None else 1,
+            duration=result.duration,
+        )
+        status = "failed" if issues else "passed"
+        return CaseResult(
+            case=case,
+            status=status,
+            issues=tuple(issues),
+            commands=(command,),
+            duration=result.duration,
+            points_earned=(case.points or 0) if status == "passed" else 0,
+        )
+
+    def _stop_service(self, scope: str) -> FixtureResult:
+        """Stop the service of a group, failed if it exited on its own."""
+        start = self._clock()
+        service = self._services.pop(scope)
+        crashed = service.process.poll() is not None
+        command_logs: list[CommandLog] = []
+        self._log_service(service, _capture_hook(command_logs))
+        return FixtureResult(
+            scope=scope,
+            stage="service",
+            status="failed" if crashed else "passed",
+            commands=tuple(command_logs),
+            duration=round(self._clock() - start, 6),
+        )
+
+    @staticmethod
+    def _log_service(service: Service, hook: Callable[..., None]) -> None:
+        exit_status = service.stop()
+        hook(
+            cmd=service.argv,
+            stdin=None,
+            stdout=service.stdout,
+            stderr=service.stderr,
+            exit_status=exit_status,
+            duration=service.duration,
+        )
+        service.close()
+
     def _iter_cases(
-        self, root: _ExecutionContext
-    ) -> Iterator[tuple[CaseModel, _ExecutionContext]]:
+        self, root: ExecutionContext
+    ) -> Iterator[tuple[CaseModel, ExecutionContext]]:
         for test in self._suite.tests:
             yield from self._walk(test, root)
 
     def _walk(
         self,
         node: CaseModel | GroupModel,
-        parent_context: _ExecutionContext,
-    ) -> Iterator[tuple[CaseModel, _ExecutionContext]]:
+        parent_context: ExecutionContext,
+    ) -> Iterator[tuple[CaseModel, ExecutionContext]]:
         if isinstance(node, CaseModel):
-            context = _ExecutionContext(
+            for expected in _expected_files(node):
+                if not (self._base_dir / expected).is_file():
+                    raise ConfigError(f"Expected file '{expected}' does not exist.")
+            if (
+                node.request is not None or node.load is not None
+            ) and not parent_context.services:
+                raise ConfigError(
+                    f"Test '{node.name}' (id {node.id_str}) sends requests "
+                    "outside of a group with a service."
+                )
+            if node.call is not None:
+                _check_call(node, parent_context.library)
+            context = ExecutionContext(
                 filters=_merge_filters(parent_context.filters, node.filters),
                 eval_filter=_resolve_eval(parent_context.eval_filter, node.eval),
                 executable=_inherit_executable(
                     parent_context.executable, node.executable, self._base_dir
                 ),
+                fail_fast=parent_context.fail_fast,
+                fixtures=parent_context.fixtures,
+                workdir=_inherit_workdir(
+                    parent_context.workdir, node.workdir, self._base_dir
+                ),
+                early_exit=_inherit_flag(parent_context.early_exit, node.early_exit),
+                services=parent_context.services,
+                library=parent_context.library,
             )
             yield (node, context)
             return
 
-        context = _ExecutionContext(
+        executable = _inherit_executable(
+            parent_context.executable, node.executable, self._base_dir
+        )
+        if node.service is not None and executable is None:
+            raise InvalidExecutableError(
+                f"Executable not provided for the service of group '{node.name}' "
+                f"(id {node.id_str})."
+            )
+        context = ExecutionContext(
             filters=_merge_filters(parent_context.filters, node.filters),
             eval_filter=_resolve_eval(parent_context.eval_filter, node.eval),
-            executable=_inherit_executable(
-                parent_context.executable, node.executable, self._base_dir
+            executable=executable,
+            fail_fast=parent_context.fail_fast
+            + ((node.id_str,) if node.fail_fast else ()),
+            fixtures=parent_context.fixtures
+            + (
+                (node,)
+                if node.setup or node.teardown or node.service or node.library
+                else ()
+            ),
+            workdir=_inherit_workdir(
+                parent_context.workdir, node.workdir, self._base_dir
             ),
+            early_exit=_inherit_flag(parent_context.early_exit, node.early_exit),
+            services=parent_context.services
+            + (((node, executable),) if node.service is not None else ()),
+            library=node if node.library is not None else parent_context.library,
         )
         for child in node.tests:
             yield from self._walk(child, context)
 
-    def _run_case(self, case: CaseModel, context: _ExecutionContext) -> CaseResult:
+    def _run_case(self, case: CaseModel, context: ExecutionContext) -> CaseResult:
+        if case.call is not None:
+            return self._run_call(case)
         start = self._clock()
-        issues: list[Any] = []
-        command_logs: list[CommandLog] = []
         exec_path = context.executable
         if exec_path is None:
             raise InvalidExecutableError(
@@ -184,12 +848,91 @@ class BaygonRunner:
             )
 
         exec_obj = self._get_executable(exec_path)
-        filters = context.filters
-        eval_filter = context.eval_filter
+        seed = None
+        counterexample = None
+        trials = None
+        load = None
+        # Generated inputs each run in their own copy of the template.
+        workdir = (
+            create_workdir(context.workdir)
+            if context.workdir is not None and case.generate is None
+            else None
+        )
+        cwd = str(workdir) if workdir is not None else None
+        try:
+            if case.generate is not None:
+                outcome, workdir = self._run_generated(case, context, exec_obj)
+                cwd = str(workdir) if workdir is not None else None
+                issues, command_logs = list(outcome.issues), list(outcome.commands)
+                seed, counterexample = outcome.seed, outcome.counterexample
+                trials = outcome.trials
+            elif case.load is not None:
+                issues, command_logs = [], []
+                service = self._service_of(context)
+                if service is not None:
+                    load = self._load(case, service, context)
+                    issues = _check_load(case, load)
+            else:
+                issues, command_logs = self._execute(
+                    case,
+                    exec_obj,
+                    context.filters,
+                    context.eval_filter,
+                    cwd=cwd,
+                    early_exit=context.early_exit,
+                    service=self._service_of(context),
+                )
+        except BaseException:
+            if workdir is not None:
+                remove_workdir(workdir)
+            raise
+
+        status = "failed" if issues else "passed"
+        if workdir is not None and not (status == "failed" and self._keep_failed):
+            remove_workdir(workdir)
+            cwd = None
+        duration = round(self._clock() - start, 6)
+        points = case.points or 0
+        earned = points if status == "passed" else 0
+
+        return CaseResult(
+            case=case,
+            status=status,
+            issues=tuple(issues),
+            commands=tuple(command_logs),
+            duration=duration,
+            points_earned=earned,
+            seed=seed,
+            counterexample=counterexample,
+            trials=trials,
+            workdir=cwd,
+            load=load,
+        )
+
+    def _execute(
+        self,
+        case: CaseModel,
+        exec_obj: Executable,
+        filters: FilterType,
+        eval_filter: EvalType,
+        reference: Executable | None = None,
+        cwd: str | None = None,
+        early_exit: bool = False,
+        service: Service | None = None,
+    ) -> tuple[list[Any], list[CommandLog]]:
+        issues: list[Any] = []
+        command_logs: list[CommandLog] = []
+        options: dict[str, Any] = {"cwd": cwd} if cwd is not None else {}
+        if self._suite.capture != "pipe":
+            options["capture"] = self._suite.capture
 
         for _ in range(case.repeat):
             filtered_args = tuple(_apply_eval(eval_filter, list(case.args)))
             filtered_stdin = _apply_eval(eval_filter, case.stdin)
+            if case.stdin_file is not None:
+                filtered_stdin = self._input_file(
+                    _apply_eval(eval_filter, case.stdin_file)
+                )
             filtered_env = _apply_eval_env(eval_filter, case.env)
             expected_exit = (
                 int(_apply_eval(eval_filter, str(case.exit)))
@@ -198,12 +941,65 @@ class BaygonRunner:
             )
 
             hook = _capture_hook(command_logs)
-            output = exec_obj.run(
-                *filtered_args,
-                stdin=filtered_stdin if filtered_stdin is not None else None,
-                env=get_env(filtered_env),
-                hook=hook,
-            )
+            monitor = None
+            if case.request is not None:
+                issues.extend(self._send(case, service, filters, eval_filter, hook))
+                continue
+            if case.dialogue:
+                output, failures = self._converse(
+                    case,
+                    exec_obj,
+                    filters,
+                    eval_filter,
+                    filtered_args,
+                    get_env(filtered_env),
+                    cwd,
+                    hook,
+                )
+                if failures:
+                    issues.extend(failures)
+                    continue
+            elif case.pipeline:
+                output, failures = self._pipe(
+                    case,
+                    exec_obj,
+                    eval_filter,
+                    filtered_stdin,
+                    get_env(filtered_env),
+                    cwd,
+                    hook,
+                )
+                issues.extend(failures)
+            else:
+                if early_exit:
+                    monitor = self._monitor(case, filters, eval_filter)
+                output = exec_obj.run(
+                    *filtered_args,
+                    stdin=filtered_stdin,
+                    env=get_env(filtered_env),
+                    hook=hook,
+                    **(
+                        options
+                        if monitor is None
+                        else {**options, "capture": "pipe", "monitor": monitor}
+                    ),
+                )
+
+            if monitor is not None and monitor.failed is not None:
+                issues.extend(
+                    _match_conditions(
+                        case,
+                        filters,
+                        eval_filter,
+                        output.data("stdout"),
+                        partial(output.text, "stdout", "replace"),
+                        "stdout",
+                        (monitor.failed.condition,),
+                        self._base_dir,
+                    )
+                )
+                issues.append(EarlyExit(monitor.size, on="stdout", test=case))
+                continue
 
             issues.extend(
                 _match_streams(
@@ -213,6 +1009,8 @@ class BaygonRunner:
                     output,
                     "stdout",
                     case.stdout,
+                    self._base_dir,
+                    self._suite.decode_errors,
                 )
             )
             issues.extend(
@@ -223,6 +1021,8 @@ class BaygonRunner:
                     output,
                     "stderr",
                     case.stderr,
+                    self._base_dir,
+                    self._suite.decode_errors,
                 )
             )
 
@@ -236,24 +1036,374 @@ class BaygonRunner:
                     )
                 )
 
-        status = "failed" if issues else "passed"
-        duration = round(self._clock() - start, 6)
-        points = case.points or 0
-        earned = points if status == "passed" else 0
+            if case.files:
+                issues.extend(
+                    _check_files(
+                        case,
+                        filters,
+                        eval_filter,
+                        cwd,
+                        self._base_dir,
+                        self._suite.decode_errors,
+                    )
+                )
 
-        return CaseResult(
-            case=case,
-            status=status,
-            issues=tuple(issues),
-            commands=tuple(command_logs),
-            duration=duration,
-            points_earned=earned,
+            if reference is not None:
+                expected = reference.run(
+                    *filtered_args,
+                    stdin=filtered_stdin,
+                    env=get_env(filtered_env),
+                    hook=_capture_hook(command_logs),
+                    **options,
+                )
+                issues.extend(
+                    _compare_reference(
+                        case, filters, output, expected, self._suite.decode_errors
+                    )
+                )
+
+        return issues, command_logs
+
+    def _converse(
+        self,
+        case: CaseModel,
+        exec_obj: Executable,
+        filters: FilterType,
+        eval_filter: EvalType,
+        args: Sequence[str],
+        env: dict[str, str],
+        cwd: str | None,
+        hook: Callable[..., None],
+    ) -> tuple[Outputs, list[Any]]:
+        """Run the dialogue of a case against a single process.
+
+        Mustaches of a step are evaluated once, before it starts, since its
+        conditions are checked again each time output arrives.
+
+        Returns:
+            The outputs of the whole dialogue, and the issues of the step that
+            failed, if any.
+        """
+        encoding = getattr(exec_obj, "encoding", "utf-8")
+        errors = self._suite.decode_errors
+        failures: list[Any] = []
+        timeout = DEFAULT_TIMEOUT
+        with Session([str(exec_obj.filename), *args], env=env, cwd=cwd) as session:
+            for number, step in enumerate(case.dialogue, start=1):
+                timeout = step.timeout or DEFAULT_TIMEOUT
+                on = f"dialogue step {number}"
+                if step.send is not None:
+                    session.send(_apply_eval(eval_filter, step.send).encode(encoding))
+                if not step.expect:
+                    continue
+                conditions = tuple(
+                    _evaluated(condition, eval_filter) for condition in step.expect
+                )
+
+                def _accept(data: bytes, conditions=conditions, on=on) -> bool:
+                    failures[:] = _match_conditions(
+                        case,
+                        filters,
+                        FilterNone(),
+                        data,
+                        partial(str, data, encoding, errors),
+                        on,
+                        conditions,
+                        self._base_dir,
+                    )
+                    return not failures
+
+                if not session.expect(_accept, timeout):
+                    failures.append(
+                        DialogueTimeout(number, timeout, session.eof, on=on, test=case)
+                    )
+                    session.kill()
+                    break
+            else:
+                if session.close(timeout) is None:
+                    failures.append(NoExit(timeout, on="exit", test=case))
+        output = Outputs(
+            session.process.returncode,
+            bytes(session.stdout),
+            bytes(session.stderr),
+            encoding=encoding,
+        )
+        hook(
+            cmd=session.argv,
+            stdin=bytes(session.sent),
+            stdout=output.stdout_bytes,
+            stderr=output.stderr_bytes,
+            exit_status=output.exit_status,
+            duration=session.duration,
+        )
+        return output, failures
+
+    def _send(
+        self,
+        case: CaseModel,
+        service: Service | None,
+        filters: FilterType,
+        eval_filter: EvalType,
+        hook: Callable[..., None],
+    ) -> list[Any]:
+        """Send the request of a case to the service of its group.
+
+        The response is checked as it arrives, like a dialogue step, and
+        read until it matches or the service times out.
+        """
+        if service is None:
+            return []
+        request = _apply_eval(eval_filter, case.request).encode()
+        conditions = tuple(
+            _evaluated(condition, eval_filter) for condition in case.response
+        )
+        errors = self._suite.decode_errors
+        failures: list[Any] = []
+
+        def _accept(data: bytes) -> bool:
+            failures[:] = _match_conditions(
+                case,
+                filters,
+                FilterNone(),
+                data,
+                partial(str, data, "utf-8", errors),
+                "response",
+                conditions,
+                self._base_dir,
+            )
+            return not failures
+
+        exchange = service.request(request, _accept)
+        hook(
+            cmd=[service.address],
+            stdin=request,
+            stdout=exchange.response,
+            stderr=b"",
+            exit_status=0,
+            duration=exchange.duration,
         )
+        if exchange.error is not None:
+            return [
+                ServiceUnavailable(
+                    service.address, exchange.error, on="response", test=case
+                )
+            ]
+        if not exchange.accepted:
+            failures.append(
+                NoResponse(service.timeout, exchange.eof, on="response", test=case)
+            )
+        return failures
+
+    def _load(
+        self, case: CaseModel, service: Service, context: ExecutionContext
+    ) -> LoadStats:
+        """Send the load of a case to the service of its group.
+
+        Mustaches of the templates are evaluated once, before the load
+        starts. A template without conditions accepts any non-empty
+        response.
+        """
+        spec = case.load
+        errors = self._suite.decode_errors
+        requests = []
+        for template in spec.templates:
+            conditions = tuple(
+                _evaluated(condition, context.eval_filter)
+                for condition in template.response
+            )
+
+            def _accept(data: bytes, conditions=conditions) -> bool:
+                if not conditions:
+                    return bool(data)
+                return not _match_conditions(
+                    case,
+                    context.filters,
+                    FilterNone(),
+                    data,
+                    partial(str, data, "utf-8", errors),
+                    "response",
+                    conditions,
+                    self._base_dir,
+                )
+
+            request = _apply_eval(context.eval_filter, template.request)
+            requests.append(LoadRequest(request.encode(), _accept))
+        return run_load(
+            service.address,
+            requests,
+            concurrency=spec.concurrency,
+            count=spec.requests,
+            duration=spec.duration,
+            timeout=service.timeout,
+        )
+
+    def _service_of(self, context: ExecutionContext) -> Service | None:
+        """Return the running service of the innermost group declaring one."""
+        if not context.services:
+            return None
+        return self._services.get(context.services[-1][0].id_str)
+
+    def _pipe(
+        self,
+        case: CaseModel,
+        exec_obj: Executable,
+        eval_filter: EvalType,
+        stdin: str | Path | None,
+        env: dict[str, str],
+        cwd: str | None,
+        hook: Callable[..., None],
+    ) -> tuple[Outputs, list[Any]]:
+        """Run the pipeline of a case, checking the exit status of each stage.
+
+        Stages without executable run the program under test. Others are
+        resolved relative to the suite when they hold a path, else searched
+        in the PATH.
+
+        Returns:
+            The outputs of the last stage, and the stages that exited with an
+            unexpected status.
+        """
+        commands = []
+        for stage in case.pipeline:
+            program = stage.executable
+            if program is None:
+                program = str(exec_obj.filename)
+            elif "/" in program:
+                program = self._resolve_path(program)
+            commands.append([program, *_apply_eval(eval_filter, list(stage.args))])
+
+        outputs = run_pipeline(
+            commands,
+            stdin=stdin,
+            env=env,
+            cwd=cwd,
+            hook=hook,
+            encoding=getattr(exec_obj, "encoding", "utf-8"),
+        )
+        failures: list[Any] = []
+        for number, (stage, output) in enumerate(zip(case.pipeline, outputs), 1):
+            if stage.exit is not None and stage.exit != output.exit_status:
+                failures.append(
+                    InvalidStageExit(
+                        number,
+                        stage.exit,
+                        output.exit_status,
+                        on=f"pipeline stage {number}",
+                        test=case,
+                    )
+                )
+        return outputs[-1], failures
+
+    def _monitor(
+        self, case: CaseModel, filters: FilterType, eval_filter: EvalType
+    ) -> OutputMonitor | None:
+        """Return a monitor of the stdout conditions that can fail early.
+
+        Only exact `equals` and negated `contains` qualify, without filters,
+        mustaches or a lenient decoding policy, since their verdict on the
+        raw bytes is then the same as on the decoded text.
+        """
+        if self._suite.decode_errors != "strict":
+            return None
+        checks = []
+        for condition in case.stdout:
+            if _has_filters(_merge_filters(filters, condition.filters)):
+                continue
+            if condition.equals is not None and _is_literal(
+                eval_filter, condition.equals
+            ):
+                checks.append(StreamCheck(condition, condition.equals.encode()))
+            checks.extend(
+                StreamCheck(condition, negated.contains.encode(), negated=True)
+                for negated in condition.negated
+                if negated.contains is not None
+                and _is_literal(eval_filter, negated.contains)
+            )
+        return OutputMonitor(checks) if checks else None
+
+    def _input_file(self, value: str) -> Path:
+        """Resolve a file given as standard input, relative to the suite."""
+        path = self._base_dir / value
+        if not path.is_file():
+            raise ConfigError(f"Input file '{value}' does not exist.")
+        return path
+
+    def _run_generated(
+        self,
+        case: CaseModel,
+        context: ExecutionContext,
+        exec_obj: Executable,
+    ) -> tuple[PropertyOutcome, Path | None]:
+        """Check the property of a generated case.
+
+        Each input, shrinking attempts included, runs in a fresh copy of the
+        working directory template, so files left by other inputs cannot change
+        its outcome.
+
+        Returns:
+            The outcome and, when failed workdirs are kept, the working
+            directory of the counterexample.
+        """
+        spec = case.generate
+        base_eval = (
+            context.eval_filter
+            if isinstance(context.eval_filter, FilterEval)
+            else FilterEval()
+        )
+        reference_path = self._resolve_path(spec.reference)
+        reference = self._get_executable(reference_path) if reference_path else None
+        failed: list[tuple[Mapping[str, Any], Path]] = []
+        failed_lock = threading.Lock()
+
+        def _trial(values: Mapping[str, Any]) -> tuple[list[Any], list[CommandLog]]:
+            eval_filter = base_eval.clone().bind(**values)
+            workdir = (
+                create_workdir(context.workdir) if context.workdir is not None else None
+            )
+            try:
+                issues, commands = self._execute(
+                    case,
+                    exec_obj,
+                    context.filters,
+                    eval_filter,
+                    reference,
+                    str(workdir) if workdir is not None else None,
+                    early_exit=context.early_exit,
+                )
+            except BaseException:
+                if workdir is not None:
+                    remove_workdir(workdir)
+                raise
+            if workdir is not None:
+                if issues and self._keep_failed:
+                    with failed_lock:
+                        failed.append((values, workdir))
+                else:
+                    remove_workdir(workdir)
+            return issues, commands
+
+        # Without a template, inputs share the current directory, so those
+        # checking files run one at a time.
+        jobs = 1 if context.workdir is None and case.files else None
+        outcome = check_property(spec, _trial, jobs=jobs)
+        kept = None
+        for values, workdir in failed:
+            if kept is None and values == outcome.counterexample:
+                kept = workdir
+            else:
+                remove_workdir(workdir)
+        return outcome, kept
 
     def _get_executable(self, path: str) -> Executable:
-        if path not in self._executables:
-            self._executables[path] = self._executable_factory(path)
-        return self._executables[path]
+        with self._executables_lock:
+            if path not in self._executables:
+                factory = (
+                    self._executable_factory
+                    if self._prefork is None
+                    else self._prefork.executable
+                )
+                self._executables[path] = factory(path)
+            return self._executables[path]
 
     def _resolve_path(self, value: str | Path | None) -> str | None:
         if value is None:
@@ -279,6 +1429,102 @@ def _inherit_executable(
     return str(path)
 
 
+def _evaluated(condition: ConditionModel, eval_filter: EvalType) -> ConditionModel:
+    """Return `condition` with the mustaches of its expected values evaluated."""
+    if isinstance(eval_filter, FilterNone):
+        return condition
+    return replace(
+        condition,
+        equals=_apply_eval(eval_filter, condition.equals),
+        regex=_apply_eval(eval_filter, condition.regex),
+        contains=_apply_eval(eval_filter, condition.contains),
+        negated=tuple(
+            replace(
+                negated,
+                equals=_apply_eval(eval_filter, negated.equals),
+                regex=_apply_eval(eval_filter, negated.regex),
+                contains=_apply_eval(eval_filter, negated.contains),
+            )
+            for negated in condition.negated
+        ),
+    )
+
+
+def _library_cases(group: GroupModel) -> Iterator[CaseModel]:
+    """Yield the calls of a group, except those of groups with a library."""
+    for test in group.tests:
+        if isinstance(test, CaseModel):
+            if test.call is not None:
+                yield test
+        elif test.library is None:
+            yield from _library_cases(test)
+
+
+def _check_call(case: CaseModel, group: GroupModel | None) -> None:
+    """Check a call against the signatures declared by its group."""
+    where = f"Test '{case.name}' (id {case.id_str})"
+    if group is None:
+        raise ConfigError(f"{where} calls a function outside of a library group.")
+    signature = group.library.functions.get(case.call)
+    if signature is None:
+        raise ConfigError(f"{where} calls '{case.call}', which is not declared.")
+    expected = len(parse_signature(signature).args)
+    if len(case.args) != expected:
+        raise ConfigError(
+            f"{where} calls '{case.call}' with {len(case.args)} arguments "
+            f"instead of {expected}."
+        )
+
+
+def _check_load(case: CaseModel, stats: LoadStats) -> list[Any]:
+    """Return the thresholds of the load of a case missed by `stats`."""
+    spec = case.load
+    issues: list[Any] = []
+    if stats.error_rate > spec.max_error_rate:
+        issues.append(
+            LoadThreshold(
+                "max-error-rate", spec.max_error_rate, stats.error_rate, test=case
+            )
+        )
+    if spec.min_rps is not None and stats.rps < spec.min_rps:
+        issues.append(LoadThreshold("min-rps", spec.min_rps, stats.rps, test=case))
+    p99 = stats.percentile(0.99)
+    if spec.max_p99 is not None and p99 is not None and p99 > spec.max_p99:
+        issues.append(LoadThreshold("max-p99", spec.max_p99, p99, test=case))
+    return issues
+
+
+def _inherit_flag(parent: bool, child: bool | None) -> bool:
+    return parent if child is None else child
+
+
+def _has_filters(filters: Any) -> bool:
+    """Return True if `filters` may change a value."""
+    if isinstance(filters, Filters):
+        return any(_has_filters(item) for item in filters)
+    return not isinstance(filters, FilterNone)
+
+
+def _is_literal(eval_filter: EvalType, value: str) -> bool:
+    """Return True if evaluating `value` cannot change it."""
+    return not (
+        isinstance(eval_filter, FilterEval) and eval_filter.has_mustaches(value)
+    )
+
+
+def _inherit_workdir(
+    parent: str | None, child: str | None, base_dir: Path
+) -> str | None:
+    if child is None:
+        return parent
+    path = Path(child)
+    if not path.is_absolute():
+        path = (base_dir / path).resolve()
+    if not path.is_dir():
+        raise ConfigError(f"Working directory template '{child}' is not a directory.")
+    return str(path)
+
+
 def _merge_filters(
     parent: FilterType | None, current: Mapping[str, Any] | None
 ) -> FilterType:
@@ -324,21 +1570,28 @@ def _capture_hook(storage: list[CommandLog]) -> Callable[..., None]:
             stdin_value = stdin.decode("utf-8", errors="replace")
         else:
             stdin_value = stdin
-        stdout_value = kwargs.get("stdout")
-        stderr_value = kwargs.get("stderr")
         storage.append(
             CommandLog(
                 argv=cmd,
                 stdin=stdin_value,
-                stdout="" if stdout_value is None else str(stdout_value),
-                stderr="" if stderr_value is None else str(stderr_value),
+                stdout=_stream_value(kwargs.get("stdout")),
+                stderr=_stream_value(kwargs.get("stderr")),
                 exit_status=int(kwargs.get("exit_status", 0)),
+                duration=kwargs.get("duration"),
             )
         )
 
     return _hook
 
 
+def _stream_value(value: Any) -> str | bytes:
+    if value is None:
+        return ""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return str(value)
+
+
 def _match_streams(
     case: CaseModel,
     base_filters: FilterType,
@@ -346,64 +1599,191 @@ def _match_streams(
     output: Outputs,
     stream_name: str,
     conditions: Sequence[ConditionModel],
+    base_dir: Path,
+    errors: str = "strict",
+) -> list[Any]:
+    return _match_conditions(
+        case,
+        base_filters,
+        eval_filter,
+        output.data(stream_name),
+        partial(output.text, stream_name, errors),
+        stream_name,
+        conditions,
+        base_dir,
+    )
+
+
+def _match_conditions(
+    case: CaseModel,
+    base_filters: FilterType,
+    eval_filter: EvalType,
+    data: bytes,
+    decode: Callable[[], str],
+    on: str,
+    conditions: Sequence[ConditionModel],
+    base_dir: Path,
 ) -> list[Any]:
+    """Check conditions on raw output, decoding it only for text matchers."""
     issues: list[Any] = []
-    stream_value = getattr(output, stream_name)
-    value = str(stream_value) if stream_value is not None else ""
+    value: str | None = None
     for condition in conditions:
-        filters = _merge_filters(base_filters, condition.filters)
-        filtered_value = filters(value)
-        issues.extend(
-            _evaluate_condition(
-                _iter_condition_expectations(condition),
-                filtered_value,
-                stream_name,
-                case,
-                inverse=False,
-                eval_filter=eval_filter,
-            )
+        if condition.file is not None:
+            difference = first_difference(data, base_dir / condition.file)
+            if difference is not None:
+                issues.append(
+                    InvalidGoldenFile(difference, condition.file, on=on, test=case)
+                )
+        matchers = _matchers(
+            _iter_condition_expectations(condition),
+            inverse=False,
+            eval_filter=eval_filter,
         )
         for negated in condition.negated:
+            matchers += _matchers(
+                _iter_condition_expectations(negated),
+                inverse=True,
+                eval_filter=eval_filter,
+            )
+        text_matchers = [matcher for matcher in matchers if not matcher.binary]
+        for matcher in matchers:
+            if matcher.binary:
+                issues.extend(_apply(matcher, data, on, case))
+        if not text_matchers:
+            continue
+        if value is None:
+            try:
+                value = decode()
+            except UnicodeDecodeError as error:
+                issues.append(InvalidEncoding(error, on=on, test=case))
+                break
+        filtered_value = _merge_filters(base_filters, condition.filters)(value)
+        for matcher in text_matchers:
+            issues.extend(_apply(matcher, filtered_value, on, case))
+    return issues
+
+
+def _expected_files(case: CaseModel) -> Iterator[str]:
+    """Yield the expected files a case compares its outputs with."""
+    for condition in (*case.stdout, *case.stderr):
+        if condition.file is not None:
+            yield condition.file
+    for check in case.files:
+        if check.same_as is not None:
+            yield check.same_as
+        for condition in check.conditions:
+            if condition.file is not None:
+                yield condition.file
+
+
+def _check_files(
+    case: CaseModel,
+    filters: FilterType,
+    eval_filter: EvalType,
+    cwd: str | None,
+    base_dir: Path,
+    errors: str = "strict",
+) -> list[Any]:
+    """Check the files the program wrote in its working directory."""
+    issues: list[Any] = []
+    root = Path(cwd) if cwd is not None else Path.cwd()
+    for check in case.files:
+        on = f"file {check.path}"
+        path = root / check.path
+        if not path.is_file():
+            issues.append(MissingFile(check.path, on=on, test=case))
+            continue
+        if check.same_as is not None and not same_content(
+            path, base_dir / check.same_as
+        ):
+            issues.append(
+                InvalidFileContent(check.path, check.same_as, on=on, test=case)
+            )
+        if check.conditions:
+            data = path.read_bytes()
             issues.extend(
-                _evaluate_condition(
-                    _iter_condition_expectations(negated),
-                    filtered_value,
-                    stream_name,
+                _match_conditions(
                     case,
-                    inverse=True,
-                    eval_filter=eval_filter,
+                    filters,
+                    eval_filter,
+                    data,
+                    partial(str, data, "utf-8", errors),
+                    on,
+                    check.conditions,
+                    base_dir,
                 )
             )
     return issues
 
 
-def _evaluate_condition(
-    expectations: Iterable[tuple[str, str]],
-    value: str,
-    stream_name: str,
+def _compare_reference(
     case: CaseModel,
-    *,
-    inverse: bool,
-    eval_filter: EvalType,
+    filters: FilterType,
+    output: Outputs,
+    expected: Outputs,
+    errors: str = "strict",
 ) -> list[Any]:
     issues: list[Any] = []
-    for matcher_name, expected in expectations:
-        evaluated = _apply_eval(eval_filter, expected)
-        matcher = MatcherFactory(
-            matcher_name,
-            evaluated,
-            inverse=inverse,
+    if output.stdout_bytes == expected.stdout_bytes:
+        value = reference_value = ""
+    else:
+        try:
+            value = filters(output.text("stdout", errors))
+            reference_value = filters(expected.text("stdout", errors))
+        except UnicodeDecodeError as error:
+            issues.append(InvalidEncoding(error, on="stdout (reference)", test=case))
+            value = reference_value = ""
+    if value != reference_value:
+        issues.append(
+            InvalidEquals(value, reference_value, on="stdout (reference)", test=case)
+        )
+    if output.exit_status != expected.exit_status:
+        issues.append(
+            InvalidExitStatus(
+                expected.exit_status,
+                output.exit_status,
+                on="exit (reference)",
+                test=case,
+            )
         )
-        issue = matcher(value, on=stream_name, test=case)
-        if issue:
-            issues.append(issue)
     return issues
 
 
+def _matchers(
+    expectations: Iterable[tuple[str, str]],
+    *,
+    inverse: bool,
+    eval_filter: EvalType,
+) -> list[MatchBase]:
+    return [
+        MatcherFactory(
+            matcher_name, _apply_eval(eval_filter, expected), inverse=inverse
+        )
+        for matcher_name, expected in expectations
+    ]
+
+
+def _apply(
+    matcher: MatchBase, value: str | bytes, stream_name: str, case: CaseModel
+) -> list[Any]:
+    issue = matcher(value, on=stream_name, test=case)
+    return [issue] if issue else []
+
+
+_EXPECTATIONS = (
+    ("equals", "equals"),
+    ("regex", "regex"),
+    ("contains", "contains"),
+    ("equals-bytes", "equals_bytes"),
+    ("sha256", "sha256"),
+)
+"""Matcher names and the condition fields giving their expected value."""
+
+
 def _iter_condition_expectations(
-    condition: ConditionModel | Any,
+    condition: ConditionModel | NegatedConditionModel,
 ) -> Iterator[tuple[str, str]]:
-    for matcher_name in ("equals", "regex", "contains"):
-        expected = getattr(condition, matcher_name, None)
+    for matcher_name, attribute in _EXPECTATIONS:
+        expected = getattr(condition, attribute, None)
         if expected is not None:
             yield matcher_name, expected
@@ -0,0 +1,226 @@
+"""Case partitioning and scheduling helpers."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+import hashlib
+import heapq
+import json
+from pathlib import Path
+import statistics
+from typing import Any, Callable
+
+from baygon.core.models import CaseModel, GroupModel, SuiteModel, TestNode
+from baygon.error import ConfigError
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse a `K/N` shard specification (1-based).
+
+    >>> parse_shard("2/4")
+    (2, 4)
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError as exc:
+        raise ConfigError(f"Invalid shard '{value}', expected K/N.") from exc
+    if count < 1 or not 1 <= index <= count:
+        raise ConfigError(f"Invalid shard '{value}', expected 1 <= K <= N.")
+    return index, count
+
+
+def hash_partition(case_id: str, count: int) -> int:
+    """Return the 0-based shard of a case from a stable hash of its id.
+
+    >>> hash_partition("1.2", 1)
+    0
+    """
+    digest = hashlib.sha1(case_id.encode("utf-8"), usedforsecurity=False)
+    return int.from_bytes(digest.digest()[:8], "big") % count
+
+
+def estimate_durations(
+    case_ids: Iterable[str], durations: Mapping[str, float]
+) -> dict[str, float]:
+    """Return a duration for every case, using the median for unknown ones.
+
+    >>> estimate_durations(["1", "2", "3"], {"1": 4.0, "2": 2.0})
+    {'1': 4.0, '2': 2.0, '3': 3.0}
+    """
+    ids = list(case_ids)
+    known = [durations[key] for key in ids if durations.get(key) is not None]
+    default = statistics.median(known) if known else 1.0
+    return {
+        key: default if durations.get(key) is None else durations[key] for key in ids
+    }
+
+
+def balanced_partition(
+    case_ids: Iterable[str],
+    count: int,
+    durations: Mapping[str, float],
+) -> dict[str, int]:
+    """Spread cases over `count` shards so their total durations are close.
+
+    Cases are assigned longest first to the least loaded shard. Cases without
+    history are assumed to take the median known duration.
+
+    >>> balanced_partition(["1", "2", "3"], 2, {"1": 3.0, "2": 2.0, "3": 1.0})
+    {'1': 0, '2': 1, '3': 1}
+    """
+    ids = list(case_ids)
+    estimates = estimate_durations(ids, durations)
+
+    loads = [0.0] * count
+    assignment: dict[str, int] = {}
+    for key in sorted(ids, key=lambda key: (-estimates[key], key)):
+        shard = min(range(count), key=lambda index: (loads[index], index))
+        assignment[key] = shard
+        loads[shard] += estimates[key]
+    return assignment
+
+
+def shard_selector(
+    cases: Iterable[CaseModel],
+    index: int,
+    count: int,
+    durations: Mapping[str, float] | None = None,
+) -> Callable[[CaseModel], bool]:
+    """Return a selector keeping the cases of shard `index` (1-based)."""
+    ids = [case.id_str for case in cases]
+    if durations and any(durations.get(key) is not None for key in ids):
+        assignment = balanced_partition(ids, count, durations)
+    else:
+        assignment = {key: hash_partition(key, count) for key in ids}
+    return lambda case: assignment.get(case.id_str) == index - 1
+
+
+def suite_hash(suite: SuiteModel) -> str:
+    """Return a fingerprint of a suite, changing whenever any case changes."""
+    return hashlib.sha256(repr(suite).encode("utf-8")).hexdigest()[:16]
+
+
+def longest_first(
+    cases: Iterable[CaseModel], durations: Mapping[str, float]
+) -> Callable[[CaseModel], float]:
+    """Return a sort key starting the longest cases first (LPT).
+
+    Cases with equal estimates keep their declaration order since Python's
+    sort is stable.
+    """
+    estimates = estimate_durations((case.id_str for case in cases), durations)
+    return lambda case: -estimates.get(case.id_str, 0.0)
+
+
+def predict_makespan(durations: Iterable[float], jobs: int) -> float:
+    """Return the wall time of durations started in order on `jobs` workers.
+
+    Each duration starts on the first worker to become idle.
+
+    >>> predict_makespan([3.0, 2.0, 2.0, 1.0], 2)
+    4.0
+    >>> predict_makespan([1.0, 2.0, 2.0, 3.0], 2)
+    5.0
+    """
+    workers = [0.0] * max(jobs, 1)
+    for duration in durations:
+        heapq.heappush(workers, heapq.heappop(workers) + duration)
+    return max(workers)
+
+
+def plan_makespan(
+    cases: Iterable[CaseModel],
+    durations: Mapping[str, float],
+    jobs: int,
+    order: Callable[[CaseModel], Any] | None = None,
+) -> float:
+    """Predict the wall time of running `cases` in `order` on `jobs` workers."""
+    planned = list(cases)
+    if order is not None:
+        planned.sort(key=order)
+    estimates = estimate_durations((case.id_str for case in planned), durations)
+    return predict_makespan((estimates[case.id_str] for case in planned), jobs)
+
+
+def load_durations(path: str | Path) -> dict[str, float]:
+    """Read per-case durations from a JSON report or a cache state file."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    cases = data.get("cases", {}) if isinstance(data, Mapping) else {}
+    if isinstance(cases, Mapping):
+        items = ((key, value.get("duration")) for key, value in cases.items())
+    else:
+        items = ((item.get("id"), item.get("duration")) for item in cases)
+    return {str(key): float(value) for key, value in items if value is not None}
+
+
+def dependency_graph(suite: SuiteModel) -> dict[str, tuple[str, ...]]:
+    """Return the prerequisite case ids of every case declaring `needs`.
+
+    A reference is a dotted id or a name; referencing a group requires all
+    of its cases. Needs declared on a group apply to every case it contains.
+
+    Raises:
+        ConfigError: A reference is unknown, ambiguous or creates a cycle.
+    """
+    by_id: dict[str, TestNode] = {}
+    by_name: dict[str, list[TestNode]] = {}
+
+    def _index(nodes: Iterable[TestNode]) -> None:
+        for node in nodes:
+            by_id[node.id_str] = node
+            if node.name:
+                by_name.setdefault(node.name, []).append(node)
+            if isinstance(node, GroupModel):
+                _index(node.tests)
+
+    def _resolve(reference: str, owner: TestNode) -> list[str]:
+        if reference in by_id:
+            node = by_id[reference]
+        elif len(by_name.get(reference, ())) == 1:
+            node = by_name[reference][0]
+        elif reference in by_name:
+            raise ConfigError(
+                f"Test {owner.id_str} needs '{reference}', which names several tests."
+            )
+        else:
+            raise ConfigError(f"Test {owner.id_str} needs unknown test '{reference}'.")
+        if isinstance(node, CaseModel):
+            return [node.id_str]
+        return [case.id_str for case in node.iter_cases()]
+
+    graph: dict[str, tuple[str, ...]] = {}
+
+    def _walk(nodes: Iterable[TestNode], inherited: tuple[str, ...]) -> None:
+        for node in nodes:
+            required = list(inherited)
+            for reference in node.needs:
+                required.extend(_resolve(reference, node))
+            if isinstance(node, GroupModel):
+                _walk(node.tests, tuple(dict.fromkeys(required)))
+            elif required:
+                graph[node.id_str] = tuple(dict.fromkeys(required))
+
+    _index(suite.tests)
+    _walk(suite.tests, ())
+    _check_acyclic(graph)
+    return graph
+
+
+def _check_acyclic(graph: Mapping[str, Iterable[str]]) -> None:
+    """Raise `ConfigError` describing the first dependency cycle found."""
+    done: set[str] = set()
+
+    def _visit(node: str, path: list[str]) -> None:
+        if node in path:
+            cycle = " -> ".join([*path[path.index(node) :], node])
+            raise ConfigError(f"Circular test dependency: {cycle}.")
+        if node in done:
+            return
+        path.append(node)
+        for required in graph.get(node, ()):
+            _visit(required, path)
+        path.pop()
+        done.add(node)
+
+    for node in graph:
+        _visit(node, [])
@@ -0,0 +1,256 @@
+"""Programs started once for a group and reached over sockets."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+import contextlib
+from dataclasses import dataclass
+import os
+import queue
+import socket
+import subprocess
+import threading
+import time
+from typing import Any, Callable
+
+from baygon.addresses import parse_address
+from baygon.executable import spill_file
+from baygon.runtime.dialogue import DEFAULT_TIMEOUT
+
+START_TIMEOUT = 5.0
+"""Seconds a service has to become ready when none is given."""
+
+STOP_GRACE = 2.0
+"""Seconds a service has to exit once asked to terminate."""
+
+POLL_INTERVAL = 0.02
+
+
+@dataclass(frozen=True)
+class Exchange:
+    """Response received for one request."""
+
+    response: bytes
+    accepted: bool
+    eof: bool = False
+    error: OSError | None = None
+    duration: float | None = None
+
+
+class Service:
+    """A program running in the background, reached over local sockets.
+
+    Its outputs are written into anonymous files, so a chatty service never
+    blocks on a full pipe. Idle connections are kept for the next requests,
+    up to `connections` at a time.
+    """
+
+    def __init__(
+        self,
+        argv: Sequence[str],
+        *,
+        address: str,
+        ready: str | None = None,
+        env: dict[str, str] | None = None,
+        cwd: str | None = None,
+        connections: int = 4,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.argv = [str(arg) for arg in argv]
+        self.address = address
+        self.ready = ready
+        self.timeout = timeout
+        self._family, self._target = parse_address(address)
+        self._idle: queue.LifoQueue[socket.socket] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(connections)
+        self._outputs = [spill_file("stdout"), spill_file("stderr")]
+        self._start = time.perf_counter()
+        self.process = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.DEVNULL,
+            stdout=self._outputs[0],
+            stderr=self._outputs[1],
+            env=env,
+            cwd=cwd,
+        )
+
+    @property
+    def stdout(self) -> bytes:
+        return _read_all(self._outputs[0])
+
+    @property
+    def stderr(self) -> bytes:
+        return _read_all(self._outputs[1])
+
+    @property
+    def duration(self) -> float:
+        return round(time.perf_counter() - self._start, 6)
+
+    def wait_ready(self, timeout: float = START_TIMEOUT) -> bool:
+        """Wait until the service writes its ready text or accepts connections.
+
+        Returns:
+            False if the service exited or the timeout expired first.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and self.process.poll() is None:
+            if self.ready is not None:
+                if self.ready.encode() in self.stdout + self.stderr:
+                    return True
+            else:
+                with contextlib.suppress(OSError):
+                    self._idle.put(self._connect(deadline - time.monotonic()))
+                    return True
+            time.sleep(POLL_INTERVAL)
+        return False
+
+    def request(
+        self,
+        data: bytes,
+        accept: Callable[[bytes], bool],
+        timeout: float | None = None,
+    ) -> Exchange:
+        """Send `data` on a pooled connection and read until `accept` holds.
+
+        A connection is kept for the next requests only if its response was
+        accepted before the service closed it.
+        """
+        timeout = timeout or self.timeout
+        start = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        response = bytearray()
+        accepted = eof = False
+        error = None
+        self._slots.acquire()
+        connection = None
+        try:
+            connection = self._acquire(timeout)
+            connection.settimeout(timeout)
+            connection.sendall(data)
+            while not (accepted := accept(bytes(response))):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                connection.settimeout(remaining)
+                chunk = connection.recv(1 << 16)
+                if not chunk:
+                    eof = True
+                    break
+                response += chunk
+        except socket.timeout:
+            pass
+        except OSError as exc:
+            error = exc
+        finally:
+            if connection is not None:
+                if accepted and not eof:
+                    self._idle.put(connection)
+                else:
+                    connection.close()
+            self._slots.release()
+        return Exchange(
+            bytes(response),
+            accepted and error is None,
+            eof,
+            error,
+            round(time.perf_counter() - start, 6),
+        )
+
+    def stop(self, timeout: float = STOP_GRACE) -> int:
+        """Close the connections, then terminate the service.
+
+        Returns:
+            The exit status of the service.
+        """
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        return self.process.returncode
+
+    def close(self) -> None:
+        """Release the files holding the outputs."""
+        for stream in self._outputs:
+            stream.close()
+
+    def _acquire(self, timeout: float) -> socket.socket:
+        """Return an idle connection still open, or a new one."""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect(timeout)
+            if _drain(connection):
+                return connection
+            connection.close()
+
+    def _connect(self, timeout: float) -> socket.socket:
+        connection = socket.socket(self._family, socket.SOCK_STREAM)
+        connection.settimeout(max(timeout, POLL_INTERVAL))
+        try:
+            connection.connect(self._target)
+        except OSError:
+            connection.close()
+            raise
+        return connection
+
+
+def _drain(connection: socket.socket) -> bool:
+    """Discard what is left of a previous response on an idle connection.
+
+    Returns:
+        False if the service closed the connection meanwhile.
+    """
+    connection.setblocking(False)
+    try:
+        while True:
+            if not connection.recv(1 << 16):
+                return False
+    except (BlockingIOError, InterruptedError):
+        return True
+    except OSError:
+        return False
+
+
+def _read_all(stream) -> bytes:
+    size = os.fstat(stream.fileno()).st_size
+    return os.pread(stream.fileno(), size, 0) if size else b""
+
+
+class NoResponse:
+    """Issue reported when a request got no matching response."""
+
+    def __init__(self, timeout: float, eof: bool, on=None, test=None, **kwargs):
+        self.timeout = timeout
+        self.eof = eof
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        if self.eof:
+            return "The service closed the connection before a matching response."
+        return f"No matching response within {self.timeout:g} s."
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
+
+
+class ServiceUnavailable:
+    """Issue reported when a request could not reach the service."""
+
+    def __init__(self, address: str, error: OSError, on=None, test=None, **kwargs):
+        self.address = address
+        self.error = error
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return f"Could not reach the service at {self.address}: {self.error}."
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
@@ -0,0 +1,80 @@
+"""Early verdicts on the standard output while the program still runs."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from baygon.core.models import ConditionModel
+
+
+@dataclass(frozen=True)
+class StreamCheck:
+    """Condition on stdout that can fail before the program exits.
+
+    Without `negated`, the output must be exactly `expected` and fails as soon
+    as it diverges. With `negated`, it fails as soon as `expected` appears.
+    """
+
+    condition: ConditionModel
+    expected: bytes
+    negated: bool = False
+
+
+class OutputMonitor:
+    """Feed chunks of stdout to checks and tell when one of them failed.
+
+    Only the last bytes needed to find a forbidden text across two chunks are
+    kept, so memory does not grow with the output.
+
+        >>> monitor = OutputMonitor([StreamCheck(ConditionModel(), b"42")])
+        >>> monitor(b"4"), monitor(b"3")
+        (False, True)
+        >>> monitor.size
+        2
+    """
+
+    def __init__(self, checks: Sequence[StreamCheck]):
+        self.checks = tuple(checks)
+        self.failed: StreamCheck | None = None
+        self.size = 0
+        self._overlap = max(
+            (len(check.expected) - 1 for check in self.checks if check.negated),
+            default=0,
+        )
+        self._tail = b""
+
+    def __call__(self, chunk: bytes) -> bool:
+        """Return True once the output can no longer satisfy every check."""
+        if self.failed is not None:
+            return True
+        start, self.size = self.size, self.size + len(chunk)
+        window = self._tail + chunk
+        for check in self.checks:
+            if check.negated:
+                failed = check.expected in window
+            else:
+                failed = chunk != check.expected[start : self.size]
+            if failed:
+                self.failed = check
+                return True
+        self._tail = window[len(window) - self._overlap :] if self._overlap else b""
+        return False
+
+
+class EarlyExit:
+    """Issue reported when a program is stopped because its output failed."""
+
+    def __init__(self, size: int, on=None, test=None, **kwargs):
+        self.size = size
+        self.on = on
+        self.test = test
+
+    def __str__(self):
+        return (
+            f"Program stopped after {self.size} bytes on {self.on}: "
+            "the test could no longer pass."
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self!s}>"
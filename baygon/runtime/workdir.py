@@ -0,0 +1,114 @@
+"""Private working directories copied from a fixture template."""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+import shutil
+import stat
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no reflinks
+    fcntl = None
+
+logger = logging.getLogger("baygon")
+
+FICLONE = 0x40049409
+"""Linux ioctl sharing the extents of a file (reflink) on CoW filesystems."""
+
+
+def default_root(template: Path) -> Path | None:
+    """Return the directory holding working copies of `template`.
+
+    Reflinks and hard links only work within a filesystem, so copies are made
+    next to the template, on tmpfs only when the template already lives there.
+
+    Returns:
+        None, for the system temporary directory, when the directory of the
+        template is not writable.
+    """
+    parent = Path(template).resolve().parent
+    if os.access(parent, os.W_OK | os.X_OK):
+        return parent
+    return None
+
+
+def clone_file(source: Path, destination: Path) -> str:
+    """Populate `destination` with the content of `source` as cheaply as possible.
+
+    A reflink is tried first since it is safe to modify. Read-only files are
+    then hard linked, and anything else is copied.
+
+    Returns:
+        The method used: "reflink", "hardlink" or "copy".
+    """
+    if fcntl is not None:
+        with source.open("rb") as src, destination.open("wb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            except OSError:
+                pass
+            else:
+                shutil.copymode(source, destination)
+                return "reflink"
+    mode = source.stat().st_mode
+    if not mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH):
+        destination.unlink(missing_ok=True)
+        try:
+            os.link(source, destination)
+        except OSError:
+            pass
+        else:
+            return "hardlink"
+    shutil.copy2(source, destination)
+    return "copy"
+
+
+def populate(template: Path, destination: Path) -> dict[str, int]:
+    """Recreate the tree of `template` inside the existing `destination`.
+
+    Returns:
+        How many files were populated with each method.
+    """
+    methods = {"reflink": 0, "hardlink": 0, "copy": 0}
+    for current, dirs, files in os.walk(template):
+        source_dir = Path(current)
+        target_dir = destination / source_dir.relative_to(template)
+        for name in dirs:
+            source = source_dir / name
+            if source.is_symlink():
+                (target_dir / name).symlink_to(source.readlink())
+            else:
+                (target_dir / name).mkdir()
+        for name in files:
+            source = source_dir / name
+            if source.is_symlink():
+                (target_dir / name).symlink_to(source.readlink())
+            else:
+                methods[clone_file(source, target_dir / name)] += 1
+    return methods
+
+
+def create_workdir(template: str | Path, root: Path | None = None) -> Path:
+    """Return a new private directory populated from `template`.
+
+    It is created in `root`, or on the filesystem of the template by default.
+    """
+    if root is None:
+        root = default_root(Path(template))
+    path = Path(tempfile.mkdtemp(prefix="baygon-", dir=root))
+    try:
+        methods = populate(Path(template), path)
+    except BaseException:
+        remove_workdir(path)
+        raise
+    logger.debug("Working directory %s from %s: %s", path, template, methods)
+    return path
+
+
+def remove_workdir(path: Path) -> None:
+    """Delete a working directory and everything the program left in it."""
+    shutil.rmtree(path, ignore_errors=True)
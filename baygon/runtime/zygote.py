@@ -0,0 +1,214 @@
+"""Warm Python interpreter forking a child for each run of a script.
+
+This script is started with the interpreter named by the shebang of the
+tested script and only depends on the standard library. It imports the
+standard modules the script imports, then waits on a control socket for
+runs: each request carries the arguments, environment and directory of the
+run along with its standard streams, and is answered by the process id of
+the forked child, then by its exit status.
+
+A script next to a file named like a module the zygote has loaded, such as
+its own `json`, would import that file when started directly but get the
+loaded module in a child. The zygote then does not become ready, and the
+runs of the script are started directly.
+"""
+
+from __future__ import annotations
+
+import ast
+import contextlib
+import gc
+import io
+import json
+import os
+from pathlib import Path
+import pkgutil  # imported by runpy.run_path, once here instead of in every run
+import runpy
+import selectors
+import signal
+import socket
+import sys
+from typing import Any, NoReturn
+
+MAX_REQUEST = 1 << 20
+"""Largest request accepted on the control socket, in bytes."""
+
+STREAMS = ("stdin", "stdout", "stderr")
+
+
+def main() -> None:
+    control = socket.socket(fileno=int(sys.argv[1]))
+    preload(sys.argv[2])
+    if shadowed(Path(sys.argv[2]).resolve().parent):
+        control.sendall(b'{"ready": false}')
+        return
+    # Objects of the zygote are left out of the collections of the children,
+    # which would otherwise copy every page they touch.
+    gc.freeze()
+    wakeup, alarm = os.pipe()
+    os.set_blocking(wakeup, False)
+    os.set_blocking(alarm, False)
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+    signal.set_wakeup_fd(alarm)
+    selector = selectors.DefaultSelector()
+    selector.register(control, selectors.EVENT_READ)
+    selector.register(wakeup, selectors.EVENT_READ)
+    replies: dict[int, socket.socket] = {}
+    control.sendall(b'{"ready": true}')
+    while True:
+        for key, _ in selector.select():
+            if key.fileobj is not control:
+                _drain(wakeup)
+                _reap(replies)
+                continue
+            message, fds, _, _ = socket.recv_fds(control, MAX_REQUEST, 4)
+            if not message:
+                return
+            pid = os.fork()
+            if pid == 0:
+                # The child keeps nothing of the server but the run it serves.
+                signal.set_wakeup_fd(-1)
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                selector.close()
+                for fd in (control.detach(), wakeup, alarm, fds[3]):
+                    os.close(fd)
+                for reply in replies.values():
+                    reply.close()
+                run(json.loads(message), fds[:3])
+            for fd in fds[:3]:
+                os.close(fd)
+            reply = socket.socket(fileno=fds[3])
+            _send(reply, {"pid": pid})
+            replies[pid] = reply
+
+
+def preload(script: str) -> None:
+    """Import the standard modules imported by `script`.
+
+    Modules shadowed by a file or package next to the script are left out,
+    as the script would import those instead.
+    """
+    stdlib = getattr(sys, "stdlib_module_names", frozenset())
+    folder = Path(script).resolve().parent
+    try:
+        tree = ast.parse(Path(script).read_bytes())
+    except (OSError, SyntaxError, ValueError):
+        return
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+    # Only the standard library is searched, whatever the zygote directory.
+    first = sys.path.pop(0)
+    for name in sorted(names & stdlib):
+        if _shadows(folder, name):
+            continue
+        with contextlib.suppress(Exception):
+            __import__(name)
+    sys.path.insert(0, first)
+
+
+def shadowed(folder: Path) -> list[str]:
+    """Return the loaded modules a script in `folder` would import from it."""
+    names = {name.partition(".")[0] for name in sys.modules}
+    names -= set(sys.builtin_module_names)
+    return sorted(name for name in names if _shadows(folder, name))
+
+
+def _shadows(folder: Path, name: str) -> bool:
+    return (folder / f"{name}.py").exists() or (folder / name).is_dir()
+
+
+def run(request: dict[str, Any], fds: list[int]) -> None:
+    """Run the script in the forked child, as `python script args` would."""
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+    for fd in set(fds) - {0, 1, 2}:
+        os.close(fd)
+    if request.get("cwd") is not None:
+        os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+    for fd, name in enumerate(STREAMS):
+        stream = _reopen(fd, name, getattr(sys, name))
+        setattr(sys, name, stream)
+        setattr(sys, f"__{name}__", stream)
+    execute(request["argv"])
+
+
+def execute(argv: list[str]) -> NoReturn:
+    """Run a script as `__main__`, then raise `SystemExit` with its status.
+
+    The stack is unwound with `SystemExit`, so the interpreter exits as
+    usual: threads are joined, exit handlers run and the outputs flushed.
+    """
+    script = argv[0]
+    sys.argv = list(argv)
+    sys.path[0] = str(Path(script).resolve().parent)
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as error:
+        sys.exit(error.code)
+    except BaseException as error:
+        traceback = error.__traceback__
+        # Frames of the zygote and runpy come before those of the script.
+        while traceback and traceback.tb_frame.f_code.co_filename != script:
+            traceback = traceback.tb_next
+        sys.excepthook(type(error), error.with_traceback(traceback), traceback)
+        sys.exit(1)
+    sys.exit(0)
+
+
+def _reopen(fd: int, name: str, previous: io.TextIOWrapper) -> io.TextIOWrapper:
+    """Open a standard stream configured like the one of the interpreter."""
+    unbuffered = isinstance(previous.buffer, io.RawIOBase)
+    raw = io.FileIO(fd, "r" if fd == 0 else "w", closefd=False)
+    raw.name = f"<{name}>"
+    if unbuffered and fd:
+        buffer = raw
+    elif fd == 0:
+        buffer = io.BufferedReader(raw)
+    else:
+        buffer = io.BufferedWriter(raw)
+    stream = io.TextIOWrapper(
+        buffer,
+        encoding=previous.encoding,
+        errors=previous.errors,
+        newline="\n",
+        line_buffering=previous.line_buffering or (fd > 0 and raw.isatty()),
+        write_through=previous.write_through,
+    )
+    stream.mode = "r" if fd == 0 else "w"
+    return stream
+
+
+def _reap(replies: dict[int, socket.socket]) -> None:
+    """Report the exit status of every child that exited."""
+    while replies:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        reply = replies.pop(pid, None)
+        if reply is not None:
+            with contextlib.suppress(OSError):
+                _send(reply, {"status": os.waitstatus_to_exitcode(status)})
+            reply.close()
+
+
+def _send(reply: socket.socket, message: dict[str, Any]) -> None:
+    reply.sendall(json.dumps(message).encode() + b"\n")
+
+
+def _drain(fd: int) -> None:
+    with contextlib.suppress(BlockingIOError):
+        while os.read(fd, 4096):
+            pass
+
+
+if __name__ == "__main__":
+    main()
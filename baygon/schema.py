@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 from collections.abc import Mapping, Sequence
+import shlex
+import socket
 from typing import Any, Literal, Union
 
 from pydantic import (
@@ -16,7 +18,10 @@ from pydantic import (
 )
 import yaml
 
+from .addresses import parse_address
 from .error import ConfigError, ConfigSyntaxError
+from .generators import get_registered_generators
+from .signatures import parse_signature
 
 
 def _coerce_value(value: Any) -> str:
@@ -29,6 +34,67 @@ def _coerce_value(value: Any) -> str:
     return str(value)
 
 
+def _coerce_hex(value: Any) -> Any:
+    """Normalize expected bytes, given in hexadecimal or as YAML binary data."""
+
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).hex()
+    if not isinstance(value, str):
+        return value
+    try:
+        return bytes.fromhex(value).hex()
+    except ValueError:
+        raise ValueError("equals-bytes must be pairs of hexadecimal digits") from None
+
+
+def _coerce_digest(value: Any) -> Any:
+    """Normalize an expected SHA-256 digest to lowercase hexadecimal."""
+
+    if not isinstance(value, str):
+        return value
+    digest = value.strip().lower()
+    if len(digest) != 64 or any(char not in "0123456789abcdef" for char in digest):
+        raise ValueError("sha256 must be 64 hexadecimal digits")
+    return digest
+
+
+def _coerce_needs(value: Any) -> list[str]:
+    """Coerce a `needs` value to a list of case references."""
+
+    if value is None:
+        return []
+    if isinstance(value, (str, int, float)):
+        value = [value]
+    if not isinstance(value, Sequence):
+        raise TypeError("needs must be a reference or a list of references")
+    return [_coerce_value(item) for item in value]
+
+
+def _coerce_commands(value: Any) -> Any:
+    """Coerce setup or teardown commands to a list of argument vectors.
+
+    A string is split like a shell command line, without running a shell.
+    Other values are left for the field validation to reject.
+    """
+
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, Sequence):
+        return value
+    commands: list[Any] = []
+    for item in value:
+        if isinstance(item, str):
+            item = shlex.split(item)
+        elif isinstance(item, Sequence):
+            item = [_coerce_value(part) for part in item]
+        if not item:
+            raise ValueError("a command cannot be empty")
+        commands.append(item)
+    return commands
+
+
 def _coerce_match_list(value: Any) -> list[Any]:
     """Coerce the match value to a list of case dictionaries."""
 
@@ -134,6 +200,9 @@ class CaseCondition(BaseModel):
     regex: str | None = None
     contains: str | None = None
     expected: str | None = None
+    file: str | None = None
+    equals_bytes: str | None = Field(default=None, alias="equals-bytes")
+    sha256: str | None = None
     not_conditions: list[NegatedCondition] | None = Field(default=None, alias="not")
 
     @field_validator("equals", "regex", "contains", "expected", mode="before")
@@ -143,13 +212,250 @@ class CaseCondition(BaseModel):
             return None
         return _coerce_value(value)
 
+    @field_validator("equals_bytes", mode="before")
+    @classmethod
+    def _convert_bytes(cls, value: Any):
+        return _coerce_hex(value)
+
+    @field_validator("sha256", mode="before")
+    @classmethod
+    def _convert_digest(cls, value: Any):
+        return _coerce_digest(value)
+
     @model_validator(mode="after")
     def _ensure_matcher(self):
-        if not any([self.equals, self.regex, self.contains, self.not_conditions]):
+        if self.equals_bytes is not None or self.sha256 is not None:
+            return self
+        if not any(
+            [self.equals, self.regex, self.contains, self.file, self.not_conditions]
+        ):
             raise ValueError("A condition must define at least one matcher")
         return self
 
 
+class FileExpectation(BaseModel):
+    """Checks applied to a file written by the program."""
+
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+
+    same_as: str | None = Field(default=None, alias="same-as")
+    conditions: list[CaseCondition] = Field(default_factory=list)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _convert_conditions(cls, value: Any):
+        if isinstance(value, Mapping) and {"same-as", "conditions"} & set(value):
+            return value
+        return {"conditions": _coerce_match_list(value)}
+
+
+class DialogueStep(BaseModel):
+    """Exchange with a running program: text to send, then output to expect."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    send: str | None = None
+    expect: list[CaseCondition] = Field(default_factory=list)
+    timeout: float | None = Field(default=None, gt=0)
+
+    @field_validator("send", mode="before")
+    @classmethod
+    def _convert_send(cls, value: Any):
+        if value is None:
+            return None
+        return _coerce_value(value)
+
+    @field_validator("expect", mode="before")
+    @classmethod
+    def _convert_expect(cls, value: Any):
+        return _coerce_match_list(value)
+
+    @model_validator(mode="after")
+    def _ensure_action(self):
+        if self.send is None and not self.expect:
+            raise ValueError("A dialogue step must send or expect something")
+        return self
+
+
+class PipelineStage(BaseModel):
+    """Command of a pipeline: another program, or the one under test."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    executable: str | None = None
+    args: list[str] = Field(default_factory=list)
+    exit: int | None = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def _convert_command(cls, value: Any):
+        if isinstance(value, Mapping) or not isinstance(value, (str, Sequence)):
+            return value
+        ((executable, *args),) = _coerce_commands([value])
+        return {"executable": executable, "args": args}
+
+    @field_validator("args", mode="before")
+    @classmethod
+    def _convert_args(cls, value: Any):
+        if value is None:
+            return []
+        if not isinstance(value, Sequence) or isinstance(value, str):
+            return value
+        return [_coerce_value(item) for item in value]
+
+
+class ServiceConfig(BaseModel):
+    """Program started once for a group and reached over a socket."""
+
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+
+    address: str
+    args: list[str] = Field(default_factory=list)
+    env: dict[str, str] = Field(default_factory=dict)
+    ready: str | None = None
+    start_timeout: float | None = Field(default=None, gt=0, alias="start-timeout")
+    timeout: float | None = Field(default=None, gt=0)
+    connections: int = Field(4, gt=0)
+
+    @field_validator("address", mode="before")
+    @classmethod
+    def _convert_address(cls, value: Any):
+        value = _coerce_value(value)
+        family, target = parse_address(value)
+        if family != socket.AF_UNIX and target[1] == 0:
+            raise ValueError("address must not use port 0")
+        return value
+
+    @field_validator("args", mode="before")
+    @classmethod
+    def _convert_args(cls, value: Any):
+        if not isinstance(value, Sequence) or isinstance(value, str):
+            return value
+        return [_coerce_value(item) for item in value]
+
+    @field_validator("env", mode="before")
+    @classmethod
+    def _convert_env(cls, value: Any):
+        if not isinstance(value, Mapping):
+            return value
+        return {str(key): _coerce_value(val) for key, val in value.items()}
+
+
+class LoadTemplate(BaseModel):
+    """Request sent during a load test, with conditions on its response."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    request: str
+    response: list[CaseCondition] = Field(default_factory=list)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _convert_template(cls, value: Any):
+        if isinstance(value, Mapping):
+            return value
+        return {"request": value}
+
+    @field_validator("request", mode="before")
+    @classmethod
+    def _convert_request(cls, value: Any):
+        return _coerce_value(value)
+
+    @field_validator("response", mode="before")
+    @classmethod
+    def _convert_response(cls, value: Any):
+        return _coerce_match_list(value)
+
+
+class LoadConfig(BaseModel):
+    """Concurrent requests sent to the service of a group."""
+
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+
+    concurrency: int = Field(1, gt=0)
+    duration: float | None = Field(default=None, gt=0)
+    requests: int | None = Field(default=None, gt=0)
+    templates: list[LoadTemplate] = Field(min_length=1)
+    min_rps: float | None = Field(default=None, ge=0, alias="min-rps")
+    max_p99: float | None = Field(default=None, gt=0, alias="max-p99")
+    max_error_rate: float = Field(0, ge=0, le=1, alias="max-error-rate")
+
+    @model_validator(mode="after")
+    def _ensure_limit(self):
+        if self.duration is None and self.requests is None:
+            raise ValueError("A load test needs a duration or a number of requests")
+        return self
+
+
+class LibraryConfig(BaseModel):
+    """Shared library whose functions are called by the tests of a group."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    path: str
+    functions: dict[str, str] = Field(min_length=1)
+    timeout: float | None = Field(default=None, gt=0)
+
+    @field_validator("functions", mode="after")
+    @classmethod
+    def _check_signatures(cls, value: dict[str, str]):
+        for name, signature in value.items():
+            if not name.isidentifier():
+                raise ValueError(f"'{name}' is not a valid function name")
+            parse_signature(signature)
+        return value
+
+
+class StdinFile(BaseModel):
+    """File given to the program as its standard input."""
+
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+
+    file: str
+
+    @field_validator("file", mode="before")
+    @classmethod
+    def _convert_file(cls, value: Any):
+        return _coerce_value(value)
+
+
+class GenerateConfig(BaseModel):
+    """Property-based input generation attached to a test case."""
+
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+
+    count: int = Field(100, gt=0)
+    seed: int | None = None
+    jobs: int | None = Field(default=None, gt=0)
+    shrink: int = Field(200, ge=0)
+    reference: str | None = None
+    values: dict[str, dict[str, Any]]
+
+    @field_validator("values", mode="before")
+    @classmethod
+    def _validate_values(cls, value: Any):
+        if not isinstance(value, Mapping) or not value:
+            raise ValueError("generate.values must be a non-empty mapping")
+        known = get_registered_generators()
+        values: dict[str, dict[str, Any]] = {}
+        for name, spec in value.items():
+            if not str(name).isidentifier():
+                raise ValueError(f"'{name}' is not a valid variable name")
+            if isinstance(spec, str):
+                spec = {spec: []}
+            if not isinstance(spec, Mapping) or len(spec) != 1:
+                raise ValueError(f"'{name}' must define exactly one generator")
+            ((kind, args),) = spec.items()
+            if str(kind).lower() not in known:
+                raise ValueError(f"Unknown generator '{kind}' for '{name}'")
+            if args is None:
+                args = []
+            elif not isinstance(args, (Mapping, list, tuple)):
+                args = [args]
+            values[str(name)] = {str(kind).lower(): args}
+        return values
+
+
 class CommonSettings(BaseModel):
     """Shared configuration items for suites, groups and test cases."""
 
@@ -160,6 +466,8 @@ class CommonSettings(BaseModel):
     points: float | int | None = None
     weight: float | int | None = None
     min_points: float | int = Field(0.1, alias="min-points")
+    workdir: str | None = None
+    early_exit: bool | None = Field(default=None, alias="early-exit")
 
     @model_validator(mode="after")
     def _check_points_weight(self):
@@ -168,6 +476,18 @@ class CommonSettings(BaseModel):
         return self
 
 
+class FixtureSettings(BaseModel):
+    """Commands run once before and after the tests of a group or suite."""
+
+    setup: list[list[str]] = Field(default_factory=list)
+    teardown: list[list[str]] = Field(default_factory=list)
+
+    @field_validator("setup", "teardown", mode="before")
+    @classmethod
+    def _convert_commands(cls, value: Any):
+        return _coerce_commands(value)
+
+
 class TestCaseModel(CommonSettings):
     """Single executable test case."""
 
@@ -175,11 +495,22 @@ class TestCaseModel(CommonSettings):
 
     args: list[str] = Field(default_factory=list)
     env: dict[str, str] = Field(default_factory=dict)
-    stdin: str | None = ""
+    stdin: str | StdinFile | None = ""
     stdout: list[CaseCondition] = Field(default_factory=list)
     stderr: list[CaseCondition] = Field(default_factory=list)
     repeat: int = 1
     exit: int | str | bool | None = None
+    generate: GenerateConfig | None = None
+    needs: list[str] = Field(default_factory=list)
+    files: dict[str, FileExpectation] = Field(default_factory=dict)
+    dialogue: list[DialogueStep] = Field(default_factory=list)
+    pipeline: list[PipelineStage] = Field(default_factory=list)
+    request: str | None = None
+    response: list[CaseCondition] = Field(default_factory=list)
+    load: LoadConfig | None = None
+    call: str | None = None
+    returns: bool | int | float | str | None = None
+    tolerance: float | None = Field(default=None, ge=0)
     test_id: list[int] = Field(default_factory=list, alias="test_id")
 
     @field_validator("args", mode="before")
@@ -203,31 +534,109 @@ class TestCaseModel(CommonSettings):
     @field_validator("stdin", mode="before")
     @classmethod
     def _convert_stdin(cls, value: Any):
-        if value is None:
-            return None
+        if value is None or isinstance(value, Mapping):
+            return value
         return _coerce_value(value)
 
-    @field_validator("stdout", "stderr", mode="before")
+    @field_validator("stdout", "stderr", "response", mode="before")
     @classmethod
     def _convert_matches(cls, value: Any):
         return _coerce_match_list(value)
 
+    @field_validator("request", mode="before")
+    @classmethod
+    def _convert_request(cls, value: Any):
+        if value is None:
+            return None
+        return _coerce_value(value)
+
+    @field_validator("needs", mode="before")
+    @classmethod
+    def _convert_needs(cls, value: Any):
+        return _coerce_needs(value)
 
-class TestGroupModel(CommonSettings):
+    @model_validator(mode="after")
+    def _check_request(self):
+        if self.response and self.request is None:
+            raise ValueError("A response needs a request")
+        if self.request is not None and self.load is not None:
+            raise ValueError("A request cannot be combined with load")
+        if (self.request is not None or self.load is not None) and (
+            self.args
+            or self.stdin
+            or self.dialogue
+            or self.pipeline
+            or self.generate is not None
+        ):
+            raise ValueError(
+                "A request or load cannot be combined with args, stdin, "
+                "dialogue, pipeline or generate"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def _check_call(self):
+        if self.call is None:
+            if self.returns is not None or self.tolerance is not None:
+                raise ValueError("'returns' and 'tolerance' need a call")
+            return self
+        if (
+            self.stdin
+            or self.stdout
+            or self.stderr
+            or self.exit is not None
+            or self.files
+            or self.dialogue
+            or self.pipeline
+            or self.request is not None
+            or self.load is not None
+            or self.generate is not None
+        ):
+            raise ValueError(
+                "A call only accepts args, returns and tolerance as test inputs "
+                "and expectations"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def _check_dialogue(self):
+        if self.dialogue and (self.stdin or self.generate is not None):
+            raise ValueError("A dialogue cannot be combined with stdin or generate")
+        return self
+
+    @model_validator(mode="after")
+    def _check_pipeline(self):
+        if self.pipeline and (self.args or self.dialogue or self.generate is not None):
+            raise ValueError(
+                "A pipeline cannot be combined with args, dialogue or generate"
+            )
+        return self
+
+
+class TestGroupModel(CommonSettings, FixtureSettings):
     """Group of tests that share settings."""
 
     model_config = ConfigDict(extra="forbid", populate_by_name=True)
 
     tests: list[BaygonTest]
+    needs: list[str] = Field(default_factory=list)
+    fail_fast: bool = Field(False, alias="fail-fast")
+    service: ServiceConfig | None = None
+    library: LibraryConfig | None = None
     test_id: list[int] = Field(default_factory=list, alias="test_id")
 
+    @field_validator("needs", mode="before")
+    @classmethod
+    def _convert_needs(cls, value: Any):
+        return _coerce_needs(value)
+
 
 BaygonTest = Union[TestCaseModel, TestGroupModel]
 
 TestGroupModel.model_rebuild()
 
 
-class BaygonConfig(CommonSettings):
+class BaygonConfig(CommonSettings, FixtureSettings):
     """Top-level Baygon configuration."""
 
     model_config = ConfigDict(extra="forbid", populate_by_name=True)
@@ -240,6 +649,13 @@ class BaygonConfig(CommonSettings):
     report: str | None = None
     format: Literal["json", "yaml"] | None = None
     table: bool = False
+    time_budget: float | None = Field(default=None, gt=0, alias="time-budget")
+    capture: Literal["pipe", "file"] | None = None
+    launcher: Literal["spawn", "prefork"] | None = None
+    decode_errors: (
+        Literal["strict", "replace", "ignore", "backslashreplace", "surrogateescape"]
+        | None
+    ) = Field(default=None, alias="decode-errors")
 
     @field_validator("version", mode="before")
     @classmethod
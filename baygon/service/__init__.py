@@ -0,0 +1,15 @@
+"""Long-running grading service."""
+
+from .fairness import FairScheduler
+from .jobs import Job, JobStore
+from .server import GradingService, SuiteCache, create_server, server_address
+
+__all__ = [
+    "FairScheduler",
+    "GradingService",
+    "Job",
+    "JobStore",
+    "SuiteCache",
+    "create_server",
+    "server_address",
+]
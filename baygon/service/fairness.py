@@ -0,0 +1,92 @@
+"""Choose which queued job runs next when several owners share the service.
+
+Jobs with a higher priority always run first. Among jobs of the same
+priority, owners take turns: the owner with the fewest running jobs goes
+first, then the one served least recently. Owners may be capped to a number
+of concurrently running jobs.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+import itertools
+import threading
+
+PRIORITIES = {"interactive": 100, "normal": 50, "nightly": 0}
+DEFAULT_PRIORITY = PRIORITIES["normal"]
+DEFAULT_OWNER = "anonymous"
+
+
+def parse_priority(value: int | str | None) -> int:
+    """Return the numeric priority of a level name or number.
+
+    >>> parse_priority("interactive")
+    100
+    >>> parse_priority(7)
+    7
+    """
+    if value is None:
+        return DEFAULT_PRIORITY
+    if isinstance(value, bool):
+        raise TypeError("priority must be a number or a level name")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value in PRIORITIES:
+        return PRIORITIES[value]
+    levels = ", ".join(PRIORITIES)
+    raise ValueError(f"unknown priority {value!r}, expected a number or {levels}")
+
+
+@dataclass(frozen=True)
+class QueueHead:
+    """Oldest pending job of an owner at a given priority."""
+
+    job_id: int
+    owner: str
+    priority: int
+
+
+class FairScheduler:
+    """Fair queuing policy with priorities and per-owner caps."""
+
+    def __init__(
+        self,
+        *,
+        owner_cap: int | None = None,
+        caps: Mapping[str, int] | None = None,
+    ) -> None:
+        self.owner_cap = owner_cap
+        self.caps = dict(caps or {})
+        self._turn = itertools.count()
+        self._served: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def cap(self, owner: str) -> int | None:
+        """Return the maximum number of running jobs of `owner`."""
+        return self.caps.get(owner, self.owner_cap)
+
+    def choose(
+        self, heads: Iterable[QueueHead], running: Mapping[str, int]
+    ) -> QueueHead | None:
+        """Return the job to start next, or None if every owner is capped."""
+        eligible = [
+            head
+            for head in heads
+            if self.cap(head.owner) is None
+            or running.get(head.owner, 0) < self.cap(head.owner)
+        ]
+        if not eligible:
+            return None
+        top = max(head.priority for head in eligible)
+        with self._lock:
+            chosen = min(
+                (head for head in eligible if head.priority == top),
+                key=lambda head: (
+                    running.get(head.owner, 0),
+                    self._served.get(head.owner, -1),
+                    head.job_id,
+                ),
+            )
+            self._served[chosen.owner] = next(self._turn)
+        return chosen
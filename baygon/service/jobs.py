@@ -0,0 +1,284 @@
+"""Persistent job queue backed by SQLite.
+
+Jobs survive a restart of the service: jobs left running when the service
+stopped are put back in the queue when the store is opened again. The next
+job to run is chosen by a `FairScheduler`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+import json
+import math
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from .fairness import DEFAULT_OWNER, DEFAULT_PRIORITY, FairScheduler, QueueHead
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    suite TEXT NOT NULL,
+    executable TEXT,
+    status TEXT NOT NULL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    report TEXT,
+    error TEXT,
+    owner TEXT NOT NULL DEFAULT 'anonymous',
+    priority INTEGER NOT NULL DEFAULT 50
+)
+"""
+
+_MIGRATIONS = {
+    "owner": "ALTER TABLE jobs ADD COLUMN owner TEXT NOT NULL DEFAULT 'anonymous'",
+    "priority": "ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 50",
+}
+
+
+@dataclass(frozen=True)
+class Job:
+    """Grading request and its outcome."""
+
+    id: int
+    suite: str
+    executable: str | None
+    status: str
+    created: float
+    started: float | None = None
+    finished: float | None = None
+    report: Mapping[str, Any] | None = None
+    error: str | None = None
+    owner: str = DEFAULT_OWNER
+    priority: int = DEFAULT_PRIORITY
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "suite": self.suite,
+            "executable": self.executable,
+            "owner": self.owner,
+            "priority": self.priority,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "report": self.report,
+            "error": self.error,
+        }
+
+
+class JobStore:
+    """Job queue stored in a SQLite database shared by the service threads."""
+
+    def __init__(
+        self,
+        path: str | Path = ":memory:",
+        *,
+        scheduler: FairScheduler | None = None,
+    ) -> None:
+        self.path = str(path)
+        self.scheduler = scheduler or FairScheduler()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._db.row_factory = sqlite3.Row
+        with self._lock:
+            self._db.execute(_SCHEMA)
+            columns = {
+                row["name"] for row in self._db.execute("PRAGMA table_info(jobs)")
+            }
+            for column, statement in _MIGRATIONS.items():
+                if column not in columns:
+                    self._db.execute(statement)
+            self._db.execute(
+                "UPDATE jobs SET status = ?, started = NULL WHERE status = ?",
+                (PENDING, RUNNING),
+            )
+
+    def submit(
+        self,
+        suite: str,
+        executable: str | None = None,
+        *,
+        owner: str = DEFAULT_OWNER,
+        priority: int = DEFAULT_PRIORITY,
+    ) -> Job:
+        """Queue a new job and return it."""
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO jobs (suite, executable, status, created, owner, priority)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (suite, executable, PENDING, time.time(), owner, priority),
+            )
+            return self._get(cursor.lastrowid)
+
+    def claim(self) -> Job | None:
+        """Mark the job chosen by the scheduler as running and return it.
+
+        Returns None when nothing is pending or every waiting owner reached
+        its cap.
+        """
+        with self._lock:
+            heads = [
+                QueueHead(row["id"], row["owner"], row["priority"])
+                for row in self._db.execute(
+                    "SELECT MIN(id) AS id, owner, priority FROM jobs"
+                    " WHERE status = ? GROUP BY owner, priority",
+                    (PENDING,),
+                )
+            ]
+            if not heads:
+                return None
+            running = {
+                row["owner"]: row["n"]
+                for row in self._db.execute(
+                    "SELECT owner, COUNT(*) AS n FROM jobs"
+                    " WHERE status = ? GROUP BY owner",
+                    (RUNNING,),
+                )
+            }
+            head = self.scheduler.choose(heads, running)
+            if head is None:
+                return None
+            self._db.execute(
+                "UPDATE jobs SET status = ?, started = ? WHERE id = ?",
+                (RUNNING, time.time(), head.job_id),
+            )
+            return self._get(head.job_id)
+
+    def finish(self, job_id: int, report: Mapping[str, Any]) -> None:
+        """Store the report of a completed job."""
+        self._close(job_id, DONE, report=json.dumps(report))
+
+    def fail(self, job_id: int, error: str) -> None:
+        """Record why a job could not be graded."""
+        self._close(job_id, FAILED, error=error)
+
+    def get(self, job_id: int) -> Job | None:
+        with self._lock:
+            return self._get(job_id)
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of jobs in each status."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ).fetchall()
+        counts = dict.fromkeys((PENDING, RUNNING, DONE, FAILED), 0)
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+    def metrics(
+        self, *, window: float = 300.0, now: float | None = None
+    ) -> dict[str, Any]:
+        """Return queue depth, wait times and throughput.
+
+        Wait times cover the jobs started during the last `window` seconds
+        and the throughput counts the jobs completed during that window.
+        """
+        now = time.time() if now is None else now
+        since = now - window
+        with self._lock:
+            depth = {
+                str(row["priority"]): row["n"]
+                for row in self._db.execute(
+                    "SELECT priority, COUNT(*) AS n FROM jobs WHERE status = ?"
+                    " GROUP BY priority",
+                    (PENDING,),
+                )
+            }
+            owners, oldest = self._db.execute(
+                "SELECT COUNT(DISTINCT owner), MIN(created) FROM jobs"
+                " WHERE status = ?",
+                (PENDING,),
+            ).fetchone()
+            waits = sorted(
+                row[0]
+                for row in self._db.execute(
+                    "SELECT started - created FROM jobs WHERE started >= ?",
+                    (since,),
+                )
+            )
+            (completed,) = self._db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE finished >= ?", (since,)
+            ).fetchone()
+        return {
+            "queue": {
+                "depth": sum(depth.values()),
+                "by_priority": depth,
+                "owners": owners,
+                "oldest_wait": None if oldest is None else round(now - oldest, 3),
+            },
+            "wait": {
+                "count": len(waits),
+                "mean": round(sum(waits) / len(waits), 3) if waits else None,
+                "p50": _percentile(waits, 0.5),
+                "p95": _percentile(waits, 0.95),
+                "max": round(waits[-1], 3) if waits else None,
+            },
+            "throughput": {
+                "window": window,
+                "completed": completed,
+                "per_minute": round(completed * 60 / window, 3),
+            },
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _close(self, job_id: int, status: str, **values: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, finished = ?, report = ?, error = ?"
+                " WHERE id = ?",
+                (
+                    status,
+                    time.time(),
+                    values.get("report"),
+                    values.get("error"),
+                    job_id,
+                ),
+            )
+
+    def _get(self, job_id: int | None) -> Job | None:
+        row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return Job(
+            id=row["id"],
+            suite=row["suite"],
+            executable=row["executable"],
+            status=row["status"],
+            created=row["created"],
+            started=row["started"],
+            finished=row["finished"],
+            report=json.loads(row["report"]) if row["report"] else None,
+            error=row["error"],
+            owner=row["owner"],
+            priority=row["priority"],
+        )
+
+
+def _percentile(values: list[float], fraction: float) -> float | None:
+    """Return the nearest-rank percentile of sorted `values`.
+
+    >>> _percentile([1.0, 2.0, 3.0, 4.0], 0.5)
+    2.0
+    """
+    if not values:
+        return None
+    rank = max(math.ceil(fraction * len(values)), 1)
+    return round(values[rank - 1], 3)
@@ -0,0 +1,298 @@
+"""Grading daemon serving a JSON API over HTTP on TCP or Unix sockets.
+
+Endpoints:
+
+- `POST /jobs` with `{"suite": PATH, "executable": PATH}` queues a job.
+  Optional `owner` and `priority` fields drive the fair scheduling.
+- `GET /jobs/ID` returns a job and, once graded, its report.
+- `GET /status` returns the number of jobs in each status, the queue depth,
+  wait times and throughput.
+- `GET /metrics` returns the same figures in the Prometheus text format.
+"""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+from pathlib import Path
+import socket
+import socketserver
+import threading
+from typing import Any
+
+from baygon.addresses import is_local, parse_address
+from baygon.config.loader import discover_config
+from baygon.error import BaygonError
+from baygon.presentation.payload import report_payload
+from baygon.suite import SuiteContext, SuiteExecutor, SuiteLoader
+
+from .fairness import DEFAULT_OWNER, DEFAULT_PRIORITY, parse_priority
+from .jobs import Job, JobStore
+
+logger = logging.getLogger("baygon")
+
+
+class SuiteCache:
+    """Loaded suites kept in memory and reloaded when their file changes."""
+
+    def __init__(self, loader: SuiteLoader | None = None) -> None:
+        self._loader = loader or SuiteLoader()
+        self._entries: dict[Path, tuple[int, SuiteContext]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str | Path) -> SuiteContext:
+        """Return the suite found at `path`, loading it again if modified."""
+        config_path = discover_config(path)
+        mtime = config_path.stat().st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(config_path)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+            context = self._loader.load(path=config_path)
+            self._entries[config_path] = (mtime, context)
+        logger.info("Loaded suite %s", config_path)
+        return context
+
+
+class GradingService:
+    """Grade queued jobs on a bounded pool of threads."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        *,
+        jobs: int = 1,
+        suites: SuiteCache | None = None,
+        executor: SuiteExecutor | None = None,
+    ) -> None:
+        self.store = store
+        self.suites = suites or SuiteCache()
+        self._executor = executor or SuiteExecutor()
+        self._size = max(jobs, 1)
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def submit(
+        self,
+        suite: str,
+        executable: str | None = None,
+        *,
+        owner: str = DEFAULT_OWNER,
+        priority: int = DEFAULT_PRIORITY,
+    ) -> Job:
+        """Queue a job and wake up an idle grading thread."""
+        job = self.store.submit(suite, executable, owner=owner, priority=priority)
+        with self._wakeup:
+            self._wakeup.notify()
+        return job
+
+    def start(self) -> None:
+        self._stopping.clear()
+        for index in range(self._size):
+            thread = threading.Thread(
+                target=self._work, name=f"baygon-grader-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Let running jobs complete, then stop the grading threads."""
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "jobs": self.store.counts(),
+            "workers": self._size,
+            **self.store.metrics(),
+        }
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            with self._wakeup:
+                job = self.store.claim()
+                if job is None:
+                    self._wakeup.wait(timeout=1.0)
+                    continue
+            self._grade(job)
+            # A finished job may let a capped owner run again.
+            with self._wakeup:
+                self._wakeup.notify_all()
+
+    def _grade(self, job: Job) -> None:
+        try:
+            context = self.suites.get(job.suite)
+            report = self._executor.run(context, executable=job.executable)
+            payload = report_payload(report)
+        except (BaygonError, OSError, ValueError) as error:
+            logger.warning("Job %d failed: %s", job.id, error)
+            self.store.fail(job.id, str(error))
+            return
+        except Exception as error:
+            # A bug met by one job must not stop the thread grading the others.
+            logger.exception("Job %d crashed", job.id)
+            self.store.fail(job.id, f"{type(error).__name__}: {error}")
+            return
+        self.store.finish(job.id, payload)
+
+
+def _parse_job(body: bytes) -> dict[str, Any]:
+    """Return the arguments of `GradingService.submit` from a request body."""
+    data = json.loads(body or b"{}")
+    if not isinstance(data, dict):
+        raise TypeError("expected a JSON object")
+    suite, executable = data.get("suite"), data.get("executable")
+    owner = data.get("owner", DEFAULT_OWNER)
+    if not isinstance(suite, str):
+        raise TypeError("'suite' must be a path")
+    if executable is not None and not isinstance(executable, str):
+        raise TypeError("'executable' must be a path")
+    if not isinstance(owner, str) or not owner:
+        raise TypeError("'owner' must be a non-empty string")
+    return {
+        "suite": suite,
+        "executable": executable,
+        "owner": owner,
+        "priority": parse_priority(data.get("priority")),
+    }
+
+
+def render_metrics(status: dict[str, Any]) -> str:
+    """Render the service status in the Prometheus text format."""
+    lines = ["# TYPE baygon_jobs gauge"]
+    lines += [
+        f'baygon_jobs{{status="{name}"}} {count}'
+        for name, count in status["jobs"].items()
+    ]
+    queue = status["queue"]
+    lines.append("# TYPE baygon_queue_depth gauge")
+    lines += [
+        f'baygon_queue_depth{{priority="{priority}"}} {count}'
+        for priority, count in queue["by_priority"].items()
+    ]
+    lines.append("# TYPE baygon_queue_owners gauge")
+    lines.append(f"baygon_queue_owners {queue['owners']}")
+    lines.append("# TYPE baygon_queue_oldest_wait_seconds gauge")
+    lines.append(f"baygon_queue_oldest_wait_seconds {queue['oldest_wait'] or 0}")
+    wait = status["wait"]
+    lines.append("# TYPE baygon_job_wait_seconds summary")
+    for quantile in ("p50", "p95"):
+        if wait[quantile] is not None:
+            lines.append(
+                f'baygon_job_wait_seconds{{quantile="0.{quantile[1:]}"}} '
+                f"{wait[quantile]}"
+            )
+    lines.append(f"baygon_job_wait_seconds_count {wait['count']}")
+    throughput = status["throughput"]
+    lines.append("# TYPE baygon_jobs_completed_per_minute gauge")
+    lines.append(f"baygon_jobs_completed_per_minute {throughput['per_minute']}")
+    lines.append("# TYPE baygon_workers gauge")
+    lines.append(f"baygon_workers {status['workers']}")
+    return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _TCPServer | _UnixServer
+
+    def do_GET(self) -> None:
+        service = self.server.service
+        if self.path == "/status":
+            self._send(HTTPStatus.OK, service.status())
+            return
+        if self.path == "/metrics":
+            self._send_text(HTTPStatus.OK, render_metrics(service.status()))
+            return
+        prefix, _, job_id = self.path.rpartition("/")
+        if prefix == "/jobs" and job_id.isdigit():
+            job = service.store.get(int(job_id))
+            if job is not None:
+                self._send(HTTPStatus.OK, job.to_dict())
+                return
+        self._send(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path != "/jobs":
+            self._send(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            return
+        try:
+            arguments = _parse_job(body)
+        except (ValueError, TypeError) as error:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": f"invalid job: {error}"})
+            return
+        job = self.server.service.submit(**arguments)
+        self._send(HTTPStatus.ACCEPTED, job.to_dict())
+
+    def _send(self, status: HTTPStatus, payload: Any) -> None:
+        self._write(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def _send_text(self, status: HTTPStatus, text: str) -> None:
+        self._write(status, text.encode("utf-8"), "text/plain; version=0.0.4")
+
+    def _write(self, status: HTTPStatus, data: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _TCPServer(ThreadingHTTPServer):
+    service: GradingService
+
+
+if hasattr(socket, "AF_UNIX"):
+
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        service: GradingService
+
+
+def create_server(
+    address: str, service: GradingService, *, allow_remote: bool = False
+) -> _TCPServer | _UnixServer:
+    """Bind the HTTP API of `service` to `host:port` or `unix:PATH`.
+
+    The API is not authenticated and grades any suite, setup commands
+    included, so it only listens on the loopback interface or a Unix socket
+    unless `allow_remote` is set.
+
+    Raises:
+        ValueError: if the address is invalid, or reachable from other
+            machines without `allow_remote`.
+    """
+    family, target = parse_address(address)
+    if not allow_remote and not is_local(address):
+        raise ValueError(
+            f"Refusing to listen on '{address}', reachable from other machines, "
+            "without allowing remote clients."
+        )
+    if family == socket.AF_UNIX:
+        if Path(target).is_socket():
+            Path(target).unlink()
+        server: _TCPServer | _UnixServer = _UnixServer(target, _Handler)
+    else:
+        server = _TCPServer(target, _Handler)
+    server.service = service
+    return server
+
+
+def server_address(server: _TCPServer | _UnixServer) -> str:
+    """Return the address a server is bound to, in `create_server` form."""
+    bound = server.server_address
+    if isinstance(bound, str):
+        return f"unix:{bound}"
+    return f"{bound[0]}:{bound[1]}"
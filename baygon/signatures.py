@@ -0,0 +1,65 @@
+"""C signatures of the functions called by library tests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+
+TYPES = frozenset(
+    {
+        "void",
+        "bool",
+        "char",
+        "int",
+        "unsigned",
+        "unsigned int",
+        "long",
+        "unsigned long",
+        "long long",
+        "size_t",
+        "float",
+        "double",
+        "char*",
+    }
+)
+"""C types accepted in signatures."""
+
+_SIGNATURE = re.compile(r"^\s*([\w\s*]+?)\s*\((.*)\)\s*$")
+
+
+@dataclass(frozen=True)
+class Signature:
+    """Return and argument types of a C function."""
+
+    returns: str
+    args: tuple[str, ...] = ()
+
+
+def parse_signature(text: str) -> Signature:
+    """Parse a signature such as "int(int, int)" or "size_t(const char *)".
+
+        >>> parse_signature("size_t(const char *)")
+        Signature(returns='size_t', args=('char*',))
+        >>> parse_signature("void(void)")
+        Signature(returns='void', args=())
+
+    Raises:
+        ValueError: if the signature is malformed or uses an unknown type.
+    """
+    match = _SIGNATURE.match(text)
+    if match is None:
+        raise ValueError(f"Invalid signature '{text}', expected 'type(type, ...)'")
+    returns = _type_name(match.group(1))
+    args = tuple(_type_name(arg) for arg in match.group(2).split(",") if arg.strip())
+    if args == ("void",):
+        args = ()
+    for name in (returns, *args):
+        if name not in TYPES or (name == "void" and name in args):
+            raise ValueError(f"Unsupported type '{name}' in signature '{text}'")
+    return Signature(returns, args)
+
+
+def _type_name(text: str) -> str:
+    words = text.replace("*", " * ").split()
+    words = [word for word in words if word != "const"]
+    return " ".join(words).replace(" *", "*")
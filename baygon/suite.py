@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping, MutableMapping
+from collections.abc import Mapping, MutableMapping, Sequence
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Any, Callable
 
@@ -12,8 +13,11 @@ from .config.loader import (
     load_config as load_config_model,
     load_config_dict,
 )
-from .core.models import SuiteModel, build_suite_model
+from .core.models import CaseModel, SuiteModel, build_suite_model
 from .error import ConfigError
+from .runtime.concurrency import AdaptiveConcurrency
+from .runtime.distributed import DistributedRunner
+from .runtime.recording import Recording, ReplayRunner
 from .runtime.runner import BaygonRunner, RunReport
 from .schema import Schema
 from .score import compute_points
@@ -55,12 +59,15 @@ class SuiteContext:
         *,
         executable: str | Path | None = None,
         runner_factory: Callable[..., BaygonRunner] = BaygonRunner,
+        keep_failed: bool = False,
     ) -> BaygonRunner:
         """Return a runner configured for this suite."""
+        options = {"keep_failed": True} if keep_failed else {}
         return runner_factory(
             self.model,
             base_dir=self.base_dir,
             executable=executable,
+            **options,
         )
 
 
@@ -161,13 +168,54 @@ class SuiteExecutor:
         *,
         executable: str | Path | None = None,
         limit: int = -1,
+        select: Callable[[CaseModel], bool] | None = None,
+        order: Callable[[CaseModel], Any] | None = None,
+        jobs: int | AdaptiveConcurrency = 1,
+        workers: Sequence[str] | None = None,
+        keep_failed: bool = False,
     ) -> RunReport:
-        """Run the suite described by the provided context."""
+        """Run the suite described by the provided context.
+
+        When `workers` lists worker addresses, cases are dispatched to them
+        and `jobs` is ignored: each connected worker runs one case at a time.
+        With `keep_failed`, the working directories of failed cases are kept.
+        """
+        if workers:
+            if context.source_path is None:
+                raise ConfigError("Distributed runs need a suite loaded from a file.")
+            runner = context.create_runner(
+                executable=executable,
+                runner_factory=partial(
+                    DistributedRunner,
+                    workers=workers,
+                    source=context.source_path.read_text(encoding="utf-8"),
+                ),
+                keep_failed=keep_failed,
+            )
+            return runner.run(limit=limit, select=select, order=order)
+
         runner = context.create_runner(
             executable=executable,
             runner_factory=self._runner_factory,
+            keep_failed=keep_failed,
+        )
+        return runner.run(limit=limit, select=select, order=order, jobs=jobs)
+
+    def regrade(
+        self,
+        context: SuiteContext,
+        *,
+        recordings: Mapping[str, Recording],
+        executable: str | Path | None = None,
+    ) -> RunReport:
+        """Grade recorded executions against the suite without spawning."""
+        runner = ReplayRunner(
+            context.model,
+            recordings=recordings,
+            base_dir=context.base_dir,
+            executable=executable,
         )
-        return runner.run(limit=limit)
+        return runner.run()
 
 
 class SuiteService:
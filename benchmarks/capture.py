@@ -0,0 +1,46 @@
+"""Compare the throughput of the output capture backends.
+
+Run with ``python benchmarks/capture.py [SIZE_MB ...]``. Each size is
+produced by ``head -c SIZE /dev/zero`` and captured with every backend of
+`Executable.run`; the best of several repetitions is reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from baygon.executable import CAPTURES, Executable
+
+
+def measure(executable: Executable, size: int, capture: str, repeat: int) -> float:
+    """Return the best wall time, in seconds, to capture `size` bytes."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = executable.run("-c", size, "/dev/zero", capture=capture)
+        best = min(best, time.perf_counter() - start)
+        if len(output.stdout) != size:
+            raise RuntimeError(f"{capture}: captured {len(output.stdout)} bytes")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=[1, 16, 128, 512])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    executable = Executable("head")
+    print(f"{'size':>8}" + "".join(f"{name:>14}" for name in CAPTURES))
+    for megabytes in args.sizes:
+        size = megabytes << 20
+        rates = [
+            megabytes / measure(executable, size, capture, args.repeat)
+            for capture in CAPTURES
+        ]
+        print(f"{megabytes:>5} MB" + "".join(f"{rate:>9.0f} MB/s" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
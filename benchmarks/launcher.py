@@ -0,0 +1,61 @@
+"""Compare the time to run a Python script spawned or forked from a zygote.
+
+Run with ``python benchmarks/launcher.py [SCRIPT [ARGS ...]]``. The script,
+``tests/cli/main.exe.py`` by default, is run many times by a plain
+`Executable` and by the prefork launcher; the best mean of several rounds is
+reported, per run.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import time
+
+from baygon.executable import Executable
+from baygon.runtime.prefork import PreforkPool
+
+SCRIPT = Path(__file__).resolve().parents[1] / "tests" / "cli" / "main.exe.py"
+
+
+def measure(executable: Executable, args: list[str], runs: int, repeat: int) -> float:
+    """Return the best mean wall time, in seconds, of a run of `executable`."""
+    expected = executable.run(*args)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(runs):
+            output = executable.run(*args)
+        best = min(best, (time.perf_counter() - start) / runs)
+        if output != expected:
+            raise RuntimeError(f"{executable}: {output!r} instead of {expected!r}")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("script", nargs="?", default=str(SCRIPT))
+    parser.add_argument("args", nargs="*", default=["1", "2"])
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pool = PreforkPool()
+    try:
+        launchers = {
+            "spawn": Executable(args.script),
+            "prefork": pool.executable(args.script),
+        }
+        times = {
+            name: measure(executable, args.args, args.runs, args.repeat)
+            for name, executable in launchers.items()
+        }
+    finally:
+        pool.close()
+    for name, seconds in times.items():
+        print(f"{name:>8} {seconds * 1000:8.2f} ms/run")
+    print(f"{'speedup':>8} {times['spawn'] / times['prefork']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,15 @@
 
 import json
 from pathlib import Path
+import threading
 from unittest import TestCase
 
+import pytest
 from typer.testing import CliRunner
 import yaml
 
 from baygon.__main__ import app
+from baygon.runtime.distributed import WorkerServer
 
 
 class TestVersion(TestCase):
@@ -229,29 +232,197 @@ class TestDemo(TestCase):
         self.directory.joinpath(name).unlink()
 
     def test_report_yaml(self):
-        name = "report.yaml"
-        runner = CliRunner()
+        for name in ("report.yaml", "report.yml"):
+            with self.subTest(name=name):
+                runner = CliRunner()
+                result = runner.invoke(
+                    app,
+                    [
+                        f"--config={self.get_config('success.yml')}",
+                        f"--report={self.directory.joinpath(name)}",
+                        self.executable,
+                        "-v",
+                    ],
+                )
+
+                print(result, result.output)
+
+                self.assertEqual(result.exit_code, 0)
+                self.assertIn("ok.", result.output)
+                self.assertTrue(self.directory.joinpath(name).exists())
+
+                text = self.directory.joinpath(name).read_text()
+                self.directory.joinpath(name).unlink()
+                self.assertFalse(text.startswith("{"))
+                report = yaml.safe_load(text)
+
+                self.assertEqual(report["total"], 4)
+                self.assertEqual(report["successes"], 4)
+                self.assertEqual(report["failures"], 0)
+                self.assertEqual(report["skipped"], 0)
+
+
+@pytest.fixture
+def cfg(tmp_path: Path) -> Path:
+    """Copy the points suite next to a link to its program."""
+    source = Path(__file__).resolve().parent
+    config = tmp_path / "baygon.yml"
+    config.write_text(
+        (source / "points.yml").read_text(encoding="utf-8"), encoding="utf-8"
+    )
+    (tmp_path / "main.exe.py").symlink_to(source / "main.exe.py")
+    return config
+
+
+def test_cli_record_then_regrade(cfg: Path, tmp_path: Path) -> None:
+    records = tmp_path / "records"
+
+    runner = CliRunner()
+    result = runner.invoke(app, [f"--config={cfg}", "--record", str(records)])
+    assert result.exit_code == 0
+    assert "Points: 4/10" in result.output
+    assert sorted(p.name for p in records.iterdir())[0] == "1.json.gz"
+
+    fixed = tmp_path / "fixed.yml"
+    fixed.write_text(
+        cfg.read_text(encoding="utf-8")
+        .replace("equals: 2 ]", "equals: 8 ]")
+        .replace("args: [16, 0]", "args: [16, 1]"),
+        encoding="utf-8",
+    )
+    result = runner.invoke(app, ["regrade", str(records), f"--config={fixed}"])
+    assert result.exit_code == 0
+    assert "Points: 6/10" in result.output
+    assert "1 case(s) need re-execution: 4" in result.output
+
+
+def test_cli_help_lists_commands() -> None:
+    result = CliRunner().invoke(app, ["--help"])
+    assert result.exit_code == 0
+    assert "regrade" in result.output
+
+
+def test_cli_last_failed_reuses_cached_passes(cfg: Path) -> None:
+
+    runner = CliRunner()
+    result = runner.invoke(app, [f"--config={cfg}", "--lf"])
+    assert "No previously failed cases" in result.output
+
+    result = runner.invoke(app, [f"--config={cfg}", "--lf", "--ff"])
+    assert result.exit_code == 0
+    assert "Test 1: Foo PASSED (cached)" in result.output
+    assert "Points: 4/10" in result.output
+
+
+def test_cli_reports_runs_whose_cache_cannot_be_written(
+    cfg: Path, tmp_path: Path
+) -> None:
+    (tmp_path / ".baygon_cache").write_text("not a directory", encoding="utf-8")
+    report = tmp_path / "report.json"
+
+    result = CliRunner().invoke(app, [f"--config={cfg}", "-r", str(report)])
+
+    assert result.exception is None
+    assert "Points: 4/10" in result.output
+    assert report.exists()
+
+
+def test_cli_shards_and_merge(cfg: Path, tmp_path: Path) -> None:
+    runner = CliRunner()
+
+    parts = []
+    for index in (1, 2):
+        part = tmp_path / f"part{index}.json"
         result = runner.invoke(
             app,
-            [
-                f"--config={self.get_config('success.yml')}",
-                f"--report={self.directory.joinpath(name)}",
-                self.executable,
-                "-v",
-            ],
+            [f"--config={cfg}", "--no-cache", f"--shard={index}/2", "-r", str(part)],
         )
+        assert result.exit_code in (0, 1)
+        assert part.exists()
+        parts.append(str(part))
+
+    merged = tmp_path / "merged.yaml"
+    result = runner.invoke(app, ["merge", *parts, "-r", str(merged)])
+    assert result.exit_code == 0
+    assert "4 tests" in result.output
+    assert "Points: 4/10" in result.output
+    assert "total: 4" in merged.read_text(encoding="utf-8")
+
+    result = runner.invoke(
+        app,
+        [f"--config={cfg}", "--no-cache", "--shard=1/2", f"--timings={parts[0]}"],
+    )
+    assert "Ran 1 tests" in result.output or "Ran 2 tests" in result.output
+
+
+def test_cli_shards_with_the_cache_report_their_own_cases(
+    cfg: Path, tmp_path: Path
+) -> None:
+    runner = CliRunner()
+
+    parts = []
+    for options in (["--shard=1/2"], ["--shard=2/2"], ["--shard=2/2", "--lf"]):
+        part = tmp_path / f"part{len(parts)}.json"
+        runner.invoke(app, [f"--config={cfg}", *options, "-r", str(part)])
+        parts.append(json.loads(part.read_text(encoding="utf-8")))
+
+    first, second, again = ([case["id"] for case in p["cases"]] for p in parts)
+    assert len(first) + len(second) == 4
+    assert not set(first) & set(second)
+    assert set(again) <= set(second)
+
+    merged = tmp_path / "merged.json"
+    result = runner.invoke(
+        app,
+        [
+            "merge",
+            *(str(tmp_path / f"part{i}.json") for i in (0, 1)),
+            "-r",
+            str(merged),
+        ],
+    )
+    assert "4 tests" in result.output
+
+
+def test_cli_jobs_reports_makespan(cfg: Path) -> None:
+
+    runner = CliRunner()
+    result = runner.invoke(app, [f"--config={cfg}", "-v", "-j", "2"])
+    assert result.exit_code == 0
+    assert "(no history yet)" in result.output
+
+    result = runner.invoke(app, [f"--config={cfg}", "-v", "--jobs=2", "--ff"])
+    assert result.exit_code == 0
+    assert "Makespan on 2 jobs:" in result.output
+    assert "predicted" in result.output
+    assert result.output.index("Test 1: Foo") < result.output.index("Test 4: Qux")
+
+
+def test_cli_runs_on_workers(cfg: Path, tmp_path: Path) -> None:
+
+    server = WorkerServer(f"unix:{tmp_path / 'worker.sock'}")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        result = CliRunner().invoke(
+            app, [f"--config={cfg}", "--no-cache", f"--workers={server.address}"]
+        )
+    finally:
+        server.shutdown()
+    assert result.exit_code == 0
+    assert "Points: 4/10" in result.output
 
-        print(result, result.output)
-
-        self.assertEqual(result.exit_code, 0)
-        self.assertIn("ok.", result.output)
-        self.assertTrue(self.directory.joinpath(name).exists())
+    result = CliRunner().invoke(
+        app, [f"--config={cfg}", "--no-cache", "--workers=127.0.0.1:1"]
+    )
+    assert result.exit_code == 1
+    assert "No worker available" in result.output
 
-        report = yaml.safe_load(self.directory.joinpath(name).read_text())
 
-        self.assertEqual(report["total"], 4)
-        self.assertEqual(report["successes"], 4)
-        self.assertEqual(report["failures"], 0)
-        self.assertEqual(report["skipped"], 0)
+def test_cli_jobs_auto(cfg: Path) -> None:
+    result = CliRunner().invoke(app, [f"--config={cfg}", "--no-cache", "-j", "auto"])
+    assert result.exit_code == 0
+    assert "Points: 4/10" in result.output
 
-        self.directory.joinpath(name).unlink()
+    result = CliRunner().invoke(app, [f"--config={cfg}", "-j", "0"])
+    assert result.exit_code == 2
@@ -58,3 +58,22 @@ def test_module_entrypoint(monkeypatch: pytest.MonkeyPatch) -> None:
 
     with pytest.raises(SystemExit):
         runpy.run_module("baygon.__main__", run_name="__main__")
+
+
+def test_cli_rejects_invalid_shard() -> None:
+    cfg = Path(__file__).resolve().parent / "points.yml"
+    result = CliRunner().invoke(app, [f"--config={cfg}", "--shard=3/2"])
+    assert result.exit_code == 1
+    assert "Invalid shard" in result.output
+
+
+def test_cli_worker_rejects_invalid_address() -> None:
+    result = CliRunner().invoke(app, ["worker", "--listen", "nowhere"])
+    assert result.exit_code == 1
+    assert "Invalid address" in result.output
+
+
+def test_cli_worker_listens_on_other_machines_only_when_allowed() -> None:
+    result = CliRunner().invoke(app, ["worker", "--listen", "0.0.0.0:0"])
+    assert result.exit_code == 1
+    assert "without allowing remote coordinators" in result.output
@@ -3,6 +3,7 @@ import shutil
 from unittest import TestCase
 
 from baygon import Executable
+from baygon.executable import Outputs
 from baygon.error import InvalidExecutableError
 from baygon.helpers import GreppableString
 
@@ -39,6 +40,61 @@ class TestExecutable(TestCase):
         print(output)
         self.assertEqual(output.stdout, test_string)
 
+    def test_stdin_file(self):
+        e = Executable(shutil.which("od"))
+        output = e.run("-An", "-tx1", stdin=dir_path.joinpath("test.txt"))
+        expected = " ".join(
+            f"{byte:02x}" for byte in dir_path.joinpath("test.txt").read_bytes()[:16]
+        )
+        self.assertEqual(output.stdout.split("\n")[0].strip(), expected)
+
+    def test_capture_file(self):
+        e = Executable(dir_path.joinpath("dummy.exe.py"))
+        self.assertEqual(e.run(capture="file"), e.run())
+
+    def test_capture_file_large_output(self):
+        e = Executable(shutil.which("head"))
+        output = e.run("-c", "3000000", "/dev/zero", capture="file")
+        self.assertEqual(output.stdout, "\0" * 3_000_000)
+        self.assertEqual(output.stderr, "")
+
+    def test_undecodable_output(self):
+        e = Executable(shutil.which("printf"))
+        output = e.run("ok\\377")
+        self.assertEqual(output.exit_status, 0)
+        self.assertEqual(output.stdout_bytes, b"ok\xff")
+        self.assertEqual(output.text("stdout", errors="replace"), "ok\ufffd")
+        with self.assertRaises(UnicodeDecodeError):
+            output.text("stdout")
+
+    def test_outputs_from_text(self):
+        output = Outputs(1, "café", None)
+        self.assertEqual(output.stdout_bytes, "café".encode())
+        self.assertEqual(output.stdout, "café")
+        self.assertEqual(output, Outputs(1, "café".encode(), b""))
+        self.assertEqual(tuple(output), (1, "café", ""))
+        self.assertNotEqual(output, (1, "café", ""))
+
+    def test_monitor_stops_program(self):
+        e = Executable(shutil.which("yes"))
+        chunks = []
+        output = e.run(monitor=lambda chunk: chunks.append(chunk) or len(chunks) > 2)
+        self.assertEqual(output.exit_status, -9)
+        self.assertEqual(output.stdout_bytes, b"".join(chunks))
+
+    def test_monitor_passes_stdin(self):
+        e = Executable(shutil.which("cat"))
+        text = "line\n" * 50_000
+        output = e.run(stdin=text, monitor=lambda _: False)
+        self.assertEqual(output, Outputs(0, text, ""))
+        with self.assertRaises(ValueError):
+            e.run(capture="file", monitor=lambda _: False)
+
+    def test_unknown_capture(self):
+        e = Executable(shutil.which("echo"))
+        with self.assertRaises(ValueError):
+            e.run(capture="socket")
+
     def test_exit_status(self):
         e = Executable(dir_path.joinpath("dummy.exe.py"))
         output = e.run()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import socket
+
+import pytest
+
+from baygon.addresses import is_local, parse_address
+
+
+@pytest.mark.parametrize(
+    ("address", "expected"),
+    [
+        ("8080", ("127.0.0.1", 8080)),
+        ("0.0.0.0:0", ("0.0.0.0", 0)),
+        ("unix:/tmp/api.sock", "/tmp/api.sock"),
+    ],
+)
+def test_parse_address(address: str, expected) -> None:
+    assert parse_address(address)[1] == expected
+
+
+@pytest.mark.parametrize("address", ["", "localhost", "host:70000", "unix:", "a:-1"])
+def test_parse_address_rejects_invalid(address: str) -> None:
+    with pytest.raises(ValueError, match="Invalid address"):
+        parse_address(address)
+
+
+def test_unix_addresses_need_unix_sockets(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delattr(socket, "AF_UNIX")
+    with pytest.raises(ValueError, match="not supported"):
+        parse_address("unix:/tmp/worker.sock")
+
+
+@pytest.mark.parametrize(
+    ("address", "local"),
+    [
+        ("4000", True),
+        ("localhost:4000", True),
+        ("127.0.0.2:4000", True),
+        ("unix:/tmp/api.sock", True),
+        ("0.0.0.0:4000", False),
+        ("grader.example.org:4000", False),
+    ],
+)
+def test_is_local(address: str, local: bool) -> None:
+    assert is_local(address) is local
@@ -0,0 +1,88 @@
+"""Test value generators."""
+
+import random
+from unittest import TestCase
+
+from baygon.generators import (
+    GenerateChoice,
+    GenerateFloat,
+    GenerateInteger,
+    GeneratorFactory,
+    GenerateText,
+    ValueGenerator,
+    get_registered_generators,
+    register_generator,
+)
+
+
+class TestGenerators(TestCase):
+    def test_integer_bounds(self):
+        g = GenerateInteger(3, 5)
+        rng = random.Random(0)
+        self.assertTrue(all(3 <= g.draw(rng) <= 5 for _ in range(50)))
+
+    def test_integer_shrinks_towards_closest_bound(self):
+        g = GenerateInteger(10, 20)
+        self.assertEqual(next(g.shrink(17)), 10)
+        self.assertEqual(list(g.shrink(10)), [])
+        self.assertEqual(next(GenerateInteger(-20, -10).shrink(-15)), -10)
+
+    def test_integer_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            GenerateInteger(5, 1)
+
+    def test_float(self):
+        g = GenerateFloat(1.0, 2.0)
+        self.assertTrue(1.0 <= g.draw(random.Random(0)) <= 2.0)
+        self.assertEqual(list(g.shrink(1.0)), [])
+        with self.assertRaises(ValueError):
+            GenerateFloat(2, 1)
+
+    def test_choice(self):
+        g = GenerateChoice("x", "y")
+        self.assertIn(g.draw(random.Random(0)), ["x", "y"])
+        self.assertEqual(list(g.shrink("z")), [])
+        with self.assertRaises(ValueError):
+            GenerateChoice()
+
+    def test_text(self):
+        g = GenerateText(min_length=2, max_length=4, alphabet="ab")
+        value = g.draw(random.Random(0))
+        self.assertTrue(2 <= len(value) <= 4)
+        self.assertTrue(all(len(c) >= 2 for c in g.shrink("abab")))
+        with self.assertRaises(ValueError):
+            GenerateText(alphabet="")
+        with self.assertRaises(ValueError):
+            GenerateText(min_length=3, max_length=1)
+
+    def test_factory_accepts_hyphenated_keywords(self):
+        g = GeneratorFactory("text", **{"max-length": 3})
+        self.assertIsInstance(g, GenerateText)
+        self.assertEqual(g.max_length, 3)
+        with self.assertRaises(ValueError):
+            GeneratorFactory("missing")
+
+    def test_register_generator(self):
+        @register_generator("constant")
+        class GenerateConstant(ValueGenerator):
+            def draw(self, rng):
+                return 1
+
+        self.assertIs(get_registered_generators()["constant"], GenerateConstant)
+        self.assertEqual(list(GenerateConstant().shrink(1)), [])
+        self.assertEqual(repr(GenerateConstant()), "GenerateConstant")
+
+        class GenerateOther(ValueGenerator):
+            def draw(self, rng):
+                return 2
+
+        with self.assertRaises(ValueError):
+            register_generator("constant")(GenerateOther)
+
+    def test_abstract_draw(self):
+        class GenerateDummy(ValueGenerator):
+            def draw(self, rng):
+                return super().draw(rng)
+
+        with self.assertRaises(NotImplementedError):
+            GenerateDummy().draw(random.Random())
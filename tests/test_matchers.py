@@ -1,8 +1,10 @@
+import hashlib
 from unittest import TestCase
 
 import baygon.matchers
 from baygon.matchers import (
     InvalidCondition,
+    InvalidEncoding,
     InvalidRegex,
     MatchBase,
     MatcherFactory,
@@ -25,6 +27,36 @@ class TestMatchers(TestCase):
             baygon.matchers.InvalidContains,
         )
 
+    def test_equals_bytes(self):
+        matcher = MatcherFactory("equals-bytes", "00ff")
+        self.assertIsNone(matcher(b"\x00\xff"))
+        issue = matcher(b"\x00\xfe\x01", on="stdout")
+        self.assertEqual(
+            str(issue),
+            "Output stdout differs from the expected bytes at byte 1: "
+            "expected ff, got fe 01.",
+        )
+        self.assertIn("end of output", str(matcher(b"\x00", on="stdout")))
+
+    def test_sha256(self):
+        digest = hashlib.sha256(b"abc").hexdigest()
+        self.assertIsNone(MatcherFactory("sha256", digest)(b"abc"))
+        issue = MatcherFactory("sha256", digest)(b"abd", on="stdout")
+        self.assertIsInstance(issue, baygon.matchers.InvalidDigest)
+        self.assertIn(f"expected {digest}", str(issue))
+        self.assertTrue(MatcherFactory("sha256", digest).binary)
+
+    def test_invalid_encoding(self):
+        try:
+            b"ok\xff".decode("utf-8")
+        except UnicodeDecodeError as error:
+            issue = InvalidEncoding(error, on="stdout")
+        self.assertEqual(
+            str(issue),
+            "Output stdout is not valid utf-8 at byte 2: invalid start byte.",
+        )
+        self.assertIn("InvalidEncoding", repr(issue))
+
     def test_regex(self):
         self.assertIsNone(baygon.matchers.MatchRegex(r"fo{2,}")("i am foobar"))
         self.assertIsInstance(
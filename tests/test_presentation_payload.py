@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from baygon.core.models import build_suite_model
+from baygon.presentation.payload import case_payload, merge_payloads, report_payload
+from baygon.runtime.fixtures import FixtureResult
+from baygon.runtime.runner import CaseResult, CommandLog, RunReport
+from baygon.schema import Schema
+
+
+def _report(statuses: dict[str, str], duration: float) -> RunReport:
+    suite = build_suite_model(
+        Schema({"points": 30, "tests": [{"exit": 0}, {"exit": 0}, {"exit": 0}]})
+    )
+    results = [
+        CaseResult(
+            case=case,
+            status=statuses[case.id_str],
+            issues=("boom",) if statuses[case.id_str] == "failed" else (),
+            commands=(),
+            duration=1.0,
+            points_earned=case.points if statuses[case.id_str] == "passed" else 0,
+        )
+        for case in suite.iter_cases()
+        if case.id_str in statuses
+    ]
+    return RunReport.from_results(suite, results, duration)
+
+
+def test_report_payload_lists_cases() -> None:
+    payload = report_payload(_report({"1": "failed"}, 1.0), shard="1/2")
+    assert payload["shard"] == "1/2"
+    assert payload["cases"] == [
+        {
+            "id": "1",
+            "name": "",
+            "status": "failed",
+            "points": 10,
+            "earned": 0,
+            "duration": 1.0,
+            "issues": ["boom"],
+        }
+    ]
+
+
+def test_merge_payloads_recomputes_totals() -> None:
+    merged = merge_payloads(
+        [
+            report_payload(_report({"3": "passed", "1": "failed"}, 2.0)),
+            report_payload(_report({"2": "skipped"}, 1.5)),
+            report_payload(_report({"1": "passed"}, 0.5)),
+        ]
+    )
+    assert [case["id"] for case in merged["cases"]] == ["1", "2", "3"]
+    assert merged["total"] == 3
+    assert merged["successes"] == 2
+    assert merged["skipped"] == 1
+    assert merged["failures"] == 0
+    assert merged["points"] == {"total": 30, "earned": 20}
+    assert merged["time"] == 2.0
+
+
+def test_report_payload_lists_fixtures() -> None:
+    report = _report({"1": "passed"}, 1.0)
+    assert "fixtures" not in report_payload(report)
+
+    command = CommandLog(
+        argv=("true",), stdin=None, stdout="", stderr="", exit_status=0, duration=0.1
+    )
+    fixture = FixtureResult(
+        scope="suite", stage="setup", status="passed", commands=(command,), duration=0.2
+    )
+    payload = report_payload(replace(report, fixtures=(fixture,)))
+
+    assert payload["fixtures"] == [
+        {
+            "scope": "suite",
+            "stage": "setup",
+            "status": "passed",
+            "duration": 0.2,
+            "commands": [
+                {
+                    "argv": ["true"],
+                    "stdin": None,
+                    "stdout": "",
+                    "stderr": "",
+                    "exit_status": 0,
+                    "duration": 0.1,
+                }
+            ],
+        }
+    ]
+
+
+def test_case_payload_reports_generated_inputs() -> None:
+    suite = build_suite_model(
+        Schema(
+            {
+                "tests": [
+                    {"args": ["{{ a }}"], "generate": {"values": {"a": "integer"}}},
+                    {"exit": 0},
+                ]
+            }
+        )
+    )
+    generated, plain = suite.iter_cases()
+    passed = CaseResult(generated, "passed", (), (), seed=7, trials=100)
+    failed = replace(passed, status="failed", counterexample={"a": 3}, trials=12)
+
+    assert case_payload(passed) == {
+        "id": "1",
+        "name": "",
+        "status": "passed",
+        "points": 0,
+        "earned": 0,
+        "duration": None,
+        "issues": [],
+        "seed": 7,
+        "trials": 100,
+        "counterexample": None,
+    }
+    assert case_payload(failed)["counterexample"] == {"a": 3}
+    assert "seed" not in case_payload(CaseResult(plain, "passed", (), ()))
@@ -53,3 +53,17 @@ def test_command_panels_with_bytes_streams() -> None:
     assert len(panels) == 1
     assert "Command #1" in panels[0].title
     assert rich_presentation._normalize_stream_value(b"bin") == "bin"
+
+
+def test_build_pretty_failure_panel_shows_counterexample() -> None:
+    result = CaseResult(
+        case=_make_case("generated"),
+        status="failed",
+        issues=("broken",),
+        commands=(),
+        seed=3,
+        counterexample={"a": 1},
+    )
+    console = Console(record=True, width=120)
+    console.print(rich_presentation._build_pretty_failure_panel(result))
+    assert "a=1 (seed 3)" in console.export_text()
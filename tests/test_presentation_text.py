@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from baygon.core.models import CaseModel
 from baygon.presentation import text as text_presentation
-from baygon.runtime.runner import CaseResult, RunReport
+from baygon.runtime.fixtures import FixtureResult
+from baygon.runtime.load import LoadStats
+from baygon.runtime.runner import CaseResult, CommandLog, RunReport
 
 
 def _case(name: str, status: str, issues=None) -> CaseResult:
@@ -59,6 +61,35 @@ def test_render_case_results_variants() -> None:
     assert any("UNKNOWN" in line for line in output)
 
 
+def test_render_case_results_shows_load_statistics() -> None:
+    output: list[str] = []
+    result = _case("load", "passed")
+    result = CaseResult(
+        case=result.case,
+        status="passed",
+        issues=(),
+        commands=(),
+        load=LoadStats(4, 1, 1.0, (0.001, 0.002, 0.004)),
+    )
+    report = RunReport(
+        suite=None,  # type: ignore[arg-type]
+        successes=1,
+        failures=0,
+        skipped=0,
+        points_total=1,
+        points_earned=1,
+        duration=0.1,
+        cases=(result,),
+    )
+
+    text_presentation.render_case_results(report, write=output.append)
+
+    assert output[1] == (
+        "Load: 4 requests, 3.0 requests/s, p50 0.0020 s, p95 0.0040 s, "
+        "p99 0.0040 s, 1 errors"
+    )
+
+
 def test_render_summary_reports_points_and_failures() -> None:
     output: list[str] = []
     report = RunReport(
@@ -77,3 +108,62 @@ def test_render_summary_reports_points_and_failures() -> None:
     assert any("Points: 4/10" in line for line in output)
     assert any("1 failed" in line for line in output)
     assert any("1 test(s) skipped" in line for line in output)
+
+
+def test_render_case_results_shows_counterexample() -> None:
+    output: list[str] = []
+    failed = _case("generated", "failed", issues=["broken"])
+    result = CaseResult(
+        case=failed.case,
+        status="failed",
+        issues=failed.issues,
+        commands=(),
+        seed=42,
+        counterexample={"a": 51, "s": ""},
+    )
+    report = RunReport(
+        suite=None,  # type: ignore[arg-type]
+        successes=0,
+        failures=1,
+        skipped=0,
+        points_total=1,
+        points_earned=0,
+        duration=0.1,
+        cases=(result,),
+    )
+
+    text_presentation.render_case_results(report, write=output.append)
+    assert "Counterexample (seed 42): a=51, s=''" in output
+
+
+def test_render_case_results_reports_failed_fixtures() -> None:
+    output: list[str] = []
+    command = CommandLog(
+        argv=("make", "data"), stdin=None, stdout="", stderr="no rule\n", exit_status=2
+    )
+    report = RunReport(
+        suite=None,  # type: ignore[arg-type]
+        successes=0,
+        failures=0,
+        skipped=1,
+        points_total=1,
+        points_earned=0,
+        duration=0.1,
+        cases=(_case("skip", "skipped", issues=["Skipped: setup failed."]),),
+        fixtures=(
+            FixtureResult(
+                scope="1", stage="setup", status="failed", commands=(command,)
+            ),
+            FixtureResult(scope="1", stage="teardown", status="passed", commands=()),
+        ),
+    )
+
+    text_presentation.render_case_results(report, write=output.append)
+
+    assert output == [
+        "Test 1: skip SKIPPED",
+        "Skipped: setup failed.",
+        "Setup of group 1 FAILED",
+        "make data exited with 2",
+        "no rule",
+    ]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from baygon.core.models import build_suite_model
+from baygon.runtime.cache import CACHE_DIRNAME, CaseState, RunCache
+from baygon.runtime.fixtures import FixtureResult
+from baygon.runtime.runner import CaseResult, RunReport
+from baygon.schema import Schema
+
+
+def _suite():
+    return build_suite_model(
+        Schema(
+            {
+                "points": 30,
+                "tests": [
+                    {"name": "a", "exit": 0},
+                    {"name": "b", "exit": 0},
+                    {"name": "c", "exit": 0},
+                ],
+            }
+        )
+    )
+
+
+def _report(suite, statuses: dict[str, str]) -> RunReport:
+    results = [
+        CaseResult(
+            case=case,
+            status=statuses[case.id_str],
+            issues=(),
+            commands=(),
+            duration=0.5,
+            points_earned=case.points if statuses[case.id_str] == "passed" else 0,
+        )
+        for case in suite.iter_cases()
+        if case.id_str in statuses
+    ]
+    return RunReport.from_results(suite, results, 1.0)
+
+
+def test_cache_round_trip(tmp_path: Path) -> None:
+    suite = _suite()
+    cache = RunCache.for_base_dir(tmp_path)
+    cache.update(_report(suite, {"1": "passed", "2": "failed"}))
+    cache.save()
+
+    assert (tmp_path / CACHE_DIRNAME / ".gitignore").exists()
+    reloaded = RunCache.for_base_dir(tmp_path)
+    assert reloaded.get("1") == CaseState("passed", 0.5)
+    assert reloaded.failed == {"2"}
+    assert set(reloaded.states) == {"1", "2"}
+
+
+def test_cache_that_cannot_be_written_is_only_logged(tmp_path: Path, caplog) -> None:
+    (tmp_path / CACHE_DIRNAME).write_text("not a directory", encoding="utf-8")
+    cache = RunCache.for_base_dir(tmp_path)
+    cache.update(_report(_suite(), {"1": "passed"}))
+
+    assert cache.save() is False
+    assert "Could not write the cache" in caplog.text
+
+
+def test_cache_ignores_corrupt_file(tmp_path: Path) -> None:
+    directory = tmp_path / CACHE_DIRNAME
+    directory.mkdir()
+    (directory / "state.json").write_text("{not json", encoding="utf-8")
+    assert RunCache(directory).states == {}
+
+
+def test_last_failed_selects_failed_and_unknown_cases(tmp_path: Path) -> None:
+    suite = _suite()
+    cache = RunCache.for_base_dir(tmp_path)
+    assert cache.last_failed() is None
+
+    cache.update(_report(suite, {"1": "passed", "2": "failed"}))
+    select = cache.last_failed()
+    assert [case.name for case in suite.iter_cases() if select(case)] == ["b", "c"]
+
+
+def test_failed_first_key(tmp_path: Path) -> None:
+    suite = _suite()
+    cache = RunCache.for_base_dir(tmp_path)
+    cache.update(_report(suite, {"1": "passed", "2": "failed", "3": "passed"}))
+    ordered = sorted(suite.iter_cases(), key=cache.failed_first())
+    assert [case.name for case in ordered] == ["b", "a", "c"]
+
+
+def test_merge_completes_score_with_cached_passes(tmp_path: Path) -> None:
+    suite = _suite()
+    cache = RunCache.for_base_dir(tmp_path)
+    cache.update(_report(suite, {"1": "passed", "2": "failed", "3": "failed"}))
+
+    merged = cache.merge(_report(suite, {"2": "passed"}))
+    assert [result.case.name for result in merged.cases] == ["a", "b"]
+    assert merged.cases[0].cached
+    assert merged.successes == 2
+    assert merged.points_total == 20
+    assert merged.points_earned == 20
+
+    cache.update(merged)
+    assert cache.get("2").status == "passed"
+
+
+def test_merge_keeps_fixture_results(tmp_path: Path) -> None:
+    suite = _suite()
+    cache = RunCache.for_base_dir(tmp_path)
+    cache.update(_report(suite, {"1": "passed", "2": "failed"}))
+    setup = FixtureResult(scope="suite", stage="setup", status="passed", commands=())
+    partial = _report(suite, {"2": "passed"})
+    partial = RunReport.from_results(
+        suite, partial.cases, partial.duration, fixtures=(setup,)
+    )
+
+    assert cache.merge(partial).fixtures == (setup,)
+
+
+def test_duration_history_per_suite(tmp_path: Path) -> None:
+    suite = _suite()
+    cache = RunCache.for_base_dir(tmp_path)
+    for _ in range(7):
+        cache.update(_report(suite, {"1": "passed"}), suite_key="abc")
+    cache.save()
+
+    reloaded = RunCache.for_base_dir(tmp_path)
+    assert reloaded.durations("abc") == {"1": 0.5}
+    assert reloaded.durations("other") == {}
+
+    for key in range(10):
+        reloaded.update(_report(suite, {"2": "passed"}), suite_key=f"s{key}")
+    assert reloaded.durations("abc") == {}
+    assert reloaded.durations("s9") == {"2": 0.5}
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+from baygon.core.models import build_suite_model
+from baygon.executable import Outputs
+from baygon.runtime.concurrency import AdaptiveConcurrency, SystemProbe
+from baygon.runtime.runner import BaygonRunner
+from baygon.schema import Schema
+
+
+class FakeProbe(SystemProbe):
+    def __init__(self, cpus: int = 4) -> None:
+        self._cpus = cpus
+        self.load_value: float | None = 0.0
+        self.memory_value: float | None = 0.9
+
+    def cpus(self) -> int:
+        return self._cpus
+
+    def load(self) -> float | None:
+        return self.load_value
+
+    def memory(self) -> float | None:
+        return self.memory_value
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def tick(self, seconds: float = 1.0) -> None:
+        self.now += seconds
+
+
+def _controller(**kwargs):
+    probe, clock = FakeProbe(), FakeClock()
+    return AdaptiveConcurrency(probe=probe, clock=clock, **kwargs), probe, clock
+
+
+def test_meminfo_is_parsed(tmp_path: Path) -> None:
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text(
+        "MemTotal:       1000 kB\nMemFree: 10 kB\nMemAvailable:    250 kB\nHuge:\n",
+        encoding="ascii",
+    )
+    assert SystemProbe(meminfo).memory() == 0.25
+    meminfo.write_text("MemFree: 10 kB\n", encoding="ascii")
+    assert SystemProbe(meminfo).memory() is None
+    assert SystemProbe(tmp_path / "missing").memory() is None
+    assert SystemProbe().cpus() >= 1
+
+
+def test_starts_at_cpu_count_and_grows_when_idle() -> None:
+    controller, _probe, clock = _controller()
+    assert controller.limit() == 4
+    for _ in range(10):
+        clock.tick()
+        controller.limit()
+    assert controller.limit() == controller.maximum == 8
+
+
+def test_adjusts_at_most_once_per_interval() -> None:
+    controller, _probe, clock = _controller(interval=5)
+    clock.tick(1)
+    assert controller.limit() == 4
+    clock.tick(5)
+    assert controller.limit() == 5
+
+
+def test_backs_off_under_load_and_low_memory(caplog) -> None:
+    controller, probe, clock = _controller(minimum=2)
+    probe.load_value = 6.0
+    clock.tick()
+    assert controller.limit() == 3
+
+    probe.load_value = 3.5
+    clock.tick()
+    assert controller.limit() == 3
+
+    probe.memory_value = 0.05
+    with caplog.at_level(logging.DEBUG, logger="baygon"):
+        clock.tick()
+        assert controller.limit() == 2
+        probe.memory_value = 0.2
+        probe.load_value = None
+        clock.tick()
+        assert controller.limit() == 2
+    assert "jobs auto: 3 -> 2 (memory low" in caplog.text
+
+
+def test_backs_off_when_cases_slow_down() -> None:
+    controller, probe, clock = _controller(expected={"1": 1.0})
+    probe.load_value = 3.5
+    for _ in range(5):
+        controller.observe("1", 4.0)
+    controller.observe("2", 10.0)
+    controller.observe("1", None)
+    clock.tick()
+    assert controller.limit() == 3
+
+
+def test_runner_accepts_adaptive_concurrency(tmp_path: Path) -> None:
+    suite = build_suite_model(
+        Schema({"tests": [{"args": [str(i)], "exit": 0} for i in range(6)]})
+    )
+
+    class Echo:
+        def run(self, *args, stdin=None, env=None, hook=None):
+            if hook:
+                hook(cmd=["prog", *args], stdin=stdin, stdout="", stderr="")
+            return Outputs(0, "", "")
+
+    controller, _probe, _clock = _controller(expected={"1": 1.0})
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=lambda _path: Echo(),
+    )
+    report = runner.run(jobs=controller)
+    assert report.successes == 6
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+from baygon.core.models import build_suite_model
+from baygon.error import ConfigError
+from baygon.matchers import InvalidContains
+from baygon.runtime.dialogue import DialogueTimeout, NoExit, Session
+from baygon.runtime.runner import BaygonRunner
+from baygon.schema import Schema
+
+REPL = """\
+import sys
+total = 0
+print("> ", end="", flush=True)
+for line in sys.stdin:
+    if line.strip() == "quit":
+        sys.exit(0)
+    if line.strip() == "hang":
+        while True:
+            pass
+    total += int(line)
+    print(total, flush=True)
+    print("> ", end="", flush=True)
+"""
+
+
+@pytest.fixture
+def repl(tmp_path: Path) -> Path:
+    program = tmp_path / "repl.py"
+    program.write_text(f"#!{sys.executable}\n{REPL}")
+    program.chmod(0o755)
+    return program
+
+
+def _run(repl: Path, case: dict, **suite):
+    model = build_suite_model(Schema({"version": 1, **suite, "tests": [case]}))
+    report = BaygonRunner(model, base_dir=repl.parent, executable=repl).run()
+    return report.cases[0]
+
+
+def test_dialogue_keeps_state_between_steps(repl: Path) -> None:
+    result = _run(
+        repl,
+        {
+            "dialogue": [
+                {"expect": "> "},
+                {"send": "2\n", "expect": [{"regex": "^2\\n> $"}]},
+                {"send": "40\n", "expect": [{"contains": "42"}], "timeout": 2},
+                {"send": "quit\n"},
+            ],
+            "stdout": [{"contains": "> 2\n> 42\n> "}],
+            "exit": 0,
+        },
+    )
+
+    assert result.status == "passed", result.issues
+    assert len(result.commands) == 1
+    assert result.commands[0].stdin == "2\n40\nquit\n"
+
+
+def test_dialogue_stops_at_the_failing_step(repl: Path) -> None:
+    result = _run(
+        repl,
+        {
+            "dialogue": [
+                {"send": "1\n", "expect": [{"contains": "1"}]},
+                {"send": "1\n", "expect": [{"contains": "3"}], "timeout": 0.2},
+                {"send": "quit\n"},
+            ],
+            "exit": 0,
+        },
+    )
+
+    assert result.status == "failed"
+    assert isinstance(result.issues[0], InvalidContains)
+    assert result.issues[0].on == "dialogue step 2"
+    assert str(result.issues[1]) == (
+        "Dialogue step 2: no matching output within 0.2 s."
+    )
+
+
+def test_dialogue_reports_a_program_that_exits_early(repl: Path) -> None:
+    result = _run(
+        repl,
+        {"dialogue": [{"send": "quit\n", "expect": [{"contains": "bye"}]}]},
+    )
+
+    assert str(result.issues[-1]) == (
+        "Dialogue step 1: the program closed its output first."
+    )
+
+
+def test_dialogue_kills_a_program_that_does_not_exit(repl: Path) -> None:
+    result = _run(
+        repl,
+        {"dialogue": [{"send": "hang\n", "timeout": 0.2}], "exit": 0},
+    )
+
+    assert [type(issue) for issue in result.issues] == [NoExit]
+    assert "did not exit within 0.2 s" in str(result.issues[0])
+
+
+def test_dialogue_evaluates_mustaches_once_per_step(repl: Path) -> None:
+    result = _run(
+        repl,
+        {
+            "dialogue": [
+                {
+                    "send": "{{ iter(5, 1) }}\n",
+                    "expect": [{"contains": "{{ iter(5, 2) }}\n"}],
+                },
+                {"send": "quit\n"},
+            ],
+        },
+        eval=True,
+    )
+
+    assert result.status == "passed", result.issues
+
+
+def test_session_send_fails_once_the_program_is_gone() -> None:
+    with Session(["true"]) as session:
+        session.close(timeout=2)
+        assert not session.send(b"x" * (1 << 20), timeout=0.2)
+    assert str(DialogueTimeout(1, 5, eof=False)) == (
+        "Dialogue step 1: no matching output within 5 s."
+    )
+
+
+@pytest.mark.parametrize(
+    "case",
+    [
+        {"dialogue": [{"timeout": 1}]},
+        {"dialogue": [{"send": "x"}], "stdin": "y"},
+        {"dialogue": [{"expect": "x", "timeout": 0}]},
+    ],
+)
+def test_invalid_dialogues(case: dict) -> None:
+    with pytest.raises(ConfigError):
+        Schema({"tests": [case]}, humanize=True)
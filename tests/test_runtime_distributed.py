@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from dataclasses import replace
+import json
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from baygon.error import ConfigError, WorkerError
+from baygon.runtime.distributed import (
+    DistributedRunner,
+    RemoteWorker,
+    WorkerServer,
+    result_from_dict,
+    result_to_dict,
+)
+from baygon.runtime.recording import command_to_dict
+from baygon.suite import SuiteExecutor, SuiteLoader
+
+SUITE = """
+version: 1
+filters:
+  trim: true
+tests:
+  - name: double
+    args: [2]
+    stdout: [equals: 4]
+  - name: wrong
+    args: [3]
+    stdout: [equals: 7]
+  - name: again
+    args: [5]
+    stdout: [equals: 10]
+"""
+
+
+@pytest.fixture
+def suite_dir(tmp_path: Path) -> Path:
+    program = tmp_path / "double.sh"
+    program.write_text("#!/bin/sh\necho $(( $1 * 2 ))\n", encoding="utf-8")
+    program.chmod(0o755)
+    (tmp_path / "baygon.yml").write_text(SUITE, encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def worker():
+    server = WorkerServer("127.0.0.1:0")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+
+
+class DyingWorker:
+    """Accept a plan, then drop the connection on the first case."""
+
+    def __init__(self) -> None:
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self.address = f"127.0.0.1:{self._sock.getsockname()[1]}"
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self) -> None:
+        conn, _ = self._sock.accept()
+        reader = conn.makefile("rb")
+        reader.readline()
+        conn.sendall(b'{"type":"ready"}\n')
+        reader.readline()
+        reader.close()
+        conn.close()
+        self._sock.close()
+
+
+def _runner(suite_dir: Path, workers, **kwargs) -> DistributedRunner:
+    context = SuiteLoader().load(path=suite_dir / "baygon.yml")
+    return DistributedRunner(
+        context.model,
+        workers=workers,
+        source=SUITE,
+        base_dir=context.base_dir,
+        executable=suite_dir / "double.sh",
+        **kwargs,
+    )
+
+
+def test_workers_reject_invalid_addresses() -> None:
+    with pytest.raises(WorkerError, match="Invalid address"):
+        WorkerServer("localhost")
+    with pytest.raises(WorkerError, match="Invalid address"):
+        RemoteWorker("unix:").connect({})
+
+
+def test_worker_listens_on_other_machines_only_when_allowed() -> None:
+    with pytest.raises(WorkerError, match="remote"):
+        WorkerServer("0.0.0.0:0")
+    server = WorkerServer("0.0.0.0:0", allow_remote=True)
+    assert server.address.startswith("0.0.0.0:")
+    server.close()
+
+
+def test_distributed_run_matches_local_run(suite_dir: Path, worker) -> None:
+    report = _runner(suite_dir, [worker.address, worker.address]).run()
+
+    assert [result.status for result in report.cases] == ["passed", "failed", "passed"]
+    assert str(report.cases[1].issues[0]) == "Output '6' does not equal '7' on stdout."
+    assert report.cases[0].commands[0].stdout.strip() == "4"
+
+
+def test_cases_a_worker_cannot_run_fail_alone(suite_dir: Path, worker) -> None:
+    source = SUITE + "  - name: unknown\n    args: [1]\n"
+    context = SuiteLoader().load(data=source, cwd=suite_dir)
+    runner = DistributedRunner(
+        context.model,
+        workers=[worker.address],
+        source=SUITE,
+        base_dir=suite_dir,
+        executable=suite_dir / "double.sh",
+    )
+
+    report = runner.run()
+
+    assert [result.status for result in report.cases] == [
+        "passed",
+        "failed",
+        "passed",
+        "failed",
+    ]
+    assert str(report.cases[3].issues[0]).endswith("Unknown case 4.")
+
+
+def test_lost_worker_cases_are_reassigned(suite_dir: Path, worker, caplog) -> None:
+    dying = DyingWorker()
+    report = _runner(suite_dir, [dying.address, worker.address]).run()
+
+    assert report.total == 3
+    assert report.successes == 2
+    assert "Lost worker" in caplog.text
+
+
+def test_all_workers_lost(suite_dir: Path) -> None:
+    with pytest.raises(WorkerError, match="disconnected"):
+        _runner(suite_dir, [DyingWorker().address]).run()
+
+
+def test_no_worker_available(suite_dir: Path) -> None:
+    with pytest.raises(WorkerError, match="No worker"):
+        _runner(suite_dir, ["127.0.0.1:1"]).run()
+
+
+def test_fixtures_cannot_run_on_workers(suite_dir: Path, worker) -> None:
+    context = SuiteLoader().load(path=suite_dir / "baygon.yml")
+    suite = replace(context.model, setup=(("true",),))
+    runner = DistributedRunner(
+        suite, workers=[worker.address], source=SUITE, base_dir=suite_dir
+    )
+
+    with pytest.raises(ConfigError, match="Setup and teardown"):
+        runner.run()
+
+
+def test_workers_refuse_plans_with_fixtures(suite_dir: Path, worker) -> None:
+    plan = _runner(suite_dir, [])._plan()
+    plan["source"] = 'version: 1\nsetup: "true"\ntests:\n  - exit: 0\n'
+
+    remote = RemoteWorker(worker.address, timeout=5)
+    with pytest.raises(WorkerError, match="cannot run on workers"):
+        remote.connect(plan)
+
+
+def test_worker_rejects_bad_messages(suite_dir: Path, worker) -> None:
+    remote = RemoteWorker(worker.address, timeout=5)
+    with pytest.raises(WorkerError, match="protocol"):
+        remote.connect({"type": "plan", "version": 99})
+
+    remote = RemoteWorker(worker.address, timeout=5)
+    remote.connect(_runner(suite_dir, [])._plan())
+    case = next(SuiteLoader().load(path=suite_dir / "baygon.yml").model.iter_cases())
+    case = replace(case, id=(42,))
+    with pytest.raises(WorkerError, match="Unknown case"):
+        remote.run_case(case)
+    remote.close()
+    with pytest.raises(ConnectionError):
+        remote.run_case(case)
+
+
+def test_eval_cases_run_locally(suite_dir: Path) -> None:
+    source = "version: 1\neval: true\ntests:\n  - args: ['{{ 1 + 1 }}']\n    exit: 0\n"
+    context = SuiteLoader().load(data=source, cwd=suite_dir)
+    runner = DistributedRunner(
+        context.model,
+        workers=[DyingWorker().address],
+        source=source,
+        base_dir=suite_dir,
+        executable=suite_dir / "double.sh",
+    )
+    report = runner.run()
+    assert report.cases[0].commands[0].argv[-1] == "2"
+
+
+def test_result_round_trip(suite_dir: Path) -> None:
+    report = SuiteExecutor().run(
+        SuiteLoader().load(path=suite_dir / "baygon.yml"),
+        executable=suite_dir / "double.sh",
+    )
+    original = report.cases[1]
+    data = json.loads(json.dumps(result_to_dict(original)))
+    rebuilt = result_from_dict(original.case, data)
+    assert rebuilt.status == original.status
+    assert [str(issue) for issue in rebuilt.issues] == [
+        str(issue) for issue in original.issues
+    ]
+    assert repr(rebuilt.issues[0]).startswith("RemoteIssue<")
+    assert [command_to_dict(command) for command in rebuilt.commands] == [
+        command_to_dict(command) for command in original.commands
+    ]
+
+
+def test_executor_requires_a_suite_file(suite_dir: Path) -> None:
+    context = SuiteLoader().load(data=SUITE, cwd=suite_dir)
+    with pytest.raises(ConfigError):
+        SuiteExecutor().run(context, workers=["127.0.0.1:1"])
+
+
+def test_worker_processes_over_unix_sockets(suite_dir: Path) -> None:
+    sockets = [suite_dir / f"w{index}.sock" for index in range(2)]
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "baygon", "worker", "--listen", f"unix:{path}"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for path in sockets
+    ]
+    try:
+        deadline = time.monotonic() + 10
+        while not all(path.exists() for path in sockets):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        report = SuiteExecutor().run(
+            SuiteLoader().load(path=suite_dir / "baygon.yml"),
+            executable=suite_dir / "double.sh",
+            workers=[f"unix:{path}" for path in sockets],
+        )
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+    assert (report.successes, report.failures) == (2, 1)
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from baygon.core.models import build_suite_model
+from baygon.error import ConfigError
+from baygon.runtime.files import (
+    InvalidFileContent,
+    InvalidGoldenFile,
+    MissingFile,
+    file_digest,
+    first_difference,
+    same_content,
+)
+from baygon.runtime.runner import BaygonRunner
+from baygon.schema import Schema
+
+
+def test_file_digest_reads_in_chunks(tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    payload = bytes(range(256)) * 100
+    path.write_bytes(payload)
+
+    assert file_digest(path, chunk_size=7) == hashlib.sha256(payload).hexdigest()
+
+
+def test_same_content(tmp_path: Path) -> None:
+    (tmp_path / "a").write_bytes(b"abc")
+    (tmp_path / "b").write_bytes(b"abc")
+    (tmp_path / "c").write_bytes(b"abd")
+    (tmp_path / "d").write_bytes(b"abcd")
+
+    assert same_content(tmp_path / "a", tmp_path / "b")
+    assert not same_content(tmp_path / "a", tmp_path / "c")
+    assert not same_content(tmp_path / "a", tmp_path / "d")
+
+
+def test_issue_messages() -> None:
+    assert str(MissingFile("out.txt")) == "Expected file out.txt was not created."
+    assert str(InvalidFileContent("out.bin", "expected.bin")) == (
+        "File out.bin differs from expected.bin."
+    )
+
+
+@pytest.fixture
+def suite_dir(tmp_path: Path) -> Path:
+    program = tmp_path / "write.sh"
+    program.write_text('#!/bin/sh\nprintf "%s\\n" "$@" > out.txt\n')
+    program.chmod(0o755)
+    (tmp_path / "work").mkdir()
+    (tmp_path / "expected.txt").write_text("HELLO\nWORLD\n")
+    return tmp_path
+
+
+def _run(suite_dir: Path, case: dict):
+    suite = build_suite_model(
+        Schema({"version": 1, "workdir": "work", "tests": [case]})
+    )
+    runner = BaygonRunner(suite, base_dir=suite_dir, executable=suite_dir / "write.sh")
+    return runner.run().cases[0]
+
+
+def test_files_are_matched_with_filters(suite_dir: Path) -> None:
+    result = _run(
+        suite_dir,
+        {
+            "args": ["hello", "world"],
+            "files": {
+                "out.txt": [
+                    {"filters": {"uppercase": True}, "contains": "HELLO"},
+                    {"regex": "world\\s*$"},
+                ],
+            },
+        },
+    )
+
+    assert result.status == "passed", result.issues
+
+
+def test_files_report_mismatches(suite_dir: Path) -> None:
+    result = _run(
+        suite_dir,
+        {
+            "args": ["hello"],
+            "files": {"out.txt": "bye", "missing.txt": []},
+        },
+    )
+
+    messages = [str(issue) for issue in result.issues]
+    assert result.status == "failed"
+    assert "Expected file missing.txt was not created." in messages
+    assert [issue.on for issue in result.issues] == ["file out.txt", "file missing.txt"]
+
+
+@pytest.mark.parametrize(
+    ("args", "status"), [(["HELLO", "WORLD"], "passed"), (["hello"], "failed")]
+)
+def test_files_compared_with_expected_file(
+    suite_dir: Path, args: list[str], status: str
+) -> None:
+    result = _run(
+        suite_dir,
+        {"args": args, "files": {"out.txt": {"same-as": "expected.txt"}}},
+    )
+
+    assert result.status == status
+
+
+@pytest.mark.parametrize(
+    ("args", "status"), [(["HELLO", "WORLD"], "passed"), (["hello"], "failed")]
+)
+def test_files_checked_by_digest(suite_dir: Path, args: list[str], status: str) -> None:
+    digest = hashlib.sha256(b"HELLO\nWORLD\n").hexdigest()
+    result = _run(
+        suite_dir,
+        {"args": args, "files": {"out.txt": [{"sha256": digest}]}},
+    )
+
+    assert result.status == status
+
+
+def test_missing_expected_file_is_a_config_error(suite_dir: Path) -> None:
+    with pytest.raises(ConfigError, match="nope"):
+        _run(suite_dir, {"files": {"out.txt": {"same-as": "nope.txt"}}})
+
+
+@pytest.mark.parametrize("chunk_size", [3, 1 << 20])
+def test_first_difference_locates_line_and_offset(
+    tmp_path: Path, chunk_size: int
+) -> None:
+    expected = tmp_path / "expected.txt"
+    lines = [f"line {index}" for index in range(200)]
+    expected.write_text("\n".join(lines) + "\n")
+    lines[150] = "line 15O"
+
+    difference = first_difference(
+        ("\n".join(lines) + "\n").encode(), expected, chunk_size=chunk_size
+    )
+
+    assert difference is not None
+    assert difference.line == 151
+    assert difference.offset == expected.read_text().index("line 150") + 7
+    assert (difference.actual, difference.expected) == (b"line 15O", b"line 150")
+
+
+def test_first_difference_handles_lengths(tmp_path: Path) -> None:
+    expected = tmp_path / "expected.txt"
+    expected.write_bytes(b"abc\ndef\n")
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+
+    assert first_difference(b"abc\ndef\n", expected) is None
+    assert first_difference(b"", empty) is None
+    shorter = first_difference(b"abc\n", expected)
+    assert (shorter.offset, shorter.line, shorter.actual) == (4, 2, b"")
+    assert shorter.expected == b"def"
+    longer = first_difference(b"abc\ndef\nmore", expected)
+    assert (longer.offset, longer.line, longer.actual) == (8, 3, b"more")
+    assert first_difference(b"x", empty).offset == 0
+
+
+def test_golden_issue_message(tmp_path: Path) -> None:
+    expected = tmp_path / "expected.txt"
+    expected.write_bytes(b"one\ntwo\n")
+    difference = first_difference(b"one\ntwi\n", expected)
+
+    issue = InvalidGoldenFile(difference, "expected.txt", on="stdout")
+
+    assert str(issue) == (
+        "Output stdout differs from expected.txt at line 2, byte 6: "
+        "expected 'two', got 'twi'."
+    )
+
+
+@pytest.mark.parametrize(("args", "status"), [(["4"], "passed"), (["5"], "failed")])
+def test_stdout_compared_with_golden_file(
+    tmp_path: Path, args: list[str], status: str
+) -> None:
+    program = tmp_path / "count.sh"
+    program.write_text('#!/bin/sh\nseq 1 "$1"\n')
+    program.chmod(0o755)
+    (tmp_path / "golden.txt").write_text("1\n2\n3\n4\n")
+    suite = build_suite_model(
+        Schema(
+            {
+                "version": 1,
+                "filters": {"trim": True},
+                "tests": [{"args": args, "stdout": {"file": "golden.txt"}}],
+            }
+        )
+    )
+
+    result = BaygonRunner(suite, base_dir=tmp_path, executable=program).run().cases[0]
+
+    assert result.status == status
+    if status == "failed":
+        assert "at line 5, byte 8" in str(result.issues[0])
+
+
+def test_stdin_streamed_from_templated_file(tmp_path: Path) -> None:
+    program = tmp_path / "size.sh"
+    program.write_text("#!/bin/sh\nwc -c\n")
+    program.chmod(0o755)
+    (tmp_path / "inputs").mkdir()
+    (tmp_path / "inputs" / "2.bin").write_bytes(bytes(range(256)) * 4)
+    suite = build_suite_model(
+        Schema(
+            {
+                "version": 1,
+                "eval": True,
+                "filters": {"trim": True},
+                "tests": [
+                    {"stdin": {"file": "inputs/{{ 1 + 1 }}.bin"}, "stdout": 1024},
+                    {"stdin": {"file": "inputs/{{ 1 + 2 }}.bin"}, "stdout": 0},
+                ],
+            }
+        )
+    )
+    runner = BaygonRunner(suite, base_dir=tmp_path, executable=program)
+    case = suite.tests[0]
+
+    assert case.stdin is None and case.stdin_file == "inputs/{{ 1 + 1 }}.bin"
+    with pytest.raises(ConfigError, match=r"inputs/3\.bin"):
+        runner.run()
+    assert runner.run(select=lambda item: item.id == (1,)).successes == 1
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+from baygon.core.models import build_suite_model
+from baygon.error import ConfigError
+from baygon.runtime.fixtures import FixtureResult, SetupFailed, run_commands
+from baygon.runtime.runner import BaygonRunner
+from baygon.schema import Schema
+
+
+def _record(calls: list[dict]):
+    return lambda **kwargs: calls.append(kwargs)
+
+
+def test_run_commands_captures_outputs() -> None:
+    calls: list[dict] = []
+    command = [
+        sys.executable,
+        "-c",
+        "import sys; print('out'); print('err', file=sys.stderr)",
+    ]
+
+    assert run_commands([command], hook=_record(calls))
+    assert calls[0]["cmd"] == command
+    assert (calls[0]["stdout"], calls[0]["stderr"]) == ("out\n", "err\n")
+    assert calls[0]["exit_status"] == 0
+
+
+def test_run_commands_stops_at_first_failure() -> None:
+    calls: list[dict] = []
+    commands = [
+        [sys.executable, "-c", "raise SystemExit(3)"],
+        [sys.executable, "-c", "pass"],
+    ]
+
+    assert not run_commands(commands, hook=_record(calls))
+    assert [call["exit_status"] for call in calls] == [3]
+
+
+def test_run_commands_reports_missing_programs() -> None:
+    calls: list[dict] = []
+
+    assert not run_commands([["/nonexistent/setup"]], hook=_record(calls))
+    assert calls[0]["exit_status"] == 127
+    assert "nonexistent" in calls[0]["stderr"]
+
+
+def test_runner_runs_fixtures_from_the_configuration_directory(
+    tmp_path: Path,
+) -> None:
+    config = {
+        "version": 1,
+        "setup": [["sh", "-c", "pwd > setup.txt"]],
+        "tests": [{"executable": sys.executable, "exit": 0}],
+    }
+    model = build_suite_model(Schema(config))
+
+    report = BaygonRunner(model, base_dir=tmp_path).run()
+
+    assert report.fixtures[0].status == "passed"
+    assert (tmp_path / "setup.txt").read_text().strip() == str(tmp_path)
+    assert not (Path.cwd() / "setup.txt").exists()
+
+
+def test_schema_coerces_commands() -> None:
+    config = Schema(
+        {
+            "setup": "mkdir -p 'data dir'",
+            "tests": [{"teardown": [["rm", "-f", 1]], "tests": [{"exit": 0}]}],
+        }
+    )
+
+    assert config["setup"] == [["mkdir", "-p", "data dir"]]
+    assert config["tests"][0]["teardown"] == [["rm", "-f", "1"]]
+
+
+@pytest.mark.parametrize("value", [[""], [3], 4])
+def test_schema_rejects_invalid_commands(value) -> None:
+    with pytest.raises(ConfigError):
+        Schema({"setup": value, "tests": [{"exit": 0}]}, humanize=True)
+
+
+def test_fixture_labels() -> None:
+    suite = FixtureResult(scope="suite", stage="setup", status="passed", commands=())
+    group = FixtureResult(scope="2", stage="teardown", status="failed", commands=())
+
+    assert suite.label == "Setup of suite"
+    assert group.label == "Teardown of group 2"
+    assert str(SetupFailed("2")) == "Skipped: the setup of group 2 failed."
+    assert str(SetupFailed("suite")) == "Skipped: the setup of the suite failed."
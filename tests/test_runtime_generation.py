@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable
+
+from pydantic import ValidationError
+import pytest
+
+from baygon.core.models import GenerateModel, build_suite_model
+from baygon.executable import Outputs
+from baygon.runtime.generation import check_property, draw_inputs, build_generators
+from baygon.runtime.runner import BaygonRunner
+from baygon.runtime.workdir import remove_workdir
+from baygon.schema import Schema
+
+
+@dataclass
+class AddExecutable:
+    """Adds its two arguments, but gets it wrong above `threshold`."""
+
+    path: str
+    threshold: int | None = None
+
+    def run(
+        self,
+        *args: str,
+        stdin: str | None = None,
+        env: dict[str, Any] | None = None,
+        hook: Callable[..., None] | None = None,
+    ) -> Outputs:
+        a, b = (int(arg) for arg in args)
+        total = a + b
+        if self.threshold is not None and a > self.threshold:
+            total += 1
+        if hook:
+            hook(cmd=[self.path, *args], stdin=stdin, stdout=str(total), stderr="")
+        return Outputs(exit_status=0, stdout=str(total), stderr="")
+
+
+def _factory(threshold: int | None = None, reference: str = "ref"):
+    def _make(path: str) -> AddExecutable:
+        if path.endswith(reference):
+            return AddExecutable(path)
+        return AddExecutable(path, threshold)
+
+    return _make
+
+
+def _suite(generate: dict[str, Any], **case: Any):
+    return build_suite_model(
+        Schema(
+            {
+                "tests": [
+                    {
+                        "name": "Addition",
+                        "args": ["{{ a }}", "{{ b }}"],
+                        "generate": generate,
+                        **case,
+                    }
+                ]
+            }
+        )
+    )
+
+
+def test_draw_inputs_is_reproducible() -> None:
+    spec = GenerateModel(values={"a": {"integer": [0, 1000]}})
+    generators = build_generators(spec)
+    assert draw_inputs(generators, 5, 42) == draw_inputs(generators, 5, 42)
+    assert draw_inputs(generators, 5, 42) != draw_inputs(generators, 5, 43)
+
+
+def test_check_property_shrinks_to_minimal_counterexample() -> None:
+    spec = GenerateModel(
+        values={"a": {"integer": {"min": 0, "max": 1000}}, "s": {"text": []}},
+        count=200,
+        seed=7,
+        jobs=4,
+    )
+
+    def _trial(values):
+        return (["too big"] if values["a"] >= 37 else []), []
+
+    outcome = check_property(spec, _trial)
+    assert not outcome.passed
+    assert outcome.seed == 7
+    assert outcome.counterexample == {"a": 37, "s": ""}
+    assert outcome.shrinks > 0
+
+
+def test_check_property_respects_shrink_budget() -> None:
+    spec = GenerateModel(values={"a": {"integer": [0, 1000]}}, seed=1, shrink=0)
+    outcome = check_property(spec, lambda _values: (["bad"], []))
+    assert outcome.shrinks == 0
+    assert outcome.trials == 1
+
+
+def test_check_property_draws_seed_when_missing() -> None:
+    spec = GenerateModel(values={"c": {"choice": ["x", "y"]}}, count=3)
+    outcome = check_property(spec, lambda _values: ([], []))
+    assert outcome.passed
+    assert outcome.trials == 3
+    assert isinstance(outcome.seed, int)
+
+
+def test_runner_generated_case_passes(tmp_path: Path) -> None:
+    suite = _suite(
+        {"count": 50, "seed": 3, "values": {"a": "integer", "b": "integer"}},
+        stdout="{{ a + b }}",
+    )
+    runner = BaygonRunner(
+        suite, base_dir=tmp_path, executable="prog", executable_factory=_factory()
+    )
+    report = runner.run()
+    assert report.successes == 1
+    assert report.cases[0].seed == 3
+    assert report.cases[0].trials == 50
+    assert report.cases[0].counterexample is None
+
+
+def test_runner_generated_case_reports_counterexample(tmp_path: Path) -> None:
+    suite = _suite(
+        {
+            "count": 100,
+            "seed": 11,
+            "values": {"a": {"integer": [0, 100]}, "b": {"integer": [0, 100]}},
+        },
+        stdout="{{ a + b }}",
+    )
+    runner = BaygonRunner(
+        suite, base_dir=tmp_path, executable="prog", executable_factory=_factory(50)
+    )
+    result = runner.run().cases[0]
+    assert result.status == "failed"
+    assert result.counterexample == {"a": 51, "b": 0}
+    assert result.commands[-1].argv[1:] == ("51", "0")
+
+
+def test_runner_generated_inputs_run_in_their_own_workdir(tmp_path: Path) -> None:
+    (tmp_path / "template").mkdir()
+    cwds, leftovers = [], []
+
+    class EvenWriter(AddExecutable):
+        """Writes out.txt only for an even first argument."""
+
+        def run(self, *args, cwd=None, **kwargs) -> Outputs:
+            cwds.append(cwd)
+            leftovers.extend(Path(cwd).iterdir())
+            if int(args[0]) % 2 == 0:
+                (Path(cwd) / "out.txt").write_text("even")
+            return super().run(*args, **kwargs)
+
+    suite = _suite(
+        {
+            "count": 40,
+            "jobs": 4,
+            "seed": 1,
+            "values": {"a": {"integer": [0, 100]}, "b": {"integer": [0, 0]}},
+        },
+        stdout="{{ a + b }}",
+        workdir="template",
+        files={"out.txt": []},
+    )
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=EvenWriter,
+        keep_failed=True,
+    )
+    result = runner.run().cases[0]
+
+    assert result.counterexample["a"] % 2 == 1
+    assert leftovers == []
+    assert len(set(cwds)) == len(cwds)
+    assert [cwd for cwd in cwds if Path(cwd).exists()] == [result.workdir]
+    remove_workdir(Path(result.workdir))
+
+
+def test_runner_generated_inputs_checking_files_without_workdir_run_one_at_a_time(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    running, peak = [], []
+    lock = threading.Lock()
+
+    class Probe(AddExecutable):
+        def run(self, *args, cwd=None, **kwargs) -> Outputs:
+            with lock:
+                running.append(cwd)
+                peak.append(len(running))
+            Path("out.txt").write_text(" ".join(args))
+            time.sleep(0.01)
+            with lock:
+                running.pop()
+            return super().run(*args, **kwargs)
+
+    suite = _suite(
+        {"count": 8, "jobs": 4, "values": {"a": "integer", "b": "integer"}},
+        stdout="{{ a + b }}",
+        files={"out.txt": []},
+    )
+    runner = BaygonRunner(
+        suite, base_dir=tmp_path, executable="prog", executable_factory=Probe
+    )
+
+    assert runner.run().successes == 1
+    assert max(peak) == 1
+
+
+def test_runner_generated_case_against_reference(tmp_path: Path) -> None:
+    suite = _suite(
+        {
+            "seed": 5,
+            "reference": "ref",
+            "values": {"a": {"integer": [0, 100]}, "b": {"integer": [0, 100]}},
+        }
+    )
+    runner = BaygonRunner(
+        suite, base_dir=tmp_path, executable="prog", executable_factory=_factory(80)
+    )
+    result = runner.run().cases[0]
+    assert result.status == "failed"
+    assert result.counterexample == {"a": 81, "b": 0}
+    assert {issue.on for issue in result.issues} == {"stdout (reference)"}
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        {},
+        {"a": {"unknown": []}},
+        {"a": {"integer": [], "float": []}},
+        {"not valid": "integer"},
+    ],
+)
+def test_schema_rejects_invalid_generate(values) -> None:
+    with pytest.raises(ValidationError):
+        Schema({"tests": [{"generate": {"values": values}}]})
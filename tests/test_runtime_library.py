@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from baygon.core.models import build_suite_model
+from baygon.error import ConfigError
+from baygon.runtime.fixtures import SetupFailed
+from baygon.runtime.library import (
+    Call,
+    CallFailed,
+    InvalidReturn,
+    LibraryError,
+    run_calls,
+)
+from baygon.runtime import runner as runner_module
+from baygon.runtime.runner import BaygonRunner
+from baygon.schema import Schema
+
+LIBC = "libc.so.6"
+
+
+def _run(library: dict, tests: list[dict], tmp_path: Path):
+    config = {"version": 1, "tests": [{"library": library, "tests": tests}]}
+    model = build_suite_model(Schema(config))
+    return BaygonRunner(model, base_dir=tmp_path).run()
+
+
+def test_calls_check_returned_values(tmp_path: Path) -> None:
+    report = _run(
+        {"path": LIBC, "functions": {"abs": "int(int)", "strlen": "size_t(char*)"}},
+        [
+            {"call": "abs", "args": [-3], "returns": 3},
+            {"call": "strlen", "args": ["hello"], "returns": 5},
+            {"call": "abs", "args": [-4], "returns": 3},
+        ],
+        tmp_path,
+    )
+
+    passed, _, failed = report.cases
+    assert [case.status for case in report.cases] == ["passed", "passed", "failed"]
+    assert passed.commands[0].argv == ("abs", "-3")
+    assert passed.commands[0].text("stdout") == "3"
+    assert isinstance(failed.issues[0], InvalidReturn)
+    assert str(failed.issues[0]) == "abs(-4) returned 4 instead of 3."
+
+
+def test_only_the_selected_calls_are_made(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    made: list[Call] = []
+
+    def _run_calls(path, functions, calls, **kwargs):
+        made.extend(calls)
+        return run_calls(path, functions, calls, **kwargs)
+
+    monkeypatch.setattr(runner_module, "run_calls", _run_calls)
+    config = {
+        "version": 1,
+        "tests": [
+            {
+                "library": {"path": LIBC, "functions": {"abs": "int(int)"}},
+                "tests": [
+                    {"call": "abs", "args": [-1], "returns": 1},
+                    {"call": "abs", "args": [-2], "returns": 2},
+                ],
+            }
+        ],
+    }
+    runner = BaygonRunner(build_suite_model(Schema(config)), base_dir=tmp_path)
+    report = runner.run(select=lambda case: case.id_str == "1.2")
+
+    assert made == [Call("abs", ("-2",))]
+    assert [case.status for case in report.cases] == ["passed"]
+
+
+def test_floating_point_returns_use_a_tolerance(tmp_path: Path) -> None:
+    report = _run(
+        {"path": "libm.so.6", "functions": {"pow": "double(double, double)"}},
+        [
+            {"call": "pow", "args": [2, 0.5], "returns": 1.4142135},
+            {"call": "pow", "args": [2, 0.5], "returns": 1.4, "tolerance": 0.1},
+            {"call": "pow", "args": [2, 0.5], "returns": 1.4},
+        ],
+        tmp_path,
+    )
+
+    assert [case.status for case in report.cases] == ["passed", "passed", "failed"]
+
+
+def test_crashing_and_hanging_calls_do_not_stop_the_next_ones() -> None:
+    functions = {"abort": "void()", "sleep": "unsigned(unsigned)", "abs": "int(int)"}
+    results = run_calls(
+        LIBC,
+        functions,
+        [
+            Call("abort"),
+            Call("abs", ("-1",)),
+            Call("sleep", ("5",)),
+            Call("abs", ("2",)),
+        ],
+        timeout=0.5,
+    )
+
+    assert [result.error for result in results] == [
+        "crashed with SIGABRT",
+        None,
+        "did not return within 0.5 s",
+        None,
+    ]
+    assert [result.value for result in results[1::2]] == [1, 2]
+
+
+def test_invalid_arguments_are_reported(tmp_path: Path) -> None:
+    report = _run(
+        {"path": LIBC, "functions": {"abs": "int(int)"}},
+        [{"call": "abs", "args": ["x"], "returns": 0}],
+        tmp_path,
+    )
+
+    (issue,) = report.cases[0].issues
+    assert isinstance(issue, CallFailed)
+    assert str(issue).startswith("abs(x) has an invalid argument:")
+
+
+def test_library_that_cannot_be_loaded_skips_its_tests(tmp_path: Path) -> None:
+    report = _run(
+        {"path": "./missing.so", "functions": {"f": "int()"}},
+        [{"call": "f", "returns": 0}],
+        tmp_path,
+    )
+
+    assert report.cases[0].status == "skipped"
+    assert isinstance(report.cases[0].issues[0], SetupFailed)
+    (failed,) = report.fixtures
+    assert (failed.stage, failed.status) == ("library", "failed")
+    assert "missing.so" in failed.commands[0].text("stderr")
+    with pytest.raises(LibraryError):
+        run_calls(LIBC, {"no_such_function": "int()"}, [Call("no_such_function")])
+
+
+@pytest.mark.parametrize(
+    "tests",
+    [
+        [{"call": "abs", "args": [1]}],
+        [
+            {
+                "library": {"path": LIBC, "functions": {"abs": "int(int)"}},
+                "tests": [{"call": "labs", "args": [1]}],
+            }
+        ],
+        [
+            {
+                "library": {"path": LIBC, "functions": {"abs": "int(int)"}},
+                "tests": [{"call": "abs", "args": [1, 2]}],
+            }
+        ],
+    ],
+)
+def test_calls_must_match_a_declared_function(tests: list, tmp_path: Path) -> None:
+    model = build_suite_model(Schema({"version": 1, "tests": tests}))
+
+    with pytest.raises(ConfigError):
+        BaygonRunner(model, base_dir=tmp_path).run()
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"tests": [{"returns": 1}]},
+        {"tests": [{"call": "f", "stdout": "x"}]},
+        {"tests": [{"call": "f", "request": "x"}]},
+        {"tests": [{"library": {"path": LIBC, "functions": {}}, "tests": []}]},
+        {
+            "tests": [
+                {"library": {"path": LIBC, "functions": {"f": "int"}}, "tests": []}
+            ]
+        },
+        {
+            "tests": [
+                {"library": {"path": LIBC, "functions": {"f": "foo()"}}, "tests": []}
+            ]
+        },
+    ],
+)
+def test_invalid_libraries(config: dict) -> None:
+    with pytest.raises(ConfigError):
+        Schema(config, humanize=True)
+
+
+def test_calls_answered_together_are_not_reported_as_timeouts() -> None:
+    functions = {"abs": "int(int)", "sleep": "unsigned(unsigned)"}
+    calls = [Call("abs", (str(-value),)) for value in range(1, 50)]
+
+    results = run_calls(LIBC, functions, [*calls, Call("sleep", ("5",))], timeout=1)
+
+    assert [result.value for result in results[:-1]] == list(range(1, 50))
+    assert results[-1].error == "did not return within 1 s"
+
+
+def test_library_built_by_the_setup_is_found_from_any_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    maps = Path("/proc/self/maps").read_text().split()
+    libc = next(item for item in maps if Path(item).name == LIBC)
+    monkeypatch.chdir(tmp_path.parent)
+    config = {
+        "version": 1,
+        "tests": [
+            {
+                "setup": [["cp", libc, "libcalc.so"]],
+                "library": {"path": "./libcalc.so", "functions": {"abs": "int(int)"}},
+                "tests": [{"call": "abs", "args": [-2], "returns": 2}],
+            }
+        ],
+    }
+    model = build_suite_model(Schema(config))
+
+    report = BaygonRunner(model, base_dir=tmp_path).run()
+
+    assert report.cases[0].status == "passed"
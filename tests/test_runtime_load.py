@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+import socketserver
+import threading
+
+import pytest
+
+from baygon.runtime.load import LoadRequest, LoadStats, LoadThreshold, run_load
+
+
+class _Echo(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if line.strip() == b"close":
+                return
+            if line.strip() != b"silent":
+                self.wfile.write(line.upper())
+
+
+@pytest.fixture
+def address() -> Iterator[str]:
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Echo)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield str(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def _line(expected: bytes) -> LoadRequest:
+    return LoadRequest(expected.lower(), lambda data: data == expected)
+
+
+def test_load_sends_the_requested_count_from_each_connection(address: str) -> None:
+    stats = run_load(address, [_line(b"A\n"), _line(b"B\n")], concurrency=4, count=200)
+
+    assert (stats.requests, stats.errors) == (200, 0)
+    assert len(stats.latencies) == 200
+    assert stats.rps > 0
+    assert sum(count for _, count in stats.histogram()) == 200
+
+
+def test_load_stops_after_its_duration(address: str) -> None:
+    stats = run_load(address, [_line(b"A\n")], concurrency=2, duration=0.2)
+
+    assert stats.requests > 0
+    assert 0.2 <= stats.duration < 2
+
+
+def test_load_counts_failed_requests_and_reconnects(address: str) -> None:
+    requests = [
+        _line(b"A\n"),
+        LoadRequest(b"silent\n", bool),
+        LoadRequest(b"close\n", bool),
+    ]
+
+    stats = run_load(address, requests, count=6, timeout=0.1)
+
+    assert (stats.requests, stats.errors) == (6, 4)
+    assert stats.error_rate == pytest.approx(4 / 6)
+
+
+def test_load_against_a_closed_port() -> None:
+    stats = run_load("1", [_line(b"A\n")], count=3, timeout=0.5)
+
+    assert (stats.errors, stats.latencies) == (3, ())
+    assert stats.summary()["latency"] == {"p50": None, "p95": None, "p99": None}
+
+
+def test_load_summary_buckets_the_latencies() -> None:
+    stats = LoadStats(3, 0, 1.0, (0.0005, 0.003, 10.0))
+
+    summary = stats.summary()
+
+    assert summary["rps"] == 3.0
+    assert summary["latency"]["p99"] == 10.0
+    counts = {bucket["le"]: bucket["count"] for bucket in summary["histogram"]}
+    assert (counts[0.001], counts[0.005], counts["inf"]) == (1, 1, 1)
+    assert str(LoadThreshold("max-p99", 0.05, 0.12)) == (
+        "99th percentile latency of 0.1200 s is above 0.05 s."
+    )
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+from baygon.core.models import build_suite_model
+from baygon.error import ConfigError
+from baygon.runtime.pipeline import InvalidStageExit, run_pipeline
+from baygon.runtime.runner import BaygonRunner
+from baygon.schema import Schema
+
+UPPER = """\
+import sys
+for line in sys.stdin:
+    sys.stdout.write(line.upper())
+print("upper done", file=sys.stderr)
+sys.exit(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
+"""
+
+
+@pytest.fixture
+def upper(tmp_path: Path) -> Path:
+    program = tmp_path / "upper.py"
+    program.write_text(f"#!{sys.executable}\n{UPPER}")
+    program.chmod(0o755)
+    return program
+
+
+def _run(program: Path, case: dict):
+    model = build_suite_model(Schema({"version": 1, "tests": [case]}))
+    report = BaygonRunner(model, base_dir=program.parent, executable=program).run()
+    return report.cases[0]
+
+
+def test_pipeline_connects_the_program_between_commands(upper: Path) -> None:
+    result = _run(
+        upper,
+        {
+            "stdin": "b\na\nb\n",
+            "pipeline": ["sort", {"args": []}, ["uniq", "-c"]],
+            "stdout": [{"regex": "^ +1 A\\n +2 B\\n$"}],
+            "exit": 0,
+        },
+    )
+
+    assert result.status == "passed", result.issues
+    assert [log.argv[0] for log in result.commands] == ["sort", str(upper), "uniq"]
+    assert result.commands[0].stdin == "b\na\nb\n"
+    assert result.commands[1].text("stderr") == "upper done\n"
+    assert [log.stdout for log in result.commands[:2]] == [b"", b""]
+
+
+def test_pipeline_checks_the_exit_status_of_each_stage(upper: Path) -> None:
+    result = _run(
+        upper,
+        {
+            "stdin": "x\n",
+            "pipeline": [{"args": [3], "exit": 0}, {"executable": "cat", "exit": 0}],
+            "stdout": "X\n",
+        },
+    )
+
+    assert [str(issue) for issue in result.issues] == [
+        "Pipeline stage 1 exited with status 3 instead of 0."
+    ]
+    assert isinstance(result.issues[0], InvalidStageExit)
+    assert result.issues[0].on == "pipeline stage 1"
+
+
+def test_pipeline_resolves_stage_paths_relative_to_the_suite(upper: Path) -> None:
+    result = _run(
+        upper,
+        {"stdin": "ok\n", "pipeline": ["./upper.py", "./upper.py 0"], "stdout": "OK\n"},
+    )
+
+    assert result.status == "passed", result.issues
+
+
+def test_pipeline_streams_large_outputs_between_stages() -> None:
+    outputs = run_pipeline([["head", "-c", str(1 << 26), "/dev/zero"], ["wc", "-c"]])
+
+    assert outputs[-1].stdout.strip() == str(1 << 26)
+    assert outputs[0].stdout_bytes == b""
+
+
+def test_pipeline_reports_stages_that_cannot_start() -> None:
+    logs = []
+    outputs = run_pipeline(
+        [["yes"], ["/nonexistent/program"], ["wc", "-c"]],
+        hook=lambda **kwargs: logs.append(kwargs),
+    )
+
+    assert [output.exit_status for output in outputs[1:]] == [127, 0]
+    assert "nonexistent" in outputs[1].stderr
+    assert outputs[-1].stdout.strip() == "0"
+    assert [log["cmd"][0] for log in logs] == ["yes", "/nonexistent/program", "wc"]
+
+
+def test_pipeline_reads_stdin_from_a_file(tmp_path: Path) -> None:
+    source = tmp_path / "input.txt"
+    source.write_text("3\n1\n2\n")
+
+    outputs = run_pipeline([["sort"], ["head", "-n", "1"]], stdin=source)
+
+    assert outputs[-1].stdout == "1\n"
+
+
+@pytest.mark.parametrize(
+    "case",
+    [
+        {"pipeline": ["cat", {"args": []}], "args": ["x"]},
+        {"pipeline": [{"args": []}], "dialogue": [{"send": "x"}]},
+        {"pipeline": [""]},
+        {"pipeline": [{"args": "x"}]},
+        {"pipeline": [{"command": "cat"}]},
+    ],
+)
+def test_invalid_pipelines(case: dict) -> None:
+    with pytest.raises(ConfigError):
+        Schema({"tests": [case]}, humanize=True)
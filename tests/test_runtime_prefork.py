@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import sys
+
+import pytest
+
+from baygon.core.models import build_suite_model
+from baygon.executable import Executable, get_env
+from baygon.runtime.prefork import (
+    PreforkExecutable,
+    PreforkPool,
+    Zygote,
+    python_shebang,
+)
+from baygon.runtime.runner import BaygonRunner
+from baygon.schema import Schema
+
+SCRIPT = """\
+import atexit
+import json
+import os
+import sys
+import threading
+
+if sys.argv[1:2] == ["raise"]:
+    raise ValueError("broken")
+if sys.argv[1:2] == ["exit"]:
+    sys.exit(sys.argv[2])
+atexit.register(print, "bye")
+print(json.dumps({
+    "argv": sys.argv,
+    "name": __name__,
+    "stdin": sys.stdin.read(),
+    "cwd": os.getcwd(),
+    "path": sys.path[0],
+    "value": os.environ.get("VALUE"),
+    "ppid": os.getppid(),
+}, sort_keys=True))
+threading.Thread(target=print, args=("thread",)).start()
+print("done", file=sys.stderr)
+sys.exit(len(sys.argv) - 1)
+"""
+
+
+@pytest.fixture
+def script(tmp_path: Path) -> Path:
+    program = tmp_path / "script.py"
+    program.write_text(f"#!{sys.executable}\n{SCRIPT}")
+    program.chmod(0o755)
+    return program
+
+
+@pytest.fixture
+def pool():
+    pool = PreforkPool()
+    yield pool
+    pool.close()
+
+
+def _without_ppid(output):
+    exit_status, stdout, stderr = output
+    lines = stdout.splitlines()
+    return exit_status, [line.split('"ppid"')[0] for line in lines], stderr
+
+
+@pytest.mark.parametrize(
+    ("args", "options"),
+    [
+        ((), {}),
+        (("a", "b c"), {"stdin": "line\n", "env": get_env({"VALUE": "1"})}),
+        (("x",), {"cwd": "/", "capture": "file"}),
+        (("raise",), {}),
+        (("exit", "message"), {}),
+    ],
+)
+def test_forked_runs_behave_like_direct_runs(
+    script: Path, pool: PreforkPool, args: tuple, options: dict
+) -> None:
+    forked = pool.executable(str(script))
+    assert isinstance(forked, PreforkExecutable)
+
+    expected = Executable(str(script)).run(*args, **options)
+    output = forked.run(*args, **options)
+
+    assert _without_ppid(output) == _without_ppid(expected)
+    if "VALUE" in options.get("env", {}):
+        assert '"value": "1"' in output.stdout
+
+
+def test_runs_are_forked_by_the_zygote(script: Path, pool: PreforkPool) -> None:
+    forked = pool.executable(str(script))
+    first, second = (forked.run().stdout for _ in range(2))
+
+    zygote = forked.zygote
+    assert f'"ppid": {zygote.process.pid}' in first
+    assert f'"ppid": {zygote.process.pid}' in second
+    other = forked.run(env=get_env({"PYTHONHASHSEED": "1"})).stdout
+    assert f'"ppid": {os.getpid()}' in other
+
+
+def test_monitor_kills_a_forked_run(tmp_path: Path, pool: PreforkPool) -> None:
+    program = tmp_path / "yes.py"
+    program.write_text(f"#!{sys.executable}\nwhile True:\n    print('y', flush=True)\n")
+    program.chmod(0o755)
+
+    output = pool.executable(str(program)).run(monitor=lambda _: True)
+
+    assert output.exit_status == -9
+    assert output.stdout.startswith("y")
+
+
+def test_runs_start_directly_without_a_zygote(script: Path) -> None:
+    zygote = Zygote(["/nonexistent/python3"], str(script))
+    executable = PreforkExecutable(str(script), zygote)
+
+    output = executable.run("a")
+
+    assert zygote.broken
+    assert f'"ppid": {os.getpid()}' in output.stdout
+
+
+def test_other_programs_are_not_forked(pool: PreforkPool) -> None:
+    assert type(pool.executable("echo")) is Executable
+
+
+@pytest.mark.parametrize(
+    ("line", "command"),
+    [
+        ("#!/usr/bin/env python3", ["/usr/bin/env", "python3"]),
+        ("#!/usr/bin/python3.11 -u -B", ["/usr/bin/python3.11", "-u -B"]),
+        ("#! /usr/bin/python", ["/usr/bin/python"]),
+        ("#!/bin/sh", None),
+        ("#!/usr/bin/env node", None),
+        ("print('no shebang')", None),
+    ],
+)
+def test_python_shebang(tmp_path: Path, line: str, command) -> None:
+    program = tmp_path / "program"
+    program.write_text(f"{line}\n")
+
+    assert python_shebang(program) == command
+
+
+def test_suite_runs_scripts_with_the_prefork_launcher() -> None:
+    cli = Path(__file__).parent / "cli"
+    config = Schema((cli / "success.yml").read_text()) | {"launcher": "prefork"}
+    model = build_suite_model(Schema(config))
+
+    report = BaygonRunner(model, base_dir=cli, executable=cli / "main.exe.py").run()
+
+    assert model.launcher == "prefork"
+    assert {case.status for case in report.cases} == {"passed"}
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+from typing import Any
+
+from baygon.core.models import build_suite_model
+from baygon.executable import Outputs
+from baygon.runtime.recording import (
+    Recording,
+    ReplayRunner,
+    StaleRecording,
+    command_from_dict,
+    command_to_dict,
+    input_hash,
+    load_recordings,
+    save_recordings,
+    stale_cases,
+)
+from baygon.runtime.runner import BaygonRunner, CommandLog
+from baygon.schema import Schema
+from baygon.suite import SuiteExecutor, SuiteLoader
+
+
+def _fake_factory(responses: dict[tuple[str, ...], tuple[int, str, str]]):
+    class _Fake:
+        def __init__(self, path: str) -> None:
+            self.path = path
+
+        def run(self, *args, stdin=None, env=None, hook=None, cwd=None) -> Outputs:
+            exit_status, stdout, stderr = responses[tuple(args)]
+            hook(
+                cmd=[self.path, *args],
+                stdin=stdin,
+                stdout=stdout,
+                stderr=stderr,
+                exit_status=exit_status,
+            )
+            return Outputs(exit_status, stdout, stderr)
+
+    return _Fake
+
+
+def _suite(tests: list[dict[str, Any]], **extra: Any):
+    return build_suite_model(Schema({"tests": tests, **extra}))
+
+
+def _record(
+    tmp_path: Path, tests: list[dict[str, Any]], responses, **extra: Any
+) -> Path:
+    suite = _suite(tests, **extra)
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_fake_factory(responses),
+    )
+    directory = tmp_path / "records"
+    save_recordings(runner.run(), directory, base_dir=tmp_path)
+    return directory
+
+
+def test_command_round_trip() -> None:
+    command = CommandLog(
+        argv=("prog", "1"),
+        stdin="in",
+        stdout="out",
+        stderr="err",
+        exit_status=3,
+        duration=0.5,
+    )
+    assert command_from_dict(command_to_dict(command)) == command
+
+
+def test_input_hash_tracks_inputs_only() -> None:
+    base = _suite([{"args": [1], "stdout": "1"}]).tests[0]
+    same_inputs = _suite([{"args": [1], "stdout": "2"}]).tests[0]
+    other_inputs = _suite([{"args": [2], "stdout": "1"}]).tests[0]
+    assert input_hash(base) == input_hash(same_inputs)
+    assert input_hash(base) != input_hash(other_inputs)
+
+
+def test_input_hash_tracks_the_content_of_input_files(tmp_path: Path) -> None:
+    case = _suite([{"stdin": {"file": "input.txt"}}]).tests[0]
+    (tmp_path / "input.txt").write_text("1 2\n")
+    recorded = input_hash(case, tmp_path)
+
+    assert input_hash(case, tmp_path) == recorded
+    (tmp_path / "input.txt").write_text("3 4\n")
+    assert input_hash(case, tmp_path) != recorded
+    (tmp_path / "input.txt").unlink()
+    assert input_hash(case, tmp_path) != recorded
+
+
+def test_save_and_load_recordings(tmp_path: Path) -> None:
+    directory = _record(
+        tmp_path,
+        [{"args": ["a"], "stdout": "x"}, {"args": ["b"], "repeat": 2}],
+        {("a",): (0, "x", ""), ("b",): (1, "y", "oops")},
+    )
+    assert sorted(p.name for p in directory.iterdir()) == ["1.json.gz", "2.json.gz"]
+
+    recordings = load_recordings(directory)
+    assert recordings["1"].status == "passed"
+    assert len(recordings["2"].commands) == 2
+    assert recordings["2"].commands[0].stderr == "oops"
+
+
+def test_load_recordings_ignores_unknown_format(tmp_path: Path) -> None:
+    payload = json.dumps({"format": 99, "id": "1"}).encode()
+    (tmp_path / "1.json.gz").write_bytes(gzip.compress(payload))
+    assert load_recordings(tmp_path) == {}
+
+
+def test_regrade_applies_current_matchers(tmp_path: Path) -> None:
+    directory = _record(
+        tmp_path,
+        [{"args": ["a"], "stdout": "x"}, {"args": ["b"], "stdout": "wrong"}],
+        {("a",): (0, " x ", ""), ("b",): (0, "y", "")},
+    )
+    fixed = _suite(
+        [{"args": ["a"], "stdout": "x"}, {"args": ["b"], "stdout": "y"}],
+        filters={"trim": True},
+    )
+
+    def _no_spawn(path: str):
+        raise AssertionError(f"Unexpected spawn of {path}")
+
+    runner = ReplayRunner(
+        fixed,
+        recordings=load_recordings(directory),
+        base_dir=tmp_path,
+        executable_factory=_no_spawn,
+    )
+    report = runner.run()
+    assert report.successes == 2
+    assert report.cases[0].commands[0].text("stdout") == " x "
+    assert stale_cases(report) == []
+
+
+def test_regrade_decodes_outputs_like_a_live_run(tmp_path: Path) -> None:
+    tests = [{"args": ["a"], "stdout": [{"contains": "ok"}]}]
+    directory = _record(tmp_path, tests, {("a",): (0, b"ok\xff\n", b"")})
+    recordings = load_recordings(directory)
+
+    strict = ReplayRunner(_suite(tests), recordings=recordings, base_dir=tmp_path)
+    lenient = ReplayRunner(
+        _suite(tests, **{"decode-errors": "replace"}),
+        recordings=recordings,
+        base_dir=tmp_path,
+    )
+
+    (failed,) = strict.run().cases
+    assert failed.status == "failed"
+    assert "not valid utf-8" in str(failed.issues[0])
+    assert failed.commands[0].stdout == b"ok\xff\n"
+    assert lenient.run().cases[0].status == "passed"
+
+
+def test_regrade_flags_stale_cases(tmp_path: Path) -> None:
+    directory = _record(
+        tmp_path,
+        [{"args": ["a"]}, {"args": ["b"]}],
+        {("a",): (0, "", ""), ("b",): (0, "", "")},
+    )
+    changed = _suite(
+        [
+            {"args": ["a"]},
+            {"args": ["c"]},
+            {"args": ["d"]},
+            {"generate": {"values": {"a": "integer"}}},
+        ]
+    )
+    recordings = load_recordings(directory)
+    recordings["1"] = Recording("1", recordings["1"].input_hash, commands=())
+    report = ReplayRunner(changed, recordings=recordings, base_dir=tmp_path).run()
+
+    assert report.skipped == 4
+    reasons = [str(result.issues[0]) for result in stale_cases(report)]
+    assert "recording is incomplete" in reasons[0]
+    assert "inputs changed" in reasons[1]
+    assert "no recording" in reasons[2]
+    assert "generated" in reasons[3]
+    assert isinstance(report.cases[0].issues[0], StaleRecording)
+    assert "StaleRecording" in repr(report.cases[0].issues[0])
+
+
+def test_regrade_flags_cases_whose_workdir_template_changed(
+    tmp_path: Path,
+) -> None:
+    template = tmp_path / "template"
+    template.mkdir()
+    (template / "data.txt").write_text("1")
+    tests = [{"args": ["a"]}]
+    directory = _record(tmp_path, tests, {("a",): (0, "", "")}, workdir="template")
+    suite = _suite(tests, workdir="template")
+
+    runner = ReplayRunner(
+        suite, recordings=load_recordings(directory), base_dir=tmp_path
+    )
+    assert runner._prefork is None
+    assert runner.run().successes == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["records", "template"]
+
+    (template / "data.txt").write_text("2")
+    runner = ReplayRunner(
+        suite, recordings=load_recordings(directory), base_dir=tmp_path
+    )
+    report = runner.run()
+    assert report.skipped == 1
+    assert "inputs changed" in str(report.cases[0].issues[0])
+
+
+def test_suite_executor_regrade(tmp_path: Path) -> None:
+    tests = [{"args": ["a"], "stdout": "x"}]
+    directory = _record(tmp_path, tests, {("a",): (0, "x", "")})
+    context = SuiteLoader().load(
+        data={"executable": "prog", "tests": tests}, cwd=tmp_path
+    )
+    report = SuiteExecutor().regrade(context, recordings=load_recordings(directory))
+    assert report.successes == 1
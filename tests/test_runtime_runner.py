@@ -2,12 +2,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+import sys
+import threading
+import time
 from typing import Any, Callable
 
 import pytest
 
 from baygon.core.models import build_suite_model
 from baygon.error import InvalidExecutableError
+from baygon.eval import reset
 from baygon.executable import Outputs
 from baygon.filters import FilterEval, FilterNone
 from baygon.runtime.runner import BaygonRunner, _apply_eval, _apply_eval_env
@@ -108,6 +112,29 @@ def test_runner_reports_failure(tmp_path: Path) -> None:
     assert result.issues, "Expected at least one issue for mismatch"
 
 
+def test_runner_runs_single_cases(tmp_path: Path) -> None:
+    suite = _suite_from_dict(
+        {
+            "tests": [
+                {"args": ["a"], "stdout": "a"},
+                {"tests": [{"args": ["b"], "stdout": "a"}]},
+            ],
+        }
+    )
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_fake_factory({("a",): (0, "a", ""), ("b",): (0, "b", "")}),
+    )
+
+    assert runner.run_case("2.1").status == "failed"
+    assert runner.run_case("1").status == "passed"
+    with pytest.raises(KeyError):
+        runner.run_case("3")
+    runner.close()
+
+
 def test_runner_respects_failure_limit(tmp_path: Path) -> None:
     suite = _suite_from_dict(
         {
@@ -211,3 +238,470 @@ def test_apply_eval_helpers() -> None:
     evaluator = FilterEval()
     values = _apply_eval_env(evaluator, {"value": "{{ 1 + 1 }}"})
     assert values["value"] == "2"
+
+
+def test_runner_select_and_order(tmp_path: Path) -> None:
+    suite = _suite_from_dict(
+        {
+            "version": 1,
+            "tests": [
+                {"name": "First", "args": ["one"]},
+                {"name": "Second", "args": ["two"]},
+                {"name": "Third", "args": ["three"]},
+            ],
+        }
+    )
+    executed: list[str] = []
+    responses = {("one",): (0, "", ""), ("two",): (1, "", ""), ("three",): (0, "", "")}
+
+    def _factory(path: str) -> FakeExecutable:
+        fake = FakeExecutable(path=path, responses=responses)
+        original = fake.run
+
+        def _run(*args, **kwargs):
+            executed.append(args[0])
+            return original(*args, **kwargs)
+
+        fake.run = _run  # type: ignore[method-assign]
+        return fake
+
+    runner = BaygonRunner(
+        suite, base_dir=tmp_path, executable="prog", executable_factory=_factory
+    )
+    report = runner.run(
+        select=lambda case: case.name != "Second",
+        order=lambda case: case.name != "Third",
+    )
+
+    assert executed == ["three", "one"]
+    assert [result.case.name for result in report.cases] == ["First", "Third"]
+
+
+def _recording_factory(
+    responses: dict[tuple[str, ...], tuple[int, str, str]], started: list[str]
+):
+    lock = threading.Lock()
+
+    def _factory(path: str) -> FakeExecutable:
+        fake = FakeExecutable(path=path, responses=responses)
+        original = fake.run
+
+        def _run(*args, **kwargs):
+            with lock:
+                started.append(args[0])
+            time.sleep(0.01)
+            return original(*args, **kwargs)
+
+        fake.run = _run  # type: ignore[method-assign]
+        return fake
+
+    return _factory
+
+
+def test_runner_parallel_keeps_declaration_order(tmp_path: Path) -> None:
+    names = ["a", "b", "c", "d", "e"]
+    suite = _suite_from_dict(
+        {
+            "version": 1,
+            "tests": [{"name": name, "args": [name], "exit": 0} for name in names],
+        }
+    )
+    responses = {(name,): (0 if name != "c" else 1, "", "") for name in names}
+    started: list[str] = []
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_recording_factory(responses, started),
+    )
+
+    report = runner.run(order=lambda case: case.name != "e", jobs=3)
+
+    assert started[0] == "e"
+    assert sorted(started) == names
+    assert [result.case.name for result in report.cases] == names
+    assert report.failures == 1
+
+
+def test_runner_parallel_respects_limit(tmp_path: Path) -> None:
+    names = [str(index) for index in range(8)]
+    suite = _suite_from_dict(
+        {"version": 1, "tests": [{"args": [name], "exit": 0} for name in names]}
+    )
+    responses = {(name,): (1, "", "") for name in names}
+    started: list[str] = []
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_recording_factory(responses, started),
+    )
+
+    report = runner.run(limit=1, jobs=2)
+
+    assert report.failures < len(names)
+    assert len(started) == report.total
+
+
+def test_runner_parallel_serializes_eval_cases(tmp_path: Path) -> None:
+    suite = _suite_from_dict(
+        {"version": 1, "eval": True, "tests": [{"args": ["{{ iter(1) }}"]}] * 3}
+    )
+    responses = {(arg,): (0, "", "") for arg in ("1", "2", "3")}
+    started: list[str] = []
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_recording_factory(responses, started),
+    )
+
+    reset()
+    report = runner.run(order=lambda case: -case.id[0], jobs=4)
+
+    assert started == ["1", "2", "3"]
+    assert [result.case.id[0] for result in report.cases] == [1, 2, 3]
+
+
+def _dependent_suite():
+    return _suite_from_dict(
+        {
+            "version": 1,
+            "tests": [
+                {"name": "compile", "args": ["compile"], "exit": 0},
+                {
+                    "name": "features",
+                    "needs": "compile",
+                    "tests": [
+                        {"name": "usage", "args": ["usage"], "exit": 0},
+                        {"args": ["deep"], "exit": 0, "needs": ["usage"]},
+                    ],
+                },
+                {"name": "other", "args": ["other"], "exit": 0},
+            ],
+        }
+    )
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_runner_skips_dependents_of_failures(tmp_path: Path, jobs: int) -> None:
+    responses = {
+        ("compile",): (1, "", ""),
+        ("usage",): (0, "", ""),
+        ("deep",): (0, "", ""),
+        ("other",): (0, "", ""),
+    }
+    started: list[str] = []
+    runner = BaygonRunner(
+        _dependent_suite(),
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_recording_factory(responses, started),
+    )
+
+    report = runner.run(jobs=jobs)
+
+    assert sorted(started) == ["compile", "other"]
+    assert [result.status for result in report.cases] == [
+        "failed",
+        "skipped",
+        "skipped",
+        "passed",
+    ]
+    assert report.skipped == 2
+    skipped = report.cases[2]
+    assert skipped.commands == () and skipped.points_earned == 0
+    assert str(skipped.issues[0]) == (
+        "Skipped: requires test 1, 2.1, which did not pass."
+    )
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_runner_waits_for_prerequisites(tmp_path: Path, jobs: int) -> None:
+    responses = {(name,): (0, "", "") for name in ("compile", "usage", "deep", "other")}
+    started: list[str] = []
+    runner = BaygonRunner(
+        _dependent_suite(),
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_recording_factory(responses, started),
+    )
+
+    report = runner.run(order=lambda case: -len(case.id), jobs=jobs)
+
+    assert started.index("compile") < started.index("usage") < started.index("deep")
+    assert report.successes == 4
+
+
+def test_runner_ignores_unselected_prerequisites(tmp_path: Path) -> None:
+    responses = {("usage",): (0, "", ""), ("deep",): (0, "", "")}
+    runner = BaygonRunner(
+        _dependent_suite(),
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_fake_factory(responses),
+    )
+
+    report = runner.run(select=lambda case: case.id[0] == 2)
+
+    assert report.successes == 2
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_runner_fail_fast_group_skips_remaining_cases(
+    tmp_path: Path, jobs: int
+) -> None:
+    suite = _suite_from_dict(
+        {
+            "version": 1,
+            "tests": [
+                {
+                    "fail-fast": True,
+                    "tests": [
+                        {"args": ["bad"], "exit": 0},
+                        {"needs": "1.1", "args": ["a"], "exit": 0},
+                        {"tests": [{"args": ["b"], "exit": 0}]},
+                    ],
+                },
+                {"args": ["c"], "exit": 0},
+            ],
+        }
+    )
+    responses = {("bad",): (1, "", "")} | {
+        (name,): (0, "", "") for name in ("a", "b", "c")
+    }
+    started: list[str] = []
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_recording_factory(responses, started),
+    )
+
+    report = runner.run(jobs=jobs)
+
+    assert "a" not in started and "c" in started
+    statuses = {result.case.id_str: result.status for result in report.cases}
+    assert statuses["1.1"] == "failed" and statuses["2"] == "passed"
+    assert statuses["1.2"] == "skipped"
+    assert str(report.cases[1].issues[0]) == (
+        "Skipped: a previous test of fail-fast group 1 failed."
+    )
+    if jobs == 1:
+        assert statuses["1.3.1"] == "skipped"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_runner_time_budget_skips_unstarted_cases(tmp_path: Path, jobs: int) -> None:
+    names = [str(index) for index in range(6)]
+    suite = _suite_from_dict(
+        {
+            "version": 1,
+            "time-budget": 0.005,
+            "tests": [{"args": [name], "exit": 0} for name in names],
+        }
+    )
+    started: list[str] = []
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_recording_factory(
+            {(name,): (0, "", "") for name in names}, started
+        ),
+    )
+
+    report = runner.run(jobs=jobs)
+
+    assert report.total == len(names)
+    assert report.successes == len(started) == jobs
+    assert report.skipped == len(names) - jobs
+    assert str(report.cases[-1].issues[0]) == (
+        "Skipped: the time budget of 0.005 s is spent."
+    )
+
+
+def test_runner_captures_outputs_in_files(tmp_path: Path) -> None:
+    suite = _suite_from_dict(
+        {
+            "version": 1,
+            "capture": "file",
+            "tests": [
+                {
+                    "stdout": [{"equals": "an apple\n"}],
+                    "stderr": [{"contains": "orange"}],
+                    "exit": 42,
+                }
+            ],
+        }
+    )
+    executable = Path(__file__).parent / "executable" / "dummy.exe.py"
+    report = BaygonRunner(suite, base_dir=tmp_path, executable=executable).run()
+
+    assert report.successes == 1
+    assert suite.capture == "file"
+
+
+def test_runner_decodes_outputs_only_for_text_matchers(tmp_path: Path) -> None:
+    digest = "0f3e6b5bd3c7a4ec5d2d0e6b9e4c4f2fc1f04a1f6ae3e0f0c3d2f65bd3c0b0b5"
+    suite = _suite_from_dict(
+        {
+            "version": 1,
+            "tests": [
+                {"args": ["exit"], "exit": 0},
+                {"args": ["bytes"], "stdout": [{"equals-bytes": "89 50 ff"}]},
+                {"args": ["text"], "stdout": [{"contains": "P"}]},
+                {"args": ["bytes"], "stdout": [{"sha256": digest}]},
+            ],
+        }
+    )
+    responses = {(name,): (0, b"\x89P\xff", b"") for name in ("exit", "bytes", "text")}
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_fake_factory(responses),
+    )
+    report = runner.run()
+
+    assert [result.status for result in report.cases] == [
+        "passed",
+        "passed",
+        "failed",
+        "failed",
+    ]
+    assert str(report.cases[2].issues[0]) == (
+        "Output stdout is not valid utf-8 at byte 0: invalid start byte."
+    )
+    assert "has SHA-256" in str(report.cases[3].issues[0])
+    assert report.cases[1].commands[0].text("stdout") == "\ufffdP\ufffd"
+
+
+def test_runner_applies_decode_errors_policy(tmp_path: Path) -> None:
+    suite = _suite_from_dict(
+        {
+            "version": 1,
+            "decode-errors": "replace",
+            "tests": [{"stdout": [{"equals": "ok\ufffd"}]}],
+        }
+    )
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_fake_factory({(): (0, b"ok\xff", b"")}),
+    )
+
+    assert runner.run().successes == 1
+
+
+def test_runner_runs_fixtures_once_per_group(tmp_path: Path) -> None:
+    log = tmp_path / "log"
+    append = [
+        sys.executable,
+        "-c",
+        "import sys; open(sys.argv[1], 'a').write(sys.argv[2] + ' ')",
+        str(log),
+    ]
+    suite = _suite_from_dict(
+        {
+            "version": 1,
+            "setup": [[*append, "suite-up"]],
+            "teardown": [[*append, "suite-down"]],
+            "tests": [
+                {
+                    "setup": [[*append, "up"]],
+                    "teardown": [[*append, "down"]],
+                    "tests": [{"args": ["a"], "exit": 0}, {"args": ["b"], "exit": 0}],
+                },
+                {"args": ["c"], "exit": 0},
+            ],
+        }
+    )
+    responses = {(name,): (0, "", "") for name in ("a", "b", "c")}
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_fake_factory(responses),
+    )
+
+    report = runner.run()
+
+    assert log.read_text().split() == ["suite-up", "up", "down", "suite-down"]
+    assert [(item.scope, item.stage) for item in report.fixtures] == [
+        ("suite", "setup"),
+        ("1", "setup"),
+        ("1", "teardown"),
+        ("suite", "teardown"),
+    ]
+    assert all(item.status == "passed" for item in report.fixtures)
+    assert report.successes == 3
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_runner_skips_cases_of_failed_setup(tmp_path: Path, jobs: int) -> None:
+    fail = [sys.executable, "-c", "import sys; sys.exit('broken fixture')"]
+    suite = _suite_from_dict(
+        {
+            "version": 1,
+            "tests": [
+                {
+                    "setup": [fail],
+                    "teardown": [[sys.executable, "-c", "pass"]],
+                    "tests": [{"args": ["a"], "exit": 0}, {"args": ["b"], "exit": 0}],
+                },
+                {"args": ["c"], "exit": 0},
+            ],
+        }
+    )
+    started: list[str] = []
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_recording_factory({("c",): (0, "", "")}, started),
+    )
+
+    report = runner.run(jobs=jobs)
+
+    assert started == ["c"]
+    assert [result.status for result in report.cases] == [
+        "skipped",
+        "skipped",
+        "passed",
+    ]
+    assert str(report.cases[0].issues[0]) == "Skipped: the setup of group 1 failed."
+    setup, teardown = report.fixtures
+    assert setup.status == "failed"
+    assert setup.commands[0].stderr == "broken fixture\n"
+    assert teardown.stage == "teardown"
+
+
+def test_runner_tears_down_after_limit(tmp_path: Path) -> None:
+    log = tmp_path / "log"
+    suite = _suite_from_dict(
+        {
+            "version": 1,
+            "tests": [
+                {
+                    "teardown": [
+                        [sys.executable, "-c", f"open({str(log)!r}, 'w').write('x')"]
+                    ],
+                    "tests": [{"args": [name], "exit": 0} for name in "abc"],
+                }
+            ],
+        }
+    )
+    responses = {(name,): (1, "", "") for name in "abc"}
+    runner = BaygonRunner(
+        suite,
+        base_dir=tmp_path,
+        executable="prog",
+        executable_factory=_fake_factory(responses),
+    )
+
+    report = runner.run(limit=1)
+
+    assert report.total == 2
+    assert log.read_text() == "x"
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from baygon.core.models import build_suite_model
+from baygon.error import ConfigError
+from baygon.runtime.scheduling import (
+    balanced_partition,
+    dependency_graph,
+    hash_partition,
+    load_durations,
+    longest_first,
+    parse_shard,
+    plan_makespan,
+    shard_selector,
+    suite_hash,
+)
+from baygon.schema import Schema
+
+
+def _cases(count: int):
+    suite = build_suite_model(
+        Schema({"tests": [{"name": f"t{i}", "exit": 0} for i in range(count)]})
+    )
+    return list(suite.iter_cases())
+
+
+@pytest.mark.parametrize("value", ["", "1", "0/2", "3/2", "a/b", "1/0"])
+def test_parse_shard_rejects_invalid(value: str) -> None:
+    with pytest.raises(ConfigError):
+        parse_shard(value)
+
+
+def test_hash_partition_is_stable() -> None:
+    assert hash_partition("1.2.3", 7) == hash_partition("1.2.3", 7)
+    assert {hash_partition(str(i), 3) for i in range(50)} == {0, 1, 2}
+
+
+def test_shards_cover_every_case_exactly_once() -> None:
+    cases = _cases(20)
+    selectors = [shard_selector(cases, k, 3) for k in (1, 2, 3)]
+    for case in cases:
+        assert sum(select(case) for select in selectors) == 1
+
+
+def test_balanced_partition_uses_durations() -> None:
+    cases = _cases(4)
+    durations = {"1": 10.0, "2": 4.0, "3": 3.0, "4": 3.0}
+    first = [c.id_str for c in cases if shard_selector(cases, 1, 2, durations)(c)]
+    second = [c.id_str for c in cases if shard_selector(cases, 2, 2, durations)(c)]
+    assert first == ["1"]
+    assert second == ["2", "3", "4"]
+
+
+def test_balanced_partition_estimates_unknown_cases() -> None:
+    assignment = balanced_partition(["1", "2", "3"], 3, {"1": 5.0})
+    assert sorted(assignment.values()) == [0, 1, 2]
+
+
+def test_load_durations_from_report_and_cache(tmp_path: Path) -> None:
+    report = tmp_path / "report.json"
+    report.write_text(
+        json.dumps({"cases": [{"id": "1", "duration": 2}, {"id": "2"}]}),
+        encoding="utf-8",
+    )
+    assert load_durations(report) == {"1": 2.0}
+
+    state = tmp_path / "state.json"
+    state.write_text(
+        json.dumps({"cases": {"1.1": {"status": "passed", "duration": 0.5}}}),
+        encoding="utf-8",
+    )
+    assert load_durations(state) == {"1.1": 0.5}
+
+
+def test_suite_hash_tracks_changes() -> None:
+    first = build_suite_model(Schema({"tests": [{"exit": 0}]}))
+    same = build_suite_model(Schema({"tests": [{"exit": 0}]}))
+    other = build_suite_model(Schema({"tests": [{"exit": 1}]}))
+    assert suite_hash(first) == suite_hash(same)
+    assert suite_hash(first) != suite_hash(other)
+
+
+def test_longest_first_and_makespan() -> None:
+    cases = _cases(4)
+    durations = {"1": 1.0, "2": 4.0, "3": 2.0}
+    key = longest_first(cases, durations)
+    assert [c.id_str for c in sorted(cases, key=key)] == ["2", "3", "4", "1"]
+    assert plan_makespan(cases, durations, 2) == 5.0
+    assert plan_makespan(cases, durations, 2, key) == 5.0
+    skewed = {"1": 1.0, "2": 1.0, "3": 1.0, "4": 3.0}
+    assert plan_makespan(cases, skewed, 2) == 4.0
+    assert plan_makespan(cases, skewed, 2, longest_first(cases, skewed)) == 3.0
+
+
+def _suite(tests):
+    return build_suite_model(Schema({"version": 1, "tests": tests}))
+
+
+def test_dependency_graph_resolves_ids_names_and_groups() -> None:
+    suite = _suite(
+        [
+            {"name": "build", "exit": 0},
+            {"name": "smoke", "tests": [{"exit": 0}, {"exit": 0}]},
+            {"needs": [1, "smoke"], "tests": [{"exit": 0, "needs": "2.1"}]},
+        ]
+    )
+
+    assert dependency_graph(suite) == {"3.1": ("1", "2.1", "2.2")}
+
+
+@pytest.mark.parametrize(
+    ("tests", "message"),
+    [
+        ([{"exit": 0, "needs": "nope"}], "unknown test 'nope'"),
+        ([{"name": "a", "exit": 0}] * 2 + [{"exit": 0, "needs": "a"}], "several"),
+        ([{"exit": 0, "needs": "1"}], "1 -> 1"),
+        ([{"name": "g", "needs": "g", "tests": [{"exit": 0}]}], "1.1 -> 1.1"),
+        (
+            [{"exit": 0, "needs": "2"}, {"exit": 0, "needs": "1"}],
+            "Circular test dependency",
+        ),
+    ],
+)
+def test_dependency_graph_rejects_invalid_needs(tests, message: str) -> None:
+    with pytest.raises(ConfigError, match=message):
+        dependency_graph(_suite(tests))
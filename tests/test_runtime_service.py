@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from pathlib import Path
+import socket
+import sys
+
+import pytest
+
+from baygon.core.models import build_suite_model
+from baygon.error import ConfigError
+from baygon.matchers import InvalidContains
+from baygon.presentation.payload import case_payload
+from baygon.runtime.fixtures import SetupFailed
+from baygon.runtime.load import LoadThreshold
+from baygon.runtime.runner import BaygonRunner
+from baygon.runtime.service import NoResponse, ServiceUnavailable
+from baygon.schema import Schema
+
+SERVER = """\
+import os
+import socket
+import sys
+import threading
+
+address = sys.argv[1]
+if address.startswith("unix:"):
+    server = socket.socket(socket.AF_UNIX)
+    server.bind(address[len("unix:"):])
+else:
+    server = socket.socket()
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(("127.0.0.1", int(address)))
+server.listen()
+print("listening", flush=True)
+connections = 0
+
+
+def serve(connection):
+    for line in connection.makefile("rb"):
+        command = line.strip().decode()
+        if command == "bye":
+            break
+        if command == "crash":
+            os._exit(3)
+        if command == "count":
+            connection.sendall(f"{connections}\\n".encode())
+        elif command != "silent":
+            connection.sendall(b"echo: " + command.upper().encode() + b"\\n")
+    connection.close()
+
+
+while True:
+    connection, _ = server.accept()
+    connections += 1
+    threading.Thread(target=serve, args=(connection,), daemon=True).start()
+"""
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Path:
+    program = tmp_path / "server.py"
+    program.write_text(f"#!{sys.executable}\n{SERVER}")
+    program.chmod(0o755)
+    return program
+
+
+@pytest.fixture
+def port() -> str:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return str(probe.getsockname()[1])
+
+
+def _run(program: Path, service: dict, tests: list[dict], **suite):
+    config = {"version": 1, **suite, "tests": [{"service": service, "tests": tests}]}
+    model = build_suite_model(Schema(config))
+    return BaygonRunner(model, base_dir=program.parent, executable=program).run()
+
+
+def test_service_answers_requests_on_pooled_connections(
+    server: Path, port: str
+) -> None:
+    report = _run(
+        server,
+        {"address": port, "args": [port]},
+        [
+            {"request": "hello\n", "response": "echo: HELLO\n"},
+            {"request": "world\n", "response": [{"contains": "WORLD"}]},
+            {"request": "count\n", "response": "1\n"},
+        ],
+    )
+
+    assert [case.status for case in report.cases] == ["passed"] * 3
+    assert report.cases[0].commands[0].argv == (port,)
+    assert report.cases[0].commands[0].text("stdout") == "echo: HELLO\n"
+    (stopped,) = report.fixtures
+    assert (stopped.label, stopped.status) == ("Service of group 1", "passed")
+    assert stopped.commands[0].text("stdout") == "listening\n"
+
+
+def test_service_waits_for_its_ready_text_on_a_unix_socket(
+    server: Path, tmp_path: Path
+) -> None:
+    address = f"unix:{tmp_path / 'server.sock'}"
+    report = _run(
+        server,
+        {"address": address, "args": [address], "ready": "listening"},
+        [{"request": "{{ 'a' * 3 }}\n", "response": "echo: AAA\n"}],
+        eval=True,
+    )
+
+    assert report.cases[0].status == "passed", report.cases[0].issues
+
+
+def test_requests_report_mismatched_and_missing_responses(
+    server: Path, port: str
+) -> None:
+    report = _run(
+        server,
+        {"address": port, "args": [port], "timeout": 0.3},
+        [
+            {"request": "silent\n", "response": [{"contains": "x"}]},
+            {"request": "bye\n", "response": [{"contains": "x"}]},
+            {"request": "one\n", "response": [{"contains": "TWO"}]},
+        ],
+    )
+
+    timeout, closed, mismatch = (case.issues for case in report.cases)
+    assert isinstance(timeout[-1], NoResponse)
+    assert str(timeout[-1]) == "No matching response within 0.3 s."
+    assert str(closed[-1]) == (
+        "The service closed the connection before a matching response."
+    )
+    assert isinstance(mismatch[0], InvalidContains)
+
+
+def test_service_that_never_gets_ready_skips_its_tests(server: Path, port: str) -> None:
+    report = _run(
+        server,
+        {"address": port, "args": ["not-a-port"], "start-timeout": 2},
+        [{"request": "hello\n"}],
+    )
+
+    assert report.cases[0].status == "skipped"
+    assert isinstance(report.cases[0].issues[0], SetupFailed)
+    (failed,) = report.fixtures
+    assert (failed.stage, failed.status) == ("service", "failed")
+    assert "ValueError" in failed.commands[0].text("stderr")
+
+
+def test_service_that_crashes_fails_its_stop(server: Path, port: str) -> None:
+    report = _run(
+        server,
+        {"address": port, "args": [port]},
+        [
+            {"request": "crash\n", "response": "x"},
+            {"request": "hello\n", "response": "echo: HELLO\n"},
+        ],
+    )
+
+    # Depending on how far the exit went, the connection is refused or closed.
+    assert isinstance(report.cases[1].issues[-1], (ServiceUnavailable, NoResponse))
+    (stopped,) = report.fixtures
+    assert stopped.status == "failed"
+    assert stopped.commands[0].exit_status == 3
+
+
+def test_load_reports_latencies_and_checks_thresholds(server: Path, port: str) -> None:
+    templates = ["a\n", {"request": "b\n", "response": "echo: B\n"}]
+    report = _run(
+        server,
+        {"address": port, "args": [port]},
+        [
+            {"load": {"concurrency": 4, "requests": 100, "templates": templates}},
+            {
+                "load": {
+                    "requests": 10,
+                    "templates": templates,
+                    "min-rps": 1e9,
+                    "max-p99": 1e-9,
+                }
+            },
+        ],
+    )
+
+    passed, failed = report.cases
+    assert passed.status == "passed", passed.issues
+    summary = case_payload(passed)["load"]
+    assert (summary["requests"], summary["errors"]) == (100, 0)
+    assert set(summary["latency"]) == {"p50", "p95", "p99"}
+    assert [issue.name for issue in failed.issues] == ["min-rps", "max-p99"]
+    assert all(isinstance(issue, LoadThreshold) for issue in failed.issues)
+
+
+def test_request_outside_of_a_service_group(server: Path) -> None:
+    model = build_suite_model(Schema({"version": 1, "tests": [{"request": "x"}]}))
+
+    with pytest.raises(ConfigError):
+        BaygonRunner(model, base_dir=server.parent, executable=server).run()
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"tests": [{"response": "x"}]},
+        {"tests": [{"request": "x", "args": ["y"]}]},
+        {"tests": [{"load": {"templates": ["x"]}}]},
+        {"tests": [{"load": {"requests": 1, "templates": []}}]},
+        {"tests": [{"request": "x", "load": {"requests": 1, "templates": ["x"]}}]},
+        {"tests": [{"service": {"address": "host"}, "tests": []}]},
+        {"tests": [{"service": {"address": 70000}, "tests": []}]},
+        {"tests": [{"service": {"address": "unix:"}, "tests": []}]},
+        {"tests": [{"service": {"address": 80, "connections": 0}, "tests": []}]},
+    ],
+)
+def test_invalid_services(config: dict) -> None:
+    with pytest.raises(ConfigError):
+        Schema(config, humanize=True)
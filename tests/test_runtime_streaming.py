@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import time
+
+import pytest
+
+from baygon.core.models import ConditionModel, build_suite_model
+from baygon.matchers import InvalidContains
+from baygon.runtime.runner import BaygonRunner
+from baygon.runtime.streaming import EarlyExit, OutputMonitor, StreamCheck
+from baygon.schema import Schema
+
+
+def test_monitor_finds_forbidden_text_across_chunks() -> None:
+    check = StreamCheck(ConditionModel(), b"error", negated=True)
+    monitor = OutputMonitor([check])
+
+    assert not monitor(b"no err")
+    assert monitor(b"or here")
+    assert monitor.failed is check
+    assert monitor.size == 13
+    assert monitor(b"") is True
+
+
+@pytest.mark.parametrize(
+    ("chunks", "failed"),
+    [
+        ([b"4", b"2\n"], False),
+        ([b"4", b"3\n"], True),
+        ([b"42\n", b"more"], True),
+    ],
+)
+def test_monitor_compares_exact_output(chunks: list[bytes], failed: bool) -> None:
+    monitor = OutputMonitor([StreamCheck(ConditionModel(), b"42\n")])
+
+    assert [monitor(chunk) for chunk in chunks][-1] is failed
+
+
+def test_early_exit_message() -> None:
+    assert str(EarlyExit(12, on="stdout")) == (
+        "Program stopped after 12 bytes on stdout: the test could no longer pass."
+    )
+
+
+@pytest.fixture
+def spinner(tmp_path: Path) -> Path:
+    program = tmp_path / "spin.py"
+    program.write_text(
+        f"#!{sys.executable}\n"
+        "import sys, time\n"
+        "print(sys.argv[1], flush=True)\n"
+        "if len(sys.argv) > 2:\n"
+        "    time.sleep(30)\n"
+    )
+    program.chmod(0o755)
+    return program
+
+
+def _run(spinner: Path, data: dict):
+    suite = build_suite_model(Schema({"version": 1, **data}))
+    return BaygonRunner(suite, base_dir=spinner.parent, executable=spinner).run()
+
+
+def test_runner_stops_programs_whose_output_failed(spinner: Path) -> None:
+    start = time.perf_counter()
+    report = _run(
+        spinner,
+        {
+            "early-exit": True,
+            "tests": [
+                {"args": ["41", "spin"], "stdout": [{"equals": "42\n"}]},
+                {"args": ["Error", "spin"], "stdout": [{"not": [{"contains": "E"}]}]},
+                {"args": ["42"], "stdout": [{"equals": "42\n"}], "exit": 0},
+            ],
+        },
+    )
+
+    assert time.perf_counter() - start < 10
+    assert [result.status for result in report.cases] == ["failed", "failed", "passed"]
+    first, second = report.cases[0].issues, report.cases[1].issues
+    assert str(first[0]).startswith("Output '41")
+    assert isinstance(first[1], EarlyExit)
+    assert isinstance(second[0], InvalidContains)
+    assert isinstance(second[1], EarlyExit)
+
+
+def test_early_exit_ignores_filtered_and_evaluated_conditions(spinner: Path) -> None:
+    report = _run(
+        spinner,
+        {
+            "early-exit": True,
+            "eval": True,
+            "tests": [
+                {
+                    "args": ["41"],
+                    "stdout": [
+                        {"filters": {"trim": True}, "equals": "42"},
+                        {"equals": "{{ 40 + 2 }}\n"},
+                    ],
+                },
+                {"early-exit": False, "args": ["41"], "stdout": [{"equals": "42\n"}]},
+            ],
+        },
+    )
+
+    for result in report.cases:
+        assert result.status == "failed"
+        assert not any(isinstance(issue, EarlyExit) for issue in result.issues)
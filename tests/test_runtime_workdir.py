@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from baygon.core.models import build_suite_model
+from baygon.error import ConfigError
+from baygon.presentation.payload import case_payload
+from baygon.runtime import workdir as workdir_module
+from baygon.runtime.runner import BaygonRunner
+from baygon.runtime.workdir import clone_file, create_workdir, populate, remove_workdir
+from baygon.schema import Schema
+
+
+@pytest.fixture
+def template(tmp_path: Path) -> Path:
+    root = tmp_path / "template"
+    (root / "data").mkdir(parents=True)
+    (root / "data" / "input.txt").write_text("1 2 3\n")
+    (root / "notes.txt").write_text("notes\n")
+    (root / "link").symlink_to("notes.txt")
+    return root
+
+
+def test_populate_recreates_the_tree(template: Path, tmp_path: Path) -> None:
+    destination = tmp_path / "copy"
+    destination.mkdir()
+
+    methods = populate(template, destination)
+
+    assert sum(methods.values()) == 2
+    assert (destination / "data" / "input.txt").read_text() == "1 2 3\n"
+    assert (destination / "link").is_symlink()
+    assert (destination / "link").read_text() == "notes\n"
+
+
+def test_clone_file_hard_links_read_only_files(template: Path, tmp_path: Path) -> None:
+    source = template / "notes.txt"
+    source.chmod(0o444)
+
+    method = clone_file(source, tmp_path / "ro.txt")
+
+    assert method in {"reflink", "hardlink"}
+    if method == "hardlink":
+        assert (tmp_path / "ro.txt").stat().st_ino == source.stat().st_ino
+
+
+def test_clone_file_copies_writable_files(template: Path, tmp_path: Path) -> None:
+    method = clone_file(template / "notes.txt", tmp_path / "rw.txt")
+
+    assert method in {"reflink", "copy"}
+    (tmp_path / "rw.txt").write_text("changed\n")
+    assert (template / "notes.txt").read_text() == "notes\n"
+
+
+def test_clone_file_without_fcntl(
+    template: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(workdir_module, "fcntl", None)
+    source = template / "notes.txt"
+
+    assert clone_file(source, tmp_path / "rw.txt") == "copy"
+    source.chmod(0o444)
+    assert clone_file(source, tmp_path / "ro.txt") == "hardlink"
+    assert (tmp_path / "ro.txt").read_text() == "notes\n"
+
+
+def test_create_and_remove_workdir(template: Path, tmp_path: Path) -> None:
+    path = create_workdir(template, tmp_path)
+
+    assert path.parent == tmp_path
+    assert (path / "notes.txt").exists()
+    remove_workdir(path)
+    assert not path.exists()
+
+
+def test_default_root_is_on_the_template_filesystem(
+    template: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert workdir_module.default_root(template) == tmp_path
+    monkeypatch.setattr(workdir_module.os, "access", lambda *_: False)
+    assert workdir_module.default_root(template) is None
+
+
+def test_workdir_shares_read_only_files_with_the_template(
+    template: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    methods = []
+
+    def _clone(source: Path, destination: Path) -> str:
+        methods.append(clone_file(source, destination))
+        return methods[-1]
+
+    monkeypatch.setattr(workdir_module, "clone_file", _clone)
+    for path in (template / "notes.txt", template / "data" / "input.txt"):
+        path.chmod(0o444)
+
+    path = create_workdir(template)
+
+    assert path.parent == template.parent
+    assert methods
+    assert set(methods) <= {"reflink", "hardlink"}
+    remove_workdir(path)
+
+
+def _program(tmp_path: Path) -> Path:
+    program = tmp_path / "append.sh"
+    program.write_text('#!/bin/sh\necho "$1" >> notes.txt\ncat notes.txt\n')
+    program.chmod(0o755)
+    return program
+
+
+def _suite(tests):
+    return build_suite_model(Schema({"version": 1, "tests": tests}))
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_runner_isolates_each_case(template: Path, tmp_path: Path, jobs: int) -> None:
+    suite = _suite(
+        [
+            {
+                "workdir": "template",
+                "tests": [
+                    {"args": [name], "stdout": [{"equals": f"notes\n{name}\n"}]}
+                    for name in ("a", "b", "c")
+                ],
+            }
+        ]
+    )
+    runner = BaygonRunner(suite, base_dir=tmp_path, executable=_program(tmp_path))
+
+    report = runner.run(jobs=jobs)
+
+    assert report.successes == 3
+    assert (template / "notes.txt").read_text() == "notes\n"
+    assert all(result.workdir is None for result in report.cases)
+
+
+def test_runner_keeps_failed_workdirs(template: Path, tmp_path: Path) -> None:
+    suite = _suite(
+        [
+            {"workdir": "template", "args": ["a"], "exit": 1},
+            {"workdir": "template", "args": ["b"], "exit": 0},
+        ]
+    )
+    runner = BaygonRunner(
+        suite, base_dir=tmp_path, executable=_program(tmp_path), keep_failed=True
+    )
+
+    failed, passed = runner.run().cases
+
+    kept = Path(failed.workdir)
+    assert (kept / "notes.txt").read_text() == "notes\na\n"
+    assert passed.workdir is None
+    assert case_payload(failed)["workdir"] == failed.workdir
+    assert "workdir" not in case_payload(passed)
+    remove_workdir(kept)
+
+
+def test_runner_rejects_missing_template(tmp_path: Path) -> None:
+    suite = _suite([{"workdir": "missing", "exit": 0}])
+    runner = BaygonRunner(suite, base_dir=tmp_path, executable=_program(tmp_path))
+
+    with pytest.raises(ConfigError, match="missing"):
+        runner.run()
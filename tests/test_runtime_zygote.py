@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+from pathlib import Path
+import socket
+import sys
+import time
+
+import pytest
+
+from baygon.runtime import zygote
+from baygon.runtime.prefork import PreforkPool
+
+
+def test_preload_imports_the_standard_modules_of_a_script(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for name in ("colorsys", "wave"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    (tmp_path / "wave.py").write_text("")
+    script = tmp_path / "script.py"
+    script.write_text("import colorsys\nfrom wave import open\nimport missing\n")
+
+    zygote.preload(str(script))
+
+    assert "colorsys" in sys.modules
+    assert "wave" not in sys.modules
+
+
+def test_preload_ignores_invalid_scripts(tmp_path: Path) -> None:
+    script = tmp_path / "script.py"
+    script.write_text("import (")
+    zygote.preload(str(script))
+    zygote.preload(str(tmp_path / "missing.py"))
+
+
+def test_shadowed_lists_loaded_modules_next_to_a_script(tmp_path: Path) -> None:
+    assert zygote.shadowed(tmp_path) == []
+
+    (tmp_path / "json.py").write_text("")
+    (tmp_path / "sys.py").write_text("")
+    (tmp_path / "selectors").mkdir()
+
+    assert zygote.shadowed(tmp_path) == ["json", "selectors"]
+
+
+@pytest.fixture(autouse=True)
+def _interpreter_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Restore what `execute` changes in the interpreter running the tests."""
+    monkeypatch.setattr(sys, "argv", list(sys.argv))
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    monkeypatch.setattr(sys, "excepthook", sys.__excepthook__)
+
+
+def test_execute_runs_a_script_as_main(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    script = tmp_path / "script.py"
+    script.write_text("import sys\nprint(__name__, sys.argv[1:], sys.path[0])\n")
+
+    with pytest.raises(SystemExit) as exit_info:
+        zygote.execute([str(script), "a", "b"])
+
+    assert exit_info.value.code == 0
+    assert capsys.readouterr().out == f"__main__ ['a', 'b'] {tmp_path}\n"
+
+
+@pytest.mark.parametrize(
+    ("source", "code"), [("raise SystemExit(3)", 3), ("exit('bye')", "bye")]
+)
+def test_execute_keeps_the_exit_status_of_a_script(
+    tmp_path: Path, source: str, code
+) -> None:
+    script = tmp_path / "script.py"
+    script.write_text(source)
+
+    with pytest.raises(SystemExit) as exit_info:
+        zygote.execute([str(script)])
+
+    assert exit_info.value.code == code
+
+
+def test_execute_reports_errors_from_the_frames_of_the_script(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    script = tmp_path / "script.py"
+    script.write_text("def fail():\n    raise ValueError('broken')\n\nfail()\n")
+
+    with pytest.raises(SystemExit) as exit_info:
+        zygote.execute([str(script)])
+
+    assert exit_info.value.code == 1
+    stderr = capsys.readouterr().err
+    assert stderr.startswith("Traceback")
+    assert f'File "{script}", line 4, in <module>' in stderr
+    assert "ValueError: broken" in stderr
+    assert "runpy" not in stderr
+    assert "zygote" not in stderr
+
+
+def test_run_gives_the_child_the_streams_and_environment_of_the_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(Path.cwd())
+    dups: list[tuple[int, int]] = []
+    closed: list[int] = []
+    executed: list[list[str]] = []
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "dup2", lambda fd, target: dups.append((fd, target)))
+        patch.setattr(os, "close", closed.append)
+        patch.setattr(os, "environ", {"OLD": "1"})
+        for name in zygote.STREAMS:
+            stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+            patch.setattr(sys, name, stream)
+            patch.setattr(sys, f"__{name}__", stream)
+        patch.setattr(zygote, "execute", executed.append)
+
+        request = {
+            "argv": ["script.py", "a"],
+            "env": {"NEW": "2"},
+            "cwd": str(tmp_path),
+        }
+        zygote.run(request, [10, 11, 12])
+
+        assert dups == [(10, 0), (11, 1), (12, 2)]
+        assert sorted(closed) == [10, 11, 12]
+        assert os.environ == {"NEW": "2"}
+        assert Path.cwd() == tmp_path
+        assert [sys.stdin.mode, sys.stdout.mode] == ["r", "w"]
+        assert sys.__stderr__ is sys.stderr
+        assert sys.stderr.buffer.name == "<stderr>"
+    assert executed == [["script.py", "a"]]
+
+
+@pytest.mark.parametrize(
+    ("previous", "buffered"),
+    [
+        (io.TextIOWrapper(io.BytesIO(), encoding="latin-1"), True),
+        (io.TextIOWrapper(io.FileIO(os.devnull, "w"), write_through=True), False),
+    ],
+)
+def test_reopen_configures_streams_like_the_interpreter(
+    previous: io.TextIOWrapper, buffered: bool
+) -> None:
+    read, write = os.pipe()
+    try:
+        stream = zygote._reopen(write, "stdout", previous)
+        stream.write("é\n")
+        stream.flush()
+
+        assert os.read(read, 16) == "é\n".encode(previous.encoding)
+        assert stream.mode == "w"
+        assert stream.buffer.name == "<stdout>"
+        assert isinstance(stream.buffer, io.BufferedWriter) == buffered
+    finally:
+        os.close(read)
+        os.close(write)
+
+
+def test_reap_reports_the_exit_status_of_children() -> None:
+    reply, remote = socket.socketpair()
+    pid = os.fork()
+    if pid == 0:
+        os._exit(3)
+    replies = {pid: reply}
+    deadline = time.monotonic() + 10
+    while replies and time.monotonic() < deadline:
+        zygote._reap(replies)
+        time.sleep(0.01)
+
+    assert replies == {}
+    assert json.loads(remote.recv(64)) == {"status": 3}
+    remote.close()
+    zygote._reap({})
+
+
+def test_drain_empties_a_pipe() -> None:
+    read, write = os.pipe()
+    os.set_blocking(read, False)
+    os.write(write, b"x" * 10000)
+
+    zygote._drain(read)
+
+    with pytest.raises(BlockingIOError):
+        os.read(read, 1)
+    os.close(read)
+    os.close(write)
+
+
+def test_scripts_next_to_modules_of_the_zygote_start_directly(tmp_path: Path) -> None:
+    (tmp_path / "json.py").write_text("def dumps(value):\n    return 'sibling'\n")
+    script = tmp_path / "script.py"
+    script.write_text(
+        f"#!{sys.executable}\nimport json, os\nprint(json.dumps(1), os.getppid())\n"
+    )
+    script.chmod(0o755)
+    pool = PreforkPool()
+    try:
+        output = pool.executable(str(script)).run()
+    finally:
+        pool.close()
+
+    assert output.stdout == f"sibling {os.getpid()}\n"
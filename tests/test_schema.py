@@ -228,3 +228,27 @@ class TestSchema(TestCase):
         with self.assertRaises(ConfigSyntaxError) as exc:
             Schema("tests:\n  - exit: [")
         self.assertIn("line", str(exc.exception))
+
+    def test_byte_matchers(self):
+        config = Schema(dedent("""
+                tests:
+                  - stdout:
+                      - equals-bytes: "89 50 4E 47"
+                      - equals-bytes: !!binary iVBORw==
+                      - sha256: E3B0C44298FC1C149AFBF4C8996FB92427AE41E4649B934CA495991B7852B855
+                """))
+        stdout = config["tests"][0]["stdout"]
+        self.assertEqual(stdout[0]["equals-bytes"], "89504e47")
+        self.assertEqual(stdout[1]["equals-bytes"], "89504e47")
+        self.assertEqual(stdout[2]["sha256"][:8], "e3b0c442")
+
+    def test_byte_matchers_invalid(self):
+        for condition in ({"equals-bytes": "8g"}, {"sha256": "abc"}):
+            with self.assertRaises(ConfigError):
+                Schema({"tests": [{"stdout": [condition]}]}, humanize=True)
+
+    def test_decode_errors_policy(self):
+        config = Schema({"decode-errors": "replace", "tests": [{"exit": 0}]})
+        self.assertEqual(config["decode-errors"], "replace")
+        with self.assertRaises(ConfigError):
+            Schema({"decode-errors": "lenient", "tests": []}, humanize=True)
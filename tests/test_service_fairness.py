@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pytest
+
+from baygon.service.fairness import (
+    DEFAULT_PRIORITY,
+    FairScheduler,
+    QueueHead,
+    parse_priority,
+)
+
+
+@pytest.mark.parametrize("value", ["urgent", True, 1.5])
+def test_parse_priority_rejects_invalid(value) -> None:
+    with pytest.raises((ValueError, TypeError)):
+        parse_priority(value)
+
+
+def test_parse_priority_default() -> None:
+    assert parse_priority(None) == DEFAULT_PRIORITY
+
+
+def test_higher_priority_runs_first() -> None:
+    heads = [QueueHead(1, "alice", 0), QueueHead(2, "bob", 100)]
+    assert FairScheduler().choose(heads, {}).job_id == 2
+
+
+def test_owners_take_turns() -> None:
+    scheduler = FairScheduler()
+    served = []
+    queue = {"alice": [1, 2, 3], "bob": [4], "carol": [5, 6]}
+    while any(queue.values()):
+        heads = [QueueHead(jobs[0], owner, 50) for owner, jobs in queue.items() if jobs]
+        head = scheduler.choose(heads, {})
+        served.append(queue[head.owner].pop(0))
+    assert served == [1, 4, 5, 2, 6, 3]
+
+
+def test_owner_with_fewer_running_jobs_goes_first() -> None:
+    heads = [QueueHead(1, "alice", 50), QueueHead(2, "bob", 50)]
+    assert FairScheduler().choose(heads, {"alice": 2}).owner == "bob"
+
+
+def test_caps_limit_running_jobs() -> None:
+    heads = [QueueHead(1, "alice", 100), QueueHead(2, "bob", 0)]
+    scheduler = FairScheduler(owner_cap=2, caps={"bob": 1})
+    assert scheduler.choose(heads, {"alice": 2}).owner == "bob"
+    assert scheduler.choose(heads, {"alice": 2, "bob": 1}) is None
+    assert scheduler.cap("carol") == 2
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sqlite3
+import time
+
+from baygon.service.fairness import FairScheduler
+from baygon.service.jobs import DONE, FAILED, PENDING, RUNNING, JobStore
+
+
+def test_jobs_are_claimed_in_order() -> None:
+    store = JobStore()
+    first = store.submit("a.yml", "./a.out")
+    second = store.submit("b.yml")
+
+    claimed = store.claim()
+    assert claimed is not None
+    assert claimed.id == first.id
+    assert claimed.status == RUNNING
+    assert claimed.started is not None
+    assert store.claim().id == second.id
+    assert store.claim() is None
+
+
+def test_job_outcomes_are_stored() -> None:
+    store = JobStore()
+    done = store.submit("a.yml")
+    failed = store.submit("b.yml")
+    store.finish(done.id, {"total": 1})
+    store.fail(failed.id, "boom")
+
+    assert store.get(done.id).report == {"total": 1}
+    assert store.get(done.id).status == DONE
+    assert store.get(failed.id).error == "boom"
+    assert store.get(failed.id).to_dict()["status"] == FAILED
+    assert store.get(42) is None
+    assert store.counts() == {PENDING: 0, RUNNING: 0, DONE: 1, FAILED: 1}
+
+
+def test_running_jobs_resume_after_restart(tmp_path: Path) -> None:
+    database = tmp_path / "jobs.sqlite"
+    store = JobStore(database)
+    job = store.submit("a.yml")
+    store.submit("b.yml")
+    store.claim()
+    store.close()
+
+    reopened = JobStore(database)
+    assert reopened.counts()[PENDING] == 2
+    resumed = reopened.claim()
+    assert resumed.id == job.id
+    assert resumed.status == RUNNING
+
+
+def test_claim_is_fair_between_owners() -> None:
+    store = JobStore(scheduler=FairScheduler(owner_cap=2))
+    for _ in range(3):
+        store.submit("a.yml", owner="alice")
+    store.submit("b.yml", owner="bob")
+    store.submit("n.yml", owner="nightly", priority=0)
+
+    order = [store.claim().owner for _ in range(4)]
+    assert order == ["alice", "bob", "alice", "nightly"]
+    assert store.claim() is None
+
+
+def test_metrics_report_queue_and_waits() -> None:
+    store = JobStore()
+    first = store.submit("a.yml", owner="alice", priority=100)
+    store.submit("b.yml", owner="bob")
+    store.submit("c.yml", owner="bob")
+    store.finish(store.claim().id, {})
+
+    metrics = store.metrics()
+    assert store.get(first.id).status == DONE
+    assert metrics["queue"]["depth"] == 2
+    assert metrics["queue"]["by_priority"] == {"50": 2}
+    assert metrics["queue"]["owners"] == 1
+    assert metrics["queue"]["oldest_wait"] >= 0
+    assert metrics["wait"]["count"] == 1
+    assert metrics["wait"]["p95"] == metrics["wait"]["max"]
+    assert metrics["throughput"]["completed"] == 1
+    assert metrics["throughput"]["per_minute"] == 0.2
+
+    later = store.metrics(window=10, now=time.time() + 3600)
+    assert later["wait"] == {
+        "count": 0,
+        "mean": None,
+        "p50": None,
+        "p95": None,
+        "max": None,
+    }
+    assert later["throughput"]["completed"] == 0
+
+
+def test_store_upgrades_older_databases(tmp_path: Path) -> None:
+    database = tmp_path / "jobs.sqlite"
+    with sqlite3.connect(database) as db:
+        db.execute(
+            "CREATE TABLE jobs (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " suite TEXT NOT NULL, executable TEXT, status TEXT NOT NULL,"
+            " created REAL NOT NULL, started REAL, finished REAL,"
+            " report TEXT, error TEXT)"
+        )
+        db.execute(
+            "INSERT INTO jobs (suite, status, created) VALUES ('a.yml', 'pending', 0)"
+        )
+    db.close()
+
+    job = JobStore(database).claim()
+    assert job.owner == "anonymous"
+    assert job.priority == 50
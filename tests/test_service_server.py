@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import http.client
+import json
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from baygon.__main__ import app
+from baygon.service import (
+    GradingService,
+    JobStore,
+    SuiteCache,
+    create_server,
+    server_address,
+)
+
+SUITE = """
+filters:
+  trim: true
+tests:
+  - args: [2]
+    stdout: [equals: 4]
+  - args: [3]
+    stdout: [equals: 7]
+"""
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str) -> None:
+        super().__init__("localhost", timeout=10)
+        self._path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self._path)
+
+
+def _connect(address: str) -> http.client.HTTPConnection:
+    if address.startswith("unix:"):
+        return UnixHTTPConnection(address[len("unix:") :])
+    host, _, port = address.rpartition(":")
+    return http.client.HTTPConnection(host, int(port), timeout=10)
+
+
+def _request(address: str, method: str, path: str, body=None):
+    connection = _connect(address)
+    payload = body if isinstance(body, bytes) or body is None else json.dumps(body)
+    connection.request(method, path, body=payload)
+    response = connection.getresponse()
+    data = json.loads(response.read())
+    connection.close()
+    return response.status, data
+
+
+def _wait_for(address: str, job_id: int) -> dict:
+    deadline = time.monotonic() + 10
+    while True:
+        _, job = _request(address, "GET", f"/jobs/{job_id}")
+        if job["status"] in {"done", "failed"}:
+            return job
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def suite_dir(tmp_path: Path) -> Path:
+    program = tmp_path / "double.sh"
+    program.write_text("#!/bin/sh\necho $(( $1 * 2 ))\n", encoding="utf-8")
+    program.chmod(0o755)
+    (tmp_path / "baygon.yml").write_text(SUITE, encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def address(request, tmp_path: Path):
+    service = GradingService(JobStore(), jobs=2)
+    listen = "127.0.0.1:0" if request.param == "tcp" else f"unix:{tmp_path}/api.sock"
+    server = create_server(listen, service)
+    service.start()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield server_address(server)
+    server.shutdown()
+    server.server_close()
+    service.stop()
+
+
+def test_suite_cache_reloads_modified_suites(suite_dir: Path) -> None:
+    cache = SuiteCache()
+    config = suite_dir / "baygon.yml"
+    first = cache.get(suite_dir)
+    assert cache.get(config) is first
+
+    config.write_text(SUITE + "  - args: [1]\n", encoding="utf-8")
+    stat = config.stat()
+    os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    reloaded = cache.get(config)
+    assert reloaded is not first
+    assert len(list(reloaded.model.iter_cases())) == 3
+
+
+def test_jobs_are_graded_through_the_api(suite_dir: Path, address: str) -> None:
+    status, job = _request(
+        address,
+        "POST",
+        "/jobs",
+        {"suite": str(suite_dir), "executable": str(suite_dir / "double.sh")},
+    )
+    assert status == 202
+    assert job["status"] == "pending"
+
+    job = _wait_for(address, job["id"])
+    assert job["status"] == "done"
+    assert job["report"]["successes"] == 1
+    assert job["report"]["failures"] == 1
+
+    _, failed = _request(
+        address, "POST", "/jobs", {"suite": str(suite_dir), "executable": "nope"}
+    )
+    failed = _wait_for(address, failed["id"])
+    assert failed["status"] == "failed"
+    assert "not an executable" in failed["error"]
+
+    status, summary = _request(address, "GET", "/status")
+    assert status == 200
+    assert summary["jobs"]["done"] == 1
+    assert summary["jobs"]["failed"] == 1
+    assert summary["throughput"]["completed"] == 2
+
+
+class CrashingSuites(SuiteCache):
+    def get(self, path):
+        if Path(path).name == "crash.yml":
+            raise RuntimeError("unexpected")
+        return super().get(path)
+
+
+def test_crashing_jobs_fail_without_stopping_the_service(suite_dir: Path) -> None:
+    store = JobStore()
+    service = GradingService(store, suites=CrashingSuites())
+    service.start()
+    try:
+        crashed = service.submit(str(suite_dir / "crash.yml"))
+        graded = service.submit(str(suite_dir), str(suite_dir / "double.sh"))
+        deadline = time.monotonic() + 10
+        while store.get(graded.id).status not in {"done", "failed"}:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+    finally:
+        service.stop()
+
+    assert store.get(crashed.id).status == "failed"
+    assert store.get(crashed.id).error == "RuntimeError: unexpected"
+    assert store.get(graded.id).status == "done"
+
+
+def test_jobs_carry_owner_and_priority(suite_dir: Path, address: str) -> None:
+    _, job = _request(
+        address,
+        "POST",
+        "/jobs",
+        {"suite": str(suite_dir), "owner": "alice", "priority": "interactive"},
+    )
+    assert job["owner"] == "alice"
+    assert job["priority"] == 100
+    _wait_for(address, job["id"])
+
+    connection = _connect(address)
+    connection.request("GET", "/metrics")
+    response = connection.getresponse()
+    text = response.read().decode("utf-8")
+    connection.close()
+    assert response.getheader("Content-Type").startswith("text/plain")
+    assert 'baygon_jobs{status="failed"} 1' in text
+    assert "baygon_job_wait_seconds_count 1" in text
+    assert 'baygon_job_wait_seconds{quantile="0.95"}' in text
+    assert "baygon_workers 2" in text
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "body", "expected"),
+    [
+        ("POST", "/jobs", b"not json", 400),
+        ("POST", "/jobs", {"executable": "a.out"}, 400),
+        ("POST", "/jobs", {"suite": "a.yml", "executable": 1}, 400),
+        ("POST", "/jobs", [1], 400),
+        ("POST", "/jobs", {"suite": "a.yml", "owner": ""}, 400),
+        ("POST", "/jobs", {"suite": "a.yml", "priority": "urgent"}, 400),
+        ("POST", "/other", {}, 404),
+        ("GET", "/jobs/999", None, 404),
+        ("GET", "/nothing", None, 404),
+    ],
+)
+def test_api_rejects_invalid_requests(address, method, path, body, expected) -> None:
+    status, payload = _request(address, method, path, body)
+    assert status == expected
+    assert "error" in payload
+
+
+def test_serve_command(suite_dir: Path) -> None:
+    socket_path = suite_dir / "api.sock"
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "baygon",
+            "serve",
+            "--listen",
+            f"unix:{socket_path}",
+            "--db",
+            str(suite_dir / "jobs.sqlite"),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while not socket_path.exists():
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        address = f"unix:{socket_path}"
+        _, job = _request(
+            address,
+            "POST",
+            "/jobs",
+            {"suite": str(suite_dir), "executable": str(suite_dir / "double.sh")},
+        )
+        assert _wait_for(address, job["id"])["status"] == "done"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def test_serve_rejects_invalid_address(tmp_path: Path) -> None:
+    result = CliRunner().invoke(
+        app, ["serve", "--listen", "nowhere", "--db", str(tmp_path / "jobs.sqlite")]
+    )
+    assert result.exit_code == 1
+    assert "Invalid" in result.output
+
+
+def test_serve_listens_on_other_machines_only_when_allowed(tmp_path: Path) -> None:
+    result = CliRunner().invoke(
+        app, ["serve", "--listen", "0.0.0.0:0", "--db", str(tmp_path / "jobs.sqlite")]
+    )
+    assert result.exit_code == 1
+    assert "without allowing remote clients" in result.output